@@ -0,0 +1,61 @@
+"""部门闭包表 sys_dept_closure
+
+Revision ID: 20261018_0001
+Revises:
+Create Date: 2026-10-18 10:00:00
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _closure_rows(parent_map: dict[int, int | None]) -> list[dict]:
+    # 迁移脚本需自包含，不引用应用代码（与 common_util.get_closure_rows 逻辑一致）
+    rows = []
+    for node_id in parent_map:
+        ancestor_id, depth, seen = node_id, 0, set()
+        while ancestor_id is not None and ancestor_id in parent_map and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            rows.append({"ancestor_id": ancestor_id, "descendant_id": node_id, "depth": depth})
+            ancestor_id = parent_map[ancestor_id]
+            depth += 1
+    return rows
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table("sys_dept_closure"):
+        op.create_table(
+            "sys_dept_closure",
+            sa.Column("ancestor_id", sa.Integer(), nullable=False, comment="祖先部门ID"),
+            sa.Column("descendant_id", sa.Integer(), nullable=False, comment="后代部门ID"),
+            sa.Column("depth", sa.Integer(), nullable=False, comment="层级距离(0:自身)"),
+            sa.ForeignKeyConstraint(["ancestor_id"], ["sys_dept.id"], ondelete="CASCADE", onupdate="CASCADE"),
+            sa.ForeignKeyConstraint(["descendant_id"], ["sys_dept.id"], ondelete="CASCADE", onupdate="CASCADE"),
+            sa.PrimaryKeyConstraint("ancestor_id", "descendant_id"),
+            comment="部门祖先闭包表",
+        )
+        op.create_index("ix_sys_dept_closure_descendant", "sys_dept_closure", ["descendant_id"])
+
+    # 按现有部门数据回填
+    dept = sa.table("sys_dept", sa.column("id"), sa.column("parent_id"), sa.column("is_deleted"))
+    closure = sa.table("sys_dept_closure", sa.column("ancestor_id"), sa.column("descendant_id"), sa.column("depth"))
+    parent_map = dict(bind.execute(sa.select(dept.c.id, dept.c.parent_id).where(dept.c.is_deleted.is_(False))).all())
+    bind.execute(sa.delete(closure))
+    rows = _closure_rows(parent_map)
+    if rows:
+        op.bulk_insert(closure, rows)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sys_dept_closure_descendant", table_name="sys_dept_closure")
+    op.drop_table("sys_dept_closure")
@@ -0,0 +1,38 @@
+"""操作日志记录请求关联ID与SQL统计
+
+Revision ID: 20261018_0002
+Revises: 20261018_0001
+Create Date: 2026-10-18 14:00:00
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0002"
+down_revision: str | None = "20261018_0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_COLUMNS = (
+    sa.Column("correlation_id", sa.String(64), nullable=True, comment="请求关联ID"),
+    sa.Column("sql_count", sa.Integer(), nullable=True, comment="SQL语句数"),
+    sa.Column("sql_time", sa.String(20), nullable=True, comment="SQL耗时"),
+)
+
+
+def upgrade() -> None:
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("sys_operation_log")}
+    with op.batch_alter_table("sys_operation_log") as batch_op:
+        for column in _COLUMNS:
+            if column.name not in existing:
+                batch_op.add_column(column)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("sys_operation_log") as batch_op:
+        for column in reversed(_COLUMNS):
+            batch_op.drop_column(column.name)
@@ -0,0 +1,106 @@
+"""工作流运行记录与节点记录
+
+Revision ID: 20261018_0003
+Revises: 20261018_0002
+Create Date: 2026-10-18 18:00:00
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261018_0003"
+down_revision: str | None = "20261018_0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_BASE_INDEXED = ("id", "uuid", "is_deleted", "created_time", "updated_time", "deleted_time", "tenant_id")
+_USER_INDEXED = ("created_id", "updated_id", "deleted_id")
+
+
+def _base_columns() -> list[sa.Column]:
+    # ModelMixin + TenantMixin 字段（迁移脚本自包含，不引用应用模型）
+    return [
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False, comment="主键ID"),
+        sa.Column("uuid", sa.String(64), nullable=False, comment="UUID全局唯一标识"),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False, comment="是否已删除(0:未删除 1:已删除)"),
+        sa.Column("created_time", sa.DateTime(), nullable=False, comment="创建时间"),
+        sa.Column("updated_time", sa.DateTime(), nullable=False, comment="更新时间"),
+        sa.Column("deleted_time", sa.DateTime(), nullable=True, comment="删除时间"),
+        sa.Column("tenant_id", sa.Integer(), nullable=False, comment="租户ID"),
+        sa.ForeignKeyConstraint(["tenant_id"], ["platform_tenant.id"], ondelete="RESTRICT", onupdate="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    ]
+
+
+def _user_columns() -> list[sa.Column]:
+    # UserMixin 字段
+    return [
+        sa.Column("created_id", sa.Integer(), nullable=True, comment="创建人ID"),
+        sa.Column("updated_id", sa.Integer(), nullable=True, comment="更新人ID"),
+        sa.Column("deleted_id", sa.Integer(), nullable=True, comment="删除人ID"),
+        *(sa.ForeignKeyConstraint([name], ["sys_user.id"], ondelete="SET NULL", onupdate="CASCADE") for name in _USER_INDEXED),
+    ]
+
+
+def _create_column_indexes(table: str, columns: Sequence[str]) -> None:
+    for column in columns:
+        op.create_index(f"ix_{table}_{column}", table, [column], unique=column == "uuid")
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("task_workflow_run"):
+        op.create_table(
+            "task_workflow_run",
+            *_base_columns(),
+            *_user_columns(),
+            sa.Column("workflow_id", sa.Integer(), nullable=False, comment="工作流ID"),
+            sa.Column("workflow_name", sa.String(128), nullable=False, comment="流程名称"),
+            sa.Column("status", sa.Integer(), nullable=False, comment="执行状态(0:失败 1:已完成 2:执行中)"),
+            sa.Column("resumed_from_id", sa.Integer(), nullable=True, comment="续跑来源运行ID"),
+            sa.Column("use_cache", sa.Boolean(), nullable=False, comment="是否跳过输入未变化的节点"),
+            sa.Column("variables", sa.JSON(), nullable=True, comment="流程变量"),
+            sa.Column("start_time", sa.DateTime(), nullable=False, comment="开始时间"),
+            sa.Column("end_time", sa.DateTime(), nullable=True, comment="结束时间"),
+            sa.Column("duration_ms", sa.Integer(), nullable=True, comment="耗时(毫秒)"),
+            sa.Column("node_total", sa.Integer(), nullable=False, comment="节点总数"),
+            sa.Column("node_executed", sa.Integer(), nullable=False, comment="实际执行成功的节点数"),
+            sa.Column("node_skipped", sa.Integer(), nullable=False, comment="沿用 / 命中缓存而跳过的节点数"),
+            sa.Column("error", sa.Text(), nullable=True, comment="错误信息"),
+            sa.ForeignKeyConstraint(["workflow_id"], ["task_workflow.id"], ondelete="CASCADE", onupdate="CASCADE"),
+            comment="工作流运行记录表",
+        )
+        _create_column_indexes("task_workflow_run", _BASE_INDEXED + _USER_INDEXED)
+        op.create_index("ix_task_workflow_run_workflow", "task_workflow_run", ["tenant_id", "workflow_id", "id"])
+        op.create_index("ix_task_workflow_run_status", "task_workflow_run", ["tenant_id", "status", "id"])
+
+    if not inspector.has_table("task_workflow_run_node"):
+        op.create_table(
+            "task_workflow_run_node",
+            *_base_columns(),
+            sa.Column("run_id", sa.Integer(), nullable=False, comment="运行ID"),
+            sa.Column("node_id", sa.String(64), nullable=False, comment="画布节点ID"),
+            sa.Column("node_type", sa.String(64), nullable=False, comment="节点类型编码"),
+            sa.Column("status", sa.Integer(), nullable=False, comment="节点状态(0:失败 1:成功 2:续跑沿用 3:缓存命中)"),
+            sa.Column("code_hash", sa.String(64), nullable=False, comment="代码块哈希"),
+            sa.Column("input_hash", sa.String(64), nullable=False, comment="输入哈希(节点类型+代码+参数+上游输出+变量)"),
+            sa.Column("output", sa.JSON(), nullable=True, comment="节点输出"),
+            sa.Column("reusable", sa.Boolean(), nullable=False, comment="输出能否原样还原(可用于续跑 / 缓存)"),
+            sa.Column("duration_ms", sa.Integer(), nullable=True, comment="耗时(毫秒)"),
+            sa.Column("error", sa.Text(), nullable=True, comment="错误信息"),
+            sa.ForeignKeyConstraint(["run_id"], ["task_workflow_run.id"], ondelete="CASCADE", onupdate="CASCADE"),
+            comment="工作流运行节点记录表",
+        )
+        _create_column_indexes("task_workflow_run_node", _BASE_INDEXED)
+        op.create_index("ix_task_workflow_run_node_run", "task_workflow_run_node", ["run_id", "node_id"])
+        op.create_index("ix_task_workflow_run_node_input", "task_workflow_run_node", ["tenant_id", "input_hash"])
+
+
+def downgrade() -> None:
+    op.drop_table("task_workflow_run_node")
+    op.drop_table("task_workflow_run")
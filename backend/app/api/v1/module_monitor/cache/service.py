@@ -47,21 +47,12 @@ class CacheService:
 
     @staticmethod
     async def clear_monitor_cache_by_name(redis: Redis, cache_name: str) -> bool:
-        cache_keys = await RedisCURD(redis).get_keys(f"{cache_name}*")
-        if cache_keys:
-            await RedisCURD(redis).delete(*cache_keys)
-        return True
+        return await RedisCURD(redis).clear(f"{cache_name}*")
 
     @staticmethod
     async def clear_monitor_cache_by_key(redis: Redis, cache_key: str) -> bool:
-        cache_keys = await RedisCURD(redis).get_keys(f"*{cache_key}")
-        if cache_keys:
-            await RedisCURD(redis).delete(*cache_keys)
-        return True
+        return await RedisCURD(redis).clear(f"*{cache_key}")
 
     @staticmethod
     async def clear_monitor_cache_all(redis: Redis) -> bool:
-        cache_keys = await RedisCURD(redis).get_keys()
-        if cache_keys:
-            await RedisCURD(redis).delete(*cache_keys)
-        return True
+        return await RedisCURD(redis).clear()
@@ -1,12 +1,12 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends
+from fastapi import APIRouter, Body, Depends, Request
 from fastapi.responses import JSONResponse
 from redis.asyncio.client import Redis
 
-from app.common.request import PaginationService
 from app.common.response import ResponseSchema, SuccessResponse
 from app.core.base_params import PaginationQueryParam
+from app.core.base_schema import AuthSchema
 from app.core.dependencies import AuthPermission, redis_getter
 from app.core.router_class import OperationLogRoute
 
@@ -16,22 +16,28 @@ from .service import OnlineService
 OnlineRouter = APIRouter(route_class=OperationLogRoute, prefix="/online", tags=["系统监控", "在线用户"])
 
 
+def _online_scope(auth: AuthSchema) -> int | None:
+    """超级管理员查看 / 清理全部租户的会话，其余仅限当前租户"""
+    return None if auth.user and auth.user.is_superuser else auth.tenant_id
+
+
 @OnlineRouter.get(
     "/list",
-    dependencies=[Depends(AuthPermission(["module_monitor:online:query"]))],
     summary="获取在线用户列表",
     response_model=ResponseSchema[list[OnlineOutSchema]],
 )
 async def get_online_list_controller(
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_monitor:online:query"]))],
     redis: Annotated[Redis, Depends(redis_getter)],
     paging_query: Annotated[PaginationQueryParam, Depends()],
     search: Annotated[OnlineQueryParam, Depends()],
 ) -> JSONResponse:
-    result_dict_list = await OnlineService.get_online_list(redis=redis, search=search)
-    result_dict = await PaginationService.paginate(
-        data_list=result_dict_list,
+    result_dict = await OnlineService.get_online_list(
+        redis=redis,
+        tenant_id=_online_scope(auth),
         page_no=paging_query.page_no,
         page_size=paging_query.page_size,
+        search=search,
     )
     return SuccessResponse(data=result_dict, msg="获取成功")
 
@@ -52,12 +58,18 @@ async def delete_online_controller(
 
 @OnlineRouter.delete(
     "/clear",
-    dependencies=[Depends(AuthPermission(["module_monitor:online:delete"]))],
     summary="清除所有在线用户",
     response_model=ResponseSchema[None],
 )
 async def clear_online_controller(
+    request: Request,
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_monitor:online:delete"]))],
     redis: Annotated[Redis, Depends(redis_getter)],
 ) -> JSONResponse:
-    await OnlineService.clear_online(redis=redis)
+    ctx = getattr(request.state, "ctx", None)
+    await OnlineService.clear_online(
+        redis=redis,
+        tenant_id=_online_scope(auth),
+        keep_session_id=ctx.session_id if ctx else None,
+    )
     return SuccessResponse(msg="清除所有在线用户成功")
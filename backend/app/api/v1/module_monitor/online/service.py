@@ -1,73 +1,68 @@
-import json
-
 from redis.asyncio.client import Redis
 
-from app.common.enums import RedisInitKeyConfig
+from app.core import session_registry
+from app.core.base_schema import PageResultSchema
 from app.core.logger import logger
-from app.core.redis_crud import RedisCURD
-from app.core.security import decode_access_token
 
 from .schema import OnlineQueryParam
 
 
+def _build_matcher(search: OnlineQueryParam | None):
+    """把查询参数转换为会话 JSON 的筛选函数（无筛选条件时返回 None）"""
+    if not search:
+        return None
+    conditions = [
+        (field, value[1].strip("%").lower())
+        for field, value in (("name", search.name), ("ipaddr", search.ipaddr), ("login_location", search.login_location))
+        if value and value[1]
+    ]
+    if not conditions:
+        return None
+    return lambda session: all(kw in str(session.get(field) or "").lower() for field, kw in conditions)
+
+
 class OnlineService:
     """在线用户管理模块服务层"""
 
     @staticmethod
-    async def get_online_list(redis: Redis, search: OnlineQueryParam | None = None) -> list[dict]:
-        keys = await RedisCURD(redis).get_keys(f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:*")
-        tokens = await RedisCURD(redis).mget(keys)
-
-        online_users = []
-        for token in tokens:
-            if not token:
-                continue
-            try:
-                payload = decode_access_token(token=token)
-                session_id = payload.sub
+    async def get_online_list(
+        redis: Redis,
+        tenant_id: int | None,
+        page_no: int,
+        page_size: int,
+        search: OnlineQueryParam | None = None,
+    ) -> PageResultSchema[dict]:
+        """
+        按登录时间倒序分页获取在线用户（基于会话登记表，不扫描全库、不解码 JWT）
 
-                # 从 Redis 读取完整会话信息
-                raw = await RedisCURD(redis).get(
-                    f"{RedisInitKeyConfig.USER_SESSION.key}:{session_id}"
-                )
-                if not raw:
-                    continue
-                session_info = json.loads(raw)
+        参数:
+        - redis (Redis): Redis 客户端实例
+        - tenant_id (int | None): 租户ID，None 表示全部租户
+        - page_no (int): 页码
+        - page_size (int): 每页数量
+        - search (OnlineQueryParam | None): 查询参数
 
-                # 内联搜索匹配逻辑
-                if search:
-                    if search.name and search.name[1]:
-                        kw = search.name[1].strip("%")
-                        if kw.lower() not in session_info.get("name", "").lower():
-                            continue
-                    if search.ipaddr and search.ipaddr[1]:
-                        kw = search.ipaddr[1].strip("%")
-                        if kw not in session_info.get("ipaddr", ""):
-                            continue
-                    if search.login_location and search.login_location[1]:
-                        kw = search.login_location[1].strip("%")
-                        if kw.lower() not in session_info.get("login_location", "").lower():
-                            continue
-
-                online_users.append(session_info)
-            except Exception as e:
-                logger.error(f"解析在线用户数据失败: {e}")
-                continue
-
-        online_users.sort(key=lambda x: x.get("login_time", ""), reverse=True)
-        return online_users
+        返回:
+        - PageResultSchema[dict]: 分页结果
+        """
+        offset = (page_no - 1) * page_size
+        total, items = await session_registry.page(redis, tenant_id, offset, page_size, _build_matcher(search))
+        return PageResultSchema(
+            items=items,
+            total=total,
+            page_no=page_no,
+            page_size=page_size,
+            has_next=offset + page_size < total,
+        )
 
     @staticmethod
     async def delete_online(redis: Redis, session_id: str) -> None:
-        await RedisCURD(redis).delete(f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}")
-        await RedisCURD(redis).delete(f"{RedisInitKeyConfig.REFRESH_TOKEN.key}:{session_id}")
-        await RedisCURD(redis).delete(f"{RedisInitKeyConfig.USER_SESSION.key}:{session_id}")
+        await session_registry.revoke(redis, [session_id])
         logger.info(f"强制下线用户会话: {session_id}")
 
     @staticmethod
-    async def clear_online(redis: Redis) -> None:
-        await RedisCURD(redis).clear(f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:*")
-        await RedisCURD(redis).clear(f"{RedisInitKeyConfig.REFRESH_TOKEN.key}:*")
-        await RedisCURD(redis).clear(f"{RedisInitKeyConfig.USER_SESSION.key}:*")
+    async def clear_online(redis: Redis, tenant_id: int | None = None, keep_session_id: str | None = None) -> None:
+        ids = await session_registry.session_ids(redis, tenant_id)
+        # 保留操作者自身的会话，避免清空后自己被下线
+        await session_registry.revoke(redis, [sid for sid in ids if sid != keep_session_id])
         logger.info("清除所有在线用户会话成功")
-
@@ -55,6 +55,20 @@ class DiskInfoSchema(BaseModel):
     usage: float = Field(ge=0, le=100, description="使用率(%)")
 
 
+class PwdHashPoolSchema(BaseModel):
+    """密码哈希线程池信息模型"""
+
+    workers: int = Field(description="线程数")
+    max_pending: int = Field(description="最大排队数")
+    pending: int = Field(description="当前排队数")
+    running: int = Field(description="当前计算数")
+    completed: int = Field(description="累计完成数")
+    rejected: int = Field(description="累计拒绝数")
+    max_pending_seen: int = Field(description="历史最大排队数")
+    avg_wait_ms: float = Field(description="平均排队耗时(ms)")
+    avg_run_ms: float = Field(description="平均计算耗时(ms)")
+
+
 class ServerMonitorSchema(BaseModel):
     """服务器监控信息模型"""
 
@@ -63,3 +77,4 @@ class ServerMonitorSchema(BaseModel):
     py: PyInfoSchema = Field(description="Python运行信息")
     sys: SysInfoSchema = Field(description="系统信息")
     disks: list[DiskInfoSchema] = Field(default_factory=list, description="磁盘信息")
+    pwd_hash: PwdHashPoolSchema | None = Field(default=None, description="密码哈希线程池信息")
@@ -7,11 +7,13 @@ from pathlib import Path
 import psutil
 
 from app.utils.common_util import bytes2human
+from app.utils.hash_bcrpy_util import PwdUtil
 
 from .schema import (
     CpuInfoSchema,
     DiskInfoSchema,
     MemoryInfoSchema,
+    PwdHashPoolSchema,
     PyInfoSchema,
     ServerMonitorSchema,
     SysInfoSchema,
@@ -29,6 +31,7 @@ class ServerService:
             sys=ServerService._get_system_info(),
             py=ServerService._get_python_info(),
             disks=ServerService._get_disk_info(),
+            pwd_hash=PwdHashPoolSchema(**PwdUtil.pool_stats()),
         )
 
     @staticmethod
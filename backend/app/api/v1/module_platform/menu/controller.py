@@ -4,9 +4,7 @@ from fastapi import APIRouter, Body, Depends, Path
 from fastapi.responses import JSONResponse
 
 from app.common.response import ResponseSchema, SuccessResponse
-from app.core import cache_util
 from app.core.base_schema import AuthSchema, BatchSetAvailable
-from app.core.cache_util import cache
 from app.core.dependencies import AuthPermission
 from app.core.router_class import OperationLogRoute
 
@@ -15,15 +13,12 @@ from .service import MenuService
 
 MenuRouter = APIRouter(route_class=OperationLogRoute, prefix="/menu", tags=["平台管理", "菜单管理"])
 
-_MENU_NS = "menu"
-
 
 @MenuRouter.get(
     "/tree",
     summary="查询菜单树",
     response_model=ResponseSchema[list[MenuOutSchema]],
 )
-@cache(expire=300, namespace=_MENU_NS)
 async def get_menu_tree_controller(
     search: Annotated[MenuQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_platform:menu:query"]))],
@@ -56,7 +51,6 @@ async def create_obj_controller(
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_platform:menu:create"]))],
 ) -> JSONResponse:
     result_dict = await MenuService(auth).create(data=data)
-    await cache_util.clear(namespace=_MENU_NS)
     return SuccessResponse(data=result_dict, msg="创建菜单成功")
 
 
@@ -71,7 +65,6 @@ async def update_obj_controller(
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_platform:menu:update"]))],
 ) -> JSONResponse:
     result_dict = await MenuService(auth).update(id=id, data=data)
-    await cache_util.clear(namespace=_MENU_NS)
     return SuccessResponse(data=result_dict, msg="修改菜单成功")
 
 
@@ -85,7 +78,6 @@ async def delete_obj_controller(
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_platform:menu:delete"]))],
 ) -> JSONResponse:
     await MenuService(auth).delete(ids=ids)
-    await cache_util.clear(namespace=_MENU_NS)
     return SuccessResponse(msg="删除菜单成功")
 
 
@@ -99,5 +91,4 @@ async def batch_set_available_obj_controller(
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_platform:menu:patch"]))],
 ) -> JSONResponse:
     await MenuService(auth).set_available(data=data)
-    await cache_util.clear(namespace=_MENU_NS)
     return SuccessResponse(msg="批量修改菜单状态成功")
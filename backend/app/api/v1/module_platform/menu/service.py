@@ -1,9 +1,15 @@
 from typing import Any
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.response import RawJSON
+from app.core import principal
 from app.core.base_schema import AuthSchema, BatchSetAvailable
 from app.core.dependencies import require_superadmin
 from app.core.exceptions import CustomException
+from app.core.tiered_cache import TieredCache
 from app.utils.common_util import (
+    TreeSnapshot,
     get_child_id_map,
     get_child_recursion,
     get_parent_id_map,
@@ -16,10 +22,13 @@ from .schema import (
     MenuCreateSchema,
     MenuOutSchema,
     MenuQueryParam,
-    MenuTreeOutSchema,
     MenuUpdateSchema,
 )
 
+# 菜单为平台级资源，全部菜单共用一份快照；可见范围在请求时按 ID 过滤
+_menu_tree_cache = TieredCache("menu_tree", maxsize=4, ttl=300.0)
+_TREE_ORDER = [{"order": "asc"}]
+
 
 class MenuService:
     """菜单管理服务（查询操作租户可见，写操作仅超级管理员可操作）"""
@@ -72,10 +81,43 @@ class MenuService:
         self,
         search: MenuQueryParam | None = None,
         order_by: list[dict] | None = None,
-    ) -> list[dict]:
-        menu_list = await MenuCRUD(self.auth).tree_list(search=vars(search) if search else None, order_by=order_by)
-        menu_dict_list = [MenuTreeOutSchema.model_validate(menu).model_dump() for menu in menu_list]
-        return traversal_to_tree(menu_dict_list)
+    ) -> list[dict] | RawJSON:
+        """
+        菜单树：从缓存的全量快照中按可见菜单 ID 构树，全部可见时直接返回预序列化结果
+
+        参数:
+        - search (MenuQueryParam | None): 查询参数
+        - order_by (list[dict] | None): 排序（非默认排序时不走缓存）
+
+        返回:
+        - list[dict] | RawJSON: 菜单树
+        """
+        search_dict = vars(search) if search else None
+        if order_by and order_by != _TREE_ORDER:
+            menu_list = await MenuCRUD(self.auth).tree_list(search=search_dict, order_by=order_by, with_children=False)
+            return traversal_to_tree([MenuOutSchema.model_validate(menu).model_dump() for menu in menu_list])
+        snapshot = await self.tree_snapshot()
+        return snapshot.tree(await MenuCRUD(self.auth).get_ids(search=search_dict))
+
+    async def tree_snapshot(self) -> TreeSnapshot:
+        """
+        全部菜单的树快照（不做权限过滤，调用方自行按可见范围筛选）
+
+        返回:
+        - TreeSnapshot: 菜单树快照
+        """
+
+        async def load() -> TreeSnapshot:
+            auth = self.auth.model_copy(update={"check_data_scope": False})
+            menu_list = await MenuCRUD(auth).tree_list(order_by=_TREE_ORDER, with_children=False)
+            return TreeSnapshot.build([MenuOutSchema.model_validate(menu).model_dump() for menu in menu_list])
+
+        return await _menu_tree_cache.get("all", load)
+
+    @staticmethod
+    def invalidate_tree(db: AsyncSession | None) -> None:
+        """菜单写入事务提交后失效菜单树快照（广播到所有 worker）"""
+        _menu_tree_cache.invalidate_after_commit(db)
 
     @require_superadmin
     async def create(self, data: MenuCreateSchema) -> MenuOutSchema:
@@ -92,6 +134,7 @@ class MenuService:
         await self._validate_parent_child_client(data.parent_id, data.client)
 
         new_menu = await MenuCRUD(self.auth).create(data=data)
+        self.invalidate_tree(self.auth.db)
         return MenuOutSchema.model_validate(new_menu)
 
     @require_superadmin
@@ -113,6 +156,8 @@ class MenuService:
                 raise CustomException(msg="更新失败，父级菜单不存在")
 
         new_menu = await MenuCRUD(self.auth).update(id=id, data=data)
+        await principal.invalidate_all(self.auth.db)
+        self.invalidate_tree(self.auth.db)
 
         if data.status is not None:
             await self.set_available(data=BatchSetAvailable(ids=[id], status=data.status))
@@ -139,6 +184,8 @@ class MenuService:
 
         delete_ids = list(delete_ids_set)
         await MenuCRUD(self.auth).delete(ids=delete_ids)
+        await principal.invalidate_all(self.auth.db)
+        self.invalidate_tree(self.auth.db)
 
     @require_superadmin
     async def set_available(self, data: BatchSetAvailable) -> None:
@@ -157,3 +204,5 @@ class MenuService:
                 total_ids.extend(disable_ids)
 
         await MenuCRUD(self.auth).set(ids=total_ids, status=data.status)
+        await principal.invalidate_all(self.auth.db)
+        self.invalidate_tree(self.auth.db)
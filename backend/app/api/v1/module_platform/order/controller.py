@@ -68,20 +68,14 @@ async def order_list_controller(
     page: Annotated[PaginationQueryParam, Depends()],
     search: Annotated[OrderQueryParam, Depends()],
 ) -> JSONResponse:
-    items, total = await OrderService.get_list(
+    result = await OrderService.get_list(
         auth=auth,
         page_no=page.page_no,
         page_size=page.page_size,
         order_by=page.order_by,
         search=search,
-    )
-    offset = (page.page_no - 1) * page.page_size
-    result = PageResultSchema(
-        page_no=page.page_no,
-        page_size=page.page_size,
-        total=total,
-        has_next=offset + page.page_size < total,
-        items=items,
+        cursor=page.cursor,
+        count=page.count,
     )
     return SuccessResponse(data=result)
 
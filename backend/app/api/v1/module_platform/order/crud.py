@@ -2,8 +2,9 @@
 
 from typing import Any
 
+from app.common.enums import PageCountEnum
 from app.core.base_crud import CRUDBase
-from app.core.base_schema import AuthSchema
+from app.core.base_schema import AuthSchema, PageResultSchema
 
 from .model import OrderModel, PaymentRecordModel, RefundModel
 from .schema import (
@@ -32,14 +33,18 @@ class OrderCRUD(CRUDBase[OrderModel, OrderCreateInternalSchema, OrderUpdateInter
         order_type: str | None = None,
         offset: int = 0,
         limit: int = 20,
-    ) -> tuple[list[OrderModel], int]:
-        result = await self.page(
+        order_by: list[dict[str, str]] | None = None,
+        cursor: str | None = None,
+        count: PageCountEnum | None = None,
+    ) -> PageResultSchema:
+        return await self.page(
             search={"tenant_id": tenant_id, "status": status, "order_type": order_type},
-            order_by=[{"created_time": "desc"}],
+            order_by=order_by or [{"created_time": "desc"}],
             offset=offset,
             limit=limit,
+            cursor=cursor,
+            count=count,
         )
-        return result.items, result.total
 
     async def mark_refunded(self, order_id: int) -> None:
         from sqlalchemy import update as sa_update
@@ -3,7 +3,8 @@ from datetime import datetime, timedelta
 
 from sqlalchemy import select
 
-from app.core.base_schema import AuthSchema
+from app.common.enums import PageCountEnum
+from app.core.base_schema import AuthSchema, PageResultSchema
 from app.core.exceptions import CustomException
 from app.core.logger import logger
 from app.utils.payment import create_payment_gateway
@@ -123,7 +124,9 @@ class OrderService:
         page_size: int,
         search: OrderQueryParam,
         order_by: list[dict[str, str]] | None = None,
-    ) -> tuple[list, int]:
+        cursor: str | None = None,
+        count: PageCountEnum | None = None,
+    ) -> PageResultSchema:
         """
         订单列表
 
@@ -133,20 +136,25 @@ class OrderService:
         - page_size (int): 每页数量
         - search (OrderQueryParam): 查询参数
         - order_by (list[dict] | None): 排序字段
+        - cursor (str | None): 游标（游标分页模式）
+        - count (PageCountEnum | None): 总数统计方式
 
         返回:
-        - tuple[list, int]: (订单列表, 总数)
+        - PageResultSchema: 订单分页结果
         """
         offset = (page_no - 1) * page_size
-        rows, total = await OrderCRUD(auth).query(
+        result = await OrderCRUD(auth).query(
             tenant_id=search.tenant_id,
             status=search.status,
             order_type=search.order_type,
             offset=offset,
             limit=page_size,
+            order_by=order_by,
+            cursor=cursor,
+            count=count,
         )
-        items = [OrderOutSchema.model_validate(r) for r in rows]
-        return items, total
+        result.items = [OrderOutSchema.model_validate(r) for r in result.items]
+        return result
 
     @classmethod
     async def cancel_order(cls, auth: AuthSchema, order_id: int) -> OrderStatusMessage:
@@ -3,8 +3,9 @@ import sqlalchemy as sa
 from sqlalchemy import func, select
 
 from app.api.v1.module_platform.tenant.model import TenantModel
+from app.core import principal
 from app.core.base_schema import AuthSchema
-from app.core.dependencies import require_superadmin
+from app.core.dependencies import clear_package_menu_cache, require_superadmin
 from app.core.exceptions import CustomException
 from app.core.logger import logger
 
@@ -75,6 +76,7 @@ class PackageService:
             await self.disable_cascade(package_id=id)
 
         updated = await PackageCRUD(self.auth).update(id=id, data=data)
+        clear_package_menu_cache()
         return PackageOutSchema.model_validate(updated)
 
     @require_superadmin
@@ -112,6 +114,8 @@ class PackageService:
         for menu_id in data.menu_ids:
             self.auth.db.add(PackageMenuModel(package_id=package_id, menu_id=menu_id))
         await self.auth.db.flush()
+        clear_package_menu_cache()
+        await principal.invalidate_all(self.auth.db)
         logger.info(f"套餐[{package_id}]菜单权限已设置, count={len(data.menu_ids)}")
 
     async def get_package_menu_ids(self, package_id: int) -> list[int]:
@@ -147,6 +151,29 @@ class PackageService:
         result = await self.auth.db.execute(menu_stmt)
         return [row[0] for row in result.all()]
 
+    async def get_tenant_available_permissions(self, tenant_id: int) -> list[str]:
+        """
+        获取租户套餐内启用菜单的权限标识（用于编译租户权限位图）。
+
+        参数:
+        - tenant_id (int): 租户ID。
+
+        返回:
+        - list[str]: 权限标识列表。
+        """
+        from app.api.v1.module_platform.menu.model import MenuModel
+
+        menu_ids = await self.get_tenant_available_menu_ids(tenant_id)
+        if not menu_ids:
+            return []
+        stmt = select(MenuModel.permission).where(
+            MenuModel.id.in_(menu_ids),
+            MenuModel.status == 0,
+            MenuModel.permission.isnot(None),
+        )
+        result = await self.auth.db.execute(stmt)
+        return [row[0] for row in result.all()]
+
     async def get_tenant_available_plugin_ids(self, tenant_id: int) -> list[int]:
         from app.api.v1.module_platform.tenant.model import TenantModel
 
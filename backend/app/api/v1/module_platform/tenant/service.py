@@ -12,6 +12,7 @@ from app.core.dependencies import require_superadmin
 from app.core.exceptions import CustomException
 from app.core.logger import logger
 from app.core.redis_crud import RedisCURD
+from app.core.tiered_cache import TieredCache
 from app.utils.hash_bcrpy_util import PwdUtil
 
 from .crud import TenantCRUD
@@ -27,6 +28,9 @@ from .schema import (
     TenantUserOutSchema,
 )
 
+# 两级缓存：{tenant_id: 租户配置}
+_config_cache = TieredCache("tenant_config", maxsize=1024, ttl=300.0)
+
 
 class TenantService:
     """
@@ -93,7 +97,7 @@ class TenantService:
         password = "".join(random.choice(characters) for _ in range(password_length))
         admin_data = {
             "username": username,
-            "password": PwdUtil.hash_password(password=password),
+            "password": await PwdUtil.hash_password_async(password=password),
             "name": f"{tenant_obj.name}管理员",
             "tenant_id": tenant_obj.id,
             "status": 0,
@@ -446,8 +450,8 @@ class TenantService:
             "package_name": pkg.name,
         }
 
-    async def check_quota(self, tenant_id: int, resource_type: str) -> None:
-        """检查租户配额是否充足，不足时抛出异常（系统租户跳过检查）"""
+    async def check_quota(self, tenant_id: int, resource_type: str, increment: int = 1) -> None:
+        """检查租户配额是否足够再创建 increment 个资源，不足时抛出异常（系统租户跳过检查）"""
         if tenant_id == 1:
             return
         from sqlalchemy import func, select
@@ -516,7 +520,7 @@ class TenantService:
         result = await self.auth.db.execute(count_stmt)
         current_count = result.scalar() or 0
 
-        if current_count >= max_limit:
+        if current_count + increment > max_limit:
             resource_labels = {"user": "用户", "role": "角色", "dept": "部门"}
             raise CustomException(
                 msg=f"租户{resource_labels.get(resource_type, resource_type)}数量已达套餐上限（{max_limit}），无法继续创建"
@@ -552,15 +556,20 @@ class TenantService:
     @staticmethod
     async def get_config_cache(redis: Redis, tenant_id: int) -> dict:
         """
-        从 Redis 缓存获取租户配置，缓存未命中则从 DB 加载并回写缓存
+        从两级缓存获取租户配置，Redis 未命中则从 DB 加载并回写缓存
 
         参数:
         - redis (Redis): Redis 客户端实例
         - tenant_id (int): 租户ID
 
         返回:
-        - dict: 租户配置字典
+        - dict: 租户配置字典（本地缓存共享，调用方不得修改）
         """
+        return await _config_cache.get(tenant_id, lambda: TenantService._fetch_config_cache(redis, tenant_id))
+
+    @staticmethod
+    async def _fetch_config_cache(redis: Redis, tenant_id: int) -> dict:
+        """从 Redis 获取租户配置，未命中则从 DB 加载并回写缓存"""
         redis_key = f"{RedisInitKeyConfig.TENANT_CONFIG.key}:{tenant_id}"
         redis_config = await RedisCURD(redis).get(key=redis_key)
 
@@ -603,6 +612,7 @@ class TenantService:
         """删除租户配置的 Redis 缓存"""
         redis_key = f"{RedisInitKeyConfig.TENANT_CONFIG.key}:{tenant_id}"
         await RedisCURD(redis).delete(redis_key)
+        await _config_cache.invalidate(tenant_id)
 
     async def update_config(self, redis: Redis, tenant_id: int, config: dict) -> list[TenantConfigOutSchema]:
         """
@@ -635,6 +645,7 @@ class TenantService:
         # 刷新 DB 数据并同步到 Redis
         new_config = await self.get_config(tenant_id)
         await TenantService._sync_configs_to_redis(redis, tenant_id, new_config)
+        await _config_cache.invalidate(tenant_id)
         logger.info(f"租户[{tenant_id}]配置已更新")
         return [TenantConfigOutSchema(config_key=k, config_value=str(v) if v is not None else None) for k, v in new_config.items()]
 
@@ -669,6 +680,7 @@ class TenantService:
 
                     await TenantService._sync_configs_to_redis(redis, tenant.id, config)
                     logger.info(f"✅ 租户[{tenant.name}](id={tenant.id}) 配置已缓存到 Redis")
+        await _config_cache.invalidate()
 
     async def renew(self, tenant_id: int, end_time: str) -> TenantOutSchema:
         """租户续期：延长 end_time 并恢复为 active 状态
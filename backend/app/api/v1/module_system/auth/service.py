@@ -2,6 +2,7 @@
 import json
 import uuid
 from datetime import datetime, timedelta
+from functools import partial
 from typing import NewType
 
 import ua_parser
@@ -14,6 +15,7 @@ from app.api.v1.module_system.user.crud import UserCRUD
 from app.api.v1.module_system.user.model import UserModel
 from app.common.enums import RedisInitKeyConfig
 from app.config.setting import settings
+from app.core import login_audit, session_registry
 from app.core.base_schema import (
     AuthSchema,
     JWTOutSchema,
@@ -48,66 +50,6 @@ CaptchaKey = NewType("CaptchaKey", str)
 CaptchaBase64 = NewType("CaptchaBase64", str)
 
 
-async def _write_login_log(
-    username: str,
-    status: int,
-    login_ip: str | None = None,
-    login_location: str | None = None,
-    request_os: str | None = None,
-    request_browser: str | None = None,
-    msg: str | None = None,
-) -> int | None:
-    """写入登录日志；返回日志 ID（用于后台补全归属地）。"""
-    from app.api.v1.module_system.log.crud import LoginLogCRUD
-    from app.api.v1.module_system.log.schema import LoginLogCreateSchema
-    from app.core.base_schema import AuthSchema
-    from app.core.database import async_db_session
-
-    try:
-        async with async_db_session() as session:
-            async with session.begin():
-                _auth = AuthSchema(db=session, check_data_scope=False)
-                obj = await LoginLogCRUD(_auth).create(data=LoginLogCreateSchema(
-                    username=username,
-                    status=status,
-                    login_ip=login_ip,
-                    login_location=login_location,
-                    request_os=request_os,
-                    request_browser=request_browser,
-                    msg=msg,
-                ))
-                return obj.id if obj else None
-    except Exception:
-        return None
-
-
-async def _async_fill_login_location(
-    redis, login_log_id: int, ip: str | None
-) -> None:
-    """后台异步补全登录日志的归属地。"""
-    if not ip:
-        return
-    try:
-        location = await IpLocalUtil.resolve_location_async(redis, ip)
-        if location == "归属地查询中" or not location:
-            return
-        from sqlalchemy import update as sa_update
-
-        from app.api.v1.module_system.log.model import LoginLogModel
-        from app.core.database import async_db_session
-
-        async with async_db_session() as session:
-            async with session.begin():
-                await session.execute(
-                    sa_update(LoginLogModel)
-                    .where(LoginLogModel.id == login_log_id)
-                    .values(login_location=location)
-                )
-    except Exception as e:
-        from app.core.logger import logger
-        logger.warning(f"异步补全登录归属地失败: {e}")
-
-
 def _resolve_request_ip(request: Request) -> str | None:
     """从请求中解析客户端真实 IP。"""
     return get_client_ip(request)
@@ -131,10 +73,14 @@ class LoginService:
         """用户认证"""
         ua_result = ua_parser.parse(request.headers.get("user-agent"))
         request_ip = _resolve_request_ip(request)
-        login_location = await IpLocalUtil.resolve_location_for_log(redis, request_ip)
-        _login_os = ua_result.os.family if ua_result.os else "Unknown"
-        _login_browser = ua_result.user_agent.family if ua_result.user_agent else "Unknown"
-        _login_username = login_form.username
+        # 登录审计只入队，归属地解析与入库在后台完成
+        audit = partial(
+            login_audit.record,
+            username=login_form.username,
+            login_ip=request_ip,
+            request_os=ua_result.os.family if ua_result.os else "Unknown",
+            request_browser=ua_result.user_agent.family if ua_result.user_agent else "Unknown",
+        )
 
         referer = request.headers.get("referer", "")
         request_from_docs = referer.endswith(("docs", "redoc"))
@@ -152,38 +98,14 @@ class LoginService:
         user = await UserCRUD(auth).get(username=login_form.username)
 
         if not user:
-            await _write_login_log(
-                username=_login_username,
-                status=2,
-                login_ip=request_ip,
-                login_location=login_location,
-                request_os=_login_os,
-                request_browser=_login_browser,
-                msg="用户不存在",
-            )
+            await audit(status=2, msg="用户不存在")
             raise CustomException(msg="用户不存在")
 
-        if not PwdUtil.verify_password(plain_password=login_form.password, password_hash=user.password):
-            await _write_login_log(
-                username=_login_username,
-                status=2,
-                login_ip=request_ip,
-                login_location=login_location,
-                request_os=_login_os,
-                request_browser=_login_browser,
-                msg="账号或密码错误",
-            )
+        if not await PwdUtil.verify_password_async(plain_password=login_form.password, password_hash=user.password):
+            await audit(status=2, msg="账号或密码错误")
             raise CustomException(msg="账号或密码错误")
         if user.status == 1:
-            await _write_login_log(
-                username=_login_username,
-                status=2,
-                login_ip=request_ip,
-                login_location=login_location,
-                request_os=_login_os,
-                request_browser=_login_browser,
-                msg="用户已被停用",
-            )
+            await audit(status=2, msg="用户已被停用")
             raise CustomException(msg="用户已被停用")
 
         from sqlalchemy import select
@@ -193,15 +115,7 @@ class LoginService:
         tenant_stmt = select(TenantModel).where(TenantModel.id == user.tenant_id, TenantModel.status == 0, TenantModel.is_deleted.is_(False)).limit(1)
         tenant_result = await auth.db.execute(tenant_stmt)
         if not tenant_result.scalar_one_or_none():
-            await _write_login_log(
-                username=_login_username,
-                status=2,
-                login_ip=request_ip,
-                login_location=login_location,
-                request_os=_login_os,
-                request_browser=_login_browser,
-                msg="所属租户已被禁用",
-            )
+            await audit(status=2, msg="所属租户已被禁用")
             raise CustomException(msg="所属租户已被禁用，请联系平台管理员")
 
         await UserCRUD(auth).update_last_login(id=user.id)
@@ -229,18 +143,7 @@ class LoginService:
             "is_superuser": user.is_superuser,
         }
 
-        log_id = await _write_login_log(
-            username=user.username,
-            status=1,
-            login_ip=request_ip,
-            login_location=login_location,
-            request_os=_login_os,
-            request_browser=_login_browser,
-            msg="登录成功",
-        )
-        # 登录成功后异步补全归属地，不阻塞返回
-        if log_id and login_location == "归属地查询中":
-            background_tasks.add_task(_async_fill_login_location, redis, log_id, request_ip)
+        await audit(username=user.username, status=1, msg="登录成功")
 
         return LoginWithTenantsSchema(
             access_token=token.access_token,
@@ -258,7 +161,8 @@ class LoginService:
         ua_result = ua_parser.parse(request.headers.get("user-agent"))
         request_ip = _resolve_request_ip(request)
 
-        login_location = await IpLocalUtil.resolve_location_for_log(redis, request_ip)
+        # 令牌签发不等待归属地查询：先写入可直接得到的值，由登录审计管道在后台解析后回填会话
+        login_location = IpLocalUtil.location_hint(request_ip)
 
         from dataclasses import replace
 
@@ -298,6 +202,7 @@ class LoginService:
             value=session_info,
             expire=int(refresh_expires.total_seconds()),
         )
+        await session_registry.register(redis, session_id, session_info, int(refresh_expires.total_seconds()))
 
         access_token = create_access_token(
             payload=JWTPayloadSchema(
@@ -326,6 +231,9 @@ class LoginService:
             expire=int(refresh_expires.total_seconds()),
         )
 
+        if login_location == IpLocalUtil.PENDING:
+            await login_audit.locate_session(session_id, request_ip)
+
         return JWTOutSchema(
             access_token=access_token,
             refresh_token=refresh_token,
@@ -373,6 +281,7 @@ class LoginService:
             key=f"{RedisInitKeyConfig.USER_SESSION.key}:{session_id}",
             expire=int(refresh_expires.total_seconds()),
         )
+        await session_registry.touch(redis, session_id, int(refresh_expires.total_seconds()))
 
         access_token = create_access_token(
             payload=JWTPayloadSchema(
@@ -421,6 +330,7 @@ class LoginService:
         await RedisCURD(redis).delete(f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}")
         await RedisCURD(redis).delete(f"{RedisInitKeyConfig.REFRESH_TOKEN.key}:{session_id}")
         await RedisCURD(redis).delete(f"{RedisInitKeyConfig.USER_SESSION.key}:{session_id}")
+        await session_registry.unregister(redis, [session_id])
 
         logger.info(f"用户退出登录成功,会话编号:{session_id}")
 
@@ -505,11 +415,13 @@ class LoginService:
         from app.core.redis_crud import RedisCURD
         from app.core.security import create_access_token
 
+        session_json = json.dumps(session_info) if isinstance(session_info, dict) else session_info
         await RedisCURD(redis).set(
             key=f"{RedisInitKeyConfig.USER_SESSION.key}:{session_id}",
-            value=json.dumps(session_info) if isinstance(session_info, dict) else session_info,
+            value=session_json,
             expire=int(refresh_expires.total_seconds()),
         )
+        await session_registry.register(redis, session_id, session_json, int(refresh_expires.total_seconds()))
 
         access_expires = timedelta(seconds=settings.ACCESS_TOKEN_EXPIRE_SECONDS)
         now = datetime.now()
@@ -789,7 +701,7 @@ class TenantRegisterService:
 
         user = UserModel(
             username=username,
-            password=PwdUtil.hash_password(password),
+            password=await PwdUtil.hash_password_async(password),
             email=email,
             tenant_id=tenant.id,
             status=0,
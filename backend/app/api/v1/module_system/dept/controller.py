@@ -4,9 +4,7 @@ from fastapi import APIRouter, Body, Depends, Path
 from fastapi.responses import JSONResponse
 
 from app.common.response import ResponseSchema, SuccessResponse
-from app.core import cache_util
 from app.core.base_schema import AuthSchema, BatchSetAvailable
-from app.core.cache_util import cache
 from app.core.dependencies import AuthPermission
 from app.core.router_class import OperationLogRoute
 
@@ -15,14 +13,11 @@ from .service import DeptService
 
 DeptRouter = APIRouter(route_class=OperationLogRoute, prefix="/dept", tags=["系统管理", "部门管理"])
 
-_DEPT_NS = "dept"
-
 @DeptRouter.get(
     "/tree",
     summary="查询部门树",
     response_model=ResponseSchema[list[DeptOutSchema]],
 )
-@cache(expire=300, namespace=_DEPT_NS)
 async def get_dept_tree_controller(
     search: Annotated[DeptQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:dept:query"]))],
@@ -53,7 +48,6 @@ async def create_obj_controller(
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:dept:create"]))],
 ) -> JSONResponse:
     result_dict = await DeptService(auth).create(data=data)
-    await cache_util.clear(namespace=_DEPT_NS)
     return SuccessResponse(data=result_dict, msg="创建部门成功")
 
 @DeptRouter.put(
@@ -67,7 +61,6 @@ async def update_obj_controller(
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:dept:update"]))],
 ) -> JSONResponse:
     result_dict = await DeptService(auth).update(id=id, data=data)
-    await cache_util.clear(namespace=_DEPT_NS)
     return SuccessResponse(data=result_dict, msg="修改部门成功")
 
 @DeptRouter.delete(
@@ -80,7 +73,6 @@ async def delete_obj_controller(
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:dept:delete"]))],
 ) -> JSONResponse:
     await DeptService(auth).delete(ids=ids)
-    await cache_util.clear(namespace=_DEPT_NS)
     return SuccessResponse(msg="删除部门成功")
 
 @DeptRouter.patch(
@@ -93,5 +85,4 @@ async def batch_set_available_obj_controller(
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:dept:patch"]))],
 ) -> JSONResponse:
     await DeptService(auth).batch_set_available(data=data)
-    await cache_util.clear(namespace=_DEPT_NS)
     return SuccessResponse(msg="批量修改部门状态成功")
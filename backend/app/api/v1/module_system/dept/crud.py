@@ -1,7 +1,11 @@
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.base_crud import CRUDBase
 from app.core.base_schema import AuthSchema
+from app.utils.common_util import get_closure_rows
 
-from .model import DeptModel
+from .model import DeptClosureModel, DeptModel
 from .schema import DeptCreateSchema, DeptUpdateSchema
 
 
@@ -10,3 +14,107 @@ class DeptCRUD(CRUDBase[DeptModel, DeptCreateSchema, DeptUpdateSchema]):
 
     def __init__(self, auth: AuthSchema) -> None:
         super().__init__(model=DeptModel, auth=auth)
+
+
+class DeptClosureCRUD:
+    """部门祖先闭包表数据层（不做租户/数据权限过滤，调用方保证部门ID已通过校验）"""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self.db = db
+
+    async def get_descendant_ids(self, id: int) -> set[int]:
+        """
+        获取部门自身及全部后代部门ID
+
+        参数:
+        - id (int): 部门ID
+
+        返回:
+        - set[int]: 部门ID集合
+        """
+        result = await self.db.execute(select(DeptClosureModel.descendant_id).where(DeptClosureModel.ancestor_id == id))
+        return {row[0] for row in result.all()}
+
+    async def insert_node(self, id: int, parent_id: int | None) -> None:
+        """
+        新增部门后写入闭包行：自身 + 父级的全部祖先
+
+        参数:
+        - id (int): 新部门ID
+        - parent_id (int | None): 父级部门ID
+        """
+        rows = [{"ancestor_id": id, "descendant_id": id, "depth": 0}]
+        if parent_id is not None:
+            result = await self.db.execute(
+                select(DeptClosureModel.ancestor_id, DeptClosureModel.depth).where(DeptClosureModel.descendant_id == parent_id)
+            )
+            rows.extend({"ancestor_id": ancestor_id, "descendant_id": id, "depth": depth + 1} for ancestor_id, depth in result.all())
+        await self.db.execute(insert(DeptClosureModel), rows)
+
+    async def move_node(self, id: int, parent_id: int | None) -> None:
+        """
+        移动部门子树：删除子树与原祖先的连接，再与新父级的祖先做笛卡尔积重新连接
+
+        参数:
+        - id (int): 被移动的部门ID
+        - parent_id (int | None): 新父级部门ID
+        """
+        result = await self.db.execute(
+            select(DeptClosureModel.descendant_id, DeptClosureModel.depth).where(DeptClosureModel.ancestor_id == id)
+        )
+        subtree = result.all()
+        if not subtree:
+            # 闭包表尚未构建该部门（历史数据），按新增处理
+            await self.insert_node(id, parent_id)
+            return
+        subtree_ids = [descendant_id for descendant_id, _ in subtree]
+
+        await self.db.execute(
+            delete(DeptClosureModel).where(
+                DeptClosureModel.descendant_id.in_(subtree_ids),
+                DeptClosureModel.ancestor_id.not_in(subtree_ids),
+            )
+        )
+        if parent_id is None:
+            return
+        result = await self.db.execute(
+            select(DeptClosureModel.ancestor_id, DeptClosureModel.depth).where(DeptClosureModel.descendant_id == parent_id)
+        )
+        ancestors = result.all()
+        rows = [
+            {"ancestor_id": ancestor_id, "descendant_id": descendant_id, "depth": a_depth + d_depth + 1}
+            for ancestor_id, a_depth in ancestors
+            for descendant_id, d_depth in subtree
+        ]
+        if rows:
+            await self.db.execute(insert(DeptClosureModel), rows)
+
+    async def delete_nodes(self, ids: list[int]) -> None:
+        """
+        删除部门的闭包行（部门为软删除，外键级联不会触发）
+
+        参数:
+        - ids (list[int]): 部门ID列表
+        """
+        await self.db.execute(
+            delete(DeptClosureModel).where(DeptClosureModel.descendant_id.in_(ids) | DeptClosureModel.ancestor_id.in_(ids))
+        )
+
+    async def rebuild(self) -> int:
+        """
+        按部门表（未删除）全量重建闭包表
+
+        返回:
+        - int: 写入的闭包行数
+        """
+        result = await self.db.execute(select(DeptModel.id, DeptModel.parent_id).where(DeptModel.is_deleted.is_(False)))
+        parent_map = dict(result.all())
+        rows = get_closure_rows(parent_map)
+        await self.db.execute(delete(DeptClosureModel))
+        if rows:
+            await self.db.execute(
+                insert(DeptClosureModel),
+                [{"ancestor_id": a, "descendant_id": d, "depth": depth} for a, d, depth in rows],
+            )
+        await self.db.flush()
+        return len(rows)
@@ -1,10 +1,10 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, String, Text, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.common.enums import PermissionFilterStrategy
-from app.core.base_model import ModelMixin, TenantMixin, UserMixin
+from app.core.base_model import MappedBase, ModelMixin, TenantMixin, UserMixin
 
 if TYPE_CHECKING:
     from app.api.v1.module_system.role.model import RoleModel
@@ -56,3 +56,33 @@ class DeptModel(ModelMixin, TenantMixin, UserMixin):
         foreign_keys="UserModel.dept_id",
         lazy="selectin",
     )
+
+
+class DeptClosureModel(MappedBase):
+    """
+    部门祖先闭包表
+
+    每个部门与其全部祖先（含自身，depth=0）各存一行，
+    「本部门及以下」数据权限可直接用 ``descendant_id IN (SELECT ... WHERE ancestor_id = ?)`` 过滤。
+    由 DeptService 在部门新增/移动/删除时维护，可通过 ``python main.py rebuild-dept-closure`` 重建。
+    """
+
+    __tablename__: str = "sys_dept_closure"
+    __table_args__ = (
+        Index("ix_sys_dept_closure_descendant", "descendant_id"),
+        {"comment": "部门祖先闭包表"},
+    )
+
+    ancestor_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("sys_dept.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+        comment="祖先部门ID",
+    )
+    descendant_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("sys_dept.id", ondelete="CASCADE", onupdate="CASCADE"),
+        primary_key=True,
+        comment="后代部门ID",
+    )
+    depth: Mapped[int] = mapped_column(Integer, nullable=False, default=0, comment="层级距离(0:自身)")
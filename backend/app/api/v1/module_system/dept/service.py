@@ -1,22 +1,30 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.common.response import RawJSON
 from app.core.base_schema import AuthSchema, BatchSetAvailable
 from app.core.exceptions import CustomException
+from app.core.tiered_cache import TieredCache
 from app.utils.common_util import (
+    TreeSnapshot,
     get_child_id_map,
     get_child_recursion,
     get_parent_id_map,
     get_parent_recursion,
+    traversal_to_tree,
 )
 
-from .crud import DeptCRUD
+from .crud import DeptClosureCRUD, DeptCRUD
 from .schema import (
     DeptCreateSchema,
     DeptOutSchema,
     DeptQueryParam,
-    DeptTreeOutSchema,
     DeptUpdateSchema,
 )
 
+# 按租户缓存部门树快照（超级管理员跨租户可见，使用 None 键）
+_dept_tree_cache = TieredCache("dept_tree", maxsize=1024, ttl=300.0)
+_TREE_ORDER = [{"order": "asc"}]
+
 
 class DeptService:
     """
@@ -41,10 +49,37 @@ class DeptService:
         self,
         search: DeptQueryParam | None = None,
         order_by: list[dict] | None = None,
-    ) -> list[dict]:
-        dept_list = await DeptCRUD(self.auth).tree_list(search=vars(search) if search else None, order_by=order_by)
-        dept_dict_list = [DeptTreeOutSchema.model_validate(dept).model_dump() for dept in dept_list]
-        return [d for d in dept_dict_list if d.get("parent_id") is None]
+    ) -> list[dict] | RawJSON:
+        """
+        部门树：从缓存的租户快照中按可见部门 ID 构树，全部可见时直接返回预序列化结果
+
+        参数:
+        - search (DeptQueryParam | None): 查询参数
+        - order_by (list[dict] | None): 排序（非默认排序时不走缓存）
+
+        返回:
+        - list[dict] | RawJSON: 部门树（上级不可见的部门作为根节点）
+        """
+        search_dict = vars(search) if search else None
+        if order_by and order_by != _TREE_ORDER:
+            dept_list = await DeptCRUD(self.auth).tree_list(search=search_dict, order_by=order_by, with_children=False)
+            return traversal_to_tree([DeptOutSchema.model_validate(dept).model_dump() for dept in dept_list])
+
+        user = self.auth.user
+        scope = self.auth.tenant_id if user and not user.is_superuser else None
+
+        async def load() -> TreeSnapshot:
+            auth = self.auth.model_copy(update={"check_data_scope": False})
+            dept_list = await DeptCRUD(auth).tree_list(order_by=_TREE_ORDER, with_children=False)
+            return TreeSnapshot.build([DeptOutSchema.model_validate(dept).model_dump() for dept in dept_list])
+
+        snapshot = await _dept_tree_cache.get(scope, load)
+        return snapshot.tree(await DeptCRUD(self.auth).get_ids(search=search_dict))
+
+    @staticmethod
+    def invalidate_tree(db: AsyncSession | None) -> None:
+        """部门写入事务提交后失效全部部门树快照（广播到所有 worker）"""
+        _dept_tree_cache.invalidate_after_commit(db)
 
     async def create(self, data: DeptCreateSchema) -> DeptOutSchema:
         dept = await DeptCRUD(self.auth).get(name=data.name)
@@ -60,6 +95,8 @@ class DeptService:
         await TenantService(self.auth).check_quota(self.auth.tenant_id, "dept")
 
         dept = await DeptCRUD(self.auth).create(data=data)
+        await DeptClosureCRUD(self.auth.db).insert_node(dept.id, dept.parent_id)
+        self.invalidate_tree(self.auth.db)
         return DeptOutSchema.model_validate(dept)
 
     async def update(self, id: int, data: DeptUpdateSchema) -> DeptOutSchema:
@@ -71,7 +108,17 @@ class DeptService:
         if exist_code and exist_code.id != id:
             raise CustomException(msg="更新失败，编码已存在")
 
+        old_parent_id = dept.parent_id
+        # 未传 parent_id（仅改名称 / 排序等）时不移动节点
+        parent_changed = "parent_id" in data.model_fields_set and data.parent_id != old_parent_id
+        if parent_changed and data.parent_id is not None:
+            if data.parent_id in await DeptClosureCRUD(self.auth.db).get_descendant_ids(id) | {id}:
+                raise CustomException(msg="更新失败，上级部门不能是自身或其子部门")
+
         dept = await DeptCRUD(self.auth).update(id=id, data=data)
+        if parent_changed:
+            await DeptClosureCRUD(self.auth.db).move_node(id, data.parent_id)
+        self.invalidate_tree(self.auth.db)
         dept_out = DeptOutSchema.model_validate(dept)
         if dept_out.parent_id:
             parent = await DeptCRUD(self.auth).get(id=dept_out.parent_id)
@@ -94,6 +141,8 @@ class DeptService:
                 raise CustomException(msg="存在子部门，不允许删除父部门")
 
         await DeptCRUD(self.auth).delete(ids=ids)
+        await DeptClosureCRUD(self.auth.db).delete_nodes(ids)
+        self.invalidate_tree(self.auth.db)
 
     async def batch_set_available(self, data: BatchSetAvailable) -> None:
         dept_list = await DeptCRUD(self.auth).get_list()
@@ -111,3 +160,17 @@ class DeptService:
                 total_ids.extend(disable_ids)
 
         await DeptCRUD(self.auth).set(ids=total_ids, status=data.status)
+        self.invalidate_tree(self.auth.db)
+
+    @staticmethod
+    async def rebuild_closure(db: AsyncSession) -> int:
+        """
+        全量重建部门闭包表（历史数据迁移、数据修复时使用）。
+
+        参数:
+        - db (AsyncSession): 数据库会话。
+
+        返回:
+        - int: 写入的闭包行数。
+        """
+        return await DeptClosureCRUD(db).rebuild()
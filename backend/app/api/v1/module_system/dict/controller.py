@@ -1,17 +1,17 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, Path
+from fastapi import APIRouter, Body, Depends, Path, Query
 from fastapi.responses import JSONResponse, StreamingResponse
 from redis.asyncio.client import Redis
 
-from app.common.response import ResponseSchema, StreamResponse, SuccessResponse
+from app.common.response import ResponseSchema, SuccessResponse
 from app.core import cache_util
 from app.core.base_params import PaginationQueryParam
 from app.core.base_schema import AuthSchema, BatchSetAvailable, PageResultSchema
 from app.core.cache_util import cache
 from app.core.dependencies import AuthPermission, redis_getter
+from app.core.exporter import ExportFormat, export_response
 from app.core.router_class import OperationLogRoute
-from app.utils.common_util import bytes2file_response
 
 from .schema import (
     DictDataCreateSchema,
@@ -135,17 +135,10 @@ async def batch_set_available_dict_type_controller(
 async def export_type_list_controller(
     search: Annotated[DictTypeQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:dict_type:export"]))],
+    file_format: Annotated[ExportFormat, Query(description="导出格式")] = "xlsx",
 ) -> StreamingResponse:
-    # 获取全量数据并转为dict列表
-    result_dict_list = await DictTypeService(auth).get_list(search=search)
-    export_data = [item.model_dump() for item in result_dict_list]
-    export_result = DictTypeService.export(data_list=export_data)
-
-    return StreamResponse(
-        data=bytes2file_response(export_result),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=dict_type.xlsx"},
-    )
+    batches = DictTypeService(auth).export_rows(search=search)
+    return export_response(batches, mapping_dict=DictTypeService.EXPORT_MAPPING, filename="dict_type", file_format=file_format)
 
 @DictRouter.get(
     "/data/detail/{id}",
@@ -241,16 +234,10 @@ async def export_data_list_controller(
     search: Annotated[DictDataQueryParam, Depends()],
     page: Annotated[PaginationQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:dict_data:export"]))],
+    file_format: Annotated[ExportFormat, Query(description="导出格式")] = "xlsx",
 ) -> StreamingResponse:
-    result_dict_list = await DictDataService(auth).get_list(search=search, order_by=page.order_by)
-    export_data = [item.model_dump() for item in result_dict_list]
-    export_result = DictDataService.export(data_list=export_data)
-
-    return StreamResponse(
-        data=bytes2file_response(export_result),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=dice_data.xlsx"},
-    )
+    batches = DictDataService(auth).export_rows(search=search, order_by=page.order_by)
+    return export_response(batches, mapping_dict=DictDataService.EXPORT_MAPPING, filename="dict_data", file_format=file_format)
 
 @DictRouter.get(
     "/data/info/{dict_type}",
@@ -1,4 +1,6 @@
 import json
+from collections.abc import AsyncIterator
+from typing import Any
 
 from redis.asyncio.client import Redis
 
@@ -6,11 +8,13 @@ from app.common.enums import RedisInitKeyConfig
 from app.core.base_schema import AuthSchema, BatchSetAvailable
 from app.core.database import async_db_session
 from app.core.exceptions import CustomException
+from app.core.exporter import stream_rows
 from app.core.logger import logger
 from app.core.redis_crud import RedisCURD
-from app.utils.excel_util import ExcelUtil
+from app.core.tiered_cache import TieredCache
 
 from .crud import DictDataCRUD, DictTypeCRUD
+from .model import DictDataModel, DictTypeModel
 from .schema import (
     DictDataCreateSchema,
     DictDataOutSchema,
@@ -22,6 +26,14 @@ from .schema import (
     DictTypeUpdateSchema,
 )
 
+# 两级缓存：{(tenant_id, dict_type): 字典数据列表}
+_dict_cache = TieredCache("system_dict", maxsize=1024, ttl=300.0)
+
+
+async def _invalidate_dict_cache(tenant_id: int | None, dict_type: str | None = None) -> None:
+    """失效字典两级缓存（广播到所有 worker）；dict_type 为 None 时清空全部。"""
+    await _dict_cache.invalidate((tenant_id, dict_type) if dict_type is not None else None)
+
 
 class DictTypeService:
     """
@@ -119,6 +131,7 @@ class DictTypeService:
                 value="[]",
                 expire=None,
             )
+            await _invalidate_dict_cache(self.auth.user.tenant_id, data.dict_type)
             logger.info(f"创建字典类型成功: {new_obj_dict}")
         except Exception as e:
             logger.error(f"创建字典类型失败: {e}")
@@ -183,6 +196,8 @@ class DictTypeService:
                 value=value,
                 expire=None,
             )
+            await _invalidate_dict_cache(self.auth.user.tenant_id, exist_obj.dict_type)
+            await _invalidate_dict_cache(self.auth.user.tenant_id, data.dict_type)
             logger.info(f"更新字典类型成功并刷新缓存: {new_obj_dict}")
         except Exception as e:
             logger.error(f"更新字典类型缓存失败: {e}")
@@ -218,6 +233,7 @@ class DictTypeService:
             redis_key = f"{RedisInitKeyConfig.SYSTEM_DICT.key}:{self.auth.user.tenant_id}:{exist_obj.dict_type}"
             try:
                 await RedisCURD(redis).delete(redis_key)
+                await _invalidate_dict_cache(self.auth.user.tenant_id, exist_obj.dict_type)
                 logger.info(f"删除字典类型成功: {nid}")
             except Exception as e:
                 logger.error(f"删除字典类型失败: {e}")
@@ -236,36 +252,40 @@ class DictTypeService:
         """
         await DictTypeCRUD(self.auth).set(ids=data.ids, status=data.status)
 
-    @staticmethod
-    def export(data_list: list[dict]) -> bytes:
+    EXPORT_MAPPING = {
+        "id": "编号",
+        "dict_name": "字典名称",
+        "dict_type": "字典类型",
+        "status": "状态",
+        "description": "备注",
+        "created_time": "创建时间",
+        "updated_time": "更新时间",
+        "created_id": "创建者ID",
+        "updated_id": "更新者ID",
+    }
+
+    def export_rows(
+        self,
+        search: DictTypeQueryParam | None = None,
+        order_by: list[dict[str, str]] | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
         """
-        导出数据字典类型列表（无状态工具方法）
+        按批读取字典类型导出数据（配合 export_response 流式输出）
 
         参数:
-        - data_list (list[dict]): 数据字典类型列表
+        - search (DictTypeQueryParam | None): 查询参数模型
+        - order_by (list[dict[str, str]] | None): 排序参数列表
 
         返回:
-        - bytes: Excel文件字节流
+        - AsyncIterator[list[dict[str, Any]]]: 导出行批次
         """
-        mapping_dict = {
-            "id": "编号",
-            "dict_name": "字典名称",
-            "dict_type": "字典类型",
-            "status": "状态",
-            "description": "备注",
-            "created_time": "创建时间",
-            "updated_time": "更新时间",
-            "created_id": "创建者ID",
-            "updated_id": "更新者ID",
-        }
-
-        # 复制数据并转换状态
-        data = data_list.copy()
-        for item in data:
-            # 处理状态
-            item["status"] = "启用" if item.get("status") == 0 else "停用"
+        return stream_rows(self.auth, DictTypeCRUD, self._export_row, search=vars(search) if search else None, order_by=order_by)
 
-        return ExcelUtil.export_list2excel(list_data=data, mapping_dict=mapping_dict)
+    @staticmethod
+    def _export_row(dict_type: DictTypeModel) -> dict[str, Any]:
+        row = {key: getattr(dict_type, key, None) for key in DictTypeService.EXPORT_MAPPING}
+        row["status"] = "启用" if dict_type.status == 0 else "停用"
+        return row
 
 
 class DictDataService:
@@ -381,11 +401,12 @@ class DictDataService:
         except Exception as e:
             logger.error(f"字典初始化过程发生错误: {e}")
             raise CustomException(msg="字典数据初始化失败") from e
+        await _invalidate_dict_cache(None)
 
     @staticmethod
     async def get_init_cache(redis: Redis, dict_type: str, tenant_id: int = 1) -> list[dict]:
         """
-        从缓存获取字典数据列表信息（无 auth）。
+        从两级缓存获取字典数据列表信息（无 auth）。
 
         参数:
         - redis (Redis): Redis客户端
@@ -393,8 +414,15 @@ class DictDataService:
         - tenant_id (int): 租户ID
 
         返回:
-        - list[dict]: 字典数据列表
+        - list[dict]: 字典数据列表（本地缓存共享，调用方不得修改）
         """
+        return await _dict_cache.get(
+            (tenant_id, dict_type), lambda: DictDataService._fetch_init_cache(redis, dict_type, tenant_id)
+        )
+
+    @staticmethod
+    async def _fetch_init_cache(redis: Redis, dict_type: str, tenant_id: int = 1) -> list[dict]:
+        """从 Redis 获取字典数据列表，未命中时重新初始化字典缓存。"""
         try:
             redis_key = f"{RedisInitKeyConfig.SYSTEM_DICT.key}:{tenant_id}:{dict_type}"
             obj_list_dict = await RedisCURD(redis).get(redis_key)
@@ -461,6 +489,7 @@ class DictDataService:
                 value=value,
                 expire=None,
             )
+            await _invalidate_dict_cache(self.auth.user.tenant_id, data.dict_type)
             logger.info(f"创建字典数据写入缓存成功: {obj}")
         except Exception as e:
             logger.error(f"创建字典数据写入缓存失败: {e}")
@@ -513,6 +542,7 @@ class DictDataService:
                         value=value,
                         expire=None,
                     )
+                    await _invalidate_dict_cache(self.auth.user.tenant_id, dict_type.dict_type)
                 except Exception as e:
                     logger.error(f"刷新旧字典缓存失败: {e}")
                     raise CustomException(msg="同步旧字典数据缓存失败") from e
@@ -530,6 +560,7 @@ class DictDataService:
                 value=value,
                 expire=None,
             )
+            await _invalidate_dict_cache(self.auth.user.tenant_id, data.dict_type)
             logger.info(f"更新字典数据写入缓存成功: {obj}")
         except Exception as e:
             logger.error(f"更新字典数据写入缓存失败: {e}")
@@ -568,6 +599,7 @@ class DictDataService:
                     value=value,
                     expire=None,
                 )
+                await _invalidate_dict_cache(self.auth.user.tenant_id, exist_obj.dict_type)
                 logger.info(f"删除字典数据并刷新缓存: {nid}")
             except Exception as e:
                 logger.error(f"删除字典数据刷新缓存失败: {e}")
@@ -586,38 +618,39 @@ class DictDataService:
         """
         await DictDataCRUD(self.auth).set(ids=data.ids, status=data.status)
 
-    @staticmethod
-    def export(data_list: list[dict]) -> bytes:
+    EXPORT_MAPPING = {
+        "id": "编号",
+        "dict_type": "字典类型",
+        "dict_label": "字典标签",
+        "dict_value": "字典键值",
+        "dict_sort": "字典排序",
+        "status": "状态",
+        "description": "备注",
+        "created_time": "创建时间",
+        "updated_time": "更新时间",
+        "created_id": "创建者ID",
+        "updated_id": "更新者ID",
+    }
+
+    def export_rows(
+        self,
+        search: DictDataQueryParam | None = None,
+        order_by: list[dict[str, str]] | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
         """
-        导出数据字典数据列表（无状态工具方法）
+        按批读取字典数据导出数据（配合 export_response 流式输出）
 
         参数:
-        - data_list (list[dict]): 数据字典数据列表
+        - search (DictDataQueryParam | None): 查询参数模型
+        - order_by (list[dict[str, str]] | None): 排序参数列表
 
         返回:
-        - bytes: Excel文件字节流
-        """
-        mapping_dict = {
-            "id": "编号",
-            "dict_type": "字典类型",
-            "dict_label": "字典标签",
-            "dict_value": "字典键值",
-            "dict_sort": "字典排序",
-            "status": "状态",
-            "description": "备注",
-            "created_time": "创建时间",
-            "updated_time": "更新时间",
-            "created_id": "创建者ID",
-            "updated_id": "更新者ID",
-        }
-
-        # 复制数据并转换状态
-        data = data_list.copy()
-        for item in data:
-            item["status"] = "启用" if item.get("status") == 0 else "停用"
-            if item.get("is_default") is True:
-                item["is_default"] = "是"
-            else:
-                item["is_default"] = "否"
-
-        return ExcelUtil.export_list2excel(list_data=data, mapping_dict=mapping_dict)
+        - AsyncIterator[list[dict[str, Any]]]: 导出行批次
+        """
+        return stream_rows(self.auth, DictDataCRUD, self._export_row, search=vars(search) if search else None, order_by=order_by)
+
+    @staticmethod
+    def _export_row(dict_data: DictDataModel) -> dict[str, Any]:
+        row = {key: getattr(dict_data, key, None) for key in DictDataService.EXPORT_MAPPING}
+        row["status"] = "启用" if dict_data.status == 0 else "停用"
+        return row
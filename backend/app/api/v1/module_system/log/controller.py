@@ -52,6 +52,8 @@ async def get_log_list_controller(
         page_size=page.page_size,
         search=search,
         order_by=page.order_by,
+        cursor=page.cursor,
+        count=page.count,
     )
     return SuccessResponse(data=result_dict, msg="查询登录日志列表成功")
 
@@ -114,6 +116,8 @@ async def list(
         page_size=page.page_size,
         search=search,
         order_by=page.order_by,
+        cursor=page.cursor,
+        count=page.count,
     )
     return SuccessResponse(data=result_dict, msg="查询操作日志列表成功")
 
@@ -58,3 +58,6 @@ class OperationLogModel(ModelMixin, TenantMixin, UserMixin):
     response_code: Mapped[int] = mapped_column(Integer, comment="响应状态码")
     response_json: Mapped[str | None] = mapped_column(get_log_text_column_type(), nullable=True, comment="响应体")
     process_time: Mapped[str | None] = mapped_column(String(20), nullable=True, comment="处理时间")
+    correlation_id: Mapped[str | None] = mapped_column(String(64), nullable=True, comment="请求关联ID")
+    sql_count: Mapped[int | None] = mapped_column(Integer, nullable=True, comment="SQL语句数")
+    sql_time: Mapped[str | None] = mapped_column(String(20), nullable=True, comment="SQL耗时")
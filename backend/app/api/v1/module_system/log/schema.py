@@ -94,6 +94,9 @@ class OperationLogOutSchema(BaseSchema, UserBySchema, TenantBySchema):
     request_method: str = Field(..., description="请求方式")
     response_code: int = Field(..., description="响应状态码")
     process_time: str | None = Field(default=None, description="处理时间")
+    correlation_id: str | None = Field(default=None, description="请求关联ID")
+    sql_count: int | None = Field(default=None, description="SQL语句数")
+    sql_time: str | None = Field(default=None, description="SQL耗时")
 
 
 class OperationLogDetailOutSchema(OperationLogOutSchema):
@@ -110,6 +113,9 @@ class OperationLogCreateSchema(BaseModel):
     response_code: int = Field(200, ge=100, le=599, description="响应状态码")
     response_json: str | None = Field(None, description="响应体")
     process_time: str | None = Field(None, max_length=20, description="处理时间")
+    correlation_id: str | None = Field(None, max_length=64, description="请求关联ID")
+    sql_count: int | None = Field(None, ge=0, description="SQL语句数")
+    sql_time: str | None = Field(None, max_length=20, description="SQL耗时")
     created_id: int | None = Field(None, description="创建人ID")
     updated_id: int | None = Field(None, description="更新人ID")
     description: str | None = Field(None, description="备注")
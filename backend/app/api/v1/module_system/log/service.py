@@ -1,4 +1,4 @@
-
+from app.common.enums import PageCountEnum
 from app.core.base_schema import AuthSchema
 from app.core.exceptions import CustomException
 from app.core.logger import logger
@@ -31,6 +31,8 @@ class LoginLogService:
         page_size: int,
         search: LoginLogQueryParam | None = None,
         order_by: list[dict[str, str]] | None = None,
+        cursor: str | None = None,
+        count: PageCountEnum | None = None,
     ) -> dict:
         return await LoginLogCRUD(self.auth).page(
             offset=(page_no - 1) * page_size,
@@ -38,6 +40,8 @@ class LoginLogService:
             order_by=order_by or [{"updated_time": "desc"}],
             search=vars(search) if search else None,
             out_schema=LoginLogOutSchema,
+            cursor=cursor,
+            count=count,
         )
 
     async def create(self, data: LoginLogCreateSchema) -> LoginLogDetailOutSchema:
@@ -112,6 +116,8 @@ class OperationLogService:
         page_size: int,
         search: OperationLogQueryParam | None = None,
         order_by: list[dict[str, str]] | None = None,
+        cursor: str | None = None,
+        count: PageCountEnum | None = None,
     ) -> dict:
         crud = OperationLogCRUD(self.auth)
         return await crud.page(
@@ -120,6 +126,8 @@ class OperationLogService:
             order_by=order_by or [{"id": "desc"}],
             search=vars(search) if search else None,
             out_schema=OperationLogOutSchema,
+            cursor=cursor,
+            count=count,
         )
 
     async def detail(self, id: int) -> OperationLogDetailOutSchema:
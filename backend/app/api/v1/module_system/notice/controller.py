@@ -1,17 +1,17 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, Path
+from fastapi import APIRouter, Body, Depends, Path, Query
 from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.common.response import ResponseSchema, StreamResponse, SuccessResponse
+from app.common.response import ResponseSchema, SuccessResponse
 from app.core import cache_util
 from app.core.base_params import PaginationQueryParam
 from app.core.base_schema import AuthSchema, BatchSetAvailable, PageResultSchema
 from app.core.cache_util import cache
 from app.core.dependencies import AuthPermission, get_current_user
+from app.core.exporter import ExportFormat, export_response
 from app.core.logger import logger
 from app.core.router_class import OperationLogRoute
-from app.utils.common_util import bytes2file_response
 
 from .schema import (
     NoticeCreateSchema,
@@ -53,6 +53,8 @@ async def get_notice_list_controller(
         page_size=page.page_size,
         search=search,
         order_by=page.order_by,
+        cursor=page.cursor,
+        count=page.count,
     )
     return SuccessResponse(data=result_dict, msg="查询公告列表成功")
 
@@ -116,16 +118,10 @@ async def batch_set_available_notice_controller(
 async def export_notice_list_controller(
     search: Annotated[NoticeQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:notice:export"]))],
+    file_format: Annotated[ExportFormat, Query(description="导出格式")] = "xlsx",
 ) -> StreamingResponse:
-    result_dict_list = await NoticeService(auth).get_list(search=search)
-    export_data = [item.model_dump() for item in result_dict_list]
-    export_result = NoticeService.export(notice_list=export_data)
-
-    return StreamResponse(
-        data=bytes2file_response(export_result),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=notice.xlsx"},
-    )
+    batches = NoticeService(auth).export_rows(search=search)
+    return export_response(batches, mapping_dict=NoticeService.EXPORT_MAPPING, filename="notice", file_format=file_format)
 
 @NoticeRouter.get(
     "/available",
@@ -1,7 +1,11 @@
+from collections.abc import AsyncIterator
+from typing import Any
+
+from app.common.enums import PageCountEnum
 from app.core.base_schema import AuthSchema, BatchSetAvailable
 from app.core.exceptions import CustomException
+from app.core.exporter import stream_rows
 from app.core.logger import logger
-from app.utils.excel_util import ExcelUtil
 
 from .crud import NoticeCRUD
 from .model import NoticeModel, NoticeReadModel
@@ -42,6 +46,8 @@ class NoticeService:
         page_size: int,
         search: NoticeQueryParam | None = None,
         order_by: list[dict] | None = None,
+        cursor: str | None = None,
+        count: PageCountEnum | None = None,
     ) -> dict:
         offset = (page_no - 1) * page_size
         return await NoticeCRUD(self.auth).page(
@@ -50,6 +56,8 @@ class NoticeService:
             order_by=order_by or [{"id": "asc"}],
             search=vars(search) if search else None,
             out_schema=NoticeOutSchema,
+            cursor=cursor,
+            count=count,
         )
 
     async def available_page(self) -> dict:
@@ -89,25 +97,42 @@ class NoticeService:
     async def set_available(self, data: BatchSetAvailable) -> None:
         await NoticeCRUD(self.auth).set(ids=data.ids, status=data.status)
 
+    EXPORT_MAPPING = {
+        "id": "编号",
+        "notice_title": "公告标题",
+        "notice_type": "公告类型（1通知 2公告）",
+        "notice_content": "公告内容",
+        "status": "状态",
+        "description": "备注",
+        "created_time": "创建时间",
+        "updated_time": "更新时间",
+        "created_id": "创建者ID",
+        "updated_id": "更新者ID",
+    }
+
+    def export_rows(
+        self,
+        search: NoticeQueryParam | None = None,
+        order_by: list[dict[str, str]] | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        按批读取公告导出数据（配合 export_response 流式输出）
+
+        参数:
+        - search (NoticeQueryParam | None): 查询参数模型
+        - order_by (list[dict[str, str]] | None): 排序参数列表
+
+        返回:
+        - AsyncIterator[list[dict[str, Any]]]: 导出行批次
+        """
+        return stream_rows(self.auth, NoticeCRUD, self._export_row, search=vars(search) if search else None, order_by=order_by)
+
     @staticmethod
-    def export(notice_list: list[dict]) -> bytes:
-        mapping_dict = {
-            "id": "编号",
-            "notice_title": "公告标题",
-            "notice_type": "公告类型（1通知 2公告）",
-            "notice_content": "公告内容",
-            "status": "状态",
-            "description": "备注",
-            "created_time": "创建时间",
-            "updated_time": "更新时间",
-            "created_id": "创建者ID",
-            "updated_id": "更新者ID",
-        }
-        data = notice_list.copy()
-        for item in data:
-            item["status"] = "启用" if item.get("status") == 0 else "停用"
-            item["notice_type"] = "通知" if item.get("notice_type") == "1" else "公告"
-        return ExcelUtil.export_list2excel(list_data=data, mapping_dict=mapping_dict)
+    def _export_row(notice: NoticeModel) -> dict[str, Any]:
+        row = {key: getattr(notice, key, None) for key in NoticeService.EXPORT_MAPPING}
+        row["status"] = "启用" if notice.status == 0 else "停用"
+        row["notice_type"] = "通知" if notice.notice_type == "1" else "公告"
+        return row
 
     async def latest(self, limit: int = 5) -> list[NoticeOutSchema]:
         from sqlalchemy import desc, select
@@ -1,15 +1,15 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, Path
+from fastapi import APIRouter, Body, Depends, Path, Query
 from fastapi.responses import JSONResponse, StreamingResponse
 from redis.asyncio.client import Redis
 
-from app.common.response import ResponseSchema, StreamResponse, SuccessResponse
+from app.common.response import ResponseSchema, SuccessResponse
 from app.core.base_params import PaginationQueryParam
 from app.core.base_schema import AuthSchema, PageResultSchema
 from app.core.dependencies import AuthPermission, redis_getter
+from app.core.exporter import ExportFormat, export_response
 from app.core.router_class import OperationLogRoute
-from app.utils.common_util import bytes2file_response
 
 from .schema import ParamsCreateSchema, ParamsOutSchema, ParamsQueryParam, ParamsUpdateSchema
 from .service import ParamsService
@@ -131,16 +131,10 @@ async def batch_set_status_controller(
 async def export_param_list_controller(
     search: Annotated[ParamsQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:param:export"]))],
+    file_format: Annotated[ExportFormat, Query(description="导出格式")] = "xlsx",
 ) -> StreamingResponse:
-    result_dict_list = await ParamsService(auth).get_list(search=search)
-    export_data = [item.model_dump() for item in result_dict_list]
-    export_result = ParamsService.export(data_list=export_data)
-
-    return StreamResponse(
-        data=bytes2file_response(export_result),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=params.xlsx"},
-    )
+    batches = ParamsService(auth).export_rows(search=search)
+    return export_response(batches, mapping_dict=ParamsService.EXPORT_MAPPING, filename="params", file_format=file_format)
 
 @ParamsRouter.get(
     "/info",
@@ -1,5 +1,6 @@
 import json
-import time
+from collections.abc import AsyncIterator
+from typing import Any
 
 from redis.asyncio.client import Redis
 
@@ -7,11 +8,13 @@ from app.common.enums import RedisInitKeyConfig
 from app.core.base_schema import AuthSchema
 from app.core.database import async_db_session
 from app.core.exceptions import CustomException
+from app.core.exporter import stream_rows
 from app.core.logger import logger
 from app.core.redis_crud import RedisCURD
-from app.utils.excel_util import ExcelUtil
+from app.core.tiered_cache import TieredCache
 
 from .crud import ParamsCRUD
+from .model import ParamsModel
 from .schema import (
     ParamsCreateSchema,
     ParamsOutSchema,
@@ -28,9 +31,9 @@ MIDDLEWARE_CONFIG_KEYS: tuple[str, ...] = (
     "operation_log_retention_days",
 )
 
-# 内存缓存（按租户隔离）
-_MID_CONFIG_TTL: float = 60.0
-_mid_config_cache: dict[int, dict] = {}
+# 两级缓存（按租户隔离）：中间件解析后的配置 / 全量系统配置列表
+_mid_config_cache = TieredCache("system_config_middleware", maxsize=256, ttl=60.0)
+_config_list_cache = TieredCache("system_config", maxsize=256, ttl=300.0)
 
 
 def _parse_bool(value: object) -> bool:
@@ -69,12 +72,15 @@ def _parse_json_list(value: object) -> list:
     return []
 
 
-def _invalidate_mid_config_cache(tenant_id: int | None = None) -> None:
-    """失效中间件内存缓存。tenant_id 为 None 时清空所有租户。"""
-    if tenant_id is None:
-        _mid_config_cache.clear()
-    else:
-        _mid_config_cache.pop(tenant_id, None)
+async def _invalidate_config_cache(tenant_id: int | None = None) -> None:
+    """失效系统配置两级缓存（广播到所有 worker）。tenant_id 为 None 时清空所有租户。"""
+    await _mid_config_cache.invalidate(tenant_id)
+    await _config_list_cache.invalidate(tenant_id)
+
+
+def _config_index_key(tenant_id: int) -> str:
+    """租户系统配置键的索引集合（成员为 config_key），枚举时无需扫描全库。"""
+    return f"{RedisInitKeyConfig.SYSTEM_CONFIG.key}_index:{tenant_id}"
 
 
 def _default_for(key: str) -> object:
@@ -235,10 +241,13 @@ class ParamsService:
             if not result:
                 logger.error(f"同步配置到缓存失败: {out}")
                 raise CustomException(msg="同步配置到缓存失败")
+            await RedisCURD(redis).index_add(_config_index_key(self.auth.user.tenant_id), data.config_key)
         except Exception as e:
             logger.error(f"创建字典类型失败: {e}")
             raise CustomException(msg="同步配置到缓存失败") from e
 
+        await _invalidate_config_cache(self.auth.user.tenant_id)
+
         return out
 
     async def update(self, redis: Redis, id: int, data: ParamsUpdateSchema) -> ParamsOutSchema:
@@ -279,8 +288,8 @@ class ParamsService:
             logger.error(f"更新系统配置失败: {e}")
             raise CustomException(msg="同步配置到缓存失败") from e
 
-        # 失效中间件内存缓存，让下次请求重新加载
-        _invalidate_mid_config_cache(self.auth.user.tenant_id)
+        # 失效两级缓存，让各 worker 下次请求重新加载
+        await _invalidate_config_cache(self.auth.user.tenant_id)
 
         return out
 
@@ -314,12 +323,13 @@ class ParamsService:
             redis_key = f"{RedisInitKeyConfig.SYSTEM_CONFIG.key}:{self.auth.user.tenant_id}:{obj.config_key}"
             try:
                 await RedisCURD(redis).delete(redis_key)
+                await RedisCURD(redis).index_remove(_config_index_key(self.auth.user.tenant_id), obj.config_key)
             except Exception as e:
                 logger.error(f"删除系统配置失败: {e}")
                 raise CustomException(msg="同步删除缓存失败") from e
 
-        # 失效中间件内存缓存
-        _invalidate_mid_config_cache(self.auth.user.tenant_id)
+        # 失效两级缓存
+        await _invalidate_config_cache(self.auth.user.tenant_id)
 
     async def batch_set_status(self, ids: list[int], status: int) -> None:
         """
@@ -337,37 +347,41 @@ class ParamsService:
 
         await ParamsCRUD(self.auth).set(ids=ids, status=status)
 
-    @staticmethod
-    def export(data_list: list[dict]) -> bytes:
+    EXPORT_MAPPING = {
+        "id": "编号",
+        "config_name": "参数名称",
+        "config_key": "参数键名",
+        "config_value": "参数键值",
+        "config_type": "系统内置((True:是 False:否))",
+        "description": "备注",
+        "created_time": "创建时间",
+        "updated_time": "更新时间",
+        "created_id": "创建者ID",
+        "updated_id": "更新者ID",
+    }
+
+    def export_rows(
+        self,
+        search: ParamsQueryParam | None = None,
+        order_by: list[dict[str, str]] | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
         """
-        导出参数列表（无状态工具方法）
+        按批读取参数导出数据（配合 export_response 流式输出）
 
         参数:
-        - data_list (list[dict]): 参数字典列表
+        - search (ParamsQueryParam | None): 查询参数模型
+        - order_by (list[dict[str, str]] | None): 排序参数列表
 
         返回:
-        - bytes: Excel 文件字节流
+        - AsyncIterator[list[dict[str, Any]]]: 导出行批次
         """
-        mapping_dict = {
-            "id": "编号",
-            "config_name": "参数名称",
-            "config_key": "参数键名",
-            "config_value": "参数键值",
-            "config_type": "系统内置((True:是 False:否))",
-            "description": "备注",
-            "created_time": "创建时间",
-            "updated_time": "更新时间",
-            "created_id": "创建者ID",
-            "updated_id": "更新者ID",
-        }
-
-        # 复制数据并转换状态
-        data = data_list.copy()
-        for item in data:
-            # 处理状态
-            item["config_type"] = "是" if item.get("config_type") else "否"
-
-        return ExcelUtil.export_list2excel(list_data=data, mapping_dict=mapping_dict)
+        return stream_rows(self.auth, ParamsCRUD, self._export_row, search=vars(search) if search else None, order_by=order_by)
+
+    @staticmethod
+    def _export_row(params: ParamsModel) -> dict[str, Any]:
+        row = {key: getattr(params, key, None) for key in ParamsService.EXPORT_MAPPING}
+        row["config_type"] = "是" if params.config_type else "否"
+        return row
 
     @staticmethod
     async def _load_all_configs_from_db() -> list:
@@ -380,6 +394,7 @@ class ParamsService:
     async def _sync_configs_to_redis(redis: Redis, config_obj: list) -> list[dict]:
         """将 DB 配置写入 Redis，返回对应的 dict 列表。"""
         configs: list[dict] = []
+        index: dict[int, list[str]] = {}
         for config in config_obj:
             redis_key = f"{RedisInitKeyConfig.SYSTEM_CONFIG.key}:{config.tenant_id}:{config.config_key}"
             out = ParamsOutSchema.model_validate(config)
@@ -387,8 +402,11 @@ class ParamsService:
             try:
                 await RedisCURD(redis).set(redis_key, json.dumps(payload, ensure_ascii=False))
                 configs.append(out.model_dump())
+                index.setdefault(config.tenant_id, []).append(config.config_key)
             except Exception as e:
                 logger.error(f"❌️ 缓存系统配置失败: {redis_key}: {e}")
+        for tenant_id, config_keys in index.items():
+            await RedisCURD(redis).index_add(_config_index_key(tenant_id), *config_keys)
         return configs
 
     @staticmethod
@@ -398,11 +416,24 @@ class ParamsService:
         if not config_obj:
             raise CustomException(msg="该数据不存在")
         await ParamsService._sync_configs_to_redis(redis, config_obj)
+        await _invalidate_config_cache()
 
     @staticmethod
     async def get_init_cache(redis: Redis, tenant_id: int = 1) -> list[dict]:
-        """从 Redis 读取系统配置；为空时自动回源 DB。"""
-        redis_keys = await RedisCURD(redis).get_keys(f"{RedisInitKeyConfig.SYSTEM_CONFIG.key}:{tenant_id}:*")
+        """从两级缓存读取系统配置；Redis 为空时自动回源 DB。"""
+        return await _config_list_cache.get(tenant_id, lambda: ParamsService._fetch_init_cache(redis, tenant_id))
+
+    @staticmethod
+    async def _fetch_init_cache(redis: Redis, tenant_id: int = 1) -> list[dict]:
+        """从 Redis 读取系统配置（按索引集合枚举键）；为空时自动回源 DB。"""
+        prefix = f"{RedisInitKeyConfig.SYSTEM_CONFIG.key}:{tenant_id}:"
+        config_keys = await RedisCURD(redis).index_members(_config_index_key(tenant_id))
+        if config_keys:
+            redis_keys = [f"{prefix}{key}" for key in config_keys]
+        else:
+            # 索引缺失（旧数据 / 被清理）：SCAN 一次并重建索引
+            redis_keys = await RedisCURD(redis).get_keys(f"{prefix}*")
+            await RedisCURD(redis).index_add(_config_index_key(tenant_id), *(key[len(prefix):] for key in redis_keys))
         redis_configs = await RedisCURD(redis).mget(redis_keys)
         configs = []
         for raw in redis_configs:
@@ -422,7 +453,7 @@ class ParamsService:
     @staticmethod
     async def get_system_config_for_middleware(redis: Redis, tenant_id: int = 1) -> dict:
         """
-        获取中间件 / 调度器所需的系统配置（带 60 秒内存缓存，按租户隔离）。
+        获取中间件 / 调度器所需的系统配置（两级缓存，60 秒本地 TTL，按租户隔离）。
 
         参数:
         - redis (Redis): Redis 客户端实例
@@ -431,13 +462,9 @@ class ParamsService:
         返回:
         - dict: 包含 MIDDLEWARE_CONFIG_KEYS 中所有 key 的解析后值。
         """
-        cached = _mid_config_cache.get(tenant_id)
-        if cached and time.monotonic() - cached[0] < _MID_CONFIG_TTL:
-            return cached[1]
-
-        config = await ParamsService._fetch_system_config_for_middleware(redis, tenant_id)
-        _mid_config_cache[tenant_id] = (time.monotonic(), config)
-        return config
+        return await _mid_config_cache.get(
+            tenant_id, lambda: ParamsService._fetch_system_config_for_middleware(redis, tenant_id)
+        )
 
     @staticmethod
     async def _fetch_system_config_for_middleware(redis: Redis, tenant_id: int = 1) -> dict:
@@ -1,16 +1,16 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, Path
+from fastapi import APIRouter, Body, Depends, Path, Query
 from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.common.response import ResponseSchema, StreamResponse, SuccessResponse
+from app.common.response import ResponseSchema, SuccessResponse
 from app.core import cache_util
 from app.core.base_params import PaginationQueryParam
 from app.core.base_schema import AuthSchema, BatchSetAvailable, PageResultSchema
 from app.core.cache_util import cache
 from app.core.dependencies import AuthPermission
+from app.core.exporter import ExportFormat, export_response
 from app.core.router_class import OperationLogRoute
-from app.utils.common_util import bytes2file_response
 
 from .schema import (
     PositionCreateSchema,
@@ -119,12 +119,7 @@ async def batch_set_available_obj_controller(
 async def export_obj_list_controller(
     search: Annotated[PositionQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:position:export"]))],
+    file_format: Annotated[ExportFormat, Query(description="导出格式")] = "xlsx",
 ) -> StreamingResponse:
-    position_query_result = await PositionService(auth).get_list(search=search)
-    position_export_result = PositionService.export_list(position_list=position_query_result)
-
-    return StreamResponse(
-        data=bytes2file_response(position_export_result),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=position.xlsx"},
-    )
+    batches = PositionService(auth).export_rows(search=search)
+    return export_response(batches, mapping_dict=PositionService.EXPORT_MAPPING, filename="position", file_format=file_format)
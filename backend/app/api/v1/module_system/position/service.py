@@ -1,8 +1,12 @@
+from collections.abc import AsyncIterator
+from typing import Any
+
 from app.core.base_schema import AuthSchema, BatchSetAvailable
 from app.core.exceptions import CustomException
-from app.utils.excel_util import ExcelUtil
+from app.core.exporter import stream_rows
 
 from .crud import PositionCRUD
+from .model import PositionModel
 from .schema import (
     PositionCreateSchema,
     PositionOutSchema,
@@ -81,21 +85,37 @@ class PositionService:
                 raise CustomException(msg="该数据不存在")
         await PositionCRUD(self.auth).set(ids=data.ids, status=data.status)
 
+    EXPORT_MAPPING = {
+        "id": "编号",
+        "name": "岗位名称",
+        "order": "显示顺序",
+        "status": "状态",
+        "description": "备注",
+        "created_time": "创建时间",
+        "updated_time": "更新时间",
+        "created_id": "创建者ID",
+        "updated_id": "更新者ID",
+    }
+
+    def export_rows(
+        self,
+        search: PositionQueryParam | None = None,
+        order_by: list[dict[str, str]] | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        按批读取岗位导出数据（配合 export_response 流式输出）
+
+        参数:
+        - search (PositionQueryParam | None): 查询参数模型
+        - order_by (list[dict[str, str]] | None): 排序参数列表
+
+        返回:
+        - AsyncIterator[list[dict[str, Any]]]: 导出行批次
+        """
+        return stream_rows(self.auth, PositionCRUD, self._export_row, search=vars(search) if search else None, order_by=order_by)
+
     @staticmethod
-    def export_list(position_list: list[dict]) -> bytes:
-        mapping_dict = {
-            "id": "编号",
-            "name": "岗位名称",
-            "order": "显示顺序",
-            "status": "状态",
-            "description": "备注",
-            "created_time": "创建时间",
-            "updated_time": "更新时间",
-            "created_id": "创建者ID",
-            "updated_id": "更新者ID",
-        }
-        data = position_list.copy()
-        for item in data:
-            item["status"] = "启用" if item.get("status") == 0 else "停用"
-            item["creator"] = item.get("created_by", {}).get("name", "未知") if isinstance(item.get("created_by"), dict) else "未知"
-        return ExcelUtil.export_list2excel(list_data=data, mapping_dict=mapping_dict)
+    def _export_row(position: PositionModel) -> dict[str, Any]:
+        row = {key: getattr(position, key, None) for key in PositionService.EXPORT_MAPPING}
+        row["status"] = "启用" if position.status == 0 else "停用"
+        return row
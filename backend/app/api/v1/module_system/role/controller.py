@@ -1,16 +1,16 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, Path
+from fastapi import APIRouter, Body, Depends, Path, Query
 from fastapi.responses import JSONResponse, StreamingResponse
 
-from app.common.response import ResponseSchema, StreamResponse, SuccessResponse
+from app.common.response import ResponseSchema, SuccessResponse
 from app.core import cache_util
 from app.core.base_params import PaginationQueryParam
 from app.core.base_schema import AuthSchema, BatchSetAvailable, PageResultSchema
 from app.core.cache_util import cache
 from app.core.dependencies import AuthPermission
+from app.core.exporter import ExportFormat, export_response
 from app.core.router_class import OperationLogRoute
-from app.utils.common_util import bytes2file_response
 
 from .schema import (
     RoleCreateSchema,
@@ -133,12 +133,7 @@ async def set_role_permission_controller(
 async def export_role_list_controller(
     search: Annotated[RoleQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:role:export"]))],
+    file_format: Annotated[ExportFormat, Query(description="导出格式")] = "xlsx",
 ) -> StreamingResponse:
-    role_query_result = await RoleService(auth).get_list(search=search)
-    role_export_result = RoleService.export_list(role_list=role_query_result)
-
-    return StreamResponse(
-        data=bytes2file_response(role_export_result),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=role.xlsx"},
-    )
+    batches = RoleService(auth).export_rows(search=search)
+    return export_response(batches, mapping_dict=RoleService.EXPORT_MAPPING, filename="role", file_format=file_format)
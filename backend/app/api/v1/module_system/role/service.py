@@ -1,11 +1,14 @@
+from collections.abc import AsyncIterator
 from typing import Any
 
 from app.api.v1.module_platform.tenant.service import TenantService
+from app.core import principal
 from app.core.base_schema import AuthSchema, BatchSetAvailable
 from app.core.exceptions import CustomException
-from app.utils.excel_util import ExcelUtil
+from app.core.exporter import stream_rows
 
 from .crud import RoleCRUD
+from .model import RoleModel
 from .schema import (
     RoleCreateSchema,
     RoleOutSchema,
@@ -14,6 +17,15 @@ from .schema import (
     RoleUpdateSchema,
 )
 
+# 数据权限导出文案
+_DATA_SCOPE_LABELS = {
+    1: "仅本人数据权限",
+    2: "本部门数据权限",
+    3: "本部门及以下数据权限",
+    4: "全部数据权限",
+    5: "自定义数据权限",
+}
+
 
 class RoleService:
     """
@@ -125,6 +137,7 @@ class RoleService:
         if exist_code and exist_code.id != id:
             raise CustomException(msg="更新失败，角色编码已存在")
         updated_role = await RoleCRUD(self.auth).update(id=id, data=data)
+        await principal.invalidate_all(self.auth.db)
         return RoleOutSchema.model_validate(updated_role)
 
     async def delete(self, ids: list[int]) -> None:
@@ -146,6 +159,7 @@ class RoleService:
             raise CustomException(msg="删除失败，部分ID不存在")
 
         await RoleCRUD(self.auth).delete(ids=ids)
+        await principal.invalidate_all(self.auth.db)
 
     async def set_permission(self, data: RolePermissionSettingSchema) -> None:
         """
@@ -169,6 +183,8 @@ class RoleService:
         else:
             await RoleCRUD(self.auth).set_role_depts_crud(role_ids=data.role_ids, dept_ids=[])
 
+        await principal.invalidate_all(self.auth.db)
+
     async def set_available(self, data: BatchSetAvailable) -> None:
         """
         设置角色可用状态
@@ -185,45 +201,41 @@ class RoleService:
             if rid not in role_map:
                 raise CustomException(msg="该数据不存在")
         await RoleCRUD(self.auth).set(ids=data.ids, status=data.status)
-
-    @staticmethod
-    def export_list(role_list: list[dict[str, Any]]) -> bytes:
+        await principal.invalidate_all(self.auth.db)
+
+    EXPORT_MAPPING = {
+        "id": "角色编号",
+        "name": "角色名称",
+        "order": "显示顺序",
+        "data_scope": "数据权限",
+        "status": "状态",
+        "description": "备注",
+        "created_time": "创建时间",
+        "updated_time": "更新时间",
+        "created_id": "创建者ID",
+        "updated_id": "更新者ID",
+    }
+
+    def export_rows(
+        self,
+        search: RoleQueryParam | None = None,
+        order_by: list[dict[str, str]] | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
         """
-        导出角色列表
+        按批读取角色导出数据（配合 export_response 流式输出）
 
         参数:
-        - role_list (list[dict[str, Any]]): 角色详情字典列表
+        - search (RoleQueryParam | None): 查询参数模型
+        - order_by (list[dict[str, str]] | None): 排序参数列表
 
         返回:
-        - bytes: Excel文件字节流
-        """
-        # 字段映射配置
-        mapping_dict = {
-            "id": "角色编号",
-            "name": "角色名称",
-            "order": "显示顺序",
-            "data_scope": "数据权限",
-            "status": "状态",
-            "description": "备注",
-            "created_time": "创建时间",
-            "updated_time": "更新时间",
-            "created_id": "创建者ID",
-            "updated_id": "更新者ID",
-        }
-
-        # 数据权限映射
-        data_scope_map = {
-            1: "仅本人数据权限",
-            2: "本部门数据权限",
-            3: "本部门及以下数据权限",
-            4: "全部数据权限",
-            5: "自定义数据权限",
-        }
-
-        # 处理数据
-        data = role_list.copy()
-        for item in data:
-            item["status"] = "启用" if item.get("status") == 0 else "停用"
-            item["data_scope"] = data_scope_map.get(item.get("data_scope", 1), "")
-
-        return ExcelUtil.export_list2excel(list_data=data, mapping_dict=mapping_dict)
+        - AsyncIterator[list[dict[str, Any]]]: 导出行批次
+        """
+        return stream_rows(self.auth, RoleCRUD, self._export_row, search=vars(search) if search else None, order_by=order_by)
+
+    @staticmethod
+    def _export_row(role: RoleModel) -> dict[str, Any]:
+        row = {key: getattr(role, key, None) for key in RoleService.EXPORT_MAPPING}
+        row["status"] = "启用" if role.status == 0 else "停用"
+        row["data_scope"] = _DATA_SCOPE_LABELS.get(role.data_scope, "")
+        return row
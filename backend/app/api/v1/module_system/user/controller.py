@@ -1,14 +1,16 @@
 import urllib.parse
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, Path, UploadFile
+from fastapi import APIRouter, Body, Depends, Path, Query, UploadFile
 from fastapi.responses import JSONResponse, StreamingResponse
+from redis.asyncio.client import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.response import ResponseSchema, StreamResponse, SuccessResponse
 from app.core.base_params import PaginationQueryParam
 from app.core.base_schema import AuthSchema, BatchSetAvailable, PageResultSchema
-from app.core.dependencies import AuthPermission, db_getter, get_current_user
+from app.core.dependencies import AuthPermission, db_getter, get_current_user, redis_getter
+from app.core.exporter import ExportFormat, export_response
 from app.core.logger import logger
 from app.core.router_class import OperationLogRoute
 from app.utils.common_util import bytes2file_response
@@ -19,6 +21,7 @@ from .schema import (
     UserChangePasswordSchema,
     UserCreateSchema,
     UserForgetPasswordSchema,
+    UserImportJobSchema,
     UserOutSchema,
     UserQueryParam,
     UserRegisterSchema,
@@ -211,15 +214,10 @@ async def export_user_list_controller(
     page: Annotated[PaginationQueryParam, Depends()],
     search: Annotated[UserQueryParam, Depends()],
     auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:user:export"]))],
+    file_format: Annotated[ExportFormat, Query(description="导出格式")] = "xlsx",
 ) -> StreamingResponse:
-    user_list = await UserService(auth).get_list(search=search, order_by=page.order_by)
-    user_export_result = UserService.export_list(user_list=user_list)
-
-    return StreamResponse(
-        data=bytes2file_response(user_export_result),
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": "attachment; filename=user.xlsx"},
-    )
+    batches = UserService(auth).export_rows(search=search, order_by=page.order_by)
+    return export_response(batches, mapping_dict=UserService.EXPORT_MAPPING, filename="user", file_format=file_format)
 
 @UserRouter.post(
     "/import/data",
@@ -232,3 +230,29 @@ async def import_user_list_controller(
 ) -> JSONResponse:
     batch_import_result = await UserService(auth).batch_import(file=file, update_support=True)
     return SuccessResponse(data=batch_import_result, msg="导入用户成功")
+
+@UserRouter.post(
+    "/import/job",
+    summary="提交后台导入用户任务",
+    response_model=ResponseSchema[UserImportJobSchema],
+)
+async def create_user_import_job_controller(
+    file: UploadFile,
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:user:import"]))],
+    redis: Annotated[Redis, Depends(redis_getter)],
+) -> JSONResponse:
+    result_dict = await UserService(auth).start_import_job(redis=redis, file=file, update_support=True)
+    return SuccessResponse(data=result_dict, msg="导入任务已提交")
+
+@UserRouter.get(
+    "/import/job/{job_id}",
+    summary="查询后台导入用户任务进度",
+    response_model=ResponseSchema[UserImportJobSchema],
+)
+async def get_user_import_job_controller(
+    job_id: Annotated[str, Path(description="任务ID")],
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_system:user:import"]))],
+    redis: Annotated[Redis, Depends(redis_getter)],
+) -> JSONResponse:
+    result_dict = await UserService(auth).get_import_job(redis=redis, job_id=job_id)
+    return SuccessResponse(data=result_dict, msg="获取成功")
@@ -1,11 +1,14 @@
 from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Row, delete, insert, select, update
 
 from app.api.v1.module_system.position.crud import PositionCRUD
 from app.api.v1.module_system.role.crud import RoleCRUD
 from app.core.base_crud import CRUDBase
 from app.core.base_schema import AuthSchema
 
-from .model import UserModel
+from .model import UserModel, UserPositionsModel, UserRolesModel
 from .schema import (
     UserCreateSchema,
     UserUpdateSchema,
@@ -89,3 +92,86 @@ class UserCRUD(CRUDBase[UserModel, UserCreateSchema, UserUpdateSchema]):
     async def forget_password(self, id: int, password_hash: str) -> UserModel:
         """重置密码（与 change_password 逻辑相同）"""
         return await self.change_password(id=id, password_hash=password_hash)
+
+    async def get_by_usernames(self, usernames: list[str], tenant_id: int) -> dict[str, Row]:
+        """
+        按账号批量查询租户内已有用户（含已删除用户，唯一约束同样覆盖已删除记录）
+
+        参数:
+        - usernames (list[str]): 账号列表
+        - tenant_id (int): 租户ID
+
+        返回:
+        - dict[str, Row]: 账号 -> (id, username, is_superuser, is_deleted)
+        """
+        if not usernames:
+            return {}
+        sql = select(UserModel.id, UserModel.username, UserModel.is_superuser, UserModel.is_deleted).where(
+            UserModel.tenant_id == tenant_id,
+            UserModel.username.in_(usernames),
+        )
+        result = await self.db.execute(sql)
+        return {row.username: row for row in result.all()}
+
+    async def bulk_create(self, rows: list[dict[str, Any]], tenant_id: int) -> dict[str, int]:
+        """
+        多行插入用户（不走 ORM 对象，不触发 refresh）
+
+        数据库支持 executemany + RETURNING 时一次取回主键，否则插入后按账号回查。
+
+        参数:
+        - rows (list[dict[str, Any]]): 用户字段列表（需包含 tenant_id 等全部字段，键一致）
+        - tenant_id (int): 租户ID
+
+        返回:
+        - dict[str, int]: 账号 -> 用户ID
+        """
+        if not rows:
+            return {}
+        if self.db.get_bind().dialect.insert_executemany_returning:
+            result = await self.db.execute(insert(UserModel).returning(UserModel.id, UserModel.username), rows)
+            return {row.username: row.id for row in result.all()}
+        await self.db.execute(insert(UserModel), rows)
+        created = await self.get_by_usernames([row["username"] for row in rows], tenant_id)
+        return {username: row.id for username, row in created.items()}
+
+    async def bulk_update(self, rows: list[dict[str, Any]]) -> None:
+        """
+        按主键批量更新用户（每行需包含 id），统一填充更新时间与更新者
+
+        参数:
+        - rows (list[dict[str, Any]]): 用户字段列表
+        """
+        if not rows:
+            return
+        # 按主键批量 UPDATE 不经过 ORM 对象，不会触发 updated_time 的 onupdate 与 CRUDBase 的审计字段填充
+        audit: dict[str, Any] = {"updated_time": datetime.now()}
+        if self.auth and self.auth.user:
+            audit["updated_id"] = self.auth.user.id
+        await self.db.execute(update(UserModel), [{**row, **audit} for row in rows])
+
+    async def bulk_set_user_roles(self, mapping: dict[int, list[int]]) -> None:
+        """
+        批量覆盖用户角色（先删后插，每种操作一条语句）
+
+        参数:
+        - mapping (dict[int, list[int]]): 用户ID -> 角色ID列表
+        """
+        await self._bulk_set_relation(UserRolesModel, "role_id", mapping)
+
+    async def bulk_set_user_positions(self, mapping: dict[int, list[int]]) -> None:
+        """
+        批量覆盖用户岗位（先删后插，每种操作一条语句）
+
+        参数:
+        - mapping (dict[int, list[int]]): 用户ID -> 岗位ID列表
+        """
+        await self._bulk_set_relation(UserPositionsModel, "position_id", mapping)
+
+    async def _bulk_set_relation(self, model: type[UserRolesModel | UserPositionsModel], column: str, mapping: dict[int, list[int]]) -> None:
+        if not mapping:
+            return
+        await self.db.execute(delete(model).where(model.user_id.in_(list(mapping))))
+        rows = [{"user_id": user_id, column: ref_id} for user_id, ref_ids in mapping.items() for ref_id in dict.fromkeys(ref_ids)]
+        if rows:
+            await self.db.execute(insert(model), rows)
@@ -0,0 +1,216 @@
+"""
+user/import_helper.py — 用户批量导入：分块读取与向量化校验
+
+导入文件按块读取（xlsx 使用 openpyxl 只读模式流式解析，csv 使用 pandas chunksize），
+每块在 DataFrame 上一次性完成必填、格式、枚举与重复校验，不再逐行构造 Pydantic 模型。
+数据库相关的处理（存在性预取、批量写入）由 UserService 完成。
+"""
+
+import io
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from app.core.exceptions import CustomException
+from app.core.validator import EMAIL_REGEX, MOBILE_REGEX, USERNAME_REGEX
+
+# 必填列：表头 -> 字段
+IMPORT_HEADERS = {
+    "部门编号": "dept_id",
+    "账号": "username",
+    "昵称": "name",
+    "邮箱": "email",
+    "手机号": "mobile",
+    "性别": "gender",
+    "状态": "status",
+}
+# 可选列：多个编号以逗号分隔
+OPTIONAL_HEADERS = {
+    "角色编号": "role_ids",
+    "岗位编号": "position_ids",
+}
+IMPORT_CHUNK_SIZE = 1000
+# 逐行错误最多保留条数，避免超大文件撑爆响应 / Redis
+MAX_ERROR_MESSAGES = 500
+
+_GENDER_MAP = {"男": "0", "女": "1", "未知": "2", "0": "0", "1": "1", "2": "2"}
+_STATUS_MAP = {"正常": 0, "停用": 1, "0": 0, "1": 1}
+
+
+@dataclass
+class ImportChunk:
+    """一块通过校验的数据（索引为 Excel 行号）与该块的逐行错误"""
+
+    rows: pd.DataFrame
+    errors: list[str] = field(default_factory=list)
+
+
+def estimate_rows(contents: bytes, filename: str | None) -> int:
+    """
+    估算数据行数（用于进度展示，不保证精确）
+
+    参数:
+    - contents (bytes): 文件内容
+    - filename (str | None): 文件名
+
+    返回:
+    - int: 数据行数（不含表头）
+    """
+    if _is_csv(filename):
+        return max(contents.count(b"\n") - 1, 0)
+    try:
+        wb = load_workbook(io.BytesIO(contents), read_only=True, data_only=True)
+        try:
+            return max((wb.worksheets[0].max_row or 1) - 1, 0)
+        finally:
+            wb.close()
+    except Exception:
+        return 0
+
+
+def iter_chunks(contents: bytes, filename: str | None, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    分块读取导入文件，列名已映射为字段名，索引为 Excel 行号（表头为第 1 行）
+
+    参数:
+    - contents (bytes): 文件内容
+    - filename (str | None): 文件名
+    - chunk_size (int): 每块行数
+
+    返回:
+    - Iterator[pd.DataFrame]: 数据块
+    """
+    if _is_csv(filename):
+        raw_chunks = pd.read_csv(io.BytesIO(contents), dtype=str, keep_default_na=False, chunksize=chunk_size)
+    else:
+        raw_chunks = _iter_xlsx(contents, chunk_size)
+
+    start = 2
+    for df in raw_chunks:
+        if start == 2:
+            _check_headers(df.columns)
+        df = df.rename(columns={**IMPORT_HEADERS, **OPTIONAL_HEADERS})
+        df.index = pd.RangeIndex(start, start + len(df))
+        start += len(df)
+        yield df
+
+
+def validate_chunk(df: pd.DataFrame, seen: set[str]) -> ImportChunk:
+    """
+    向量化校验一块数据，返回通过校验并规范化后的行（dept_id/status 为整数，gender 为 0/1/2）
+
+    参数:
+    - df (pd.DataFrame): 原始数据块
+    - seen (set[str]): 之前各块已出现的账号（用于跨块查重，会被更新）
+
+    返回:
+    - ImportChunk: 通过校验的数据与逐行错误
+    """
+    username = _text(df["username"])
+    name = _text(df["name"])
+    email = _text(df["email"])
+    mobile = _text(df["mobile"])
+    gender_raw = _text(df["gender"])
+    status_raw = _text(df["status"])
+    dept_id = pd.to_numeric(_text(df["dept_id"]), errors="coerce")
+    gender = gender_raw.map(_GENDER_MAP)
+    status = status_raw.map(_STATUS_MAP)
+
+    # 按优先级排列，每行只报告第一个错误
+    checks: list[tuple[pd.Series, str | pd.Series]] = [
+        (username.eq(""), "账号不能为空"),
+        (~username.str.match(USERNAME_REGEX), "账号需以字母开头，2-32 位，仅允许字母、数字、_ . -"),
+        (username.duplicated() | username.isin(seen), "账号 " + username + " 在导入文件中重复"),
+        (name.eq(""), "昵称不能为空"),
+        (name.str.len().gt(32), "昵称长度不能超过 32 个字符"),
+        (dept_id.isna() | dept_id.ne(dept_id.round()), "部门编号无效"),
+        (mobile.ne("") & ~mobile.str.match(MOBILE_REGEX), "手机号格式不正确"),
+        (email.ne("") & (email.str.len().gt(64) | ~email.str.match(EMAIL_REGEX)), "邮箱地址格式不正确"),
+        (gender_raw.ne("") & gender.isna(), "性别仅支持 男、女、未知"),
+        (status_raw.ne("") & status.isna(), "状态仅支持 正常、停用"),
+    ]
+    role_ids, role_bad = _parse_ids(df, "role_ids")
+    position_ids, position_bad = _parse_ids(df, "position_ids")
+    checks += [(role_bad, "角色编号格式不正确"), (position_bad, "岗位编号格式不正确")]
+
+    message = pd.Series("", index=df.index, dtype=object)
+    for mask, text in reversed(checks):
+        mask = mask.fillna(False).astype(bool)
+        message = message.mask(mask, text[mask] if isinstance(text, pd.Series) else text)
+    invalid = message.ne("")
+    seen.update(username[~invalid & username.ne("")])
+
+    rows = pd.DataFrame(
+        {
+            "username": username,
+            "name": name,
+            "email": email.replace("", None),
+            "mobile": mobile.replace("", None),
+            "gender": gender.fillna("2"),
+            "status": status.fillna(0),
+            "dept_id": dept_id,
+            "role_ids": role_ids,
+            "position_ids": position_ids,
+        }
+    )[~invalid]
+    rows["dept_id"] = rows["dept_id"].astype(int)
+    rows["status"] = rows["status"].astype(int)
+    errors = [f"第{row}行: {msg}" for row, msg in message[invalid].items()]
+    return ImportChunk(rows=rows, errors=errors)
+
+
+def _is_csv(filename: str | None) -> bool:
+    return bool(filename) and filename.lower().endswith(".csv")
+
+
+def _iter_xlsx(contents: bytes, chunk_size: int) -> Iterator[pd.DataFrame]:
+    try:
+        wb = load_workbook(io.BytesIO(contents), read_only=True, data_only=True)
+    except Exception:
+        # 非 xlsx（如旧版 xls）退回 pandas 整表读取，再按块切分
+        df = pd.read_excel(io.BytesIO(contents), dtype=str)
+        for i in range(0, max(len(df), 1), chunk_size):
+            yield df.iloc[i : i + chunk_size]
+        return
+
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise CustomException(msg="导入文件为空")
+        columns = [str(h).strip() if h is not None else "" for h in header]
+        batch: list[tuple] = []
+        for row in rows:
+            if all(v is None or v == "" for v in row):
+                continue
+            batch.append((*row[: len(columns)], *([None] * (len(columns) - len(row)))))
+            if len(batch) >= chunk_size:
+                yield pd.DataFrame(batch, columns=columns, dtype=object)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns, dtype=object)
+    finally:
+        wb.close()
+
+
+def _check_headers(columns: pd.Index) -> None:
+    missing = [header for header in IMPORT_HEADERS if header not in columns]
+    if missing:
+        raise CustomException(msg=f"导入文件缺少必要的列: {', '.join(missing)}")
+
+
+def _text(series: pd.Series) -> pd.Series:
+    text = series.astype("string").str.strip().fillna("")
+    # Excel 数字单元格（如手机号、部门编号）可能被读成浮点，去掉多余的 .0
+    return text.str.replace(r"^(\d+)\.0$", r"\1", regex=True).astype(object)
+
+
+def _parse_ids(df: pd.DataFrame, column: str) -> tuple[pd.Series, pd.Series]:
+    if column not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object), pd.Series(False, index=df.index)
+    text = _text(df[column]).str.replace("，", ",", regex=False).str.replace(" ", "", regex=False)
+    bad = text.ne("") & ~text.str.fullmatch(r"\d+(,\d+)*")
+    ids = text.where(~bad & text.ne(""), None).map(lambda v: [int(x) for x in v.split(",")] if v else None)
+    return ids, bad
@@ -330,3 +330,19 @@ class UserQueryParam(BaseQueryParam, UserByQueryParam, TenantByQueryParam):
             self.dept_id = (QueueEnum.eq.value, self.dept_id)
         if self.status:
             self.status = (QueueEnum.eq.value, self.status)
+
+
+class UserImportJobSchema(BaseModel):
+    """用户导入任务进度"""
+
+    job_id: str | None = Field(default=None, description="任务ID（同步导入时为空）")
+    status: str = Field(default="pending", description="状态(pending:排队 running:导入中 success:完成 failed:失败)")
+    total: int = Field(default=0, description="预计总行数")
+    processed: int = Field(default=0, description="已处理行数")
+    created: int = Field(default=0, description="新增数")
+    updated: int = Field(default=0, description="更新数")
+    failed: int = Field(default=0, description="失败数")
+    errors: list[str] = Field(default_factory=list, description="逐行错误信息（最多保留前 500 条）")
+    msg: str | None = Field(default=None, description="任务级错误信息")
+    tenant_id: int | None = Field(default=None, description="发起任务的租户ID")
+    created_id: int | None = Field(default=None, description="发起任务的用户ID")
@@ -1,36 +1,69 @@
-import io
+import asyncio
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from typing import Any
 
 import pandas as pd
 from fastapi import UploadFile
+from redis.asyncio.client import Redis
 
-from app.api.v1.module_platform.menu.crud import MenuCRUD
-from app.api.v1.module_platform.menu.schema import MenuOutSchema
+from app.api.v1.module_platform.menu.service import MenuService
 from app.api.v1.module_platform.package.service import PackageService
 from app.api.v1.module_platform.tenant.service import TenantService
 from app.api.v1.module_system.dept.crud import DeptCRUD
 from app.api.v1.module_system.position.crud import PositionCRUD
 from app.api.v1.module_system.role.crud import RoleCRUD
+from app.common.enums import RedisInitKeyConfig
+from app.core import principal, sql_stats
 from app.core.base_schema import AuthSchema, BatchSetAvailable
+from app.core.database import async_db_session
 from app.core.exceptions import CustomException
+from app.core.exporter import stream_rows
 from app.core.logger import logger
-from app.utils.common_util import traversal_to_tree
+from app.core.redis_crud import RedisCURD
 from app.utils.excel_util import ExcelUtil
 from app.utils.hash_bcrpy_util import PwdUtil
 
 from .crud import UserCRUD
+from .import_helper import (
+    IMPORT_HEADERS,
+    MAX_ERROR_MESSAGES,
+    OPTIONAL_HEADERS,
+    estimate_rows,
+    iter_chunks,
+    validate_chunk,
+)
+from .model import UserModel
 from .schema import (
     CurrentUserUpdateSchema,
     ResetPasswordSchema,
     UserChangePasswordSchema,
     UserCreateSchema,
     UserForgetPasswordSchema,
+    UserImportJobSchema,
     UserOutSchema,
     UserQueryParam,
     UserRegisterSchema,
     UserUpdateSchema,
 )
 
+_IMPORT_DEFAULT_PASSWORD = "123456"
+# 导入任务进度保留时间（秒）
+_IMPORT_JOB_EXPIRE = 60 * 60 * 24
+# 持有后台导入任务的引用，避免被垃圾回收
+_IMPORT_TASKS: set[asyncio.Task] = set()
+
+
+def _collect_ids(column: pd.Series) -> list[int]:
+    return sorted({ref for ids in column if isinstance(ids, list) for ref in ids})
+
+
+def _append_errors(progress: UserImportJobSchema, errors: list[str]) -> None:
+    room = MAX_ERROR_MESSAGES - len(progress.errors)
+    if room > 0:
+        progress.errors.extend(errors[:room])
+
 
 class UserService:
     """用户管理服务"""
@@ -87,7 +120,7 @@ class UserService:
         await TenantService(self.auth).check_quota(self.auth.tenant_id, "user")
 
         if data.password:
-            data.password = PwdUtil.hash_password(password=data.password)
+            data.password = await PwdUtil.hash_password_async(password=data.password)
         user_dict = data.model_dump(exclude_unset=True, exclude={"role_ids", "position_ids"})
         new_user = await UserCRUD(self.auth).create(data=user_dict)
         if data.role_ids and len(data.role_ids) > 0:
@@ -140,6 +173,7 @@ class UserService:
                 raise CustomException(msg="更新失败，部分岗位已被禁用")
             await UserCRUD(self.auth).set_user_positions(user_ids=[id], position_ids=data.position_ids)
 
+        await principal.invalidate_users(self.auth.db, [id])
         return UserOutSchema.model_validate(new_user)
 
     async def delete(self, ids: list[int]) -> None:
@@ -161,6 +195,7 @@ class UserService:
         await UserCRUD(self.auth).set_user_roles(user_ids=ids, role_ids=[])
         await UserCRUD(self.auth).set_user_positions(user_ids=ids, position_ids=[])
         await UserCRUD(self.auth).delete(ids=ids)
+        await principal.invalidate_users(self.auth.db, ids)
 
     async def current_info(self) -> UserOutSchema:
         if not self.auth.user or not self.auth.user.id:
@@ -170,13 +205,9 @@ class UserService:
         if user and user.dept:
             user_dict.dept_name = user.dept.name
 
-        _pc_only = {"client": "pc"}
+        snapshot = await MenuService(self.auth).tree_snapshot()
         if self.auth.user and self.auth.user.is_superuser:
-            menu_all = await MenuCRUD(self.auth).tree_list(
-                search={"type": ("in", [1, 2, 3, 4]), "status": 0, **_pc_only},
-                order_by=[{"order": "asc"}],
-            )
-            menus = [MenuOutSchema.model_validate(menu) for menu in menu_all]
+            user_dict.menus = snapshot.select(lambda row: row["type"] in (1, 2, 3, 4) and row["status"] == 0 and row["client"] == "pc")
         else:
             menu_ids = {menu.id for role in self.auth.user.roles or [] for menu in role.menus if menu.status == 0 and getattr(menu, "client", "pc") == "pc"}
 
@@ -185,18 +216,7 @@ class UserService:
                 allowed_set = set(allowed_ids)
                 menu_ids = menu_ids & allowed_set
 
-            menus = (
-                [
-                    MenuOutSchema.model_validate(menu)
-                    for menu in await MenuCRUD(self.auth).tree_list(
-                        search={"id": ("in", list(menu_ids)), **_pc_only},
-                        order_by=[{"order": "asc"}],
-                    )
-                ]
-                if menu_ids
-                else []
-            )
-        user_dict.menus = traversal_to_tree([menu.model_dump() for menu in menus])
+            user_dict.menus = snapshot.select(lambda row: row["id"] in menu_ids and row["client"] == "pc")
         return user_dict
 
     async def update_current_info(self, data: CurrentUserUpdateSchema) -> UserOutSchema:
@@ -217,6 +237,7 @@ class UserService:
                 raise CustomException(msg="该数据已存在")
         user_update_data = UserUpdateSchema(**data.model_dump())
         new_user = await UserCRUD(self.auth).update(id=self.auth.user.id, data=user_update_data)
+        await principal.invalidate_users(self.auth.db, [self.auth.user.id])
         return UserOutSchema.model_validate(new_user)
 
     async def set_available(self, data: BatchSetAvailable) -> None:
@@ -225,6 +246,7 @@ class UserService:
             if user.is_superuser:
                 raise CustomException(msg="超级管理员状态不能修改")
         await UserCRUD(self.auth).set(ids=data.ids, status=data.status)
+        await principal.invalidate_users(self.auth.db, data.ids)
 
     async def change_password(self, data: UserChangePasswordSchema) -> UserOutSchema:
         if not self.auth.user or not self.auth.user.id:
@@ -235,10 +257,10 @@ class UserService:
         user = await UserCRUD(self.auth).get(id=self.auth.user.id)
         if not user:
             raise CustomException(msg="该数据不存在")
-        if not PwdUtil.verify_password(plain_password=data.old_password, password_hash=user.password):
+        if not await PwdUtil.verify_password_async(plain_password=data.old_password, password_hash=user.password):
             raise CustomException(msg="原密码输入错误")
 
-        new_password_hash = PwdUtil.hash_password(password=data.new_password)
+        new_password_hash = await PwdUtil.hash_password_async(password=data.new_password)
         new_user = await UserCRUD(self.auth).change_password(id=user.id, password_hash=new_password_hash)
         return UserOutSchema.model_validate(new_user)
 
@@ -253,7 +275,7 @@ class UserService:
         if user.is_superuser:
             raise CustomException(msg="超级管理员密码不能重置")
 
-        new_password_hash = PwdUtil.hash_password(password=data.password)
+        new_password_hash = await PwdUtil.hash_password_async(password=data.password)
         new_user = await UserCRUD(self.auth).change_password(id=data.id, password_hash=new_password_hash)
         return UserOutSchema.model_validate(new_user)
 
@@ -262,7 +284,7 @@ class UserService:
         if username_ok:
             raise CustomException(msg="该数据已存在")
 
-        data.password = PwdUtil.hash_password(password=data.password)
+        data.password = await PwdUtil.hash_password_async(password=data.password)
         data.name = data.username
         create_dict = data.model_dump(exclude_unset=True, exclude={"role_ids", "position_ids"})
 
@@ -287,115 +309,288 @@ class UserService:
         if data.mobile and user.mobile != data.mobile:
             raise CustomException(msg="手机号不匹配")
 
-        new_password_hash = PwdUtil.hash_password(password=data.new_password)
+        new_password_hash = await PwdUtil.hash_password_async(password=data.new_password)
         new_user = await UserCRUD(self.auth).forget_password(id=user.id, password_hash=new_password_hash)
         return UserOutSchema.model_validate(new_user)
 
     async def batch_import(self, file: UploadFile, update_support: bool = False) -> str:
-        header_dict = {
-            "部门编号": "dept_id",
-            "账号": "username",
-            "昵称": "name",
-            "邮箱": "email",
-            "手机号": "mobile",
-            "性别": "gender",
-            "状态": "status",
-        }
-
-        try:
-            contents = await file.read()
-            df = pd.read_excel(io.BytesIO(contents))
-            await file.close()
-
-            if df.empty:
-                raise CustomException(msg="导入文件为空")
-
-            missing_headers = [header for header in header_dict if header not in df.columns]
-            if missing_headers:
-                raise CustomException(msg=f"导入文件缺少必要的列: {', '.join(missing_headers)}")
+        """
+        同步导入用户（适合小文件）：在请求事务内逐块导入，每块一个保存点。
 
-            df.rename(columns=header_dict, inplace=True)
+        参数:
+        - file (UploadFile): 导入文件（xlsx / csv）
+        - update_support (bool): 账号已存在时是否更新
 
-            required_fields = ["username", "name", "dept_id"]
-            errors = []
-            for field in required_fields:
-                if df[field].isnull().any():
-                    missing_count = df[field].isnull().sum()
-                    errors.append(f"字段'{field}'有{missing_count}行缺少数据")
+        返回:
+        - str: 导入结果描述
+        """
+        contents = await file.read()
+        filename = file.filename
+        await file.close()
 
-            if errors:
-                raise CustomException(msg="\n".join(errors))
+        progress = UserImportJobSchema(status="running")
+        try:
+            await self._run_import(contents, filename, update_support, progress, self._savepoint_scope)
+        except CustomException:
+            raise
+        except Exception as e:
+            logger.error(f"批量导入用户失败: {e!s}")
+            raise CustomException(msg=f"导入失败: {e!s}") from e
+        return self._import_summary(progress)
+
+    async def start_import_job(self, redis: Redis, file: UploadFile, update_support: bool = False) -> UserImportJobSchema:
+        """
+        提交后台导入任务：每块独立事务提交，进度写入 Redis 供轮询。
+
+        参数:
+        - redis (Redis): Redis 连接
+        - file (UploadFile): 导入文件（xlsx / csv）
+        - update_support (bool): 账号已存在时是否更新
+
+        返回:
+        - UserImportJobSchema: 初始任务进度
+        """
+        contents = await file.read()
+        filename = file.filename
+        await file.close()
+
+        progress = UserImportJobSchema(
+            job_id=uuid.uuid4().hex,
+            total=await asyncio.to_thread(estimate_rows, contents, filename),
+            tenant_id=self._import_tenant_id(),
+            created_id=self.auth.user.id if self.auth.user else None,
+        )
+        await self._save_import_job(redis, progress)
+        # 请求级会话随请求结束关闭，后台任务只保留用户与租户信息
+        job_service = UserService(self.auth.model_copy(update={"db": None}))
+        # 后台任务在不带请求 SQL 统计的上下文中运行，其语句不计入本请求
+        task = asyncio.create_task(
+            job_service._run_import_job(redis, contents, filename, update_support, progress),
+            name=f"user-import-{progress.job_id}",
+            context=sql_stats.detached_context(),
+        )
+        _IMPORT_TASKS.add(task)
+        task.add_done_callback(_IMPORT_TASKS.discard)
+        return progress
+
+    async def get_import_job(self, redis: Redis, job_id: str) -> UserImportJobSchema:
+        """
+        查询后台导入任务进度（仅发起任务的租户可见）。
+
+        参数:
+        - redis (Redis): Redis 连接
+        - job_id (str): 任务ID
+
+        返回:
+        - UserImportJobSchema: 任务进度
+        """
+        raw = await RedisCURD(redis).get(self._import_job_key(job_id))
+        progress = UserImportJobSchema.model_validate_json(raw) if raw else None
+        is_platform = bool(self.auth.user and self.auth.user.is_superuser)
+        if progress is None or (not is_platform and progress.tenant_id != self._import_tenant_id()):
+            raise CustomException(msg="导入任务不存在或已过期")
+        return progress
+
+    async def _run_import_job(
+        self,
+        redis: Redis,
+        contents: bytes,
+        filename: str | None,
+        update_support: bool,
+        progress: UserImportJobSchema,
+    ) -> None:
+        progress.status = "running"
+        await self._save_import_job(redis, progress)
+
+        async def report(progress: UserImportJobSchema) -> None:
+            await self._save_import_job(redis, progress)
 
-            success_count = 0
-            error_msgs = []
+        try:
+            await self._run_import(contents, filename, update_support, progress, self._transaction_scope, report)
+            progress.status = "success"
+        except Exception as e:
+            logger.error(f"后台导入用户失败[{progress.job_id}]: {e!s}")
+            progress.status = "failed"
+            progress.msg = str(e)
+        await self._save_import_job(redis, progress)
 
-            for i, (_, row) in enumerate(df.iterrows(), start=2):
+    async def _run_import(
+        self,
+        contents: bytes,
+        filename: str | None,
+        update_support: bool,
+        progress: UserImportJobSchema,
+        scope: Callable[[], AbstractAsyncContextManager[AuthSchema]],
+        report: Callable[[UserImportJobSchema], Awaitable[None]] | None = None,
+    ) -> None:
+        # 默认密码只哈希一次，整个导入共用
+        password_hash = await PwdUtil.hash_password_async(password=_IMPORT_DEFAULT_PASSWORD)
+        tenant_id = self._import_tenant_id()
+        seen: set[str] = set()
+        chunks = iter_chunks(contents, filename)
+        empty = True
+
+        # 文件解析放到线程中执行，避免大文件阻塞事件循环
+        while (df := await asyncio.to_thread(next, chunks, None)) is not None:
+            empty = False
+            chunk = validate_chunk(df, seen)
+            errors = list(chunk.errors)
+            if not chunk.rows.empty:
                 try:
-                    username = str(row["username"]).strip() if pd.notna(row["username"]) else ""
-                    name = str(row["name"]).strip() if pd.notna(row["name"]) else ""
-                    if not username:
-                        error_msgs.append(f"第{i}行: 账号不能为空")
-                        continue
-                    if not name:
-                        error_msgs.append(f"第{i}行: 昵称不能为空")
-                        continue
-
-                    user_data = {
-                        "username": username,
-                        "name": name,
-                        "email": str(row["email"]).strip() if pd.notna(row["email"]) else None,
-                        "mobile": str(row["mobile"]).strip() if pd.notna(row["mobile"]) else None,
-                        "gender": str(row["gender"]).strip() if pd.notna(row["gender"]) else "1",
-                        "status": 0 if str(row["status"]).strip() == "正常" else 1,
-                        "dept_id": int(row["dept_id"]),
-                        "password": PwdUtil.hash_password(password="123456"),
+                    async with scope() as auth:
+                        created, updated, row_errors = await UserService(auth)._import_chunk(
+                            chunk.rows, tenant_id, password_hash, update_support
+                        )
+                    progress.created += created
+                    progress.updated += updated
+                    errors += row_errors
+                except Exception as e:
+                    logger.error(f"导入第{df.index[0]}-{df.index[-1]}行失败: {e!s}")
+                    progress.failed += len(chunk.rows)
+                    _append_errors(progress, [f"第{df.index[0]}-{df.index[-1]}行: 导入失败 {e!s}"])
+            progress.failed += len(errors)
+            _append_errors(progress, errors)
+            progress.processed += len(df)
+            progress.total = max(progress.total, progress.processed)
+            if report:
+                await report(progress)
+
+        if empty:
+            raise CustomException(msg="导入文件为空")
+
+    async def _import_chunk(
+        self,
+        rows: pd.DataFrame,
+        tenant_id: int,
+        password_hash: str,
+        update_support: bool,
+    ) -> tuple[int, int, list[str]]:
+        """
+        导入一块已校验的数据：每类引用一次 IN 查询，新增 / 更新 / 关联各一次批量写入。
+
+        参数:
+        - rows (pd.DataFrame): 已校验的数据（索引为 Excel 行号）
+        - tenant_id (int): 导入目标租户
+        - password_hash (str): 默认密码哈希
+        - update_support (bool): 账号已存在时是否更新
+
+        返回:
+        - tuple[int, int, list[str]]: (新增数, 更新数, 逐行错误)
+        """
+        user_crud = UserCRUD(self.auth)
+        existing = await user_crud.get_by_usernames(rows["username"].tolist(), tenant_id)
+        dept_ids = await DeptCRUD(self.auth).get_ids(search={"id": ("in", rows["dept_id"].unique().tolist())})
+        role_refs = _collect_ids(rows["role_ids"])
+        role_ids = await RoleCRUD(self.auth).get_ids(search={"id": ("in", role_refs)}) if role_refs else set()
+        position_refs = _collect_ids(rows["position_ids"])
+        position_ids = await PositionCRUD(self.auth).get_ids(search={"id": ("in", position_refs)}) if position_refs else set()
+        operator_id = self.auth.user.id if self.auth.user else None
+
+        errors: list[str] = []
+        creates: list[dict[str, Any]] = []
+        updates: list[dict[str, Any]] = []
+        new_relations: dict[str, tuple[list[int] | None, list[int] | None]] = {}
+        role_map: dict[int, list[int]] = {}
+        position_map: dict[int, list[int]] = {}
+
+        for row in rows.itertuples():
+            roles = row.role_ids if isinstance(row.role_ids, list) else None
+            positions = row.position_ids if isinstance(row.position_ids, list) else None
+            if row.dept_id not in dept_ids:
+                errors.append(f"第{row.Index}行: 部门编号 {row.dept_id} 不存在")
+                continue
+            if roles and (missing := [r for r in roles if r not in role_ids]):
+                errors.append(f"第{row.Index}行: 角色编号 {','.join(map(str, missing))} 不存在")
+                continue
+            if positions and (missing := [p for p in positions if p not in position_ids]):
+                errors.append(f"第{row.Index}行: 岗位编号 {','.join(map(str, missing))} 不存在")
+                continue
+
+            data = {
+                "name": row.name,
+                "email": row.email,
+                "mobile": row.mobile,
+                "gender": row.gender,
+                "status": row.status,
+                "dept_id": row.dept_id,
+                "updated_id": operator_id,
+            }
+            user = existing.get(row.username)
+            if user is None:
+                creates.append(
+                    {
+                        **data,
+                        "username": row.username,
+                        "password": password_hash,
+                        "tenant_id": tenant_id,
+                        "created_id": operator_id,
                     }
+                )
+                new_relations[row.username] = (roles, positions)
+            elif user.is_deleted:
+                errors.append(f"第{row.Index}行: 用户 {row.username} 已被删除，无法导入")
+            elif user.is_superuser:
+                errors.append(f"第{row.Index}行: 超级管理员不允许修改")
+            elif not update_support:
+                errors.append(f"第{row.Index}行: 用户 {row.username} 已存在")
+            else:
+                updates.append({"id": user.id, **data})
+                if roles is not None:
+                    role_map[user.id] = roles
+                if positions is not None:
+                    position_map[user.id] = positions
+
+        if creates:
+            await TenantService(self.auth).check_quota(tenant_id, "user", increment=len(creates))
+            created_ids = await user_crud.bulk_create(creates, tenant_id)
+            for username, (roles, positions) in new_relations.items():
+                if roles:
+                    role_map[created_ids[username]] = roles
+                if positions:
+                    position_map[created_ids[username]] = positions
+        await user_crud.bulk_update(updates)
+        await user_crud.bulk_set_user_roles(role_map)
+        await user_crud.bulk_set_user_positions(position_map)
+        await principal.invalidate_users(self.auth.db, [row["id"] for row in updates])
+        return len(creates), len(updates), errors
+
+    @asynccontextmanager
+    async def _savepoint_scope(self) -> AsyncIterator[AuthSchema]:
+        async with self.auth.db.begin_nested():
+            yield self.auth
+
+    @asynccontextmanager
+    async def _transaction_scope(self) -> AsyncIterator[AuthSchema]:
+        async with async_db_session() as session, session.begin():
+            yield self.auth.model_copy(update={"db": session})
+
+    def _import_tenant_id(self) -> int:
+        return self.auth.tenant_id or (self.auth.user.tenant_id if self.auth.user else None) or 1
 
-                    exists_user = await UserCRUD(self.auth).get(username=user_data["username"])
-                    if exists_user:
-                        if exists_user.is_superuser:
-                            error_msgs.append(f"第{i}行: 超级管理员不允许修改")
-                            continue
-                        if update_support:
-                            user_update_data = UserUpdateSchema(**user_data)
-                            await UserCRUD(self.auth).update(id=exists_user.id, data=user_update_data)
-                            success_count += 1
-                        else:
-                            error_msgs.append(f"第{i}行: 用户 {user_data['username']} 已存在")
-                    else:
-                        user_create_schema = UserCreateSchema(**user_data)
-                        user_create_data = user_create_schema.model_dump(exclude_unset=True, exclude={"role_ids", "position_ids"})
-                        new_user = await UserCRUD(self.auth).create(data=user_create_data)
-                        if user_create_schema.role_ids and len(user_create_schema.role_ids) > 0:
-                            await UserCRUD(self.auth).set_user_roles(user_ids=[new_user.id], role_ids=user_create_schema.role_ids)
-                        if user_create_schema.position_ids and len(user_create_schema.position_ids) > 0:
-                            await UserCRUD(self.auth).set_user_positions(user_ids=[new_user.id], position_ids=user_create_schema.position_ids)
-                        success_count += 1
-
-                except Exception as e:
-                    error_msgs.append(f"第{i}行: 异常{e!s}")
-                    continue
+    @staticmethod
+    def _import_job_key(job_id: str) -> str:
+        return f"{RedisInitKeyConfig.USER_IMPORT_JOB.key}:{job_id}"
 
-            result = f"成功导入 {success_count} 条数据"
-            if error_msgs:
-                result += "\n错误信息:\n" + "\n".join(error_msgs)
-            return result
+    @staticmethod
+    async def _save_import_job(redis: Redis, progress: UserImportJobSchema) -> None:
+        await RedisCURD(redis).set(
+            UserService._import_job_key(progress.job_id),
+            progress.model_dump_json(),
+            expire=_IMPORT_JOB_EXPIRE,
+        )
 
-        except Exception as e:
-            logger.error(f"批量导入用户失败: {e!s}")
-            raise CustomException(msg=f"导入失败: {e!s}") from e
+    @staticmethod
+    def _import_summary(progress: UserImportJobSchema) -> str:
+        result = f"成功导入 {progress.created + progress.updated} 条数据"
+        if progress.errors:
+            result += "\n错误信息:\n" + "\n".join(progress.errors)
+            if progress.failed > len(progress.errors):
+                result += f"\n……其余 {progress.failed - len(progress.errors)} 条错误已省略"
+        return result
 
     @staticmethod
     def get_import_template() -> bytes:
-        header_list = [
-            "部门编号",
-            "账号",
-            "昵称",
-            "邮箱",
-            "手机号",
-            "性别",
-            "状态",
-        ]
+        header_list = [*IMPORT_HEADERS, *OPTIONAL_HEADERS]
         selector_header_list = ["性别", "状态"]
         option_list = [
             {"性别": ["男", "女", "未知"]},
@@ -407,35 +602,46 @@ class UserService:
             option_list=option_list,
         )
 
+    EXPORT_MAPPING = {
+        "id": "用户编号",
+        "avatar": "头像",
+        "username": "用户名称",
+        "name": "用户昵称",
+        "dept_name": "部门",
+        "email": "邮箱",
+        "mobile": "手机号",
+        "gender": "性别",
+        "status": "状态",
+        "is_superuser": "是否超级管理员",
+        "last_login": "最后登录时间",
+        "description": "备注",
+        "created_time": "创建时间",
+        "updated_time": "更新时间",
+        "updated_id": "更新者ID",
+    }
+
+    def export_rows(
+        self,
+        search: UserQueryParam | None = None,
+        order_by: list[dict[str, str]] | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """
+        按批读取导出数据（配合 export_response 流式输出）。
+
+        参数:
+        - search (UserQueryParam | None): 查询参数
+        - order_by (list[dict[str, str]] | None): 排序字段
+
+        返回:
+        - AsyncIterator[list[dict[str, Any]]]: 导出行批次
+        """
+        return stream_rows(self.auth, UserCRUD, self._export_row, search=vars(search) if search else None, order_by=order_by)
+
     @staticmethod
-    def export_list(user_list: list[dict[str, Any]]) -> bytes:
-        if not user_list:
-            raise CustomException(msg="没有数据可导出")
-
-        mapping_dict = {
-            "id": "用户编号",
-            "avatar": "头像",
-            "username": "用户名称",
-            "name": "用户昵称",
-            "dept_name": "部门",
-            "email": "邮箱",
-            "mobile": "手机号",
-            "gender": "性别",
-            "status": "状态",
-            "is_superuser": "是否超级管理员",
-            "last_login": "最后登录时间",
-            "description": "备注",
-            "created_time": "创建时间",
-            "updated_time": "更新时间",
-            "updated_id": "更新者ID",
-        }
-
-        data = user_list.copy()
-        for item in data:
-            item["status"] = "启用" if item.get("status") == 0 else "停用"
-            gender = item.get("gender")
-            item["gender"] = "男" if gender == "1" else ("女" if gender == "2" else "未知")
-            item["is_superuser"] = "是" if item.get("is_superuser") else "否"
-            item["creator"] = item.get("created_by", {}).get("name", "未知") if isinstance(item.get("created_by"), dict) else "未知"
-
-        return ExcelUtil.export_list2excel(list_data=data, mapping_dict=mapping_dict)
+    def _export_row(user: UserModel) -> dict[str, Any]:
+        row = {key: getattr(user, key, None) for key in UserService.EXPORT_MAPPING}
+        row["dept_name"] = user.dept.name if user.dept else None
+        row["status"] = "启用" if user.status == 0 else "停用"
+        row["gender"] = {"0": "男", "1": "女"}.get(user.gender or "", "未知")
+        row["is_superuser"] = "是" if user.is_superuser else "否"
+        return row
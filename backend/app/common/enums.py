@@ -54,6 +54,17 @@ class RedisInitKeyConfig(Enum):
         "remark": "定时任务初始化锁",
     }
     AI_MODEL_CONFIG = {"key": "ai_model_config", "remark": "用户AI模型配置"}
+    AUTH_PRINCIPAL_VERSION = {"key": "auth_principal_version", "remark": "认证主体缓存版本"}
+    CACHE_INVALIDATE = {"key": "cache_invalidate", "remark": "本地缓存失效广播频道"}
+    ONLINE_SESSION_INDEX = {"key": "online_session_index", "remark": "在线会话登记(按登录时间排序)"}
+    ONLINE_SESSION_DATA = {"key": "online_session_data", "remark": "在线会话登记数据"}
+    ONLINE_SESSION_EXPIRE = {"key": "online_session_expire", "remark": "在线会话登记过期时间"}
+    USER_IMPORT_JOB = {"key": "user_import_job", "remark": "用户导入任务进度"}
+    SCHEDULER_LEADER = {"key": "scheduler_leader", "remark": "调度器主节点租约"}
+    SCHEDULER_CONTROL = {"key": "scheduler_control", "remark": "调度器控制广播频道"}
+    SCHEDULER_PAUSED = {"key": "scheduler_paused", "remark": "调度器集群暂停标记"}
+    TASK_QUEUE = {"key": "task_queue", "remark": "定时任务分片执行队列"}
+    TASK_RESULT = {"key": "task_result", "remark": "定时任务执行结果频道"}
 
     @property
     def key(self) -> str:
@@ -112,6 +123,15 @@ class QueueEnum(str, Enum):
     le = "<=" or "le"
 
 
+@unique
+class PageCountEnum(str, Enum):
+    """分页总数统计方式"""
+
+    exact = "exact"  # COUNT 精确统计
+    estimate = "estimate"  # 表级行数估算（PostgreSQL pg_class / MySQL information_schema），仅无筛选条件时生效，否则回退精确统计
+    none = "none"  # 不统计总数
+
+
 class PermissionFilterStrategy(str, Enum):
     """
     权限过滤策略枚举
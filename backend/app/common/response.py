@@ -2,6 +2,7 @@ from collections.abc import Mapping
 from datetime import date, datetime, time
 from typing import Any
 
+import orjson
 from fastapi import status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
@@ -9,6 +10,7 @@ from pydantic import BaseModel, Field
 from starlette.background import BackgroundTask
 
 from app.common.constant import DATE_DISPLAY_FMT, DATETIME_DISPLAY_FMT, RET, TIME_DISPLAY_FMT
+from app.config.setting import settings
 
 # 裸 datetime/date/time（未走 Pydantic 的 dict 等）JSON 输出与 constant 中展示格式一致
 _JSON_DATETIME_CUSTOM_ENCODER: dict[type[Any], Any] = {
@@ -18,8 +20,50 @@ _JSON_DATETIME_CUSTOM_ENCODER: dict[type[Any], Any] = {
 }
 
 
+# datetime/date/time 交给 default 按展示格式输出；dict 的非字符串键与 json 模块一致转为字符串
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class RawJSON:
+    """已序列化的 JSON 片段（如缓存的整棵树）：快速路径原样嵌入响应，兼容路径解析后再编码"""
+
+    __slots__ = ("body",)
+
+    def __init__(self, body: bytes) -> None:
+        self.body = body
+
+
 def jsonable_response_content(content: Any) -> Any:
-    return jsonable_encoder(content, custom_encoder=_JSON_DATETIME_CUSTOM_ENCODER)
+    return jsonable_encoder(
+        content,
+        custom_encoder={**_JSON_DATETIME_CUSTOM_ENCODER, RawJSON: lambda raw: orjson.loads(raw.body)},
+    )
+
+
+def _orjson_default(obj: Any) -> Any:
+    if isinstance(obj, RawJSON):
+        return orjson.Fragment(obj.body)
+    encoder = _JSON_DATETIME_CUSTOM_ENCODER.get(type(obj))
+    if encoder is not None:
+        return encoder(obj)
+    if isinstance(obj, BaseModel):
+        # python 模式导出，普通 datetime 字段与 DateTimeStr 一样回到上面的展示格式
+        return obj.model_dump()
+    # Decimal、set、bytes 等少见类型沿用 jsonable_encoder 的规则
+    return jsonable_response_content(obj)
+
+
+def dumps_response_content(content: Any) -> bytes:
+    """
+    使用 orjson 序列化响应内容，不再经过 ResponseSchema.model_dump + jsonable_encoder 的两次深拷贝。
+
+    参数:
+    - content (Any): 响应内容（dict / list / Pydantic 模型等）。
+
+    返回:
+    - bytes: UTF-8 JSON。
+    """
+    return orjson.dumps(content, default=_orjson_default, option=_ORJSON_OPTIONS)
 
 
 class ResponseSchema[T](BaseModel):
@@ -32,7 +76,35 @@ class ResponseSchema[T](BaseModel):
     success: bool = Field(default=True, description="操作是否成功")
 
 
-class SuccessResponse(JSONResponse):
+class _UnifiedJSONResponse(JSONResponse):
+    """统一响应基类：按 fast 选择 orjson 直出或 jsonable_encoder + json 的兼容路径"""
+
+    def __init__(
+        self,
+        data: Any,
+        msg: str,
+        code: int,
+        status_code: int,
+        success: bool,
+        fast: bool | None,
+    ) -> None:
+        self.fast = settings.FAST_JSON_RESPONSE if fast is None else fast
+        if self.fast:
+            content: Any = {"code": code, "msg": msg, "data": data, "status_code": status_code, "success": success}
+        else:
+            content = jsonable_response_content(
+                ResponseSchema(code=code, msg=msg, data=data, status_code=status_code, success=success).model_dump()
+            )
+        super().__init__(content=content, status_code=status_code)
+        self.headers["Content-Type"] = "application/json; charset=utf-8"
+
+    def render(self, content: Any) -> bytes:
+        if self.fast:
+            return dumps_response_content(content)
+        return super().render(content)
+
+
+class SuccessResponse(_UnifiedJSONResponse):
     """成功响应类"""
 
     def __init__(
@@ -42,6 +114,7 @@ class SuccessResponse(JSONResponse):
         code: int = RET.OK.code,
         status_code: int = status.HTTP_200_OK,
         success: bool = True,
+        fast: bool | None = None,
     ) -> None:
         """
         初始化成功响应类
@@ -52,22 +125,15 @@ class SuccessResponse(JSONResponse):
         - code (int): 业务状态码。
         - status_code (int): HTTP 状态码。
         - success (bool): 操作是否成功。
+        - fast (bool | None): 是否使用 orjson 快速序列化，None 时取 settings.FAST_JSON_RESPONSE。
 
         返回:
         - None
         """
-        content = ResponseSchema(
-            code=code,
-            msg=msg,
-            data=data,
-            status_code=status_code,
-            success=success,
-        ).model_dump()
-        super().__init__(content=jsonable_response_content(content), status_code=status_code)
-        self.headers["Content-Type"] = "application/json; charset=utf-8"
+        super().__init__(data=data, msg=msg, code=code, status_code=status_code, success=success, fast=fast)
 
 
-class ErrorResponse(JSONResponse):
+class ErrorResponse(_UnifiedJSONResponse):
     """错误响应类"""
 
     def __init__(
@@ -77,6 +143,7 @@ class ErrorResponse(JSONResponse):
         code: int = RET.ERROR.code,
         status_code: int = status.HTTP_400_BAD_REQUEST,
         success: bool = False,
+        fast: bool | None = None,
     ) -> None:
         """
         初始化错误响应类
@@ -87,19 +154,12 @@ class ErrorResponse(JSONResponse):
         - code (int): 业务状态码。
         - status_code (int): HTTP 状态码。
         - success (bool): 操作是否成功。
+        - fast (bool | None): 是否使用 orjson 快速序列化，None 时取 settings.FAST_JSON_RESPONSE。
 
         返回:
         - None
         """
-        content = ResponseSchema(
-            code=code,
-            msg=msg,
-            data=data,
-            status_code=status_code,
-            success=success,
-        ).model_dump()
-        super().__init__(content=jsonable_response_content(content), status_code=status_code)
-        self.headers["Content-Type"] = "application/json; charset=utf-8"
+        super().__init__(data=data, msg=msg, code=code, status_code=status_code, success=success, fast=fast)
 
 
 class StreamResponse(StreamingResponse):
@@ -30,6 +30,7 @@ class Settings(BaseSettings):
     # ================================================= #
     SERVER_HOST: str = "0.0.0.0"  # 允许访问的IP地址
     SERVER_PORT: int = 8001  # 服务端口
+    FAST_JSON_RESPONSE: bool = True  # 统一响应使用 orjson 直接序列化(False 回退 jsonable_encoder + json)
 
     # ================================================= #
     # ******************* API文档配置 ****************** #
@@ -67,6 +68,10 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_SECONDS: int = 60 * 60 * 12  # refresh_token过期时间(秒)12 小时
     TOKEN_TYPE: str = "Bearer"  # token类型（RFC 6750 标准大小写）
     TOKEN_SLIDING_EXPIRE: bool = True  # 是否启用滑动过期(用户操作时自动续期)
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10000  # 认证主体进程内缓存最大用户数
+    AUTH_PRINCIPAL_CACHE_TTL: int = 300  # 认证主体进程内缓存兜底过期时间(秒)
+    PASSWORD_HASH_WORKERS: int = 4  # 密码哈希线程池大小(同时进行的 PBKDF2 计算数)
+    PASSWORD_HASH_MAX_PENDING: int = 256  # 密码哈希最大排队数，超出直接返回繁忙
 
     # 多租户中间件白名单路径（不需要租户上下文的公开接口）
     TENANT_WHITELIST_PATHS: list[str] = [
@@ -103,6 +108,10 @@ class Settings(BaseSettings):
     AUTOFLUSH: bool = False  # 是否自动刷新（映射 SQLAlchemy sessionmaker(autoflush=...)）
     AUTOFETCH: bool | None = None  # AUTOFLUSH 别名（优先级高于 AUTOFLUSH，兼容旧环境变量名）
     EXPIRE_ON_COMMIT: bool = False  # 是否在提交时过期
+    SQL_STATS_ENABLE: bool = True  # 是否统计每个请求的 SQL 条数/耗时（Server-Timing 响应头、操作日志）
+    SQL_STATS_TOP_N: int = 5  # 每个请求保留的最慢语句条数
+    SQL_SLOW_STATEMENT_MS: float = 200.0  # 单条语句超过该耗时(毫秒)时输出慢 SQL 告警
+    SQL_REPEAT_LIMIT: int = 0  # 同一请求内相同语句形态最多执行次数，超出即报错以暴露 N+1 查询（0 关闭，仅建议开发/测试环境开启）
 
     # MySQL/PostgreSQL数据库连接
     DATABASE_TYPE: Literal["mysql", "postgres", "sqlite"] = "mysql"
@@ -150,7 +159,10 @@ class Settings(BaseSettings):
     # ******************* 外部 HTTP（httpx）******************* #
     # ================================================= #
     HTTPX_DEFAULT_TIMEOUT: float = 10.0  # 对外 HTTP 请求默认超时（秒）
-    IP_LOCATION_ENABLE: bool = True  # 是否启用 IP 归属地查询（登录时对外发起 HTTP 请求）
+    IP_LOCATION_ENABLE: bool = True  # 是否启用 IP 归属地查询
+    IP_LOCATION_DB_PATH: str = "static/data/ip2region.xdb"  # 离线 IP 库(ip2region xdb 格式，需自行下载放置，仓库不附带)，文件不存在时跳过
+    IP_LOCATION_REMOTE_ENABLE: bool = False  # 离线库与缓存未命中时是否回退到在线 API（会把用户 IP 发往第三方，默认关闭）
+    IP_LOCATION_CACHE_SIZE: int = 10000  # 进程内归属地 LRU 容量
 
     # ================================================= #
     # ********************* 日志配置 ******************* #
@@ -164,6 +176,37 @@ class Settings(BaseSettings):
         "HEAD",
         "OPTIONS",
     ]  # 需要记录的请求方法
+    LOG_SINK_QUEUE_SIZE: int = 10000  # 日志写入队列容量(操作日志、登录日志各一个)
+    LOG_SINK_BATCH_SIZE: int = 200  # 日志单次批量写入最大行数
+    LOG_SINK_FLUSH_INTERVAL_MS: int = 500  # 日志批量写入最长等待时间(毫秒)
+    LOG_SINK_OVERFLOW: Literal["drop", "block", "spill"] = "spill"  # 队列满时: 丢弃 / 等待 / 写入本地文件待回放
+    LOGIN_AUDIT_AGGREGATE: bool = True  # 是否合并同一用户名+IP短时间内的重复登录失败
+    LOGIN_AUDIT_AGGREGATE_WINDOW: int = 60  # 登录失败聚合窗口(秒)
+    LOGIN_AUDIT_AGGREGATE_THRESHOLD: int = 5  # 窗口内前N次失败逐条记录，其余合并为一条带次数的记录
+
+    # ================================================= #
+    # ******************* 定时任务配置 ******************* #
+    # ================================================= #
+    TASK_CODE_CACHE_SIZE: int = 256  # 任务代码块编译结果缓存条目数(按源码内容哈希，超出按 LRU 淘汰)
+    WORKFLOW_MAX_WORKERS: int = 16  # 工作流节点共享线程池大小(所有工作流执行共用)
+    WORKFLOW_NODE_TIMEOUT: float = 300  # 工作流节点默认超时(秒)，节点 data.timeout 可单独设置
+    SCHEDULER_LEADER_ELECTION: bool = True  # 多 worker / 多节点时通过 Redis 租约选出唯一运行调度循环的进程
+    SCHEDULER_LEADER_TTL: int = 10  # 调度器主节点租约时长(秒)，主节点异常退出后最迟约此时长内完成切换
+    TASK_QUEUE_ENABLE: bool = False  # 分片执行模式: 节点任务投递到 Redis 任务队列，由 `main.py worker` 执行进程消费
+    TASK_QUEUE_CONCURRENCY: int = 4  # 每个执行进程同时执行的任务数
+    TASK_QUEUE_RESULT_TIMEOUT: int = 3600  # 调度器等待执行结果的最长时间(秒)，超时记为执行失败
+    TASK_QUEUE_CLAIM_IDLE: int = 60  # 执行进程失联多久(秒)后，其未完成的任务由其他执行进程接管
+    TASK_QUEUE_MAX_DELIVERIES: int = 3  # 同一任务最多投递次数(执行进程反复崩溃时不再重试)
+    TASK_QUEUE_MAXLEN: int = 100000  # 任务队列最大长度(近似裁剪)
+
+    # ================================================= #
+    # ******************* 监控指标配置 ******************* #
+    # ================================================= #
+    METRICS_ENABLE: bool = True  # 是否启用 Prometheus 指标(请求耗时、连接池、Redis、定时任务、缓存)
+    METRICS_PATH: str = "/metrics"  # 指标抓取路由
+    METRICS_MULTIPROC_DIR: str = ""  # 多 worker 部署时的指标共享目录(设置 PROMETHEUS_MULTIPROC_DIR)，为空表示单进程
+    METRICS_TENANT_LABEL: bool = True  # 请求耗时是否按租户区分(租户很多时建议关闭以控制时间序列数)
+    METRICS_REFRESH_INTERVAL: int = 15  # 连接池、缓存、日志队列等快照指标的刷新间隔(秒)
 
     # ================================================= #
     # ******************* Gzip压缩配置 ******************* #
@@ -224,14 +267,17 @@ class Settings(BaseSettings):
     def MIDDLEWARE_LIST(self) -> list[str | None]:
         # 中间件列表（注册时逆序叠加：下列第一项在列表中最前，最终位于最外层，优先生效）
         # 中间件执行顺序（从外到内）：
-        #   CORS → RequestLog → GZip → CorrelationId → 业务路由
+        #   CORS → Metrics → RequestLog → GZip → CorrelationId → SqlStats → Tenant → 业务路由
         # 安全响应头（X-Content-Type-Options / Referrer-Policy / Permissions-Policy / HSTS）
-        # 由前置 Nginx / 反向代理通过 add_header 设置，避免应用层 BaseHTTPMiddleware 开销。
+        # 由前置 Nginx / 反向代理通过 add_header 设置，避免应用层中间件开销。
+        # 自定义中间件均为纯 ASGI 实现（不使用 BaseHTTPMiddleware），不缓冲流式响应。
         MIDDLEWARES: list[str | None] = [
             "app.core.middlewares.CustomCORSMiddleware" if self.CORS_ORIGIN_ENABLE else None,
+            "app.core.middlewares.MetricsMiddleware" if self.METRICS_ENABLE else None,  # 请求耗时指标（含其内侧全部中间件）
             "app.core.middlewares.RequestLogMiddleware" if self.OPERATION_LOG_RECORD else None,
             "app.core.middlewares.CustomGZipMiddleware" if self.GZIP_ENABLE else None,
             "app.core.middlewares.CorrelationIdMiddleware",  # 请求上下文
+            "app.core.middlewares.SqlStatsMiddleware" if self.SQL_STATS_ENABLE else None,  # 请求级 SQL 统计（需在关联 ID 内侧）
             "app.core.middlewares.TenantMiddleware",  # 租户上下文（需 JWT）
         ]
         return MIDDLEWARES
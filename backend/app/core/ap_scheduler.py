@@ -1,7 +1,10 @@
+import asyncio
 import json
+import time
+import types
 from collections.abc import Callable
 from datetime import datetime
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from apscheduler.events import (
     EVENT_ALL,
@@ -41,25 +44,26 @@ from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from redis.asyncio import Redis
 
+from app.common.enums import RedisInitKeyConfig
 from app.config.setting import settings
+from app.core import code_cache, job_log_sink, metrics, scheduler_leader, task_queue
 from app.core.database import engine
+from app.core.job_log_sink import JOB_STATUS_PENDING
 from app.core.logger import logger
-from app.plugin.module_task.cronjob.node.model import NodeModel
 from app.utils.cron_util import CronUtil
 
-# 任务状态常量（与 JobModel.status 注释保持一致：0:待执行 1:执行中 2:成功 3:失败 4:超时 5:已取消）
-JOB_STATUS_PENDING = 0
-JOB_STATUS_RUNNING = 1
-JOB_STATUS_SUCCESS = 2
-JOB_STATUS_FAILED = 3
-JOB_STATUS_TIMEOUT = 4
-JOB_STATUS_CANCELLED = 5
+if TYPE_CHECKING:
+    # 仅用于类型标注：运行时导入会与 module_task 的控制器形成循环导入
+    from app.plugin.module_task.cronjob.node.model import NodeModel
 
 # 调度器状态常量（0:已停止 1:运行中 2:已暂停）
 SCHEDULER_STATUS_STOPPED = 0
 SCHEDULER_STATUS_RUNNING = 1
 SCHEDULER_STATUS_PAUSED = 2
 
+# 从节点不运行调度循环，这些任务存储变更事件转发给主节点记录执行日志并唤醒其调度循环
+_FORWARDED_EVENTS = EVENT_JOB_ADDED | EVENT_JOB_MODIFIED | EVENT_JOB_REMOVED | EVENT_ALL_JOBS_REMOVED
+
 scheduler = AsyncIOScheduler()
 scheduler.configure(
     jobstores={
@@ -93,14 +97,13 @@ class SchedulerUtil:
     """
 
     redis_instance: Redis | None = None
-    # 临时存储 job_name，用于在 EVENT_JOB_SUBMITTED 时获取
-    # 格式可以是: str (任务名称) 或 tuple[str, str] (原任务ID, 任务名称)
-    _job_name_cache: dict[str, str | tuple[str, str]] = {}
+    # 集群级暂停标记（启用主节点选举时由 pause / resume 写入 Redis 并广播）
+    cluster_paused: bool = False
 
     @classmethod
     def scheduler_event_listener(cls, event: JobEvent | JobExecutionEvent) -> None:
         """
-        监听任务执行事件，记录执行日志；每次执行新建日志行，保留历史。
+        监听任务执行事件，记录执行日志；每次执行对应一行日志，保留历史。
 
         参数:
         - event (JobEvent | JobExecutionEvent): APScheduler 事件对象。
@@ -109,6 +112,18 @@ class SchedulerUtil:
         - None
         """
         try:
+            if settings.METRICS_ENABLE:
+                metrics.observe_scheduler_event(event)
+            if event.code & _FORWARDED_EVENTS and not scheduler_leader.is_leader():
+                scheduler_leader.notify({
+                    "action": "job",
+                    "code": event.code,
+                    "job_id": getattr(event, "job_id", None),
+                    "jobstore": getattr(event, "jobstore", None),
+                })
+            else:
+                # 执行日志交给后台批量写入，这里不做数据库 / 任务存储读写
+                job_log_sink.record(event)
             # 事件处理器映射
             event_handlers: dict[int, Callable] = {
                 # 调度器事件
@@ -151,49 +166,7 @@ class SchedulerUtil:
         """
         处理任务提交事件
         """
-        job_id = str(event.job_id)
-        job = cls.get_job(job_id=job_id)
-
-        if job:
-            logger.info(f"任务 {job_id} ({job.name}) 已提交执行")
-
-            trigger_type = cls._get_trigger_type(job_id)
-
-            # 周期性任务（cron/interval）：更新 pending 状态为 running
-            if trigger_type in ("cron", "interval"):
-                cls._update_job_log(
-                    job_id=job_id,
-                    status=JOB_STATUS_RUNNING,
-                )
-            else:
-                # 一次性任务（manual/date）：创建新的 running 状态日志
-                cls._create_job_log(
-                    job_id=job_id,
-                    job_name=job.name,
-                    trigger_type=trigger_type,
-                    status=JOB_STATUS_RUNNING,
-                )
-        else:
-            # 任务可能已经被移除（一次性任务执行完毕后自动移除）
-            # 尝试从缓存获取 job_name 和原任务 ID
-            cached_value = cls._job_name_cache.pop(job_id, None)
-            # 处理新的缓存格式 (原任务ID, 任务名称) 或旧的格式 任务名称
-            if isinstance(cached_value, tuple):
-                original_job_id, job_name = cached_value
-            else:
-                original_job_id, job_name = job_id, cached_value
-
-            logger.info(f"任务 {job_id} 提交执行，但未找到任务信息（可能已被移除），尝试创建日志")
-            result = cls._create_job_log(
-                job_id=original_job_id,
-                job_name=job_name,
-                trigger_type="manual",
-                status=JOB_STATUS_RUNNING,
-            )
-            if result:
-                logger.info(f"任务 {original_job_id} 日志创建成功，id={result}")
-            else:
-                logger.error(f"任务 {original_job_id} 日志创建失败")
+        logger.info(f"任务 {event.job_id} 已提交执行")
 
     @classmethod
     def _handle_job_executed(cls, event: JobExecutionEvent) -> None:
@@ -210,26 +183,6 @@ class SchedulerUtil:
         if scheduled_run_time:
             logger.debug(f"任务 {job_id} 计划执行时间: {scheduled_run_time}")
 
-        # 更新执行日志
-        cls._update_latest_job_log(
-            job_id=job_id,
-            status=JOB_STATUS_SUCCESS,
-            result=str(retval) if retval else None,
-        )
-
-        # 为周期性任务创建新的 pending 状态日志，等待下次执行
-        job = cls.get_job(job_id=job_id)
-        if job:
-            trigger_type = cls._get_trigger_type(job_id)
-            if trigger_type in ("cron", "interval") and job.next_run_time:
-                cls._create_job_log(
-                    job_id=job_id,
-                    job_name=job.name,
-                    trigger_type=trigger_type,
-                    status=JOB_STATUS_PENDING,
-                )
-                logger.debug(f"任务 {job_id} 已创建新的 pending 状态日志，等待下次执行")
-
     @classmethod
     def _handle_job_error(cls, event: JobExecutionEvent) -> None:
         """
@@ -246,58 +199,12 @@ class SchedulerUtil:
         if scheduled_run_time:
             logger.debug(f"任务 {job_id} 计划执行时间: {scheduled_run_time}")
 
-        # 更新执行日志
-        cls._update_latest_job_log(
-            job_id=job_id,
-            status=JOB_STATUS_FAILED,
-            result="failed",
-            error=str(exception) if exception else "未知错误",
-        )
-
-        # 为周期性任务创建新的 pending 状态日志，等待下次执行
-        job = cls.get_job(job_id=job_id)
-        if job:
-            trigger_type = cls._get_trigger_type(job_id)
-            if trigger_type in ("cron", "interval") and job.next_run_time:
-                cls._create_job_log(
-                    job_id=job_id,
-                    job_name=job.name,
-                    trigger_type=trigger_type,
-                    status=JOB_STATUS_PENDING,
-                )
-                logger.debug(f"任务 {job_id} 已创建新的 pending 状态日志，等待下次执行")
-
     @classmethod
     def _handle_job_missed(cls, event: JobEvent) -> None:
         """
         处理任务错过执行时间事件
         """
-        job_id = str(event.job_id)
-        job = cls.get_job(job_id=job_id)
-
-        logger.warning(f"任务 {job_id} 错过执行时间")
-        if job:
-            logger.debug(f"任务 {job_id} ({job.name}) 错过执行")
-
-        # 更新执行日志
-        cls._update_latest_job_log(
-            job_id=job_id,
-            status=JOB_STATUS_TIMEOUT,
-            result="timeout",
-            error="任务错过执行时间",
-        )
-
-        # 为周期性任务创建新的 pending 状态日志，等待下次执行
-        if job:
-            trigger_type = cls._get_trigger_type(job_id)
-            if trigger_type in ("cron", "interval") and job.next_run_time:
-                cls._create_job_log(
-                    job_id=job_id,
-                    job_name=job.name,
-                    trigger_type=trigger_type,
-                    status=JOB_STATUS_PENDING,
-                )
-                logger.debug(f"任务 {job_id} 已创建新的 pending 状态日志，等待下次执行")
+        logger.warning(f"任务 {event.job_id} 错过执行时间")
 
     @classmethod
     def _handle_job_removed(cls, event: JobEvent) -> None:
@@ -305,69 +212,25 @@ class SchedulerUtil:
         处理任务被移除事件
 
         注意：APScheduler 对于一次性任务（DateTrigger）会先触发 JOB_REMOVED，
-        然后再触发 JOB_SUBMITTED 和 JOB_EXECUTED。因此：
-        - 对于一次性任务，不应该在 JOB_REMOVED 时创建或更新日志
-        - 只有周期性任务在移除时才需要更新日志状态
+        然后再触发 JOB_SUBMITTED 和 JOB_EXECUTED，其执行日志由后两者处理；
+        周期性任务被移除时由 job_log_sink 取消其 pending 日志。
         """
-        job_id = str(event.job_id)
         jobstore = getattr(event, "jobstore", "unknown")
-
-        logger.info(f"任务 {job_id} 从 {jobstore} 存储器中移除")
-
-        # 检查是否是一次性任务（DateTrigger）
-        # 如果任务已经不存在，说明可能是一次性任务执行后被自动移除
-        # 这种情况下不需要更新日志，因为 JOB_EXECUTED 会处理
-        job = cls.get_job(job_id=job_id)
-        if job is None:
-            # 任务已经被移除，可能是一次性任务
-            # 不需要在这里创建日志，JOB_SUBMITTED 和 JOB_EXECUTED 会处理
-            logger.debug(f"任务 {job_id} 已从调度器中移除（可能是一次性任务），跳过日志更新")
-            return
-
-        # 任务还存在，说明是周期性任务被手动移除
-        # 更新执行日志
-        cls._update_job_log_on_removed(job_id=job_id)
+        logger.info(f"任务 {event.job_id} 从 {jobstore} 存储器中移除")
 
     @classmethod
     def _handle_job_added(cls, event: JobEvent) -> None:
         """
-        处理任务添加事件
+        处理任务添加事件（周期性任务的初始 pending 日志由 job_log_sink 创建）
         """
-        job_id = str(event.job_id)
-        jobstore = event.jobstore
-        job = cls.get_job(job_id=job_id)
-
-        if job:
-            logger.info(f"任务 {job_id} ({job.name}) 已添加到 {jobstore} 存储器")
-
-            # 为周期性任务（cron/interval）创建初始的 pending 状态日志
-            trigger_type = cls._get_trigger_type(job_id)
-            if trigger_type in ("cron", "interval"):
-                # 清理旧的 pending 日志，避免重启导致 pending 日志累积
-                cls._cleanup_obsolete_pending_logs(job_id)
-                cls._create_job_log(
-                    job_id=job_id,
-                    job_name=job.name,
-                    trigger_type=trigger_type,
-                    status=JOB_STATUS_PENDING,
-                )
-                logger.info(f"任务 {job_id} 已创建初始 pending 状态日志")
-        else:
-            logger.info(f"任务 {job_id} 已添加到 {jobstore} 存储器")
+        logger.info(f"任务 {event.job_id} 已添加到 {event.jobstore} 存储器")
 
     @classmethod
     def _handle_job_modified(cls, event: JobEvent) -> None:
         """
         处理任务修改事件
         """
-        job_id = str(event.job_id)
-        jobstore = event.jobstore
-        job = cls.get_job(job_id=job_id)
-
-        if job:
-            logger.info(f"任务 {job_id} ({job.name}) 已在 {jobstore} 存储器中修改")
-        else:
-            logger.info(f"任务 {job_id} 已在 {jobstore} 存储器中修改")
+        logger.info(f"任务 {event.job_id} 已在 {event.jobstore} 存储器中修改")
 
     @classmethod
     def _handle_scheduler_started(cls, event: SchedulerEvent) -> None:
@@ -453,10 +316,9 @@ class SchedulerUtil:
     def _handle_all_jobs_removed(cls, event: SchedulerEvent) -> None:
         """
         处理所有任务移除事件
-        注意：清空调度器任务不应该清空执行日志，而是将所有 pending 状态的日志更新为 cancelled
+        注意：清空调度器任务不应该清空执行日志，由 job_log_sink 将所有 pending 状态的日志更新为 cancelled
         """
         logger.info("所有任务已从调度器中移除")
-        cls._cancel_all_pending_job_logs()
 
     @classmethod
     def _handle_job_max_instances(cls, event: JobEvent) -> None:
@@ -535,31 +397,10 @@ class SchedulerUtil:
             logger.error(f"清空任务日志失败: {e!s}", exc_info=True)
 
     @classmethod
-    def _cancel_all_pending_job_logs(cls) -> None:
-        """
-        将所有 pending 状态的执行日志更新为 cancelled
-        用于清空调度器任务时，不删除日志而是更新状态
-        """
-        try:
-            from sqlalchemy.orm import Session
-
-            from app.plugin.module_task.cronjob.job.model import JobModel
-
-            with Session(engine) as session:
-                session.query(JobModel).filter(JobModel.status == JOB_STATUS_PENDING).update({
-                    "status": JOB_STATUS_CANCELLED
-                })
-                session.commit()
-                logger.info("所有待执行任务日志已标记为已取消")
-        except Exception as e:
-            logger.error(f"取消待执行任务日志失败: {e!s}", exc_info=True)
-
-    @classmethod
-    def _get_trigger_type(cls, job_id: str) -> str:
+    def _get_trigger_type(cls, job: Job | None) -> str:
         """
         获取任务的触发类型
         """
-        job = cls.get_job(job_id=job_id)
         if not job:
             return "manual"
         trigger = job.trigger
@@ -576,6 +417,58 @@ class SchedulerUtil:
             return "date"
         return "manual"
 
+    @classmethod
+    def _remember_job(
+        cls, job: Job | None, log_job_id: str | None = None, job_name: str | None = None, trigger_type: str | None = None
+    ) -> Job | None:
+        """
+        登记写执行日志所需的任务信息，事件处理时不再读取任务存储。
+
+        参数:
+        - job (Job | None): 刚添加 / 修改的任务。
+        - log_job_id (str | None): 日志中记录的任务 ID（立即执行的临时任务记为原任务 ID）。
+        - job_name (str | None): 日志中记录的任务名称。
+        - trigger_type (str | None): 触发方式，默认按触发器判断。
+
+        返回:
+        - Job | None: 原样返回 job。
+        """
+        # 从节点的任务变更转发给主节点，由主节点登记
+        if job is not None and scheduler_leader.is_leader():
+            job_log_sink.remember(str(job.id), cls._job_meta(job, log_job_id, job_name, trigger_type))
+        return job
+
+    @classmethod
+    def _job_meta(
+        cls, job: Job, log_job_id: str | None = None, job_name: str | None = None, trigger_type: str | None = None
+    ) -> job_log_sink.JobMeta:
+        """
+        从 Job 对象提取执行日志所需的任务信息。
+        """
+        return job_log_sink.JobMeta(
+            log_job_id=log_job_id or str(job.id),
+            name=job_name if job_name is not None else job.name,
+            trigger_type=trigger_type or cls._get_trigger_type(job),
+            trigger=job.trigger,
+            paused=job.next_run_time is None,
+            state=cls._get_job_state(job),
+        )
+
+    @classmethod
+    def _describe_job(cls, job_id: str) -> job_log_sink.JobMeta | None:
+        """
+        从任务存储读取任务信息（job_log_sink 在工作线程中补查未登记的任务时调用）。
+        """
+        job = cls.get_job(job_id=job_id)
+        if job is None:
+            # 立即执行的临时任务执行后已被移除，按原任务记录
+            original_id, sep, _ = job_id.partition("_run_now_")
+            original = cls.get_job(job_id=original_id) if sep else None
+            if original is None:
+                return None
+            return cls._job_meta(original, original_id, f"{original.name}(立即执行)", "manual")
+        return cls._job_meta(job)
+
     @classmethod
     async def init_scheduler(cls, redis: Redis | None = None) -> None:
         """
@@ -589,10 +482,66 @@ class SchedulerUtil:
         """
         if redis:
             cls.redis_instance = redis
-        scheduler.start()
         scheduler.add_listener(cls.scheduler_event_listener, EVENT_ALL)
-        scheduler.resume()
+        await cls.start()
+
+    @classmethod
+    def _election_enabled(cls) -> bool:
+        return settings.SCHEDULER_LEADER_ELECTION and cls.redis_instance is not None
+
+    @classmethod
+    async def _on_elected(cls) -> None:
+        """
+        成为调度器主节点（未启用选举时启动即调用）：注册系统任务、接管已有任务的执行日志并恢复调度循环。
+        """
+        job_log_sink.forget()
         cls._register_system_jobs()
+        # 登记任务存储中已有的任务（上次运行 / 前任主节点添加的任务在本进程没有添加事件）
+        jobs = await asyncio.to_thread(scheduler.get_jobs)
+        await job_log_sink.adopt({str(job.id): cls._job_meta(job) for job in jobs})
+        if not cls.cluster_paused:
+            scheduler.resume()
+
+    @classmethod
+    async def _on_demoted(cls) -> None:
+        """
+        失去主节点身份：暂停调度循环（已在执行的任务继续完成并照常记录日志）。
+        """
+        if scheduler.running:
+            scheduler.pause()
+        job_log_sink.forget()
+
+    @classmethod
+    async def _on_control(cls, message: dict[str, Any]) -> None:
+        """
+        处理其他进程广播的调度器控制消息。
+
+        参数:
+        - message (dict[str, Any]): ``job``：从节点转发的任务变更；``pause`` / ``resume``：集群级暂停 / 恢复。
+        """
+        action = message.get("action")
+        if action in ("pause", "resume"):
+            cls.cluster_paused = action == "pause"
+            if not scheduler_leader.is_leader():
+                return
+            if cls.cluster_paused:
+                scheduler.pause()
+            else:
+                scheduler.resume()
+            return
+        if action != "job" or not scheduler_leader.is_leader():
+            return
+        code, job_id = message["code"], message.get("job_id")
+        if code == EVENT_ALL_JOBS_REMOVED:
+            job_log_sink.record(SchedulerEvent(code))
+        else:
+            if code in (EVENT_JOB_ADDED, EVENT_JOB_MODIFIED):
+                meta = await asyncio.to_thread(cls._describe_job, str(job_id))
+                if meta is not None:
+                    job_log_sink.remember(str(job_id), meta)
+            job_log_sink.record(JobEvent(code, job_id, message.get("jobstore")))
+        # 任务由其他进程写入任务存储，重新计算下一次唤醒时间
+        scheduler.wakeup()
 
     @classmethod
     def _register_system_jobs(cls) -> None:
@@ -607,47 +556,47 @@ class SchedulerUtil:
         from app.api.v1.module_platform.tenant.service import TenantService
 
         # 租户到期检查（每小时）
-        scheduler.add_job(
+        cls._remember_job(scheduler.add_job(
             TenantService.check_tenant_expiry,
             trigger=IntervalTrigger(hours=1),
             id="system_tenant_expiry_check",
             name="租户到期检查",
             replace_existing=True,
-        )
+        ))
         # 宽限期续费提醒（每天 9:00）
-        scheduler.add_job(
+        cls._remember_job(scheduler.add_job(
             TenantService.send_grace_reminders,
             trigger=CronTrigger(hour=9, minute=0),
             id="system_grace_reminder",
             name="宽限期续费提醒",
             replace_existing=True,
-        )
+        ))
         # 过期租户归档清理（每月 1 号 2:00）
-        scheduler.add_job(
+        cls._remember_job(scheduler.add_job(
             TenantService.clean_expired_tenants,
             trigger=CronTrigger(day=1, hour=2, minute=0),
             id="system_clean_expired",
             name="过期租户归档清理",
             replace_existing=True,
-        )
+        ))
         # 超时订单取消（每 5 分钟）
-        scheduler.add_job(
+        cls._remember_job(scheduler.add_job(
             OrderService.cancel_expired_orders,
             trigger=IntervalTrigger(minutes=5),
             id="system_cancel_expired_orders",
             name="超时订单取消",
             replace_existing=True,
-        )
+        ))
         # 操作日志清理（每周日 3:00）
         from app.api.v1.module_system.log.service import OperationLogService
 
-        scheduler.add_job(
+        cls._remember_job(scheduler.add_job(
             OperationLogService.cleanup_operation_log,
             trigger=CronTrigger(day_of_week="sun", hour=3, minute=0),
             id="system_cleanup_operation_log",
             name="操作日志清理",
             replace_existing=True,
-        )
+        ))
         logger.info("✅ 6 个系统周期任务已注册（租户到期/续费提醒/归档清理/订单取消/日志清理）")
 
     @classmethod
@@ -657,34 +606,59 @@ class SchedulerUtil:
 
         支持完整的 Python 语法，包括 import 语句
         """
-        import types
+        return cls._run_code_block(job_id, code_block, args, kwargs)
 
-        def run_sync_handler():
-            """
-            在独立模块命名空间中执行代码块并调用 handler。
-
-            返回:
-            - Any: handler 返回值；无代码块时为 None。
-            """
-            if not code_block:
-                return None
+    @classmethod
+    async def _dispatch_task(cls, job_id: str | int, code_block: str | None, *args, **kwargs) -> Any:
+        """
+        任务执行入口（分片模式，用于 AsyncIOExecutor）：投递到任务队列，由执行进程运行代码块并回传结果。
 
-            # 创建一个新的模块作为执行环境
-            module = types.ModuleType(f"node_task_{job_id}")
-            module.__dict__["__builtins__"] = __builtins__
+        分片模式关闭后，任务存储中仍引用本入口的任务回退到本地线程中执行。
+        """
+        if not task_queue.enabled():
+            return await asyncio.to_thread(cls._run_code_block, job_id, code_block, args, kwargs)
+        return await task_queue.submit(str(job_id), code_block, args, kwargs)
 
-            # 在模块环境中执行代码
-            exec(code_block, module.__dict__)
+    @classmethod
+    def _run_code_block(
+        cls, job_id: str | int, code_block: str | None, args: tuple | list, kwargs: dict, label: str | None = None
+    ) -> Any:
+        """
+        在独立模块命名空间中执行代码块并调用 handler（编译结果按源码内容缓存）。
 
-            # 获取 handler 函数
-            handler = module.__dict__.get("handler")
-            if handler and callable(handler):
-                return handler(*args, **kwargs)
-            raise ValueError("代码块必须定义 handler(*args, **kwargs) 函数")
+        参数:
+        - job_id (str | int): 任务 / 节点 ID，用于模块名与日志。
+        - code_block (str | None): 代码块源码，须定义 handler(*args, **kwargs)。
+        - args (tuple | list): handler 位置参数。
+        - kwargs (dict): handler 关键字参数。
+        - label (str | None): 耗时指标中的节点标识，默认为任务 ID。
 
+        返回:
+        - Any: handler 返回值；无代码块时为 None。
+        """
+        if not code_block:
+            return None
+        node = label or str(job_id)
         try:
-            result = run_sync_handler()
-            return result
+            code, compile_elapsed = code_cache.get_code(code_block)
+            if compile_elapsed and settings.METRICS_ENABLE:
+                metrics.observe_task_code(node, "compile", compile_elapsed)
+
+            started = time.perf_counter()
+            try:
+                # 创建一个新的模块作为执行环境
+                module = types.ModuleType(f"node_task_{job_id}")
+                module.__dict__["__builtins__"] = __builtins__
+                exec(code, module.__dict__)
+
+                # 获取 handler 函数
+                handler = module.__dict__.get("handler")
+                if not handler or not callable(handler):
+                    raise ValueError("代码块必须定义 handler(*args, **kwargs) 函数")
+                return handler(*args, **kwargs)
+            finally:
+                if settings.METRICS_ENABLE:
+                    metrics.observe_task_code(node, "execute", time.perf_counter() - started)
         except Exception as e:
             logger.error(f"任务 {job_id} 执行失败: {e!s}")
             raise
@@ -797,231 +771,6 @@ class SchedulerUtil:
         except Exception as e:
             return {"error": str(e), "raw_data": str(blob_data[:200])}
 
-    @classmethod
-    def _cleanup_obsolete_pending_logs(cls, job_id: str) -> None:
-        """清理该 job_id 的所有旧的 pending 日志，避免重启累积。"""
-        from sqlalchemy.orm import Session
-
-        from app.plugin.module_task.cronjob.job.model import JobModel
-
-        try:
-            with Session(engine) as session:
-                deleted = (
-                    session.query(JobModel)
-                    .filter(JobModel.job_id == job_id, JobModel.status == JOB_STATUS_PENDING)
-                    .delete(synchronize_session=False)
-                )
-                session.commit()
-                if deleted:
-                    logger.info(f"清理了任务 {job_id} 的 {deleted} 条旧 pending 日志")
-        except Exception as e:
-            logger.error(f"清理任务 {job_id} 旧 pending 日志失败: {e}")
-
-    @classmethod
-    def _create_job_log(
-        cls,
-        job_id: str,
-        job_name: str | None = None,
-        trigger_type: str = "manual",
-        status: int = JOB_STATUS_RUNNING,
-    ) -> int | None:
-        """
-        创建执行日志
-        """
-        from sqlalchemy.orm import Session
-
-        from app.plugin.module_task.cronjob.job.model import JobModel
-
-        try:
-            job = cls.get_job(job_id=job_id)
-            next_run_time = str(job.next_run_time) if job and job.next_run_time else None
-            job_state = cls._get_job_state(job) if job else None
-            # 如果没有传入 job_name，尝试从 job 获取
-            if not job_name and job:
-                job_name = job.name
-
-            with Session(engine) as session:
-                job_log = JobModel(
-                    job_id=job_id,
-                    job_name=job_name,
-                    trigger_type=trigger_type,
-                    status=status,
-                    next_run_time=next_run_time,
-                    job_state=job_state,
-                )
-                session.add(job_log)
-                session.commit()
-                logger.info(f"执行日志创建成功: job_id={job_id}, id={job_log.id}")
-                return job_log.id
-        except Exception as e:
-            logger.error(f"创建执行日志失败: job_id={job_id}, error={e}", exc_info=True)
-            return None
-
-    @classmethod
-    def _update_job_log(
-        cls, job_id: str, status: int, result: str | None = None, error: str | None = None
-    ) -> None:
-        """
-        更新执行日志（更新该 job_id 最新的 pending 状态日志）
-        用于周期性任务在提交执行时将 pending 更新为 running
-        """
-        from sqlalchemy.orm import Session
-
-        from app.plugin.module_task.cronjob.job.model import JobModel
-
-        job = cls.get_job(job_id=job_id)
-        next_run_time = str(job.next_run_time) if job and job.next_run_time else None
-        job_state = cls._get_job_state(job) if job else None
-
-        with Session(engine) as session:
-            job_log = (
-                session
-                .query(JobModel)
-                .filter(JobModel.job_id == job_id, JobModel.status == JOB_STATUS_PENDING)
-                .order_by(JobModel.created_time.desc())
-                .first()
-            )
-            if job_log:
-                job_log.status = status
-                if next_run_time:
-                    job_log.next_run_time = next_run_time
-                if job_state:
-                    job_log.job_state = job_state
-                if result:
-                    job_log.result = result
-                if error:
-                    job_log.error = error
-                session.commit()
-            else:
-                logger.warning(f"未找到任务 {job_id} 的待执行日志记录")
-
-    @classmethod
-    def _update_latest_job_log(
-        cls, job_id: str, status: int, result: str | None = None, error: str | None = None
-    ) -> None:
-        """
-        更新最新的执行日志（更新该 job_id 最新的一条日志）
-        用于每次执行完成后更新状态
-        """
-        from sqlalchemy.orm import Session
-
-        from app.plugin.module_task.cronjob.job.model import JobModel
-
-        try:
-            job = cls.get_job(job_id=job_id)
-            next_run_time = str(job.next_run_time) if job and job.next_run_time else None
-            job_state = cls._get_job_state(job) if job else None
-
-            with Session(engine) as session:
-                # 首先尝试更新 running 状态的日志
-                job_log = (
-                    session
-                    .query(JobModel)
-                    .filter(JobModel.job_id == job_id, JobModel.status == JOB_STATUS_RUNNING)
-                    .order_by(JobModel.created_time.desc())
-                    .first()
-                )
-                if job_log:
-                    job_log.status = status
-                    if next_run_time:
-                        job_log.next_run_time = next_run_time
-                    if job_state:
-                        job_log.job_state = job_state
-                    if result:
-                        job_log.result = result
-                    if error:
-                        job_log.error = error
-                    session.commit()
-                    logger.info(f"执行日志更新成功: job_id={job_id}, id={job_log.id}, status={status}")
-                    return
-
-                # 没有找到 running 状态的日志，尝试更新 cancelled 状态的日志
-                # 这种情况发生在 EVENT_JOB_REMOVED 先于 EVENT_JOB_SUBMITTED 触发时
-                job_log = (
-                    session
-                    .query(JobModel)
-                    .filter(JobModel.job_id == job_id, JobModel.status == JOB_STATUS_CANCELLED)
-                    .order_by(JobModel.created_time.desc())
-                    .first()
-                )
-                if job_log:
-                    job_log.status = status
-                    if next_run_time:
-                        job_log.next_run_time = next_run_time
-                    if job_state:
-                        job_log.job_state = job_state
-                    if result:
-                        job_log.result = result
-                    if error:
-                        job_log.error = error
-                    session.commit()
-                    logger.info(f"执行日志更新成功: job_id={job_id}, id={job_log.id}, status={status}")
-                    return
-
-                # 创建新的日志记录
-                logger.debug(f"未找到任务 {job_id} 的日志记录，创建新日志")
-                trigger_type = cls._get_trigger_type(job_id) if job else "manual"
-                new_log = JobModel(
-                    job_id=job_id,
-                    job_name=job.name if job else None,
-                    trigger_type=trigger_type,
-                    status=status,
-                    next_run_time=next_run_time,
-                    job_state=job_state,
-                    result=result,
-                    error=error,
-                )
-                session.add(new_log)
-                session.commit()
-                logger.info(f"执行日志创建成功: job_id={job_id}, id={new_log.id}, status={status}")
-        except Exception as e:
-            logger.error(
-                f"更新执行日志失败: job_id={job_id}, status={status}, error={e}", exc_info=True
-            )
-
-    @classmethod
-    def _update_job_log_on_removed(cls, job_id: str) -> None:
-        """
-        任务被移除时，更新最新的 pending 或 running 状态日志为 cancelled
-
-        事件触发顺序分析：
-        1. 一次性任务（manual/date）：
-           - EVENT_JOB_SUBMITTED -> 创建日志（status=running）
-           - EVENT_JOB_EXECUTED/ERROR -> 更新日志（status=success/failed）
-           - EVENT_JOB_REMOVED -> 日志已更新，不会被标记为 cancelled
-
-        2. 周期性任务（cron/interval）：
-           - EVENT_JOB_SUBMITTED -> 创建日志（status=running）
-           - EVENT_JOB_EXECUTED/ERROR -> 更新日志（status=success/failed）
-           - 下次执行 -> EVENT_JOB_SUBMITTED -> 创建新日志（status=running）
-           - EVENT_JOB_REMOVED -> 将 pending/running 标记为 cancelled
-
-        3. 特殊情况：
-           - 一次性任务在执行前被删除：running -> cancelled
-           - 周期性任务在 pending 状态被删除：pending -> cancelled
-
-        注意：
-        - 只有当任务还在 pending 或 running 状态时才更新为 cancelled
-        - 如果任务已经执行完成（success/failed/timeout），则不需要更新
-        - 如果任务已经标记为 cancelled，则不需要更新
-        """
-        from sqlalchemy.orm import Session
-
-        from app.plugin.module_task.cronjob.job.model import JobModel
-
-        with Session(engine) as session:
-            job_log = (
-                session
-                .query(JobModel)
-                .filter(JobModel.job_id == job_id, JobModel.status.in_([JOB_STATUS_PENDING, JOB_STATUS_RUNNING]))
-                .order_by(JobModel.created_time.desc())
-                .first()
-            )
-            if job_log:
-                job_log.status = JOB_STATUS_CANCELLED
-                session.commit()
-                logger.info(f"任务 {job_id} 的执行日志已标记为已取消")
-
     @classmethod
     def get_job_status(cls, job_id: str | int) -> int:
         """
@@ -1047,7 +796,7 @@ class SchedulerUtil:
         return 0
 
     @classmethod
-    def add_and_run_job_now(cls, job_info: NodeModel) -> Job:
+    def add_and_run_job_now(cls, job_info: "NodeModel") -> Job:
         """
         立即执行任务（加入调度器并尽快触发一次）。
 
@@ -1068,7 +817,7 @@ class SchedulerUtil:
     @classmethod
     def add_cron_job(
         cls,
-        job_info: NodeModel,
+        job_info: "NodeModel",
         trigger_args: str | None = None,
         start_date: str | None = None,
         end_date: str | None = None,
@@ -1130,7 +879,7 @@ class SchedulerUtil:
     @classmethod
     def add_interval_job(
         cls,
-        job_info: NodeModel,
+        job_info: "NodeModel",
         trigger_args: str | None = None,
         start_date: str | None = None,
         end_date: str | None = None,
@@ -1171,7 +920,7 @@ class SchedulerUtil:
         return cls._add_job_with_trigger(job_info, trigger)
 
     @classmethod
-    def add_date_job(cls, job_info: NodeModel, run_date: str | None = None) -> Job:
+    def add_date_job(cls, job_info: "NodeModel", run_date: str | None = None) -> Job:
         """
         创建指定时刻执行一次的任务。
 
@@ -1190,7 +939,7 @@ class SchedulerUtil:
         return cls._add_job_with_trigger(job_info, trigger)
 
     @classmethod
-    def _add_job_with_trigger(cls, job_info: NodeModel, trigger) -> Job:
+    def _add_job_with_trigger(cls, job_info: "NodeModel", trigger) -> Job:
         """
         添加任务到调度器
         """
@@ -1200,6 +949,10 @@ class SchedulerUtil:
 
         jobstore = job_info.jobstore or "sqlalchemy"
         executor = job_info.executor or "threadpool"
+        func = cls._task_wrapper
+        if settings.TASK_QUEUE_ENABLE:
+            # 分片模式：调度器只负责投递并等待结果，代码块在执行进程中运行
+            func, executor = cls._dispatch_task, "default"
 
         job_args = []
         if job_info.args:
@@ -1216,12 +969,9 @@ class SchedulerUtil:
                 except json.JSONDecodeError:
                     raise ValueError(f"关键字参数JSON格式无效: {kwargs_str}")
 
-        # 缓存 job_name，用于 EVENT_JOB_SUBMITTED 时获取
-        cls._job_name_cache[str(job_info.id)] = job_info.name or ""
-
         try:
             job = scheduler.add_job(
-                func=cls._task_wrapper,
+                func=func,
                 trigger=trigger,
                 args=[str(job_info.id), code_block, *job_args],
                 kwargs=job_kwargs,
@@ -1233,11 +983,11 @@ class SchedulerUtil:
                 executor=executor,
             )
             logger.info(f"任务 {job_info.id} 添加到 {jobstore} 存储器成功")
-            return job
+            return cls._remember_job(job, job_name=job_info.name or "")
         except ConflictingIdError:
             scheduler.remove_job(job_id=str(job_info.id), jobstore=jobstore)
             job = scheduler.add_job(
-                func=cls._task_wrapper,
+                func=func,
                 trigger=trigger,
                 args=[str(job_info.id), code_block, *job_args],
                 kwargs=job_kwargs,
@@ -1249,20 +999,28 @@ class SchedulerUtil:
                 executor=executor,
             )
             logger.info(f"任务 {job_info.id} 已存在，已移除旧任务并重新添加")
-            return job
+            return cls._remember_job(job, job_name=job_info.name or "")
 
     @classmethod
-    def start(cls, paused: bool = False) -> None:
+    async def start(cls) -> None:
         """
         启动全局调度器。
 
-        参数:
-        - paused (bool): 是否以暂停状态启动。
+        以暂停状态启动：各进程都可读写任务存储，调度循环只在主节点恢复；
+        未启用主节点选举时本进程直接作为主节点。
 
         返回:
         - None
         """
-        scheduler.start(paused=paused)
+        scheduler.start(paused=True)
+        await job_log_sink.init(cls._describe_job)
+        if settings.TASK_QUEUE_ENABLE and cls.redis_instance is not None:
+            await task_queue.init(cls.redis_instance)
+        if cls._election_enabled():
+            cls.cluster_paused = bool(await cls.redis_instance.get(RedisInitKeyConfig.SCHEDULER_PAUSED.key))
+            await scheduler_leader.init(cls.redis_instance, cls._on_elected, cls._on_demoted, cls._on_control)
+        else:
+            await cls._on_elected()
 
     @classmethod
     async def shutdown(cls, wait: bool = False):
@@ -1275,7 +1033,12 @@ class SchedulerUtil:
         返回:
         - 与 APScheduler shutdown 返回值一致。
         """
-        return scheduler.shutdown(wait=wait)
+        result = scheduler.shutdown(wait=wait)
+        # 调度循环停止后再释放主节点租约，其他进程随即接手
+        await scheduler_leader.close()
+        await task_queue.close()
+        await job_log_sink.close()
+        return result
 
     @classmethod
     def configure(
@@ -1295,24 +1058,34 @@ class SchedulerUtil:
         scheduler.configure(gconfig or {}, prefix, **options)
 
     @classmethod
-    def pause(cls) -> None:
+    async def pause(cls) -> None:
         """
-        暂停调度器。
+        暂停调度器（启用主节点选举时对整个集群生效，之后当选的主节点同样保持暂停）。
 
         返回:
         - None
         """
-        scheduler.pause()
+        if cls._election_enabled():
+            cls.cluster_paused = True
+            await cls.redis_instance.set(RedisInitKeyConfig.SCHEDULER_PAUSED.key, "1")
+            await scheduler_leader.publish({"action": "pause"})
+        if scheduler_leader.is_leader():
+            scheduler.pause()
 
     @classmethod
-    def resume(cls) -> None:
+    async def resume(cls) -> None:
         """
-        恢复调度器。
+        恢复调度器（启用主节点选举时对整个集群生效，只有主节点恢复调度循环）。
 
         返回:
         - None
         """
-        scheduler.resume()
+        if cls._election_enabled():
+            cls.cluster_paused = False
+            await cls.redis_instance.delete(RedisInitKeyConfig.SCHEDULER_PAUSED.key)
+            await scheduler_leader.publish({"action": "resume"})
+        if scheduler_leader.is_leader():
+            scheduler.resume()
 
     @classmethod
     def is_running(cls) -> bool:
@@ -1334,6 +1107,9 @@ class SchedulerUtil:
         """
         if scheduler.state == 0:
             return "停止"
+        if cls._election_enabled():
+            # 从节点的调度器始终处于暂停状态，按集群状态展示
+            return "暂停" if cls.cluster_paused else "运行中"
         if scheduler.state == 1:
             return "运行中"
         if scheduler.state == 2:
@@ -1445,7 +1221,7 @@ class SchedulerUtil:
                     job_log = JobModel(
                         job_id=str(job.id),
                         job_name=job.name,
-                        trigger_type=cls._get_trigger_type(str(job.id)),
+                        trigger_type=cls._get_trigger_type(job),
                         status=JOB_STATUS_PENDING,
                         next_run_time=str(job.next_run_time) if job.next_run_time else None,
                         job_state=cls._get_job_state(job),
@@ -1468,7 +1244,7 @@ class SchedulerUtil:
         返回:
         - Job | None: 暂停后的 Job 或 None。
         """
-        return scheduler.pause_job(str(job_id), jobstore)
+        return cls._remember_job(scheduler.pause_job(str(job_id), jobstore))
 
     @classmethod
     def resume_job(cls, job_id: str | int, jobstore: str | None = None) -> Job | None:
@@ -1482,7 +1258,7 @@ class SchedulerUtil:
         返回:
         - Job | None: 恢复后的 Job 或 None。
         """
-        return scheduler.resume_job(str(job_id), jobstore)
+        return cls._remember_job(scheduler.resume_job(str(job_id), jobstore))
 
     @classmethod
     def modify_job(cls, job_id: str | int, jobstore: str | None = None, **changes) -> Job | None:
@@ -1497,7 +1273,7 @@ class SchedulerUtil:
         返回:
         - Job | None: 修改后的 Job 或 None。
         """
-        return scheduler.modify_job(str(job_id), jobstore, **changes)
+        return cls._remember_job(scheduler.modify_job(str(job_id), jobstore, **changes))
 
     @classmethod
     def run_job_now(cls, job_id: str | int, jobstore: str | None = None) -> Job | None:
@@ -1521,10 +1297,6 @@ class SchedulerUtil:
         # 创建一个新的临时任务 ID
         temp_job_id = f"{job_id}_run_now_{datetime.now().timestamp()}"
 
-        # 缓存 job_name 和原任务 ID，用于 EVENT_JOB_SUBMITTED 时获取
-        # 格式: (原任务ID, 任务名称)
-        cls._job_name_cache[temp_job_id] = (str(job_id), f"{job.name}(立即执行)")
-
         # 创建临时任务，延迟 0.1 秒执行，确保事件监听器能够捕获事件
         from datetime import timedelta
 
@@ -1543,5 +1315,8 @@ class SchedulerUtil:
             max_instances=1,
         )
 
+        # 执行日志记在原任务 ID 下
+        cls._remember_job(temp_job, str(job_id), f"{job.name}(立即执行)", "manual")
+
         logger.info(f"任务 {job_id} 已触发立即执行，临时任务 ID: {temp_job_id}")
         return temp_job
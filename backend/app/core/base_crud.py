@@ -15,19 +15,22 @@
             super().__init__(model=OrderModel, session=session)
 """
 
-from collections.abc import Sequence
-from datetime import datetime, timedelta
+import base64
+import json
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime
 from typing import TYPE_CHECKING, Any, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy import Select, asc, delete, desc, false, func, literal_column, select, update
-from sqlalchemy import inspect as sa_inspect
+from sqlalchemy import Select, and_, asc, delete, desc, false, func, literal_column, or_, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import noload, selectinload
 from sqlalchemy.sql.elements import ColumnElement
 
+from app.common.enums import PageCountEnum
 from app.core.base_model import MappedBase
 from app.core.base_schema import AuthSchema, PageResultSchema
+from app.core.crud_meta import OPERATORS, CRUDMeta
 from app.core.exceptions import CustomException
 from app.core.permission import Permission
 
@@ -55,6 +58,7 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         - session: 数据库会话（后台任务场景），仅在 auth=None 时使用
         """
         self.model = model
+        self.meta = CRUDMeta.of(model)
         self.auth = auth
         self.db = session if session is not None else (auth.db if auth else None)
         if self.db is None:
@@ -64,20 +68,16 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
 
     def _get_pk_col(self) -> ColumnElement:
         """获取模型主键列"""
-        mapper = sa_inspect(self.model)
-        pk_cols = list(getattr(mapper, "primary_key", []))
-        if not pk_cols:
+        if self.meta.pk is None:
             raise CustomException(msg="模型缺少主键")
-        if len(pk_cols) > 1:
+        if self.meta.pk_count > 1:
             raise CustomException(msg="暂不支持复合主键操作")
-        return pk_cols[0]
+        return self.meta.pk
 
     @property
     def _supports_soft_delete(self) -> bool:
         """模型是否支持软删除"""
-        return all(
-            hasattr(self.model, attr) for attr in ("is_deleted", "deleted_time", "deleted_id")
-        )
+        return self.meta.soft_delete
 
     def _soft_delete_values(self) -> dict[str, Any]:
         """软删除时需要更新的字段值"""
@@ -99,9 +99,7 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         - 对象实例或 None
         """
         conditions = await self.__build_conditions(**kwargs)
-        sql = select(self.model).where(*conditions)
-        for opt in self.__loader_options(preload):
-            sql = sql.options(opt)
+        sql = self.meta.base_select(preload).where(*conditions)
         sql = await self.__filter_permissions(sql)
         result: Result = await self.db.execute(sql)
         return result.scalars().first()
@@ -212,9 +210,7 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         try:
             conditions = await self.__build_conditions(**(search or {}))
             order = order_by or [{"id": "asc"}]
-            sql = select(self.model).where(*conditions).order_by(*self._parse_order(order))
-            for opt in self.__loader_options(preload):
-                sql = sql.options(opt)
+            sql = self.meta.base_select(preload).where(*conditions).order_by(*self._parse_order(order))
             sql = await self.__filter_permissions(sql)
             result: Result = await self.db.execute(sql)
             return result.scalars().all()
@@ -223,12 +219,68 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         except Exception as e:
             raise CustomException(msg=f"列表查询失败: {e!s}")
 
+    async def stream(
+        self,
+        search: dict | None = None,
+        order_by: list[dict[str, str]] | None = None,
+        preload: list[str | Any] | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[ModelType]]:
+        """
+        按批流式读取符合条件的对象（服务端游标 + yield_per，内存占用与总行数无关）
+
+        每批对象在调用方处理完、取下一批时从会话中移出，调用方不要跨批持有对象。
+
+        参数:
+        - search: 查询条件
+        - order_by: 排序字段, 格式为 [{'id': 'asc'}, {'name': 'desc'}]
+        - preload: 预加载关系（仅支持 selectin 方式）
+        - batch_size: 每批行数
+
+        返回:
+        - 对象批次的异步迭代器
+        """
+        conditions = await self.__build_conditions(**(search or {}))
+        order = order_by or [{"id": "asc"}]
+        sql = self.meta.base_select(preload).where(*conditions).order_by(*self._parse_order(order))
+        sql = await self.__filter_permissions(sql)
+        result = await self.db.stream_scalars(sql.execution_options(yield_per=batch_size))
+        try:
+            async for batch in result.partitions():
+                yield batch
+                for obj in batch:
+                    self.db.expunge(obj)
+        finally:
+            await result.close()
+
+    async def get_ids(self, search: dict | None = None) -> set[int]:
+        """
+        根据条件获取主键集合（不加载对象，适合批量校验引用是否存在且可见）
+
+        参数:
+        - search: 查询条件
+
+        返回:
+        - 主键集合
+        """
+        try:
+            conditions = await self.__build_conditions(**(search or {}))
+            sql = select(self._get_pk_col()).select_from(self.model).where(*conditions)
+            sql = await self.__filter_permissions(sql)
+            result: Result = await self.db.execute(sql)
+            return set(result.scalars().all())
+        except CustomException:
+            raise
+        except Exception as e:
+            raise CustomException(msg=f"列表查询失败: {e!s}")
+
     async def tree_list(
         self,
         search: dict | None = None,
         order_by: list[dict[str, str]] | None = None,
         children_attr: str | None = None,
         preload: list[str | Any] | None = None,
+        with_children: bool = True,
     ) -> Sequence[ModelType]:
         """
         获取树形结构数据列表（复用请求级事务会话）
@@ -238,6 +290,7 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         - order_by: 排序字段
         - children_attr: 子节点属性名（None 时自动从模型 __tree_children_attr__ 推断）
         - preload: 额外预加载关系
+        - with_children: 是否加载子节点关系；False 时只返回扁平节点，由调用方按 parent_id 构树
 
         返回:
         - 树形结构数据列表
@@ -248,15 +301,21 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         try:
             conditions = await self.__build_conditions(**(search or {}))
             order = order_by or [{"id": "asc"}]
-            sql = select(self.model).where(*conditions).order_by(*self._parse_order(order))
-
             final_preload = preload
             if preload is None and children_attr and hasattr(self.model, children_attr):
-                model_defaults = getattr(self.model, "__loader_options__", [])
-                final_preload = [*list(model_defaults), children_attr]
-
-            for opt in self.__loader_options(final_preload):
-                sql = sql.options(opt)
+                final_preload = [*self.meta.default_preload, children_attr]
+
+            if not with_children and children_attr and hasattr(self.model, children_attr):
+                # 去掉 children 预加载，并屏蔽模型上 lazy="selectin" 的逐层加载
+                names, extra = self.meta.preload_key(preload)
+                base_sql = self.meta.base_select([]).options(
+                    *[selectinload(getattr(self.model, name)) for name in names if name != children_attr],
+                    *extra,
+                    noload(getattr(self.model, children_attr)),
+                )
+            else:
+                base_sql = self.meta.base_select(final_preload)
+            sql = base_sql.where(*conditions).order_by(*self._parse_order(order))
 
             sql = await self.__filter_permissions(sql)
             result: Result = await self.db.execute(sql)
@@ -274,10 +333,16 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         search: dict,
         out_schema: type[OutSchemaType] | None = None,
         preload: list[str | Any] | None = None,
+        cursor: str | None = None,
+        count: PageCountEnum | str | None = PageCountEnum.exact,
     ) -> PageResultSchema:
         """
         获取分页数据（复用请求级事务会话；count 与 data 共享同一会话）
 
+        ``cursor`` 不为 None 时切换为游标（keyset）分页：按 ``order_by`` 列 + 主键定位，
+        以 ``WHERE (排序列, 主键) > 游标值`` 代替 OFFSET，深分页耗时与页码无关；
+        首页传空字符串，后续传上一页返回的 ``next_cursor``，此时 ``offset`` 被忽略。
+
         参数:
         - offset: 偏移量
         - limit: 每页数量
@@ -285,6 +350,8 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         - search: 查询条件
         - out_schema: 输出数据模型（None 时返回原始 ORM 对象）
         - preload: 预加载关系
+        - cursor: 游标（None 为传统页码分页）
+        - count: 总数统计方式（exact 精确 / estimate 表级估算 / none 不统计）
 
         返回:
         - PageResultSchema: 分页结果
@@ -292,40 +359,52 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         try:
             conditions = await self.__build_conditions(**(search or {}))
             order = order_by or [{"id": "asc"}]
-
-            mapper = sa_inspect(self.model)
-            pk_cols = list(getattr(mapper, "primary_key", []))
-            pk = pk_cols[0] if pk_cols else literal_column("1")
-
-            data_sql = select(self.model).where(*conditions)
-            for opt in self.__loader_options(preload):
-                data_sql = data_sql.options(opt)
-            data_sql = await self.__filter_permissions(data_sql)
-
-            count_sql = select(func.count(pk)).select_from(self.model)
-            where_clause = data_sql.whereclause
-            if where_clause is not None:
-                count_sql = count_sql.where(where_clause)
-
-            total_result = await self.db.execute(count_sql)
-            total = total_result.scalar() or 0
-
-            result: Result = await self.db.execute(
-                data_sql.order_by(*self._parse_order(order)).offset(offset).limit(limit)
-            )
-            objs = result.scalars().all()
+            count = PageCountEnum(count or PageCountEnum.exact)
+
+            pk = self.meta.pk if self.meta.pk is not None else literal_column("1")
+
+            data_sql = self.meta.base_select(preload).where(*conditions)
+            scoped_sql = await self.__filter_permissions(data_sql)
+            # 表级估算值不区分筛选条件：仅当除软删除标记外没有查询 / 租户 / 数据权限条件时可用
+            estimable = scoped_sql is data_sql and len(conditions) == (self.meta.is_deleted is not None)
+            data_sql = scoped_sql
+
+            total = await self._page_total(data_sql, pk, count, estimable)
+
+            if cursor is not None:
+                if self.meta.pk is None:
+                    raise CustomException(msg="游标分页需要模型主键")
+                keys = self._cursor_keys(order, pk)
+                if cursor:
+                    data_sql = data_sql.where(self._cursor_condition(keys, self._decode_cursor(cursor, keys)))
+                result: Result = await self.db.execute(data_sql.order_by(*self._cursor_order(keys)).limit(limit + 1))
+                objs = list(result.scalars().all())
+                has_next = len(objs) > limit
+                objs = objs[:limit]
+                next_cursor = self._encode_cursor(keys, objs[-1]) if has_next and objs else None
+                page_no = None
+            else:
+                result = await self.db.execute(
+                    data_sql.order_by(*self._parse_order(order)).offset(offset).limit(limit + 1)
+                )
+                objs = list(result.scalars().all())
+                has_next = len(objs) > limit
+                objs = objs[:limit]
+                next_cursor = None
+                page_no = offset // limit + 1 if limit else 1
 
             items = (
                 [out_schema.model_validate(obj).model_dump() for obj in objs]
                 if out_schema
-                else list(objs)
+                else objs
             )
 
             return PageResultSchema(
-                page_no=offset // limit + 1 if limit else 1,
+                page_no=page_no,
                 page_size=limit or 10,
                 total=total,
-                has_next=offset + limit < total,
+                has_next=has_next,
+                next_cursor=next_cursor,
                 items=items,
             )
         except CustomException:
@@ -333,6 +412,146 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         except Exception as e:
             raise CustomException(msg=f"分页查询失败: {e!s}")
 
+    async def _page_total(self, data_sql: Select, pk: Any, count: PageCountEnum, estimable: bool = False) -> int | None:
+        """
+        按统计方式计算分页总数
+
+        参数:
+        - data_sql: 已附加筛选与数据权限条件的查询
+        - pk: 主键列
+        - count: 统计方式
+        - estimable: 查询是否未附加任何筛选条件（否则 estimate 回退精确统计，避免返回跨租户 / 越权的整表行数）
+
+        返回:
+        - 总数（count=none 时为 None）
+        """
+        if count == PageCountEnum.none:
+            return None
+        if count == PageCountEnum.estimate and estimable:
+            estimated = await self._estimate_rows()
+            if estimated is not None:
+                return estimated
+        count_sql = select(func.count(pk)).select_from(self.model)
+        where_clause = data_sql.whereclause
+        if where_clause is not None:
+            count_sql = count_sql.where(where_clause)
+        total_result = await self.db.execute(count_sql)
+        return total_result.scalar() or 0
+
+    async def _estimate_rows(self) -> int | None:
+        """
+        读取数据库统计信息中的表行数估算值（不支持的数据库返回 None，回退精确统计）
+        """
+        table_name = self.model.__tablename__
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            sql = text("SELECT reltuples::bigint FROM pg_class WHERE relname = :name")
+        elif dialect == "mysql":
+            sql = text(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :name"
+            )
+        else:
+            return None
+        result = await self.db.execute(sql, {"name": table_name})
+        estimated = result.scalar()
+        # PostgreSQL 从未 ANALYZE 过的表 reltuples 为 -1
+        if estimated is None or estimated < 0:
+            return None
+        return int(estimated)
+
+    def _cursor_keys(self, order: list[dict[str, str]], pk: Any) -> list[tuple[str, Any, bool]]:
+        """
+        游标分页的排序键：order_by 列 + 主键（保证排序唯一）
+
+        返回:
+        - [(字段名, 列, 是否降序)]
+        """
+        keys: list[tuple[str, Any, bool]] = []
+        for item in order:
+            for field, direction in item.items():
+                keys.append((field, getattr(self.model, field), direction.lower() == "desc"))
+        if pk.key not in {field for field, _, _ in keys}:
+            keys.append((pk.key, pk, keys[-1][2] if keys else False))
+        return keys
+
+    @staticmethod
+    def _nullable(col: Any) -> bool:
+        """排序列是否可为空（主键与 NOT NULL 列无需 NULL 处理）"""
+        return bool(getattr(getattr(col, "expression", col), "nullable", False))
+
+    @classmethod
+    def _cursor_order(cls, keys: list[tuple[str, Any, bool]]) -> list[ColumnElement]:
+        """
+        游标分页的排序表达式：可空列视 NULL 为最大值（升序排在最后、降序排在最前）
+
+        以 ``col IS NULL`` 前置排序实现，不依赖各数据库对 NULLS FIRST / LAST 的支持差异。
+        """
+        order: list[ColumnElement] = []
+        for _, col, is_desc in keys:
+            direction = desc if is_desc else asc
+            if cls._nullable(col):
+                order.append(direction(col.is_(None)))
+            order.append(direction(col))
+        return order
+
+    @classmethod
+    def _cursor_condition(cls, keys: list[tuple[str, Any, bool]], values: list[Any]) -> ColumnElement:
+        """
+        构建 keyset 条件：(c1 > v1) OR (c1 = v1 AND c2 > v2) OR ...（降序列使用 <）
+
+        可空列按 NULL 为最大值处理，比较与相等均使用 NULL 安全的谓词，与 ``_cursor_order`` 的顺序一致。
+        """
+        clauses = []
+        for i, (_, col, is_desc) in enumerate(keys):
+            equal_prefix = [cls._cursor_equal(keys[j][1], values[j]) for j in range(i)]
+            clauses.append(and_(*equal_prefix, cls._cursor_step(col, values[i], is_desc)))
+        return or_(*clauses)
+
+    @staticmethod
+    def _cursor_equal(col: Any, value: Any) -> ColumnElement:
+        return col.is_(None) if value is None else col == value
+
+    @classmethod
+    def _cursor_step(cls, col: Any, value: Any, is_desc: bool) -> ColumnElement:
+        nullable = cls._nullable(col)
+        if value is None:
+            # NULL 为最大值：升序之后没有更大的值，降序之后是全部非空值
+            return col.is_not(None) if is_desc else false()
+        if is_desc:
+            return col < value
+        return or_(col > value, col.is_(None)) if nullable else col > value
+
+    @staticmethod
+    def _encode_cursor(keys: list[tuple[str, Any, bool]], obj: Any) -> str:
+        """将末行的排序键值编码为不透明游标（含排序签名，防止与其他排序混用）"""
+        values = []
+        for field, _, _ in keys:
+            value = getattr(obj, field)
+            values.append(value.isoformat() if isinstance(value, (datetime, date)) else value)
+        payload = {"k": [f"{field}:{'d' if is_desc else 'a'}" for field, _, is_desc in keys], "v": values}
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, keys: list[tuple[str, Any, bool]]) -> list[Any]:
+        """解析游标并按列类型还原排序键值"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            signature = [f"{field}:{'d' if is_desc else 'a'}" for field, _, is_desc in keys]
+            if payload.get("k") != signature or len(payload.get("v", [])) != len(keys):
+                raise ValueError("排序签名不一致")
+            values = []
+            for (_, col, _), value in zip(keys, payload["v"], strict=True):
+                python_type = col.type.python_type
+                if value is not None and python_type in (datetime, date):
+                    value = python_type.fromisoformat(value)
+                values.append(value)
+            return values
+        except Exception:
+            raise CustomException(msg="分页游标无效或与当前排序不匹配")
+
     async def create(self, data: CreateSchemaType) -> ModelType:
         """创建新对象（有认证时自动填充租户与审计字段）
 
@@ -381,8 +600,7 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         """
         try:
             obj_dict = data if isinstance(data, dict) else data.model_dump(exclude_unset=True, exclude={"id"})
-            model_defaults = getattr(self.model, "__loader_options__", [])
-            obj = await self._get_one(id=id, preload=model_defaults)
+            obj = await self._get_one(id=id, preload=list(self.meta.default_preload))
             if not obj:
                 raise CustomException(msg="更新对象不存在")
 
@@ -391,8 +609,7 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
                 if hasattr(obj, "tenant_id"):
                     obj_tid = getattr(obj, "tenant_id", None)
                     if obj_tid is not None and obj_tid != self.auth.user.tenant_id:
-                        is_platform = getattr(self.model, "__platform_data_shared__", False)
-                        if is_platform and obj_tid == 1:
+                        if self.meta.platform_shared and obj_tid == 1:
                             raise CustomException(msg="平台数据仅管理员可修改")
                         raise CustomException(msg="无权修改其他租户的数据")
 
@@ -480,7 +697,7 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         """过滤数据权限（仅用于 Select）"""
         if not self.auth:
             return sql
-        if getattr(self.model, "__platform_data_shared__", False):
+        if self.meta.platform_shared:
             for condition in self._platform_shared_conditions():
                 sql = sql.where(condition)
         filter_obj = Permission(model=self.model, auth=self.auth)
@@ -491,33 +708,30 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
             return []
         tid = self.auth.user.tenant_id
         if tid is not None and tid != 1:
-            return [
-                (getattr(self.model, "tenant_id") == tid)
-                | (getattr(self.model, "tenant_id") == 1)
-            ]
+            return [(self.meta.tenant_id == tid) | (self.meta.tenant_id == 1)]
         return []
 
     def _tenant_dml_where(self, sql):
         """为 DML 语句注入 tenant_id 条件（不读平台数据）"""
-        if self.auth and hasattr(self.model, "tenant_id") \
+        if self.auth and self.meta.tenant_id is not None \
            and self.auth.user and not self.auth.user.is_superuser:
             tid = self.auth.tenant_id
             if tid is not None:
-                return sql.where(getattr(self.model, "tenant_id") == tid)
+                return sql.where(self.meta.tenant_id == tid)
         return sql
 
     async def __build_conditions(self, **kwargs) -> list[ColumnElement]:
         conditions: list[ColumnElement] = []
+        meta = self.meta
 
-        if hasattr(self.model, "is_deleted"):
-            conditions.append(getattr(self.model, "is_deleted") == False)  # noqa: E712
+        if meta.is_deleted is not None:
+            conditions.append(meta.is_deleted == False)  # noqa: E712
 
-        if self.auth and hasattr(self.model, "tenant_id") \
-           and not getattr(self.model, "__platform_data_shared__", False):
+        if self.auth and meta.tenant_id is not None and not meta.platform_shared:
             if self.auth.user and not self.auth.user.is_superuser:
                 tid = self.auth.tenant_id
                 if tid is not None:
-                    conditions.append(getattr(self.model, "tenant_id") == tid)
+                    conditions.append(meta.tenant_id == tid)
 
         for key, value in kwargs.items():
             if value is None or value == "":
@@ -526,46 +740,9 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
             attr = getattr(self.model, key)
             if isinstance(value, tuple):
                 seq, val = value
-                if seq == "None":
-                    conditions.append(attr.is_(None))
-                elif seq == "not None":
-                    conditions.append(attr.isnot(None))
-                elif seq == "date" and val:
-                    dt = datetime.strptime(val, "%Y-%m-%d")
-                    conditions.append(attr >= dt)
-                    conditions.append(attr < dt + timedelta(days=1))
-                elif seq == "month" and val:
-                    dt = datetime.strptime(val, "%Y-%m")
-                    next_month = (
-                        dt.replace(year=dt.year + 1, month=1)
-                        if dt.month == 12
-                        else dt.replace(month=dt.month + 1)
-                    )
-                    conditions.append(attr >= dt)
-                    conditions.append(attr < next_month)
-                elif seq == "like" and val:
-                    conditions.append(attr.like(f"%{val}%"))
-                elif seq == "in":
-                    if val is None:
-                        continue
-                    if isinstance(val, (list, tuple, set)) and len(val) == 0:
-                        conditions.append(false())
-                    else:
-                        conditions.append(attr.in_(val))
-                elif seq == "between" and isinstance(val, (list, tuple)) and len(val) == 2:
-                    conditions.append(attr.between(val[0], val[1]))
-                elif seq in ("!=", "ne") and val is not None:
-                    conditions.append(attr != val)
-                elif seq in (">", "gt") and val is not None:
-                    conditions.append(attr > val)
-                elif seq in (">=", "ge") and val is not None:
-                    conditions.append(attr >= val)
-                elif seq in ("<", "lt") and val is not None:
-                    conditions.append(attr < val)
-                elif seq in ("<=", "le") and val is not None:
-                    conditions.append(attr <= val)
-                elif seq in ("eq", "==") and val is not None:
-                    conditions.append(attr == val)
+                operator = OPERATORS.get(seq)
+                if operator is not None:
+                    conditions.extend(operator(attr, val))
             else:
                 conditions.append(attr == value)
         return conditions
@@ -582,41 +759,4 @@ class CRUDBase[ModelType: MappedBase, CreateSchemaType: BaseModel, UpdateSchemaT
         返回:
         - 排序表达式列表
         """
-        columns: list[ColumnElement] = []
-        for item in order:
-            for field, direction in item.items():
-                column = getattr(self.model, field)
-                columns.append(desc(column) if direction.lower() == "desc" else asc(column))
-        return columns
-
-    def __loader_options(
-        self, preload: list[str | Any] | None = None
-    ) -> list[Any]:
-        """
-        构建预加载选项
-
-        参数:
-        - preload: 预加载关系，支持关系名字符串或 SQLAlchemy loader option
-
-        返回:
-        - 预加载选项列表
-        """
-        options: list[Any] = []
-        model_loader_options = getattr(self.model, "__loader_options__", [])
-
-        all_preloads: set[str | Any] = set(model_loader_options)
-        if preload:
-            for opt in preload:
-                if isinstance(opt, str):
-                    all_preloads.add(opt)
-        elif preload == []:
-            all_preloads = set()
-
-        for opt in all_preloads:
-            if isinstance(opt, str):
-                if hasattr(self.model, opt):
-                    options.append(selectinload(getattr(self.model, opt)))
-            else:
-                options.append(opt)
-
-        return options
+        return list(self.meta.order(order))
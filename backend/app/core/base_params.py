@@ -3,7 +3,7 @@ from dataclasses import dataclass
 
 from fastapi import Query
 
-from app.common.enums import QueueEnum
+from app.common.enums import PageCountEnum, QueueEnum
 from app.core.validator import DateTimeStr
 
 
@@ -42,7 +42,7 @@ def _unwrap_query_defaults(self: object) -> None:
 
 @dataclass
 class PaginationQueryParam(QueryParam):
-    """分页 —— 自动继承 page_no / page_size / order_by，子类无需重复声明"""
+    """分页 —— 自动继承 page_no / page_size / order_by / cursor / count，子类无需重复声明"""
 
     page_no: int = Query(default=1, description="当前页码", ge=1)
     page_size: int = Query(default=10, description="每页数量", ge=1, le=100)
@@ -50,6 +50,11 @@ class PaginationQueryParam(QueryParam):
         default=None,
         description="排序字段,格式:[{'field1': 'asc'}, {'field2': 'desc'}]",
     )
+    cursor: str | None = Query(
+        default=None,
+        description="游标分页：首页传空字符串，后续传上一页返回的 next_cursor（传入时忽略 page_no）",
+    )
+    count: PageCountEnum = Query(default=PageCountEnum.exact, description="总数统计方式: exact/estimate/none")
 
     def __post_init__(self) -> None:
         if self.order_by and isinstance(self.order_by, str):
@@ -92,12 +92,14 @@ class AuthSchema(BaseModel):
     """权限认证模型
 
     ``user`` 字段运行时为 ``Any``（避免与 SQLAlchemy 懒加载冲突，也避免
-    循环依赖）。通过 ``get_user()`` 方法获得 IDE 类型推断。
+    循环依赖）。请求认证链路中为不可变的 ``UserPrincipal`` 快照（属性名与
+    ``UserModel`` 一致），登录等内部流程中也可能直接是 ``UserModel``。
+    通过 ``get_user()`` 方法获得 IDE 类型推断。
     """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    user: Any = Field(default=None, description="用户信息（UserModel 实例）", exclude=True)
+    user: Any = Field(default=None, description="用户信息（UserPrincipal / UserModel 实例）", exclude=True)
     check_data_scope: bool = Field(default=True, description="是否检查数据权限")
     db: AsyncSession | None = Field(default=None, description="数据库会话", exclude=True)
     tenant_id: int | None = Field(default=None, description="租户ID,用于用户认证前查询")
@@ -153,8 +155,9 @@ class PageResultSchema[T](BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
-    page_no: int | None = Field(default=None, ge=1, description="页码，默认为1")
+    page_no: int | None = Field(default=None, ge=1, description="页码，默认为1（游标分页时为空）")
     page_size: int | None = Field(default=None, ge=1, description="页面大小，默认为10")
-    total: int = Field(default=0, ge=0, description="总记录数")
+    total: int | None = Field(default=0, ge=0, description="总记录数（count=none 时为空，count=estimate 时为估算值）")
     has_next: bool | None = Field(default=False, description="是否有下一页")
+    next_cursor: str | None = Field(default=None, description="下一页游标（游标分页模式，无下一页时为空）")
     items: list[T] = Field(default_factory=list, description="分页后的数据列表")
@@ -60,6 +60,6 @@ async def clear(namespace: str | None = None) -> None:
     if _REDIS is None:
         return
     pattern = f"{_PREFIX}:{namespace}:*" if namespace else f"{_PREFIX}:*"
-    keys = [key async for key in _REDIS.scan_iter(match=pattern)]
-    if keys:
-        await _REDIS.delete(*keys)
+    keys = [key async for key in _REDIS.scan_iter(match=pattern, count=1000)]
+    for i in range(0, len(keys), 500):
+        await _REDIS.unlink(*keys[i : i + 500])
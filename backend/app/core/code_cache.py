@@ -0,0 +1,89 @@
+"""任务代码块编译缓存
+
+定时任务节点、工作流节点每次执行都要把 ``code_block`` 源码重新解析、编译一遍，
+高频 interval 任务和大型工作流会反复编译完全相同的源码。
+
+这里按源码内容哈希缓存编译后的 code 对象（有界 LRU）：
+
+- 只缓存 code 对象，每次执行仍在全新的模块命名空间中运行，代码块的模块级状态不会在执行间共享
+- 键为内容哈希，节点修改 ``func`` 后自然命中新条目；``NodeService`` / ``WorkflowNodeTypeService``
+  更新时调用 ``invalidate`` 立即释放旧源码的条目（其他 worker 的旧条目由 LRU 淘汰）
+- 执行器线程池中并发调用，读写加锁
+"""
+
+import hashlib
+import threading
+import time
+import types
+from collections import OrderedDict
+from typing import Any
+
+from app.config.setting import settings
+
+_FILENAME = "<node_task>"
+
+_CODES: OrderedDict[bytes, types.CodeType] = OrderedDict()
+_LOCK = threading.Lock()
+_STATS: dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+
+def _key(source: str) -> bytes:
+    return hashlib.blake2b(source.encode("utf-8"), digest_size=16).digest()
+
+
+def get_code(source: str) -> tuple[types.CodeType, float]:
+    """
+    取得代码块编译后的 code 对象，未命中时编译并缓存。
+
+    参数:
+    - source (str): 代码块源码。
+
+    返回:
+    - tuple[types.CodeType, float]: code 对象与本次编译耗时（秒，命中时为 0）。
+    """
+    key = _key(source)
+    with _LOCK:
+        code = _CODES.get(key)
+        if code is not None:
+            _CODES.move_to_end(key)
+            _STATS["hits"] += 1
+            return code, 0.0
+
+    # 编译放在锁外，并发首次执行同一代码块时最多重复编译一次
+    started = time.perf_counter()
+    code = compile(source, _FILENAME, "exec")
+    elapsed = time.perf_counter() - started
+    with _LOCK:
+        _STATS["misses"] += 1
+        _CODES[key] = code
+        _CODES.move_to_end(key)
+        while len(_CODES) > settings.TASK_CODE_CACHE_SIZE:
+            _CODES.popitem(last=False)
+            _STATS["evictions"] += 1
+    return code, elapsed
+
+
+def invalidate(source: str | None = None) -> None:
+    """
+    丢弃代码块的编译结果（节点代码修改后调用）。
+
+    参数:
+    - source (str | None): 修改前的代码块源码，None 表示清空。
+    """
+    with _LOCK:
+        _STATS["invalidations"] += 1
+        if source is None:
+            _CODES.clear()
+        else:
+            _CODES.pop(_key(source), None)
+
+
+def stats() -> dict[str, Any]:
+    """
+    缓存统计。
+
+    返回:
+    - dict[str, Any]: 条目数、容量与命中/未命中/淘汰/失效次数。
+    """
+    with _LOCK:
+        return {"size": len(_CODES), "maxsize": settings.TASK_CODE_CACHE_SIZE, **_STATS}
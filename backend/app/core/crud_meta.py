@@ -0,0 +1,189 @@
+"""CRUD 模型元数据描述符
+
+CRUDBase 每次调用都要用到的模型信息（主键列、软删除/租户列、平台共享标记、
+默认预加载关系、排序列）在每个模型上只解析一次并缓存在模型类上，
+避免每个请求重复 ``sa_inspect`` / ``hasattr`` / ``selectinload(...)``。
+
+同时提供查询条件的运算符分派表，替代逐个 ``elif`` 比较的条件构建链。
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Select, asc, desc, false, select
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import selectinload
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def _op_date(attr: Any, val: Any) -> list[ColumnElement]:
+    if not val:
+        return []
+    dt = datetime.strptime(val, "%Y-%m-%d")
+    return [attr >= dt, attr < dt + timedelta(days=1)]
+
+
+def _op_month(attr: Any, val: Any) -> list[ColumnElement]:
+    if not val:
+        return []
+    dt = datetime.strptime(val, "%Y-%m")
+    next_month = dt.replace(year=dt.year + 1, month=1) if dt.month == 12 else dt.replace(month=dt.month + 1)
+    return [attr >= dt, attr < next_month]
+
+
+def _op_in(attr: Any, val: Any) -> list[ColumnElement]:
+    if val is None:
+        return []
+    if isinstance(val, (list, tuple, set)) and len(val) == 0:
+        return [false()]
+    return [attr.in_(val)]
+
+
+def _op_between(attr: Any, val: Any) -> list[ColumnElement]:
+    if isinstance(val, (list, tuple)) and len(val) == 2:
+        return [attr.between(val[0], val[1])]
+    return []
+
+
+def _binary(fn: Callable[[Any, Any], ColumnElement]) -> Callable[[Any, Any], list[ColumnElement]]:
+    """值为 None 时忽略的二元比较"""
+    return lambda attr, val: [fn(attr, val)] if val is not None else []
+
+
+# 查询条件运算符分派表：(seq) -> (列, 值) -> 条件列表（空列表表示忽略该条件）
+OPERATORS: dict[str, Callable[[Any, Any], list[ColumnElement]]] = {
+    "None": lambda attr, val: [attr.is_(None)],
+    "not None": lambda attr, val: [attr.isnot(None)],
+    "date": _op_date,
+    "month": _op_month,
+    "like": lambda attr, val: [attr.like(f"%{val}%")] if val else [],
+    "in": _op_in,
+    "between": _op_between,
+    "!=": _binary(lambda attr, val: attr != val),
+    "ne": _binary(lambda attr, val: attr != val),
+    ">": _binary(lambda attr, val: attr > val),
+    "gt": _binary(lambda attr, val: attr > val),
+    ">=": _binary(lambda attr, val: attr >= val),
+    "ge": _binary(lambda attr, val: attr >= val),
+    "<": _binary(lambda attr, val: attr < val),
+    "lt": _binary(lambda attr, val: attr < val),
+    "<=": _binary(lambda attr, val: attr <= val),
+    "le": _binary(lambda attr, val: attr <= val),
+    "eq": _binary(lambda attr, val: attr == val),
+    "==": _binary(lambda attr, val: attr == val),
+}
+
+
+@dataclass(slots=True)
+class CRUDMeta:
+    """单个模型的 CRUD 元数据（首次使用时解析，之后复用）"""
+
+    model: type
+    pk: Any
+    pk_count: int
+    soft_delete: bool
+    is_deleted: Any
+    tenant_id: Any
+    platform_shared: bool
+    default_preload: tuple[str, ...]
+    _select_cache: dict[tuple[str, ...], Select] = field(default_factory=dict)
+    _order_cache: dict[tuple[tuple[str, str], ...], tuple[ColumnElement, ...]] = field(default_factory=dict)
+
+    @classmethod
+    def of(cls, model: type) -> "CRUDMeta":
+        """
+        获取模型元数据（缓存在模型类的 ``__crud_meta__`` 上）。
+
+        参数:
+        - model (type): ORM 模型类。
+
+        返回:
+        - CRUDMeta: 元数据描述符。
+        """
+        meta = model.__dict__.get("__crud_meta__")
+        if meta is None:
+            meta = cls._build(model)
+            model.__crud_meta__ = meta
+        return meta
+
+    @classmethod
+    def _build(cls, model: type) -> "CRUDMeta":
+        pk_cols = list(getattr(sa_inspect(model), "primary_key", []))
+        return cls(
+            model=model,
+            pk=pk_cols[0] if pk_cols else None,
+            pk_count=len(pk_cols),
+            soft_delete=all(hasattr(model, attr) for attr in ("is_deleted", "deleted_time", "deleted_id")),
+            is_deleted=getattr(model, "is_deleted", None),
+            tenant_id=getattr(model, "tenant_id", None),
+            platform_shared=bool(getattr(model, "__platform_data_shared__", False)),
+            default_preload=tuple(sorted(opt for opt in getattr(model, "__loader_options__", []) if isinstance(opt, str))),
+        )
+
+    def preload_key(self, preload: list[str | Any] | None) -> tuple[tuple[str, ...], list[Any]]:
+        """
+        归一化预加载参数。
+
+        参数:
+        - preload: None 使用模型默认预加载；[] 不预加载；否则在默认基础上追加。
+
+        返回:
+        - tuple[tuple[str, ...], list[Any]]: (关系名缓存键, 额外的 loader option 对象)
+        """
+        if preload == []:
+            return (), []
+        if not preload:
+            return self.default_preload, []
+        names = set(self.default_preload)
+        extra: list[Any] = []
+        for opt in preload:
+            if isinstance(opt, str):
+                names.add(opt)
+            else:
+                extra.append(opt)
+        return tuple(sorted(names)), extra
+
+    def base_select(self, preload: list[str | Any] | None = None) -> Select:
+        """
+        带预加载选项的 ``select(model)``，按预加载组合缓存（Select 为不可变的生成式对象，可安全复用）。
+
+        参数:
+        - preload: 预加载关系。
+
+        返回:
+        - Select: 基础查询。
+        """
+        key, extra = self.preload_key(preload)
+        sql = self._select_cache.get(key)
+        if sql is None:
+            options = [selectinload(getattr(self.model, name)) for name in key if hasattr(self.model, name)]
+            sql = select(self.model).options(*options) if options else select(self.model)
+            self._select_cache[key] = sql
+        return sql.options(*extra) if extra else sql
+
+    def order(self, order: list[dict[str, str]]) -> tuple[ColumnElement, ...]:
+        """
+        解析并缓存排序表达式。
+
+        参数:
+        - order: 排序字段列表, 格式为 [{'id': 'asc'}, {'name': 'desc'}]
+
+        返回:
+        - tuple[ColumnElement, ...]: 排序表达式
+        """
+        key = tuple(
+            (field, "desc" if direction.lower() == "desc" else "asc") for item in order for field, direction in item.items()
+        )
+        columns = self._order_cache.get(key)
+        if columns is None:
+            # 排序来自请求参数，组合过多时整体重建，避免缓存无限增长
+            if len(self._order_cache) >= 256:
+                self._order_cache.clear()
+            columns = tuple(
+                desc(getattr(self.model, field)) if direction == "desc" else asc(getattr(self.model, field))
+                for field, direction in key
+            )
+            self._order_cache[key] = columns
+        return columns
@@ -132,6 +132,21 @@ async def drop_tables() -> None:
         await conn.run_sync(MappedBase.metadata.drop_all)
 
 
+def redis_url() -> str:
+    """
+    按配置构建 Redis 连接 URL（处理用户名和密码的组合情况）。
+
+    返回:
+    - str: Redis URL。
+    """
+    auth_part = ""
+    if settings.REDIS_USER and settings.REDIS_PASSWORD:
+        auth_part = f"{settings.REDIS_USER}:{settings.REDIS_PASSWORD}@"
+    elif settings.REDIS_PASSWORD:
+        auth_part = f":{settings.REDIS_PASSWORD}@"
+    return f"redis://{auth_part}{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB_NAME}"
+
+
 async def redis_connect(app: FastAPI, status: bool) -> Redis | None:
     """
     创建或关闭Redis连接。
@@ -151,16 +166,8 @@ async def redis_connect(app: FastAPI, status: bool) -> Redis | None:
 
     if status:
         try:
-            # 构建 Redis URL：处理用户名和密码的组合情况
-            auth_part = ""
-            if settings.REDIS_USER and settings.REDIS_PASSWORD:
-                auth_part = f"{settings.REDIS_USER}:{settings.REDIS_PASSWORD}@"
-            elif settings.REDIS_PASSWORD:
-                auth_part = f":{settings.REDIS_PASSWORD}@"
-            
-            redis_url = f"redis://{auth_part}{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB_NAME}"
             rd = await Redis.from_url(
-                url=redis_url,
+                url=redis_url(),
                 encoding="utf-8",
                 decode_responses=True,
                 health_check_interval=20,
@@ -12,17 +12,20 @@ from sqlalchemy.orm import selectinload
 
 from app.common.enums import RedisInitKeyConfig
 from app.config.setting import settings
+from app.core import principal as principal_cache
 from app.core.base_schema import AuthSchema
 from app.core.database import async_db_session
 from app.core.exceptions import CustomException
 from app.core.logger import logger
+from app.core.permission_index import PermissionIndex
+from app.core.principal import UserPrincipal
 from app.core.redis_crud import RedisCURD
 from app.core.request_context import RequestContext
 from app.core.request_context import get_current_tenant_id as _get_ctx_tenant_id
 from app.core.security import OAuth2Schema, decode_access_token
 
-# 套餐菜单权限缓存: {tenant_id: (timestamp, [menu_ids])}
-_package_menu_cache: dict[int, tuple[float, list[int]]] = {}
+# 套餐菜单权限位图缓存: {tenant_id: (timestamp, permission_bits)}
+_package_menu_cache: dict[int, tuple[float, int]] = {}
 
 
 async def db_getter() -> AsyncGenerator[AsyncSession, None]:
@@ -59,87 +62,59 @@ async def get_current_tenant_id() -> int | None:
     """
     return _get_ctx_tenant_id()
 
-async def _decode_token_info(token: str, redis: Redis) -> tuple[dict, str]:
-    """解码 JWT token 返回 (user_info, session_id)
-
-    JWT sub 现为纯 session_id，完整会话信息从 Redis 读取。
+def _decode_session_id(token: str) -> str:
+    """解码 JWT 访问令牌返回 session_id（JWT sub 为纯 session_id，完整会话信息从 Redis 读取）
 
     参数:
         token: JWT token 字符串
-        redis: Redis 连接
 
     返回:
-        (user_info, session_id): 用户信息字典和会话 ID
+        str: 会话 ID
     """
     payload = decode_access_token(token)
     if not payload or not hasattr(payload, "is_refresh") or payload.is_refresh:
         raise CustomException(msg="非法凭证", code=10401, status_code=401)
-
-    session_id = payload.sub
-    if not session_id:
-        raise CustomException(msg="认证已失效", code=10401, status_code=401)
-
-    raw = await RedisCURD(redis).get(
-        f"{RedisInitKeyConfig.USER_SESSION.key}:{session_id}"
-    )
-    if not raw:
+    if not payload.sub:
         raise CustomException(msg="认证已失效", code=10401, status_code=401)
+    return payload.sub
 
-    user_info = json.loads(raw)
-    return user_info, session_id
 
+async def fetch_session_state(redis: Redis, session_id: str) -> tuple[dict | None, int]:
+    """一次 Redis 往返获取会话信息、访问令牌在线状态（TTL），并按需滑动续期
 
-async def _check_token_online(redis: Redis, session_id: str) -> None:
-    """检查 token 是否在线（Redis 中存在对应 session）
+    续期仅在 token 剩余不足一半时触发（TTL 返回秒，配置也是秒，无需转换）。
 
     参数:
         redis: Redis 连接
         session_id: 会话 ID
-    """
-    online_ok = await RedisCURD(redis).exists(
-        key=f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}"
-    )
-    if not online_ok:
-        raise CustomException(msg="认证已失效", code=10401, status_code=401)
-
-
-async def _try_sliding_refresh(redis: Redis, session_id: str) -> None:
-    """滑动过期续期（仅在 token 剩余不足一半时触发）
 
-    参数:
-        redis: Redis 连接
-        session_id: 会话 ID
+    返回:
+        (user_info, ttl): 会话信息（不存在为 None）和访问令牌剩余 TTL（-2 表示不在线）
     """
-    if not settings.TOKEN_SLIDING_EXPIRE:
-        return
-
-    ttl = await RedisCURD(redis).ttl(
-        key=f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}"
-    )
-    # TTL 返回秒，配置也是秒，无需转换
     expire_seconds = settings.ACCESS_TOKEN_EXPIRE_SECONDS
-    if ttl > 0 and ttl < expire_seconds // 2:
-        await RedisCURD(redis).expire(
-            key=f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}",
-            expire=expire_seconds,
-        )
-        await RedisCURD(redis).expire(
-            key=f"{RedisInitKeyConfig.REFRESH_TOKEN.key}:{session_id}",
-            expire=settings.REFRESH_TOKEN_EXPIRE_SECONDS,
-        )
+    raw, ttl = await RedisCURD(redis).session_state(
+        session_key=f"{RedisInitKeyConfig.USER_SESSION.key}:{session_id}",
+        access_key=f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}",
+        refresh_key=f"{RedisInitKeyConfig.REFRESH_TOKEN.key}:{session_id}",
+        renew_below=expire_seconds // 2 if settings.TOKEN_SLIDING_EXPIRE else 0,
+        access_expire=expire_seconds,
+        refresh_expire=settings.REFRESH_TOKEN_EXPIRE_SECONDS,
+    )
+    return (json.loads(raw) if raw else None), ttl
 
-async def _load_user_from_db(db: AsyncSession, username: str):
-    """从数据库加载用户（含角色、菜单、部门、职位全量预加载）
+
+async def _load_user_from_db(db: AsyncSession, user_id: int):
+    """从数据库加载用户（含角色、菜单、部门全量预加载）
 
     使用原始查询以绕过 CRUDBase 的权限过滤，确保用户认证阶段不受数据权限影响。
-    所有关系链均 eager-loaded，调用方可在会话关闭后安全访问对象属性。
+    仅在认证主体缓存未命中时调用，结果会被转换为不可变的 ``UserPrincipal``。
 
     参数:
         db: 数据库会话
-        username: 用户名
+        user_id: 用户ID
 
     返回:
-        UserModel: 已全量加载的用户 ORM 对象
+        UserModel: 已预加载角色/菜单/部门的用户 ORM 对象
     """
     from app.api.v1.module_system.role.model import RoleModel
     from app.api.v1.module_system.user.model import UserModel
@@ -147,12 +122,10 @@ async def _load_user_from_db(db: AsyncSession, username: str):
     stmt = (
         select(UserModel)
         .options(
-            selectinload(UserModel.dept),
             selectinload(UserModel.roles).selectinload(RoleModel.menus),
-            selectinload(UserModel.positions),
-            selectinload(UserModel.created_by),
+            selectinload(UserModel.roles).selectinload(RoleModel.depts),
         )
-        .where(UserModel.username == username, UserModel.is_deleted == False)  # noqa: E712
+        .where(UserModel.id == user_id, UserModel.is_deleted == False)  # noqa: E712
     )
     result = await db.execute(stmt)
     user = result.scalars().first()
@@ -160,14 +133,30 @@ async def _load_user_from_db(db: AsyncSession, username: str):
         raise CustomException(msg="用户不存在", code=10401, status_code=401)
     if user.status == 1:
         raise CustomException(msg="用户已被停用", code=10401, status_code=401)
+    return user
 
-    # 过滤不可用的角色和职位（在会话内完成，确保关联数据已加载）
-    if hasattr(user, "roles"):
-        user.roles = [role for role in user.roles if role and role.status]
-    if hasattr(user, "positions"):
-        user.positions = [pos for pos in user.positions if pos and pos.status]
 
-    return user
+async def _load_principal(redis: Redis, user_id: int) -> UserPrincipal:
+    """获取用户认证快照：进程内缓存 + Redis 版本号校验，未命中时回源数据库
+
+    参数:
+        redis: Redis 连接
+        user_id: 用户ID
+
+    返回:
+        UserPrincipal: 用户认证快照
+    """
+    version = await principal_cache.get_version(redis, user_id)
+    principal = principal_cache.get_cached(user_id, version)
+    if principal is not None:
+        return principal
+
+    # 用户查询使用独立只读会话（不参与请求事务，查询后立即释放快照）
+    async with async_db_session() as lookup_db:
+        user = await _load_user_from_db(lookup_db, user_id)
+        principal = UserPrincipal.from_model(user)
+    principal_cache.put_cached(principal, version)
+    return principal
 
 async def get_current_user(
     request: Request,
@@ -177,7 +166,7 @@ async def get_current_user(
 ) -> AuthSchema:
     """获取当前用户
 
-    用户查询使用独立的只读数据库会话（不参与请求事务，查询完成后立即释放快照），
+    用户信息来自认证主体缓存（命中时零 SQL，未命中时使用独立只读会话回源），
     返回的 auth.db 指向请求级事务会话供后续写操作使用。
 
     参数:
@@ -234,41 +223,39 @@ async def _authenticate(
     if token.startswith("Bearer"):
         token = token.split(" ")[1]
 
-    # 优先使用 TenantMiddleware 缓存在 request.state.ctx 中的会话信息（避免重复 Redis 读取）
-    user_info = None
-    if request:
-        ctx = getattr(request.state, "ctx", None)
-        user_info = ctx.jwt_user_info if ctx else None
-
-    if not user_info:
-        # 降级路径：自行从 Redis 读取会话信息
-        user_info, _ = await _decode_token_info(token, redis)
+    # 优先使用中间件预解析的认证上下文（同一 token 已解码并完成会话读取 / 在线检查 / 滑动续期）
+    ctx = getattr(request.state, "ctx", None) if request else None
+    if ctx and ctx.access_token == token and ctx.access_ttl is not None:
+        user_info, ttl = ctx.jwt_user_info, ctx.access_ttl
+    else:
+        # 降级路径（WebSocket / 未经中间件）：自行解码并读取会话
+        user_info, ttl = await fetch_session_state(redis, _decode_session_id(token))
 
+    if not user_info or ttl == -2:
+        raise CustomException(msg="认证已失效", code=10401, status_code=401)
     session_id = user_info.get("session_id")
     if not session_id:
         raise CustomException(msg="认证已失效", code=10401, status_code=401)
 
-    # Redis 在线检查 + 滑动续期
-    await _check_token_online(redis, session_id)
-    await _try_sliding_refresh(redis, session_id)
-
-    username = user_info.get("user_name")
-    if not username:
+    user_id = user_info.get("user_id")
+    if not user_id:
         raise CustomException(msg="认证已失效", code=10401, status_code=401)
     tenant_id = user_info.get("tenant_id")
 
-    # 用户查询使用独立只读会话（不参与请求事务，查询后立即释放快照）
-    async with async_db_session() as lookup_db:
-        user = await _load_user_from_db(lookup_db, username)
+    # 请求内复用已解析的认证快照，跨请求走 principal 缓存
+    user = ctx.principal if ctx and ctx.principal and ctx.principal.id == user_id else None
+    if user is None:
+        user = await _load_principal(redis, int(user_id))
 
     # 设置请求上下文（仅在当前 request 对象上，业务方通过 request.state.ctx 读取）
     if request:
         request.state.ctx = replace(
-            (getattr(request.state, "ctx", None) or RequestContext()),
+            (ctx or RequestContext()),
             user_id=user.id,
             user_username=user.username,
             session_id=session_id,
             session_info=user_info,
+            principal=user,
         )
 
     # 返回的 auth.db 指向请求级事务会话，供后续读写操作使用
@@ -276,8 +263,8 @@ async def _authenticate(
     auth.user = user
     return auth
 
-async def _get_cached_tenant_menu_ids(auth: AuthSchema, tenant_id: int) -> list[int]:
-    """获取租户可用菜单 ID，带 60s 进程级缓存
+async def _get_cached_tenant_permission_bits(auth: AuthSchema, tenant_id: int) -> int:
+    """获取租户套餐可用权限位图，带 60s 进程级缓存
 
     套餐菜单变更频率极低，缓存可大幅减少 AuthPermission 的 DB 查询次数。
 
@@ -286,7 +273,7 @@ async def _get_cached_tenant_menu_ids(auth: AuthSchema, tenant_id: int) -> list[
         tenant_id: 租户 ID
 
     返回:
-        可用菜单 ID 列表
+        套餐内启用菜单的权限位图
     """
     cached = _package_menu_cache.get(tenant_id)
     if cached and time.time() - cached[0] < 60:
@@ -294,11 +281,23 @@ async def _get_cached_tenant_menu_ids(auth: AuthSchema, tenant_id: int) -> list[
 
     from app.api.v1.module_platform.package.service import PackageService
 
-    result = await PackageService.get_tenant_available_menu_ids(auth, tenant_id)
+    result = PermissionIndex.mask(await PackageService(auth).get_tenant_available_permissions(tenant_id))
     _package_menu_cache[tenant_id] = (time.time(), result)
     return result
 
 
+def clear_package_menu_cache(tenant_id: int | None = None) -> None:
+    """清除租户套餐菜单进程级缓存（套餐菜单变更时调用）
+
+    参数:
+        tenant_id: 租户 ID，为 None 时清空全部
+    """
+    if tenant_id is None:
+        _package_menu_cache.clear()
+    else:
+        _package_menu_cache.pop(tenant_id, None)
+
+
 class AuthPermission:
     """权限验证类"""
 
@@ -316,6 +315,14 @@ class AuthPermission:
         """
         self.permissions = permissions or []
         self.check_data_scope = check_data_scope
+        self._required_bits: int | None = None
+
+    @property
+    def required_bits(self) -> int:
+        """接口所需权限位图（首次访问时编译）。"""
+        if self._required_bits is None:
+            self._required_bits = PermissionIndex.mask(self.permissions)
+        return self._required_bits
 
     async def __call__(self, auth: AuthSchema = Depends(get_current_user)) -> AuthSchema:
         """
@@ -346,27 +353,17 @@ class AuthPermission:
         if not auth.user or not auth.user.roles:
             raise CustomException(msg="无权限操作", code=10403, status_code=403)
 
-        # 收集角色权限（附带 menu_id 用于套餐过滤）
-        role_perms: dict[str, int] = {}
-        for role in auth.user.roles:
-            if role.status != 0:
-                continue
-            for menu in role.menus:
-                if menu.status == 0 and menu.permission:
-                    role_perms[menu.permission] = menu.id
-
-        if not role_perms:
+        # 角色权限位图（快照中已预编译）
+        user_bits = PermissionIndex.user_mask(auth.user)
+        if not user_bits:
             raise CustomException(msg="无权限操作", code=10403, status_code=403)
 
         # 租户用户：权限必须受套餐菜单约束（带 60s 进程级缓存）
         if auth.tenant_id:
-            allowed_ids = set(await _get_cached_tenant_menu_ids(auth, auth.tenant_id))
-            user_permissions = {p for p, mid in role_perms.items() if mid in allowed_ids}
-        else:
-            user_permissions = set(role_perms.keys())
+            user_bits &= await _get_cached_tenant_permission_bits(auth, auth.tenant_id)
 
         # 权限验证 - 满足任一权限即可
-        if not any(perm in user_permissions for perm in self.permissions):
+        if not user_bits & self.required_bits:
             logger.error(f"用户缺少任何所需的权限: {self.permissions}")
             raise CustomException(msg="无权限操作", code=10403, status_code=403)
 
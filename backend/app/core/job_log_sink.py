@@ -0,0 +1,460 @@
+"""定时任务执行日志写入器
+
+``SchedulerUtil.scheduler_event_listener`` 在事件循环线程（线程池执行器则在工作线程）中被调用，
+原先每个事件都要同步打开 ``Session(engine)`` 查询 / 提交，并通过 ``get_job`` 同步读取 RedisJobStore，
+任务每提交、完成一次，整个 worker 的 HTTP 请求都要等一次数据库往返。
+
+这里把执行日志改为内存状态 + 后台批量写入：
+
+- 每次执行对应一条内存记录，事件只修改记录并标记待写入（不做任何 I/O）；
+  周期任务的 pending 记录在提交时转为 running，之后变为 success / failed / timeout，始终是同一行
+- 后台任务在 ``LOG_SINK_FLUSH_INTERVAL_MS`` 内攒批：尚未写入的记录直接以最终状态插入，
+  已写入的按主键更新，短任务的「提交 → 执行中 → 完成」合并为一次写入
+- 任务名称、触发方式、下次执行时间、任务状态取自事件与 ``remember`` 登记的任务信息
+  （``SchedulerUtil`` 添加 / 修改任务时已持有 Job 对象），事件处理时不再读取任务存储；
+  登记之外的任务（如上次运行遗留在存储中的任务）由后台任务在工作线程中补查一次
+"""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from apscheduler.events import (
+    EVENT_ALL_JOBS_REMOVED,
+    EVENT_JOB_ADDED,
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MISSED,
+    EVENT_JOB_REMOVED,
+    EVENT_JOB_SUBMITTED,
+)
+from sqlalchemy import delete, select, update
+
+from app.config.setting import settings
+from app.core.database import async_db_session
+from app.core.logger import logger
+
+# 任务状态常量（与 JobModel.status 注释保持一致：0:待执行 1:执行中 2:成功 3:失败 4:超时 5:已取消）
+JOB_STATUS_PENDING = 0
+JOB_STATUS_RUNNING = 1
+JOB_STATUS_SUCCESS = 2
+JOB_STATUS_FAILED = 3
+JOB_STATUS_TIMEOUT = 4
+JOB_STATUS_CANCELLED = 5
+
+_PERIODIC = ("cron", "interval")
+_HANDLED_EVENTS = (
+    EVENT_JOB_ADDED
+    | EVENT_JOB_REMOVED
+    | EVENT_JOB_SUBMITTED
+    | EVENT_JOB_EXECUTED
+    | EVENT_JOB_ERROR
+    | EVENT_JOB_MISSED
+    | EVENT_ALL_JOBS_REMOVED
+)
+
+
+@dataclass
+class JobMeta:
+    """写执行日志所需的任务信息（添加 / 修改任务时登记）"""
+
+    log_job_id: str
+    name: str | None
+    trigger_type: str
+    trigger: Any = None
+    paused: bool = False
+    state: str | None = None
+
+    @property
+    def periodic(self) -> bool:
+        return self.trigger_type in _PERIODIC
+
+
+@dataclass
+class _Execution:
+    """一次执行对应的日志行"""
+
+    job_id: str
+    job_name: str | None
+    trigger_type: str
+    status: int
+    next_run_time: str | None = None
+    job_state: str | None = None
+    result: str | None = None
+    error: str | None = None
+    row_id: int | None = None
+    # 事件发生时尚未登记任务信息，写入前补查
+    scheduler_job_id: str | None = field(default=None, repr=False)
+
+    def values(self) -> dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "job_name": self.job_name,
+            "trigger_type": self.trigger_type,
+            "status": self.status,
+            "next_run_time": self.next_run_time,
+            "job_state": self.job_state,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+_META: dict[str, JobMeta] = {}
+# 周期任务下一次执行的 pending 记录：调度器任务 ID -> 记录
+_PENDING: dict[str, _Execution] = {}
+# 执行中的记录：(调度器任务 ID, 计划执行时间) -> 记录
+_RUNNING: dict[tuple[str, Any], _Execution] = {}
+# 先于提交事件到达的完成事件（线程池中的短任务）：(调度器任务 ID, 计划执行时间) -> 事件
+_EARLY: dict[tuple[str, Any], Any] = {}
+# 待写入的记录（按对象去重）与批量操作
+_DIRTY: dict[int, _Execution] = {}
+_OPS: list[tuple[str, str | None]] = []
+_STATS: dict[str, int] = {"events": 0, "written": 0, "batches": 0, "failed": 0}
+
+_LOOP: asyncio.AbstractEventLoop | None = None
+_WAKE: asyncio.Event | None = None
+_TASK: asyncio.Task | None = None
+_INFLIGHT: asyncio.Future | None = None
+_DESCRIBE: Callable[[str], JobMeta | None] | None = None
+
+
+def remember(job_id: str, meta: JobMeta) -> None:
+    """
+    登记任务信息（添加、修改、暂停、恢复任务后调用，需在事件循环线程中调用）。
+
+    参数:
+    - job_id (str): 调度器任务 ID。
+    - meta (JobMeta): 任务信息。
+    """
+    _META[job_id] = meta
+
+
+def record(event: Any) -> None:
+    """
+    记录调度器事件（``scheduler_event_listener`` 调用，可在任意线程中调用）。
+
+    参数:
+    - event (Any): APScheduler 事件对象。
+    """
+    if not event.code & _HANDLED_EVENTS or _LOOP is None:
+        return
+    try:
+        _LOOP.call_soon_threadsafe(_apply, event)
+    except RuntimeError:
+        # 事件循环已关闭（进程退出阶段）
+        pass
+
+
+async def init(describe: Callable[[str], JobMeta | None]) -> None:
+    """
+    启动后台写入任务（调度器启动前调用）。
+
+    参数:
+    - describe (Callable[[str], JobMeta | None]): 从任务存储读取任务信息（仅在工作线程中调用）。
+    """
+    global _LOOP, _WAKE, _TASK, _DESCRIBE
+    _DESCRIBE = describe
+    if _TASK is not None and not _TASK.done():
+        return
+    _LOOP = asyncio.get_running_loop()
+    _WAKE = asyncio.Event()
+    _TASK = asyncio.create_task(_run(), name="job-log-sink")
+
+
+async def adopt(metas: dict[str, JobMeta]) -> None:
+    """
+    登记任务存储中已有的任务，并接管其在数据库中最新的 pending 日志（进程重启后沿用，避免遗留）。
+
+    参数:
+    - metas (dict[str, JobMeta]): 调度器任务 ID -> 任务信息。
+    """
+    from app.plugin.module_task.cronjob.job.model import JobModel
+
+    for job_id, meta in metas.items():
+        _META.setdefault(job_id, meta)
+    periodic = {meta.log_job_id: job_id for job_id, meta in metas.items() if meta.periodic and job_id not in _PENDING}
+    if not periodic:
+        return
+    try:
+        async with async_db_session() as session:
+            rows = await session.execute(
+                select(JobModel.id, JobModel.job_id, JobModel.next_run_time)
+                .where(JobModel.job_id.in_(periodic), JobModel.status == JOB_STATUS_PENDING)
+                .order_by(JobModel.created_time)
+            )
+    except Exception as e:
+        logger.error(f"读取待执行任务日志失败: {e}")
+        return
+    for row_id, log_job_id, next_run_time in rows:
+        job_id = periodic[log_job_id]
+        if job_id in _PENDING and _PENDING[job_id].row_id is None:
+            # 事件已先行创建了内存记录，保留其状态
+            continue
+        meta = _META[job_id]
+        _PENDING[job_id] = _Execution(
+            job_id=log_job_id,
+            job_name=meta.name,
+            trigger_type=meta.trigger_type,
+            status=JOB_STATUS_PENDING,
+            next_run_time=next_run_time,
+            job_state=meta.state,
+            row_id=row_id,
+        )
+
+
+def forget() -> None:
+    """
+    丢弃已登记的任务信息与 pending 记录（调度器主节点切换时调用）。
+
+    已写入数据库的 pending 日志由新当选的主节点 ``adopt`` 接管；执行中的记录保留，
+    本进程仍在执行的任务结束后照常更新其日志行，但不再为其创建下一次的 pending 记录。
+    """
+    _META.clear()
+    _PENDING.clear()
+
+
+async def close() -> None:
+    """停止后台任务并写完剩余日志（调度器关闭后调用）"""
+    global _TASK, _INFLIGHT, _LOOP
+    if _TASK is not None:
+        _TASK.cancel()
+        try:
+            await _TASK
+        except asyncio.CancelledError:
+            pass
+        _TASK = None
+    if _INFLIGHT is not None:
+        await _INFLIGHT
+        _INFLIGHT = None
+    # 让执行器线程投递的最后一批事件先生效
+    await asyncio.sleep(0)
+    await _flush()
+    _LOOP = None
+
+
+def stats() -> dict[str, Any]:
+    """
+    运行统计。
+
+    返回:
+    - dict[str, Any]: 已登记任务数、pending / 执行中记录数、待写入数以及事件 / 写入 / 失败计数。
+    """
+    return {
+        "running": _TASK is not None and not _TASK.done(),
+        "jobs": len(_META),
+        "pending": len(_PENDING),
+        "executing": len(_RUNNING),
+        "dirty": len(_DIRTY),
+        **_STATS,
+    }
+
+
+def _touch(execution: _Execution) -> None:
+    _DIRTY[id(execution)] = execution
+    if _WAKE is not None:
+        _WAKE.set()
+
+
+def _new_execution(job_id: str, meta: JobMeta | None, status: int) -> _Execution:
+    if meta is None:
+        return _Execution(job_id=job_id, job_name=None, trigger_type="manual", status=status, scheduler_job_id=job_id)
+    return _Execution(job_id=meta.log_job_id, job_name=meta.name, trigger_type=meta.trigger_type, status=status, job_state=meta.state)
+
+
+def _next_run_time(meta: JobMeta | None, previous: datetime | None) -> datetime | None:
+    if meta is None or not meta.periodic or meta.paused or meta.trigger is None:
+        return None
+    now = datetime.now(previous.tzinfo if previous else None)
+    try:
+        return meta.trigger.get_next_fire_time(previous, now)
+    except Exception:
+        return None
+
+
+def _schedule_pending(job_id: str, meta: JobMeta | None, previous: datetime | None) -> None:
+    """周期任务执行结束（或错过）后，为下一次执行创建 pending 记录"""
+    next_run_time = _next_run_time(meta, previous)
+    if meta is None or next_run_time is None:
+        return
+    execution = _new_execution(job_id, meta, JOB_STATUS_PENDING)
+    execution.next_run_time = str(next_run_time)
+    _PENDING[job_id] = execution
+    _touch(execution)
+
+
+def _finish(event: Any, status: int, result: str | None, error: str | None) -> None:
+    job_id = str(event.job_id)
+    meta = _META.get(job_id)
+    execution = _RUNNING.pop((job_id, event.scheduled_run_time), None) or _new_execution(job_id, meta, status)
+    execution.status = status
+    execution.result = result
+    execution.error = error
+    _touch(execution)
+    if meta is not None and not meta.periodic:
+        # 一次性任务执行完即结束，登记信息不再需要
+        _META.pop(job_id, None)
+    _schedule_pending(job_id, meta, event.scheduled_run_time)
+
+
+def _complete(event: Any) -> None:
+    if event.code == EVENT_JOB_EXECUTED:
+        retval = getattr(event, "retval", None)
+        _finish(event, JOB_STATUS_SUCCESS, str(retval) if retval else None, None)
+    else:
+        exception = getattr(event, "exception", None)
+        _finish(event, JOB_STATUS_FAILED, "failed", str(exception) if exception else "未知错误")
+
+
+def _apply(event: Any) -> None:
+    _STATS["events"] += 1
+    code = event.code
+    if code == EVENT_ALL_JOBS_REMOVED:
+        for execution in _PENDING.values():
+            execution.status = JOB_STATUS_CANCELLED
+            _touch(execution)
+        _PENDING.clear()
+        # 同时取消数据库中其他遗留的 pending 日志
+        _OPS.append(("cancel_pending", None))
+        return
+
+    job_id = str(event.job_id)
+    meta = _META.get(job_id)
+    if code == EVENT_JOB_ADDED:
+        if meta is not None and meta.periodic:
+            # 清理旧的 pending 日志，避免重启 / 重复添加导致累积
+            _PENDING.pop(job_id, None)
+            _OPS.append(("purge_pending", meta.log_job_id))
+            execution = _new_execution(job_id, meta, JOB_STATUS_PENDING)
+            next_run_time = _next_run_time(meta, None)
+            execution.next_run_time = str(next_run_time) if next_run_time else None
+            _PENDING[job_id] = execution
+            _touch(execution)
+    elif code == EVENT_JOB_SUBMITTED:
+        for run_time in event.scheduled_run_times:
+            execution = _PENDING.pop(job_id, None) or _new_execution(job_id, meta, JOB_STATUS_RUNNING)
+            execution.status = JOB_STATUS_RUNNING
+            next_run_time = _next_run_time(meta, run_time)
+            if next_run_time is not None:
+                execution.next_run_time = str(next_run_time)
+            _RUNNING[(job_id, run_time)] = execution
+            _touch(execution)
+            early = _EARLY.pop((job_id, run_time), None)
+            if early is not None:
+                _complete(early)
+    elif code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+        key = (job_id, event.scheduled_run_time)
+        if key not in _RUNNING:
+            # 提交事件在调度线程中 submit_job 返回后才派发，短任务的完成事件可能先到：
+            # 暂存到提交事件登记执行记录后再处理，未等到的在下一次写入前按无提交记录处理
+            _EARLY[key] = event
+            if _WAKE is not None:
+                _WAKE.set()
+            return
+        _complete(event)
+    elif code == EVENT_JOB_MISSED:
+        # 错过的那次执行沿用 pending 记录
+        execution = _PENDING.pop(job_id, None) or _new_execution(job_id, meta, JOB_STATUS_TIMEOUT)
+        execution.status = JOB_STATUS_TIMEOUT
+        execution.result = "timeout"
+        execution.error = "任务错过执行时间"
+        _touch(execution)
+        _schedule_pending(job_id, meta, event.scheduled_run_time)
+    elif code == EVENT_JOB_REMOVED:
+        # 一次性任务在提交前就会被移除，其执行记录由随后的提交 / 完成事件处理；
+        # 周期任务被移除时取消其 pending 记录
+        execution = _PENDING.pop(job_id, None)
+        if execution is not None:
+            execution.status = JOB_STATUS_CANCELLED
+            _touch(execution)
+        if meta is not None and meta.periodic:
+            _META.pop(job_id, None)
+
+
+async def _run() -> None:
+    assert _WAKE is not None
+    global _INFLIGHT
+    interval = settings.LOG_SINK_FLUSH_INTERVAL_MS / 1000
+    while True:
+        await _WAKE.wait()
+        # 攒批：短任务的提交与完成在窗口内合并为一次写入
+        await asyncio.sleep(interval)
+        _WAKE.clear()
+        _INFLIGHT = asyncio.ensure_future(_flush())
+        await asyncio.shield(_INFLIGHT)
+        _INFLIGHT = None
+
+
+async def _resolve(executions: list[_Execution]) -> None:
+    unresolved = {execution.scheduler_job_id for execution in executions if execution.scheduler_job_id}
+    if not unresolved or _DESCRIBE is None:
+        return
+    describe = _DESCRIBE
+
+    def load() -> dict[str, JobMeta | None]:
+        return {job_id: describe(job_id) for job_id in unresolved}
+
+    try:
+        metas = await asyncio.to_thread(load)
+    except Exception as e:
+        logger.warning(f"补查任务信息失败: {e}")
+        return
+    for execution in executions:
+        meta = metas.get(execution.scheduler_job_id or "")
+        if meta is not None:
+            _META.setdefault(execution.scheduler_job_id, meta)
+            execution.job_id = meta.log_job_id
+            execution.job_name = meta.name
+            execution.trigger_type = meta.trigger_type
+            execution.job_state = meta.state
+        execution.scheduler_job_id = None
+
+
+async def _flush() -> None:
+    from app.plugin.module_task.cronjob.job.model import JobModel
+
+    while _EARLY:
+        _complete(_EARLY.popitem()[1])
+    if not _DIRTY and not _OPS:
+        return
+    ops = list(_OPS)
+    _OPS.clear()
+    executions = list(_DIRTY.values())
+    _DIRTY.clear()
+    await _resolve(executions)
+
+    inserts = [execution for execution in executions if execution.row_id is None]
+    now = datetime.now()
+    updates = [
+        {"id": execution.row_id, "updated_time": now, **execution.values()}
+        for execution in executions
+        if execution.row_id is not None
+    ]
+    try:
+        async with async_db_session() as session, session.begin():
+            for op, log_job_id in ops:
+                if op == "purge_pending":
+                    await session.execute(
+                        delete(JobModel).where(JobModel.job_id == log_job_id, JobModel.status == JOB_STATUS_PENDING)
+                    )
+                else:
+                    await session.execute(
+                        update(JobModel).where(JobModel.status == JOB_STATUS_PENDING).values(status=JOB_STATUS_CANCELLED)
+                    )
+            models = [JobModel(**execution.values()) for execution in inserts]
+            session.add_all(models)
+            await session.flush()
+            if updates:
+                await session.execute(update(JobModel), updates)
+        for execution, model in zip(inserts, models, strict=True):
+            execution.row_id = model.id
+        _STATS["written"] += len(executions)
+        _STATS["batches"] += 1
+    except Exception:
+        _STATS["failed"] += len(executions)
+        logger.exception("任务执行日志写入失败: {} 条，稍后重试", len(executions))
+        # 保留最新状态，下一批重试
+        _OPS[:0] = ops
+        for execution in executions:
+            _DIRTY.setdefault(id(execution), execution)
@@ -0,0 +1,272 @@
+"""日志批量写入器
+
+操作日志、登录日志原先每条都单独打开会话、开启事务、插入一行再提交，写多的场景下
+日志本身就占用与业务相当的连接数。``LogSink`` 改为进程内有界队列 + 后台写入任务：
+
+- ``submit``：请求侧只把行放入队列（补齐创建 / 更新时间），不占用数据库连接
+- 后台任务攒够 ``LOG_SINK_BATCH_SIZE`` 行或等待满 ``LOG_SINK_FLUSH_INTERVAL_MS`` 后，
+  用一条多行 INSERT 写入
+- 队列已满时按 ``LOG_SINK_OVERFLOW`` 处理：drop 丢弃并计数 / block 等待队列空位 /
+  spill 追加写入本地 JSON Lines 文件，下次启动时回放入库
+- ``close`` 在 lifespan 关闭时调用，停止后台任务并写完队列中剩余的行
+
+未启动（脚本、测试等未走 lifespan 的场景）时 ``submit`` 退化为直接写入单行。
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import insert
+
+from app.config.path_conf import LOG_DIR
+from app.config.setting import settings
+from app.core.base_model import MappedBase
+from app.core.database import async_db_session
+from app.core.logger import logger
+
+# 入队时补齐的时间字段；溢出文件中以 ISO 字符串保存，回放时还原
+_TIME_FIELDS = ("created_time", "updated_time")
+SPILL_DIR = LOG_DIR / "spill"
+
+
+class LogSink:
+    """有界队列 + 后台批量写入，一个实例对应一张日志表"""
+
+    _registry: dict[str, "LogSink"] = {}
+
+    def __init__(self, name: str, model_loader: Callable[[], type[MappedBase]]) -> None:
+        """
+        创建并注册一个写入器。
+
+        参数:
+        - name (str): 写入器名称（同时用作溢出文件名前缀，需全局唯一）。
+        - model_loader (Callable[[], type[MappedBase]]): 返回目标 ORM 模型（延迟导入，避免循环依赖）。
+        """
+        self.name = name
+        self.model_loader = model_loader
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._task: asyncio.Task | None = None
+        self._inflight: asyncio.Future | None = None
+        self._pending: list[dict[str, Any]] = []
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.failed = 0
+        LogSink._registry[name] = self
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def submit(self, row: dict[str, Any]) -> None:
+        """
+        提交一行日志。
+
+        参数:
+        - row (dict[str, Any]): 列名 -> 值（已通过对应 CreateSchema 校验）。
+
+        返回:
+        - None
+        """
+        now = datetime.now()
+        for field in _TIME_FIELDS:
+            row.setdefault(field, now)
+
+        if not self.running or self._queue is None:
+            await self._write([row])
+            return
+        try:
+            self._queue.put_nowait(row)
+        except asyncio.QueueFull:
+            await self._overflow(row)
+
+    async def start(self) -> None:
+        """回放上次遗留的溢出文件并启动后台写入任务"""
+        if self.running:
+            return
+        await self._replay_spill()
+        self._queue = asyncio.Queue(maxsize=settings.LOG_SINK_QUEUE_SIZE)
+        self._task = asyncio.create_task(self._run(), name=f"log-sink-{self.name}")
+
+    async def close(self) -> None:
+        """停止后台任务并写完队列中剩余的行"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._inflight is not None:
+            await self._inflight
+            self._inflight = None
+        if self._queue is not None:
+            rows, self._pending = self._pending, []
+            while not self._queue.empty():
+                rows.append(self._queue.get_nowait())
+            for i in range(0, len(rows), settings.LOG_SINK_BATCH_SIZE):
+                await self._write(rows[i : i + settings.LOG_SINK_BATCH_SIZE])
+            self._queue = None
+
+    def stats(self) -> dict[str, Any]:
+        """
+        运行统计。
+
+        返回:
+        - dict[str, Any]: 队列长度、已写入行数、批次数以及丢弃 / 溢出 / 失败行数。
+        """
+        return {
+            "name": self.name,
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "failed": self.failed,
+        }
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        batch_size = settings.LOG_SINK_BATCH_SIZE
+        interval = settings.LOG_SINK_FLUSH_INTERVAL_MS / 1000
+        while True:
+            rows = [await queue.get()]
+            deadline = time.monotonic() + interval
+            try:
+                while len(rows) < batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        rows.append(await asyncio.wait_for(queue.get(), timeout))
+                    except TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # 关闭时已取出的行暂存，由 close 统一写完
+                self._pending = rows
+                raise
+            # 写入中途被取消时不中断数据库操作，close 会等待其完成
+            self._inflight = asyncio.ensure_future(self._write(rows))
+            await asyncio.shield(self._inflight)
+            self._inflight = None
+
+    async def _write(self, rows: list[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        try:
+            async with async_db_session() as session, session.begin():
+                await session.execute(insert(self.model_loader()), rows)
+            self.written += len(rows)
+            self.batches += 1
+        except Exception:
+            self.failed += len(rows)
+            logger.exception("{}写入失败: {} 行", self.name, len(rows))
+            if settings.LOG_SINK_OVERFLOW == "spill":
+                await self._spill(rows)
+
+    async def _overflow(self, row: dict[str, Any]) -> None:
+        assert self._queue is not None
+        policy = settings.LOG_SINK_OVERFLOW
+        if policy == "block":
+            await self._queue.put(row)
+        elif policy == "spill":
+            await self._spill([row])
+        else:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning("{}队列已满，已丢弃 {} 行", self.name, self.dropped)
+
+    def _spill_path(self) -> Path:
+        return SPILL_DIR / f"{self.name}-{os.getpid()}.jsonl"
+
+    async def _spill(self, rows: list[dict[str, Any]]) -> None:
+        lines = "".join(json.dumps(row, ensure_ascii=False, default=_json_default) + "\n" for row in rows)
+        try:
+            await asyncio.to_thread(_append_text, self._spill_path(), lines)
+            self.spilled += len(rows)
+        except OSError:
+            self.dropped += len(rows)
+            logger.exception("{}溢出文件写入失败，丢弃 {} 行", self.name, len(rows))
+
+    async def _replay_spill(self) -> None:
+        for path in sorted(SPILL_DIR.glob(f"{self.name}-*.jsonl")):
+            # 先改名再读取，避免与仍在追加的进程争用同一文件
+            replaying = path.with_suffix(".replaying")
+            try:
+                path.rename(replaying)
+                text = await asyncio.to_thread(replaying.read_text, encoding="utf-8")
+            except OSError:
+                continue
+            rows = [_load_row(line) for line in text.splitlines() if line.strip()]
+            failed = self.failed
+            for i in range(0, len(rows), settings.LOG_SINK_BATCH_SIZE):
+                await self._write(rows[i : i + settings.LOG_SINK_BATCH_SIZE])
+            replaying.unlink(missing_ok=True)
+            logger.info("{}回放溢出文件 {}: {} 行（失败 {} 行）", self.name, path.name, len(rows), self.failed - failed)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _load_row(line: str) -> dict[str, Any]:
+    row = json.loads(line)
+    for field in _TIME_FIELDS:
+        if isinstance(row.get(field), str):
+            row[field] = datetime.fromisoformat(row[field])
+    return row
+
+
+def _append_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def _operation_log_model() -> type[MappedBase]:
+    from app.api.v1.module_system.log.model import OperationLogModel
+
+    return OperationLogModel
+
+
+def _login_log_model() -> type[MappedBase]:
+    from app.api.v1.module_system.log.model import LoginLogModel
+
+    return LoginLogModel
+
+
+OPERATION_LOG_SINK = LogSink("operation_log", _operation_log_model)
+LOGIN_LOG_SINK = LogSink("login_log", _login_log_model)
+
+
+async def init() -> None:
+    """启动全部写入器（lifespan 启动时调用）"""
+    for sink in LogSink._registry.values():
+        await sink.start()
+
+
+async def close() -> None:
+    """停止全部写入器并写完剩余日志（lifespan 关闭时调用）"""
+    for sink in LogSink._registry.values():
+        await sink.close()
+
+
+def all_stats() -> list[dict[str, Any]]:
+    """
+    全部写入器的运行统计。
+
+    返回:
+    - list[dict[str, Any]]: 每个写入器一项。
+    """
+    return [sink.stats() for sink in LogSink._registry.values()]
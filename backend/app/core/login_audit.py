@@ -0,0 +1,315 @@
+"""登录审计管道
+
+登录接口原先在每个失败分支内联写登录日志，签发令牌前还要先查一次 IP 归属地；
+撞库 / 暴力破解时每次失败都是一次日志写入，登录延迟随攻击流量上升。这里把登录相关的
+审计副作用全部移出请求路径：
+
+- ``record``：请求侧只构造日志行并放入队列，不等待归属地查询和数据库写入
+- 后台任务按批取出，同一批内每个 IP 只解析一次归属地（``IpLocalUtil.resolve_locations`` 批量查询），
+  再交给 ``LOGIN_LOG_SINK`` 批量入库
+- ``locate_session``：签发令牌时会话归属地先写占位值，解析完成后回填到会话
+- 失败聚合（``LOGIN_AUDIT_AGGREGATE``）：同一用户名 + IP + 失败原因在
+  ``LOGIN_AUDIT_AGGREGATE_WINDOW`` 秒内的前 ``LOGIN_AUDIT_AGGREGATE_THRESHOLD`` 次逐条记录，
+  其余只计数，窗口结束时合并为一条带次数的记录
+
+聚合状态保存在进程内，多 worker 部署时各自聚合。未启动（脚本、测试等未走 lifespan 的场景）时
+``record`` 退化为当场解析并提交。
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from redis.asyncio.client import Redis
+
+from app.config.setting import settings
+from app.core import session_registry
+from app.core.log_sink import LOGIN_LOG_SINK
+from app.core.logger import logger
+from app.utils.ip_local_util import IpLocalUtil
+
+# 聚合窗口检查间隔（秒）
+_SWEEP_INTERVAL = 1.0
+# 同时跟踪的聚合窗口上限，超出后新键不再聚合（逐条记录），避免海量随机用户名撑爆内存
+_MAX_WINDOWS = 100_000
+
+_REDIS: Redis | None = None
+_QUEUE: asyncio.Queue["_AuditEvent"] | None = None
+_TASK: asyncio.Task | None = None
+_INFLIGHT: asyncio.Future | None = None
+_WINDOWS: dict[tuple[str, str | None, str | None], "_FailureWindow"] = {}
+_STATS: dict[str, int] = {"recorded": 0, "aggregated": 0, "aggregate_rows": 0, "dropped": 0}
+
+
+@dataclass
+class _AuditEvent:
+    """待处理的审计事件：日志行（可为空）与需要回填归属地的会话"""
+
+    row: dict[str, Any] | None
+    ip: str | None
+    session_id: str | None = None
+
+
+@dataclass
+class _FailureWindow:
+    """一个用户名 + IP + 失败原因的聚合窗口"""
+
+    row: dict[str, Any]
+    ip: str | None
+    opened: float
+    count: int = 1
+    suppressed: int = 0
+    first_suppressed: datetime | None = None
+    last_suppressed: datetime | None = None
+
+
+async def record(
+    username: str,
+    status: int,
+    login_ip: str | None = None,
+    request_os: str | None = None,
+    request_browser: str | None = None,
+    msg: str | None = None,
+) -> None:
+    """
+    记录一次登录结果（不等待归属地查询和入库，不抛出异常）。
+
+    参数:
+    - username (str): 登录用户名。
+    - status (int): 登录状态(1成功 2失败)。
+    - login_ip (str | None): 客户端 IP。
+    - request_os (str | None): 操作系统。
+    - request_browser (str | None): 浏览器。
+    - msg (str | None): 提示消息。
+
+    返回:
+    - None
+    """
+    row = _build_row(username, status, login_ip, request_os, request_browser, msg)
+    if row is None:
+        return
+    _STATS["recorded"] += 1
+    if status == 2 and settings.LOGIN_AUDIT_AGGREGATE and _running():
+        expired, single = _aggregate(row, login_ip)
+        if expired is not None:
+            await _emit(expired)
+        if not single:
+            return
+    await _emit(_AuditEvent(row=row, ip=login_ip))
+
+
+async def locate_session(session_id: str, ip: str | None) -> None:
+    """
+    在后台解析归属地并回填到会话（签发令牌时调用）。
+
+    参数:
+    - session_id (str): 会话编号。
+    - ip (str | None): 客户端 IP。
+
+    返回:
+    - None
+    """
+    if ip:
+        await _emit(_AuditEvent(row=None, ip=ip, session_id=session_id))
+
+
+async def init(redis: Redis) -> None:
+    """
+    启动后台处理任务（lifespan 启动时调用，需在 log_sink.init 之后）。
+
+    参数:
+    - redis (Redis): Redis 连接（归属地缓存与会话回填）。
+    """
+    global _REDIS, _QUEUE, _TASK
+    _REDIS = redis
+    if _running():
+        return
+    _QUEUE = asyncio.Queue(maxsize=settings.LOG_SINK_QUEUE_SIZE)
+    _TASK = asyncio.create_task(_run(), name="login-audit")
+
+
+async def close() -> None:
+    """停止后台任务，写出全部聚合窗口和队列中剩余的事件（需在 log_sink.close 之前调用）"""
+    global _QUEUE, _TASK, _INFLIGHT
+    if _TASK is not None:
+        _TASK.cancel()
+        try:
+            await _TASK
+        except asyncio.CancelledError:
+            pass
+        _TASK = None
+    if _INFLIGHT is not None:
+        await _INFLIGHT
+        _INFLIGHT = None
+    events: list[_AuditEvent] = []
+    if _QUEUE is not None:
+        while not _QUEUE.empty():
+            events.append(_QUEUE.get_nowait())
+        _QUEUE = None
+    events.extend(_sweep(force=True))
+    await _process(events)
+
+
+def stats() -> dict[str, Any]:
+    """
+    运行统计。
+
+    返回:
+    - dict[str, Any]: 队列长度、聚合窗口数以及记录 / 聚合 / 丢弃计数。
+    """
+    return {
+        "running": _running(),
+        "queued": _QUEUE.qsize() if _QUEUE is not None else 0,
+        "windows": len(_WINDOWS),
+        **_STATS,
+    }
+
+
+def _build_row(
+    username: str,
+    status: int,
+    login_ip: str | None,
+    request_os: str | None,
+    request_browser: str | None,
+    msg: str | None,
+) -> dict[str, Any] | None:
+    from app.api.v1.module_system.log.schema import LoginLogCreateSchema
+
+    try:
+        row = LoginLogCreateSchema(
+            username=username,
+            status=status,
+            login_ip=login_ip,
+            request_os=request_os,
+            request_browser=request_browser,
+            msg=msg,
+        ).model_dump()
+    except ValueError:
+        # 登录日志不影响登录本身
+        return None
+    # 记录时即记下登录时间，后台解析归属地的延迟不影响日志时间
+    row["created_time"] = row["updated_time"] = datetime.now()
+    # 合并记录在备注中写明次数，同批各行列保持一致
+    row["description"] = None
+    return row
+
+
+def _running() -> bool:
+    return _TASK is not None and not _TASK.done()
+
+
+def _aggregate(row: dict[str, Any], ip: str | None) -> tuple[_AuditEvent | None, bool]:
+    """登记一次失败，返回 (已过期窗口的合并记录, 本次是否需要单独记录)"""
+    key = (row["username"], ip, row["msg"])
+    now = time.monotonic()
+    expired = None
+    window = _WINDOWS.get(key)
+    if window is not None and now - window.opened >= settings.LOGIN_AUDIT_AGGREGATE_WINDOW:
+        # 窗口已结束但尚未被清扫，先写出它的计数
+        expired = _close_window(_WINDOWS.pop(key))
+        window = None
+    if window is None:
+        if len(_WINDOWS) < _MAX_WINDOWS:
+            _WINDOWS[key] = _FailureWindow(row=row, ip=ip, opened=now)
+        return expired, True
+    window.count += 1
+    if window.count <= settings.LOGIN_AUDIT_AGGREGATE_THRESHOLD:
+        return expired, True
+    window.suppressed += 1
+    window.first_suppressed = window.first_suppressed or row["created_time"]
+    window.last_suppressed = row["created_time"]
+    _STATS["aggregated"] += 1
+    return expired, False
+
+
+def _close_window(window: _FailureWindow) -> _AuditEvent | None:
+    """窗口结束：有被合并的失败时生成一条带次数的记录"""
+    if not window.suppressed:
+        return None
+    _STATS["aggregate_rows"] += 1
+    row = dict(window.row)
+    row["msg"] = f"{row['msg'] or '登录失败'}（重复 {window.suppressed} 次）"[:255]
+    row["description"] = (
+        f"{settings.LOGIN_AUDIT_AGGREGATE_WINDOW} 秒内共失败 {window.count} 次，"
+        f"其中 {window.suppressed} 次合并为本条记录"
+        f"（{window.first_suppressed:%Y-%m-%d %H:%M:%S} 至 {window.last_suppressed:%Y-%m-%d %H:%M:%S}）"
+    )
+    row["created_time"] = row["updated_time"] = window.last_suppressed
+    return _AuditEvent(row=row, ip=window.ip)
+
+
+def _sweep(force: bool = False) -> list[_AuditEvent]:
+    """取出已结束的聚合窗口，返回需要写出的合并记录"""
+    now = time.monotonic()
+    window_seconds = settings.LOGIN_AUDIT_AGGREGATE_WINDOW
+    expired = [key for key, window in _WINDOWS.items() if force or now - window.opened >= window_seconds]
+    events = [_close_window(_WINDOWS.pop(key)) for key in expired]
+    return [event for event in events if event is not None]
+
+
+def _enqueue(event: _AuditEvent) -> bool:
+    if _QUEUE is None or not _running():
+        return False
+    try:
+        _QUEUE.put_nowait(event)
+        return True
+    except asyncio.QueueFull:
+        _STATS["dropped"] += 1
+        if _STATS["dropped"] % 1000 == 1:
+            logger.warning("登录审计队列已满，已丢弃 {} 条", _STATS["dropped"])
+        return True
+
+
+async def _emit(event: _AuditEvent) -> None:
+    if not _enqueue(event):
+        # 未启动时当场提交，只使用本地 / 缓存可得的归属地，不发起外网查询
+        await _process([event], remote=False)
+
+
+async def _run() -> None:
+    global _INFLIGHT
+    assert _QUEUE is not None
+    queue = _QUEUE
+    batch_size = settings.LOG_SINK_BATCH_SIZE
+    next_sweep = time.monotonic() + _SWEEP_INTERVAL
+    while True:
+        try:
+            events = [await asyncio.wait_for(queue.get(), max(next_sweep - time.monotonic(), 0))]
+        except TimeoutError:
+            events = []
+        while events and len(events) < batch_size and not queue.empty():
+            events.append(queue.get_nowait())
+        if time.monotonic() >= next_sweep:
+            events.extend(_sweep())
+            next_sweep = time.monotonic() + _SWEEP_INTERVAL
+        if events:
+            # 处理中途被取消时不中断，close 会等待其完成
+            _INFLIGHT = asyncio.ensure_future(_process(events))
+            await asyncio.shield(_INFLIGHT)
+            _INFLIGHT = None
+
+
+async def _process(events: list[_AuditEvent], remote: bool = True) -> None:
+    if not events:
+        return
+    locations = await _locate({event.ip for event in events if event.ip}, remote)
+    for event in events:
+        location = locations.get(event.ip) if event.ip else None
+        if event.row is not None:
+            event.row["login_location"] = location
+            await LOGIN_LOG_SINK.submit(event.row)
+        if event.session_id and location not in (None, IpLocalUtil.PENDING) and _REDIS is not None:
+            await session_registry.set_login_location(_REDIS, event.session_id, location)
+
+
+async def _locate(ips: set[str], remote: bool) -> dict[str, str | None]:
+    """同一批内每个 IP 只解析一次"""
+    try:
+        if remote:
+            return await IpLocalUtil.resolve_locations(_REDIS, ips)
+        return {ip: await IpLocalUtil.resolve_location_for_log(_REDIS, ip) for ip in ips}
+    except Exception as e:
+        logger.warning(f"解析登录归属地失败: {e}")
+        return {}
@@ -0,0 +1,337 @@
+"""Prometheus 指标
+
+``/metrics`` 早已在 ``TenantMiddleware`` 白名单中，这里提供实际的指标：
+
+- 请求耗时：按方法、路由模板、状态码、租户区分的直方图（``MetricsMiddleware``）
+- 数据库连接池：取连接等待耗时直方图，连接池大小 / 已借出 / 溢出连接数
+- Redis：按命令区分的耗时直方图
+- 定时任务：执行耗时直方图，错过执行（misfire）与超出最大实例数的次数，代码块编译 / 执行耗时直方图，
+  本进程是否为调度器主节点（多进程汇总后应恒为 1）
+- 缓存与日志写入器：``TieredCache``、任务代码块编译缓存的命中 / 未命中 / 淘汰次数与条目数，日志队列长度与写入 / 丢弃行数
+
+热路径只做一次字典查找：标签组合第一次出现时调用 ``labels()`` 并缓存子指标，之后直接 ``observe``，
+不再为每个请求构造标签字典。连接池、缓存等快照指标由后台任务按 ``METRICS_REFRESH_INTERVAL`` 刷新。
+
+多 worker 部署时设置 ``METRICS_MULTIPROC_DIR``（即 ``PROMETHEUS_MULTIPROC_DIR``，需在导入
+``prometheus_client`` 前生效），各 worker 把指标写入该目录下的 mmap 文件，抓取时由任一 worker 汇总；
+启动前由 ``reset_multiprocess_dir`` 清空目录，worker 退出时 ``close`` 标记本进程指标失效。
+命中率请在 Prometheus 中计算，如 ``rate(..._cache_requests_total{result="hit"}[5m]) / rate(..._cache_requests_total[5m])``。
+"""
+
+import asyncio
+import os
+import shutil
+import time
+from collections.abc import Hashable
+from pathlib import Path
+from typing import Any
+
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, EVENT_JOB_SUBMITTED
+from redis.asyncio.client import Redis
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Scope
+
+from app.config.setting import settings
+from app.core.logger import logger
+
+# prometheus_client 在导入时根据 PROMETHEUS_MULTIPROC_DIR 选择指标存储方式，必须先设置
+if settings.METRICS_MULTIPROC_DIR:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.METRICS_MULTIPROC_DIR)
+    Path(os.environ["PROMETHEUS_MULTIPROC_DIR"]).mkdir(parents=True, exist_ok=True)
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess  # noqa: E402
+
+_NAMESPACE = "fastapiadmin"
+# 未匹配到路由（404、静态文件等）时的路由标签，避免原始路径撑爆时间序列
+_UNMATCHED = "<unmatched>"
+# 已提交未完成的任务执行记录上限（丢失完成事件时防止无限增长）
+_MAX_PENDING_JOBS = 1024
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP 请求耗时（秒）",
+    ["method", "route", "status", "tenant"],
+    namespace=_NAMESPACE,
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "从连接池取得数据库连接的等待耗时（秒）",
+    namespace=_NAMESPACE,
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+DB_POOL_SIZE = Gauge("db_pool_size", "连接池常驻连接数", namespace=_NAMESPACE, multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "已借出的数据库连接数", namespace=_NAMESPACE, multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "超出常驻连接数的溢出连接数", namespace=_NAMESPACE, multiprocess_mode="livesum")
+REDIS_COMMAND_DURATION = Histogram(
+    "redis_command_duration_seconds",
+    "Redis 命令耗时（秒，不含 pipeline）",
+    ["command"],
+    namespace=_NAMESPACE,
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+SCHEDULER_JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds",
+    "定时任务执行耗时（秒，自提交到执行完成）",
+    ["job", "status"],
+    namespace=_NAMESPACE,
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+SCHEDULER_JOB_SKIPPED = Counter(
+    "scheduler_job_skipped_total",
+    "定时任务未执行次数（misfire：错过执行时间；max_instances：超出最大实例数）",
+    ["job", "reason"],
+    namespace=_NAMESPACE,
+)
+TASK_CODE_DURATION = Histogram(
+    "task_code_duration_seconds",
+    "任务代码块耗时（秒；compile：编译，仅缓存未命中时记录；execute：执行模块与 handler）",
+    ["node", "phase"],
+    namespace=_NAMESPACE,
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 300.0),
+)
+SCHEDULER_LEADER = Gauge("scheduler_leader", "本进程是否为调度器主节点", namespace=_NAMESPACE, multiprocess_mode="livesum")
+CACHE_REQUESTS = Counter("cache_requests_total", "进程内缓存读取次数", ["cache", "result"], namespace=_NAMESPACE)
+CACHE_EVICTIONS = Counter("cache_evictions_total", "进程内缓存淘汰次数", ["cache"], namespace=_NAMESPACE)
+CACHE_ENTRIES = Gauge("cache_entries", "进程内缓存条目数", ["cache"], namespace=_NAMESPACE, multiprocess_mode="livesum")
+LOG_SINK_QUEUED = Gauge("log_sink_queued", "日志写入队列长度", ["sink"], namespace=_NAMESPACE, multiprocess_mode="livesum")
+LOG_SINK_ROWS = Counter("log_sink_rows_total", "日志写入器处理行数", ["sink", "result"], namespace=_NAMESPACE)
+
+# 预先绑定的子指标：标签组合 -> child
+_HTTP_CHILDREN: dict[tuple[str, str, int, Any], Any] = {}
+_REDIS_CHILDREN: dict[Any, Any] = {}
+_JOB_CHILDREN: dict[tuple[str, str], Any] = {}
+_CODE_CHILDREN: dict[tuple[str, str], Any] = {}
+# (job_id, 计划执行时间) -> 提交时刻
+_JOB_STARTS: dict[tuple[str, Any], float] = {}
+# 快照指标上次的累计值，用于换算为 Counter 增量
+_LAST_TOTALS: dict[Hashable, int] = {}
+
+_ENGINE: AsyncEngine | None = None
+_REDIS: Redis | None = None
+_REFRESHER: asyncio.Task | None = None
+
+
+def observe_request(scope: Scope, status: int, elapsed: float) -> None:
+    """
+    记录一次 HTTP 请求耗时（``MetricsMiddleware`` 在请求结束时调用）。
+
+    参数:
+    - scope (Scope): ASGI scope（路由匹配后带有 ``route``，认证预解析后 ``state`` 带有 ``tenant_id``）。
+    - status (int): 响应状态码。
+    - elapsed (float): 耗时（秒）。
+    """
+    route = scope.get("route")
+    template = route.path_format if route is not None else _UNMATCHED
+    tenant = None
+    if settings.METRICS_TENANT_LABEL:
+        state = scope.get("state")
+        tenant = state.get("tenant_id") if state else None
+    key = (scope["method"], template, status, tenant)
+    child = _HTTP_CHILDREN.get(key)
+    if child is None:
+        child = _HTTP_CHILDREN[key] = HTTP_REQUEST_DURATION.labels(key[0], template, str(status), "" if tenant is None else str(tenant))
+    child.observe(elapsed)
+
+
+def observe_scheduler_event(event: Any) -> None:
+    """
+    记录定时任务事件（``SchedulerUtil.scheduler_event_listener`` 调用）。
+
+    提交事件在任务交给执行器之后才派发，极短的任务可能先收到完成事件，此时不计入耗时直方图。
+
+    参数:
+    - event (Any): APScheduler 事件对象。
+    """
+    code = event.code
+    if code == EVENT_JOB_SUBMITTED:
+        now = time.perf_counter()
+        if len(_JOB_STARTS) >= _MAX_PENDING_JOBS:
+            for key in list(_JOB_STARTS)[: _MAX_PENDING_JOBS // 2]:
+                _JOB_STARTS.pop(key, None)
+        for run_time in event.scheduled_run_times:
+            _JOB_STARTS[(event.job_id, run_time)] = now
+    elif code in (EVENT_JOB_EXECUTED, EVENT_JOB_ERROR):
+        started = _JOB_STARTS.pop((event.job_id, event.scheduled_run_time), None)
+        if started is not None:
+            status = "failed" if code == EVENT_JOB_ERROR else "success"
+            _job_child(_job_label(event.job_id), status).observe(time.perf_counter() - started)
+    elif code == EVENT_JOB_MISSED:
+        SCHEDULER_JOB_SKIPPED.labels(_job_label(event.job_id), "misfire").inc()
+    elif code == EVENT_JOB_MAX_INSTANCES:
+        SCHEDULER_JOB_SKIPPED.labels(_job_label(event.job_id), "max_instances").inc()
+
+
+def observe_task_code(node: str, phase: str, elapsed: float) -> None:
+    """
+    记录任务代码块的编译 / 执行耗时（``SchedulerUtil._run_code_block`` 调用，执行器线程中调用）。
+
+    参数:
+    - node (str): 节点标识（定时任务为任务 ID，工作流节点为 ``workflow:<节点类型编码>``）。
+    - phase (str): compile / execute。
+    - elapsed (float): 耗时（秒）。
+    """
+    key = (_job_label(node), phase)
+    child = _CODE_CHILDREN.get(key)
+    if child is None:
+        child = _CODE_CHILDREN[key] = TASK_CODE_DURATION.labels(*key)
+    child.observe(elapsed)
+
+
+def refresh() -> None:
+    """把连接池、调度器主节点、缓存、日志写入器的当前快照写入指标（后台任务定期调用，抓取时也会调用一次）"""
+    from app.core import code_cache, log_sink, scheduler_leader
+    from app.core.tiered_cache import TieredCache
+
+    if _ENGINE is not None:
+        pool = _ENGINE.sync_engine.pool
+        if hasattr(pool, "checkedout"):
+            DB_POOL_SIZE.set(pool.size())
+            DB_POOL_CHECKED_OUT.set(pool.checkedout())
+            DB_POOL_OVERFLOW.set(max(pool.overflow(), 0))
+
+    SCHEDULER_LEADER.set(int(scheduler_leader.is_leader()))
+
+    for stats in [*TieredCache.all_stats(), {"name": "task_code", **code_cache.stats()}]:
+        name = stats["name"]
+        _inc_total(CACHE_REQUESTS.labels(name, "hit"), ("cache", name, "hit"), stats["hits"])
+        _inc_total(CACHE_REQUESTS.labels(name, "miss"), ("cache", name, "miss"), stats["misses"])
+        _inc_total(CACHE_EVICTIONS.labels(name), ("cache", name, "evictions"), stats["evictions"])
+        CACHE_ENTRIES.labels(name).set(stats["size"])
+
+    for stats in log_sink.all_stats():
+        name = stats["name"]
+        LOG_SINK_QUEUED.labels(name).set(stats["queued"])
+        for result in ("written", "dropped", "spilled", "failed"):
+            _inc_total(LOG_SINK_ROWS.labels(name, result), ("log_sink", name, result), stats[result])
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    """
+    指标抓取接口。
+
+    参数:
+    - request (Request): 请求对象。
+
+    返回:
+    - Response: Prometheus 文本格式的指标。
+    """
+    refresh()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def reset_multiprocess_dir() -> None:
+    """清空多进程指标目录（启动 worker 之前调用，避免沿用上次运行的计数）"""
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not directory:
+        return
+    shutil.rmtree(directory, ignore_errors=True)
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+
+async def init(engine: AsyncEngine, redis: Redis | None) -> None:
+    """
+    挂载连接池与 Redis 计时并启动快照刷新任务（lifespan 启动时调用）。
+
+    参数:
+    - engine (AsyncEngine): 异步数据库引擎。
+    - redis (Redis | None): Redis 连接。
+    """
+    global _ENGINE, _REDIS, _REFRESHER
+    if not settings.METRICS_ENABLE or _ENGINE is not None:
+        return
+    _ENGINE = engine
+    _instrument_pool(engine)
+    if redis is not None:
+        _REDIS = redis
+        _instrument_redis(redis)
+    _REFRESHER = asyncio.create_task(_refresh_loop(), name="metrics-refresh")
+
+
+async def close() -> None:
+    """停止刷新任务、移除计时并标记本进程的多进程指标失效（lifespan 关闭时调用）"""
+    global _ENGINE, _REDIS, _REFRESHER
+    if _REFRESHER is not None:
+        _REFRESHER.cancel()
+        try:
+            await _REFRESHER
+        except (asyncio.CancelledError, Exception):
+            pass
+        _REFRESHER = None
+    if _ENGINE is not None:
+        _ENGINE.sync_engine.pool.__dict__.pop("_do_get", None)
+        _ENGINE = None
+    if _REDIS is not None:
+        _REDIS.__dict__.pop("execute_command", None)
+        _REDIS = None
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+def _job_label(job_id: str) -> str:
+    # 「立即执行」使用 ``<原任务ID>_run_now_<时间戳>`` 的临时任务，按原任务统计
+    return str(job_id).split("_run_now_", 1)[0]
+
+
+def _job_child(job: str, status: str) -> Any:
+    key = (job, status)
+    child = _JOB_CHILDREN.get(key)
+    if child is None:
+        child = _JOB_CHILDREN[key] = SCHEDULER_JOB_DURATION.labels(job, status)
+    return child
+
+
+def _inc_total(child: Any, key: Hashable, total: int) -> None:
+    last = _LAST_TOTALS.get(key, 0)
+    if total > last:
+        child.inc(total - last)
+    _LAST_TOTALS[key] = total
+
+
+def _instrument_pool(engine: AsyncEngine) -> None:
+    # 连接池事件只在取得连接之后触发，等待耗时需包住 ``_do_get``（排队、建连、超时都在其中）
+    pool = engine.sync_engine.pool
+    do_get = pool._do_get
+    observe = DB_POOL_WAIT.observe
+
+    def timed_do_get() -> Any:
+        start = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            observe(time.perf_counter() - start)
+
+    pool._do_get = timed_do_get
+
+
+def _instrument_redis(redis: Redis) -> None:
+    execute_command = redis.execute_command
+
+    async def timed_execute_command(*args: Any, **options: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await execute_command(*args, **options)
+        finally:
+            command = args[0]
+            child = _REDIS_CHILDREN.get(command)
+            if child is None:
+                name = command.decode() if isinstance(command, bytes) else str(command)
+                child = _REDIS_CHILDREN[command] = REDIS_COMMAND_DURATION.labels(name.upper())
+            child.observe(time.perf_counter() - start)
+
+    redis.execute_command = timed_execute_command
+
+
+async def _refresh_loop() -> None:
+    while True:
+        try:
+            refresh()
+        except Exception as e:
+            logger.warning(f"指标快照刷新失败: {e}")
+        await asyncio.sleep(settings.METRICS_REFRESH_INTERVAL)
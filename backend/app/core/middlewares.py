@@ -1,19 +1,19 @@
-import json
 import time
 import uuid
 from dataclasses import replace
 from types import MappingProxyType
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.gzip import GZipMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.api.v1.module_system.params.service import ParamsService
 from app.common.response import ErrorResponse
 from app.config.setting import settings
+from app.core import metrics, sql_stats
+from app.core.dependencies import fetch_session_state
 from app.core.exceptions import CustomException
 from app.core.logger import logger
 from app.core.request_context import RequestContext, clear_current_tenant, reset_correlation_id, set_correlation_id, set_current_tenant
@@ -55,37 +55,61 @@ class CustomCORSMiddleware(CORSMiddleware):
         )
 
 
-class RequestLogMiddleware(BaseHTTPMiddleware):
-    """请求日志 & 演示模式拦截"""
+class MetricsMiddleware:
+    """请求耗时指标：按方法、路由模板、状态码、租户记录直方图（含内侧中间件与响应体发送耗时）"""
 
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.observe_request(scope, status, time.perf_counter() - start)
+
+
+class RequestLogMiddleware:
+    """请求日志 & 演示模式拦截（纯 ASGI：不额外起任务、不缓冲流式响应）"""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    @staticmethod
-    def _hydrate_session_id(request: Request) -> None:
-        """从 ctx / JWT 中提取 session_id 并写入 ctx。"""
-        ctx = getattr(request.state, "ctx", None)
-        sid = ctx.session_id if ctx else None
-        if not sid and ctx and ctx.jwt_user_info:
-            sid = ctx.jwt_user_info.get("session_id")
-        if not sid:
-            token = _strip_bearer(request.headers.get("Authorization", ""))
-            if token:
-                try:
-                    payload = decode_access_token(token)
-                    sid = getattr(payload, "sub", None) if payload else None
-                except Exception:
-                    sid = None
-        if sid:
-            request.state.ctx = replace(ctx or RequestContext(), session_id=sid)
-
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
         start_time = time.time()
-        self._hydrate_session_id(request)
+        request = Request(scope)
+        await _resolve_auth(request)
 
         client_ip = get_client_ip(request)
         logger.info("请求: {} {} | client={}", request.method, request.url.path, client_ip or "unknown")
 
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+                process_time = round(time.time() - start_time, 5)
+                MutableHeaders(scope=message)["X-Process-Time"] = str(process_time)
+                logger.info("响应: {} | {:.1f}ms", message["status"], process_time * 1000)
+            await send(message)
+
         try:
             path = request.url.path
             config = await self._load_config(request)
@@ -103,18 +127,18 @@ class RequestLogMiddleware(BaseHTTPMiddleware):
                     request.method, path, client_ip,
                     "IP黑名单" if is_blacklisted else "演示模式",
                 )
-                return ErrorResponse(
+                response = ErrorResponse(
                     msg="IP已被黑名单" if is_blacklisted else "演示环境，禁止操作"
                 )
+                await response(scope, receive, send)
+                return
 
-            response = await call_next(request)
-            process_time = round(time.time() - start_time, 5)
-            response.headers["X-Process-Time"] = str(process_time)
-            logger.info("响应: {} | {:.1f}ms", response.status_code, process_time * 1000)
-            return response
+            await self.app(scope, receive, send_wrapper)
         except CustomException as e:
+            if response_started:
+                raise
             logger.exception(f"中间件异常: {e!s}")
-            return ErrorResponse(msg="系统异常，请联系管理员", data=str(e))
+            await ErrorResponse(msg="系统异常，请联系管理员", data=str(e))(scope, receive, send)
 
     @staticmethod
     async def _load_config(request: Request) -> dict:
@@ -134,22 +158,60 @@ class CustomGZipMiddleware(GZipMiddleware):
         super().__init__(app, minimum_size=settings.GZIP_MIN_SIZE, compresslevel=settings.GZIP_COMPRESS_LEVEL)
 
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
+class CorrelationIdMiddleware:
+    """请求关联 ID：读取或生成 X-Correlation-ID，写入日志上下文并回写响应头。"""
+
     def __init__(self, app: ASGIApp) -> None:
+        self.app = app
         self._header = "X-Correlation-ID"
-        super().__init__(app)
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        cid = request.headers.get(self._header) or str(uuid.uuid4())
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cid = Headers(scope=scope).get(self._header) or str(uuid.uuid4())
         token = set_correlation_id(cid)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[self._header] = cid
+            await send(message)
+
         try:
-            response = await call_next(request)
-            response.headers[self._header] = cid
-            return response
+            await self.app(scope, receive, send_wrapper)
         finally:
             reset_correlation_id(token)
 
 
+class SqlStatsMiddleware:
+    """请求级 SQL 统计：为每个请求开启统计，并把语句数 / 数据库耗时写入 Server-Timing 响应头。
+
+    需位于 CorrelationIdMiddleware 内侧，统计才能带上关联 ID；流式响应在响应头发出后执行的语句不计入。
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = sql_stats.begin()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+                sql_stats.finish(stats)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sql_stats.reset(token)
+
+
 _TENANT_WHITELIST_PREFIXES = ("/docs", "/redoc", "/openapi.json", "/metrics", "/static/")
 _WHITELIST_ALL = (
     "/api/v1/system/auth/login", "/api/v1/system/auth/captcha",
@@ -165,47 +227,55 @@ def _tenant_is_whitelisted(path: str) -> bool:
     return False
 
 
-async def _extract_tenant_from_token(request: Request) -> int | None:
-    """从 JWT + Redis 会话解析租户 ID；结果挂到 request.state 上以便本请求内复用。
+async def _resolve_auth(request: Request) -> None:
+    """认证预解析：每个请求只解码一次 JWT，并用一次 Redis 往返取回会话 / 在线 TTL（含滑动续期）。
 
-    返回 None 表示未登录 / 会话过期，调用方应避免回退到平台租户（1）。
+    结果写入 request.state.ctx，供 TenantMiddleware 与认证依赖复用；解析失败时静默跳过，
+    由认证依赖按原逻辑给出具体错误。
     """
     if hasattr(request.state, "tenant_id_resolved"):
-        return request.state.tenant_id
-
+        return
     request.state.tenant_id_resolved = True
     request.state.tenant_id = None
 
     token = _strip_bearer(request.headers.get("Authorization", ""))
     if not token:
-        return None
+        return
     try:
         payload = decode_access_token(token)
-        if not payload or not hasattr(payload, "sub"):
-            return None
+    except Exception:
+        return
+    if not payload or not payload.sub:
+        return
 
-        session_id = payload.sub
-        redis = getattr(request.app.state, "redis", None)
-        raw = await await_redis_get(redis, session_id) if redis else None
-        user_info = json.loads(raw) if raw else None
+    user_info, ttl = None, None
+    redis = getattr(request.app.state, "redis", None)
+    if redis and not payload.is_refresh:
+        try:
+            user_info, ttl = await fetch_session_state(redis, payload.sub)
+        except Exception:
+            user_info, ttl = None, None
 
-        base = getattr(request.state, "ctx", None) or RequestContext()
-        request.state.ctx = replace(base, jwt_payload=payload, jwt_user_info=user_info)
-        if user_info and user_info.get("tenant_id"):
-            request.state.tenant_id = int(user_info["tenant_id"])
-    except Exception:
-        pass
-    return request.state.tenant_id
+    base = getattr(request.state, "ctx", None) or RequestContext()
+    request.state.ctx = replace(
+        base,
+        jwt_payload=payload,
+        jwt_user_info=user_info,
+        session_id=base.session_id or payload.sub,
+        access_token=token,
+        access_ttl=ttl,
+    )
+    if user_info and user_info.get("tenant_id"):
+        request.state.tenant_id = int(user_info["tenant_id"])
 
 
-async def await_redis_get(redis, key: str) -> str | None:
-    """获取用户会话；Redis 不可用时返回 None。"""
-    from app.common.enums import RedisInitKeyConfig
-    from app.core.redis_crud import RedisCURD
-    try:
-        return await RedisCURD(redis).get(f"{RedisInitKeyConfig.USER_SESSION.key}:{key}")
-    except Exception:
-        return None
+async def _extract_tenant_from_token(request: Request) -> int | None:
+    """从预解析的 JWT 会话中获取租户 ID。
+
+    返回 None 表示未登录 / 会话过期，调用方应避免回退到平台租户（1）。
+    """
+    await _resolve_auth(request)
+    return request.state.tenant_id
 
 
 def _is_path_whitelisted(path: str, whitelist: list) -> bool:
@@ -221,18 +291,26 @@ def _is_path_whitelisted(path: str, whitelist: list) -> bool:
     return False
 
 
-class TenantMiddleware(BaseHTTPMiddleware):
+class TenantMiddleware:
+    """租户上下文：解析 JWT 会话中的租户 ID 写入 ContextVar，请求结束后清理。"""
+
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        request = Request(scope)
         if request.method == "OPTIONS" or _tenant_is_whitelisted(request.url.path):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
         try:
             set_current_tenant(await _extract_tenant_from_token(request))
         except Exception:
             logger.exception("租户中间件异常: path={}", request.url.path)
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send)
         finally:
             clear_current_tenant()
@@ -1,11 +1,10 @@
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import Select, or_, select
 from sqlalchemy.sql.elements import ColumnElement
 
 from app.common.enums import PermissionFilterStrategy
 from app.core.base_schema import AuthSchema
-from app.utils.common_util import get_child_id_map, get_child_recursion
 
 
 class Permission:
@@ -173,13 +172,13 @@ class Permission:
             return None
 
         # 收集所有可访问的部门ID
-        accessible_dept_ids = await self.__get_accessible_dept_ids(data_scopes, custom_dept_ids)
+        accessible_dept_ids, child_dept_subquery = self.__get_accessible_dept_ids(data_scopes, custom_dept_ids)
 
         # 根据模型类型过滤
         if self.model.__name__ == "DeptModel":
-            return self.__filter_dept_model(accessible_dept_ids)
+            return self.__filter_dept_model(accessible_dept_ids, child_dept_subquery)
         elif self.model.__name__ == "UserModel":
-            return self.__filter_user_model(accessible_dept_ids)
+            return self.__filter_user_model(accessible_dept_ids, child_dept_subquery)
         else:
             return None
 
@@ -226,7 +225,7 @@ class Permission:
             return None
 
         # 收集所有可访问的部门ID
-        accessible_dept_ids = await self.__get_accessible_dept_ids(data_scopes, custom_dept_ids)
+        accessible_dept_ids, child_dept_subquery = self.__get_accessible_dept_ids(data_scopes, custom_dept_ids)
 
         # 如果有部门权限，使用部门过滤
         if accessible_dept_ids:
@@ -234,12 +233,12 @@ class Permission:
             if self.model.__name__ == "UserModel" and hasattr(self.model, "dept_id"):
                 dept_id_attr = getattr(self.model, "dept_id", None)
                 if dept_id_attr is not None:
-                    return dept_id_attr.in_(list(accessible_dept_ids))
+                    return self.__dept_in(dept_id_attr, accessible_dept_ids, child_dept_subquery)
 
             # 其他模型：通过created_by关系过滤创建人的部门
             creator_rel = getattr(self.model, "created_by", None)
             if creator_rel is not None and hasattr(UserModel, "dept_id"):
-                return creator_rel.has(UserModel.dept_id.in_(list(accessible_dept_ids)))
+                return creator_rel.has(self.__dept_in(UserModel.dept_id, accessible_dept_ids, child_dept_subquery))
 
             # 降级方案：只能查看自己的数据
             created_id_attr = getattr(self.model, "created_id", None)
@@ -260,18 +259,22 @@ class Permission:
             return created_id_attr == self.auth.user.id
         return None
 
-    async def __get_accessible_dept_ids(self, data_scopes: set, custom_dept_ids: set) -> set[int]:
+    def __get_accessible_dept_ids(self, data_scopes: set, custom_dept_ids: set) -> tuple[set[int], Select | None]:
         """
-        获取用户可访问的所有部门ID
+        获取用户可访问的部门ID
+
+        本部门及以下（3）不再加载整张部门表递归，而是返回部门闭包表子查询，
+        由数据库通过 ``dept_id IN (SELECT descendant_id ...)`` 走索引过滤。
 
         Args:
             data_scopes: 用户角色的数据权限范围集合
             custom_dept_ids: 自定义权限关联的部门ID集合
 
         Returns:
-            可访问的部门ID集合
+            (可访问的部门ID集合, 本部门及以下子查询或 None)
         """
         accessible_dept_ids = set()
+        child_dept_subquery = None
         user_dept_id = getattr(self.auth.user, "dept_id", None)
 
         # 处理自定义数据权限（5）
@@ -284,27 +287,31 @@ class Permission:
 
         # 处理本部门及以下数据权限（3）
         if self.DATA_SCOPE_DEPT_AND_CHILD in data_scopes and user_dept_id is not None:
-            try:
-                from app.api.v1.module_system.dept.model import DeptModel
-                dept_sql = select(DeptModel)
-                dept_result = await self.auth.db.execute(dept_sql)
-                dept_objs = dept_result.scalars().all()
-                id_map = get_child_id_map(dept_objs)
-                dept_with_children_ids = get_child_recursion(id=user_dept_id, id_map=id_map)
-                accessible_dept_ids.update(dept_with_children_ids)
-            except Exception:
-                accessible_dept_ids.add(user_dept_id)
-
-        return accessible_dept_ids
-
-    def __filter_dept_model(self, accessible_dept_ids: set[int]) -> ColumnElement | None:
+            from app.api.v1.module_system.dept.model import DeptClosureModel
+
+            accessible_dept_ids.add(user_dept_id)
+            child_dept_subquery = select(DeptClosureModel.descendant_id).where(DeptClosureModel.ancestor_id == user_dept_id)
+
+        return accessible_dept_ids, child_dept_subquery
+
+    @staticmethod
+    def __dept_in(column: Any, dept_ids: set[int], child_dept_subquery: Select | None) -> ColumnElement:
+        """
+        构建部门过滤条件：显式部门ID + 本部门及以下子查询
+        """
+        condition = column.in_(list(dept_ids))
+        if child_dept_subquery is not None:
+            condition = or_(condition, column.in_(child_dept_subquery))
+        return condition
+
+    def __filter_dept_model(self, accessible_dept_ids: set[int], child_dept_subquery: Select | None = None) -> ColumnElement | None:
         """
         过滤部门模型
         """
         if accessible_dept_ids:
             id_attr = getattr(self.model, "id", None)
             if id_attr is not None:
-                return id_attr.in_(list(accessible_dept_ids))
+                return self.__dept_in(id_attr, accessible_dept_ids, child_dept_subquery)
         user_dept_id = getattr(self.auth.user, "dept_id", None)
         if user_dept_id is not None:
             id_attr = getattr(self.model, "id", None)
@@ -312,12 +319,12 @@ class Permission:
                 return id_attr == user_dept_id
         return None
 
-    def __filter_user_model(self, accessible_dept_ids: set[int]) -> ColumnElement | None:
+    def __filter_user_model(self, accessible_dept_ids: set[int], child_dept_subquery: Select | None = None) -> ColumnElement | None:
         """
         过滤用户模型
         """
         if accessible_dept_ids:
             dept_id_attr = getattr(self.model, "dept_id", None)
             if dept_id_attr is not None:
-                return dept_id_attr.in_(list(accessible_dept_ids))
+                return self.__dept_in(dept_id_attr, accessible_dept_ids, child_dept_subquery)
         return None
@@ -0,0 +1,110 @@
+"""权限位图索引
+
+为每个菜单权限标识（``menu.permission``）分配一个进程内稳定的整数槽位，
+角色 / 用户 / 租户套餐的权限集合都预编译为 Python int 位图：
+
+    (用户位图 & 租户套餐位图 & 接口所需位图) != 0
+
+即可完成一次接口鉴权，不再需要每个请求遍历角色菜单构建 dict。
+
+槽位只追加不回收（权限标识被删除后其槽位闲置），因此已缓存的位图在进程生命周期内始终有效。
+"""
+
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import select
+
+from app.core.logger import logger
+
+
+class PermissionIndex:
+    """权限标识 → 位图槽位索引（进程级单例，类方法访问）"""
+
+    _slots: dict[str, int] = {}
+
+    @classmethod
+    def slot(cls, permission: str) -> int:
+        """
+        获取权限标识的槽位，不存在时追加分配。
+
+        参数:
+        - permission (str): 权限标识。
+
+        返回:
+        - int: 槽位编号。
+        """
+        slot = cls._slots.get(permission)
+        if slot is None:
+            slot = cls._slots.setdefault(permission, len(cls._slots))
+        return slot
+
+    @classmethod
+    def mask(cls, permissions: Iterable[str | None]) -> int:
+        """
+        将一组权限标识编译为位图（空值忽略）。
+
+        参数:
+        - permissions (Iterable[str | None]): 权限标识集合。
+
+        返回:
+        - int: 位图。
+        """
+        bits = 0
+        for permission in permissions:
+            if permission:
+                bits |= 1 << cls.slot(permission)
+        return bits
+
+    @classmethod
+    def role_mask(cls, role: Any) -> int:
+        """
+        编译角色的启用菜单权限位图（兼容 RoleModel 与 RolePrincipal）。
+
+        参数:
+        - role (Any): 角色对象，需包含 ``menus``。
+
+        返回:
+        - int: 位图。
+        """
+        return cls.mask(menu.permission for menu in role.menus or [] if menu.status == 0)
+
+    @classmethod
+    def user_mask(cls, user: Any) -> int:
+        """
+        获取用户全部启用角色的权限位图；快照已预编译时直接返回。
+
+        参数:
+        - user (Any): UserPrincipal 或 UserModel。
+
+        返回:
+        - int: 位图。
+        """
+        bits = getattr(user, "permission_bits", None)
+        if bits is not None:
+            return bits
+        bits = 0
+        for role in getattr(user, "roles", None) or []:
+            if role.status == 0:
+                bits |= cls.role_mask(role)
+        return bits
+
+    @classmethod
+    def size(cls) -> int:
+        """当前已分配的槽位数量。"""
+        return len(cls._slots)
+
+    @classmethod
+    async def init(cls) -> None:
+        """
+        启动时按菜单 ID 顺序预分配全部权限槽位，保证多数权限的槽位在各 worker 间一致、位图紧凑。
+        """
+        from app.api.v1.module_platform.menu.model import MenuModel
+        from app.core.database import async_db_session
+
+        async with async_db_session() as db:
+            result = await db.execute(
+                select(MenuModel.permission).where(MenuModel.permission.isnot(None)).order_by(MenuModel.id)
+            )
+            cls.mask(row[0] for row in result.all())
+        logger.info(f"权限位图索引已加载, slots={cls.size()}")
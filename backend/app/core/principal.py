@@ -0,0 +1,289 @@
+"""认证主体（Principal）缓存 — 替代每个请求都查库加载用户
+
+请求认证只需要「用户 + 启用角色 + 菜单权限 + 数据范围」这一小块只读信息，
+这里把它压缩成不可变快照 ``UserPrincipal``，按 ``user_id`` 缓存在进程内，
+并用 Redis 中的版本号（全局版本 + 用户版本）做跨 worker 失效：
+
+- 命中：一次 Redis MGET 校验版本，零 SQL
+- 未命中 / 版本变化：回源数据库重建快照
+
+写入方（UserService / RoleService / MenuService / PackageService）调用
+``invalidate_users`` / ``invalidate_all`` 递增版本号，事务提交后会再递增一次，
+避免并发请求在提交前把旧数据按新版本写回缓存。
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from redis.asyncio.client import Redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
+from app.core.logger import logger
+from app.core.permission_index import PermissionIndex
+from app.core.redis_crud import RedisCURD
+
+_REDIS: Redis | None = None
+
+# {user_id: (version_stamp, cached_at, principal)}
+_principal_cache: OrderedDict[int, tuple[tuple[Any, Any], float, "UserPrincipal"]] = OrderedDict()
+
+
+@dataclass(frozen=True, slots=True)
+class MenuGrant:
+    """角色授权菜单（仅保留鉴权需要的字段）。"""
+
+    id: int
+    permission: str | None
+    status: int
+    client: str = "pc"
+
+
+@dataclass(frozen=True, slots=True)
+class DeptRef:
+    """角色自定义数据权限关联的部门。"""
+
+    id: int
+
+
+@dataclass(frozen=True, slots=True)
+class RolePrincipal:
+    """角色快照，属性名与 RoleModel 保持一致，调用方无需区分 ORM 对象与快照。"""
+
+    id: int
+    name: str
+    code: str
+    status: int
+    data_scope: int
+    menus: tuple[MenuGrant, ...] = ()
+    depts: tuple[DeptRef, ...] = ()
+    permission_bits: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class UserPrincipal:
+    """用户认证快照
+
+    属性名与 UserModel 保持一致（``id`` / ``tenant_id`` / ``roles`` ...），
+    ``auth.user`` 的既有调用方可以无感切换；额外预计算了 ``role_ids``、
+    ``permissions``（启用菜单的权限标识）、``permission_bits``（权限位图）与 ``data_scopes``。
+    """
+
+    id: int
+    uuid: str | None
+    username: str
+    name: str
+    tenant_id: int | None
+    dept_id: int | None
+    is_superuser: bool
+    status: int
+    avatar: str | None = None
+    email: str | None = None
+    mobile: str | None = None
+    roles: tuple[RolePrincipal, ...] = ()
+    role_ids: frozenset[int] = field(default_factory=frozenset)
+    permissions: frozenset[str] = field(default_factory=frozenset)
+    data_scopes: frozenset[int] = field(default_factory=frozenset)
+    permission_bits: int = 0
+
+    @classmethod
+    def from_model(cls, user: Any) -> "UserPrincipal":
+        """
+        由已预加载角色/菜单/部门关系的 UserModel 构建快照。
+
+        参数:
+        - user (UserModel): 用户 ORM 对象（roles.menus / roles.depts 已加载）。
+
+        返回:
+        - UserPrincipal: 不可变认证快照（仅包含启用状态的角色）。
+        """
+        roles = tuple(
+            RolePrincipal(
+                id=role.id,
+                name=role.name,
+                code=role.code,
+                status=role.status,
+                data_scope=role.data_scope,
+                menus=tuple(
+                    MenuGrant(
+                        id=menu.id,
+                        permission=menu.permission,
+                        status=menu.status,
+                        client=getattr(menu, "client", None) or "pc",
+                    )
+                    for menu in role.menus or []
+                ),
+                depts=tuple(DeptRef(id=dept.id) for dept in role.depts or []),
+                permission_bits=PermissionIndex.role_mask(role),
+            )
+            for role in user.roles or []
+            if role and role.status == 0
+        )
+        permission_bits = 0
+        for role in roles:
+            permission_bits |= role.permission_bits
+        return cls(
+            id=user.id,
+            uuid=user.uuid,
+            username=user.username,
+            name=user.name,
+            tenant_id=user.tenant_id,
+            dept_id=user.dept_id,
+            is_superuser=bool(user.is_superuser),
+            status=user.status,
+            avatar=user.avatar,
+            email=user.email,
+            mobile=user.mobile,
+            roles=roles,
+            role_ids=frozenset(role.id for role in roles),
+            permissions=frozenset(
+                menu.permission for role in roles for menu in role.menus if menu.status == 0 and menu.permission
+            ),
+            data_scopes=frozenset(role.data_scope for role in roles),
+            permission_bits=permission_bits,
+        )
+
+
+async def init(redis: Redis) -> None:
+    """
+    注册用于版本号读写的 Redis 连接（lifespan 中调用）。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    """
+    global _REDIS
+    _REDIS = redis
+
+
+def _global_version_key() -> str:
+    return f"{RedisInitKeyConfig.AUTH_PRINCIPAL_VERSION.key}:global"
+
+
+def _user_version_key(user_id: int) -> str:
+    return f"{RedisInitKeyConfig.AUTH_PRINCIPAL_VERSION.key}:{user_id}"
+
+
+async def get_version(redis: Redis, user_id: int) -> tuple[Any, Any]:
+    """
+    读取用户当前版本戳（全局版本, 用户版本），一次 MGET。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    - user_id (int): 用户ID。
+
+    返回:
+    - tuple[Any, Any]: 版本戳；Redis 不可用时返回 (None, None)。
+    """
+    values = await RedisCURD(redis).mget([_global_version_key(), _user_version_key(user_id)])
+    if not isinstance(values, list) or len(values) != 2:
+        return (None, None)
+    return (values[0], values[1])
+
+
+def get_cached(user_id: int, version: tuple[Any, Any]) -> UserPrincipal | None:
+    """
+    按版本戳读取进程内缓存；版本不一致或超过 TTL 视为未命中。
+
+    参数:
+    - user_id (int): 用户ID。
+    - version (tuple[Any, Any]): 当前版本戳。
+
+    返回:
+    - UserPrincipal | None: 命中的快照。
+    """
+    entry = _principal_cache.get(user_id)
+    if entry is None:
+        return None
+    cached_version, cached_at, principal = entry
+    if cached_version != version or time.monotonic() - cached_at > settings.AUTH_PRINCIPAL_CACHE_TTL:
+        _principal_cache.pop(user_id, None)
+        return None
+    _principal_cache.move_to_end(user_id)
+    return principal
+
+
+def put_cached(principal: UserPrincipal, version: tuple[Any, Any]) -> None:
+    """
+    写入进程内缓存（LRU 淘汰）。
+
+    参数:
+    - principal (UserPrincipal): 用户快照。
+    - version (tuple[Any, Any]): 回源前读取到的版本戳。
+    """
+    _principal_cache[principal.id] = (version, time.monotonic(), principal)
+    _principal_cache.move_to_end(principal.id)
+    while len(_principal_cache) > settings.AUTH_PRINCIPAL_CACHE_SIZE:
+        _principal_cache.popitem(last=False)
+
+
+async def _bump(keys: list[str]) -> None:
+    if _REDIS is None or not keys:
+        return
+    stamp = time.time_ns()
+    for key in keys:
+        await RedisCURD(_REDIS).set(key=key, value=stamp, expire=None)
+
+
+def _bump_after_commit(db: AsyncSession | None, keys: list[str], user_ids: list[int] | None) -> None:
+    """事务提交后再递增一次版本，覆盖「提交前被并发请求回填旧快照」的窗口。"""
+    if db is None:
+        return
+
+    def _on_commit(_session: Any) -> None:
+        _drop_local(user_ids)
+        try:
+            asyncio.get_running_loop().create_task(_bump(keys))
+        except RuntimeError:
+            pass
+
+    event.listen(db.sync_session, "after_commit", _on_commit, once=True)
+
+
+def _drop_local(user_ids: Iterable[int] | None) -> None:
+    if user_ids is None:
+        _principal_cache.clear()
+        return
+    for uid in user_ids:
+        _principal_cache.pop(uid, None)
+
+
+async def invalidate_users(db: AsyncSession | None, user_ids: Iterable[int]) -> None:
+    """
+    失效指定用户的认证快照（用户资料、状态、角色绑定变更时调用）。
+
+    参数:
+    - db (AsyncSession | None): 当前事务会话，提交后会再次失效。
+    - user_ids (Iterable[int]): 用户ID列表。
+    """
+    ids = [int(uid) for uid in user_ids if uid is not None]
+    if not ids:
+        return
+    keys = [_user_version_key(uid) for uid in ids]
+    _drop_local(ids)
+    try:
+        await _bump(keys)
+    except Exception as e:
+        logger.warning(f"认证缓存失效失败: {e}")
+    _bump_after_commit(db, keys, ids)
+
+
+async def invalidate_all(db: AsyncSession | None) -> None:
+    """
+    失效全部认证快照（角色权限、菜单、套餐菜单变更时调用）。
+
+    参数:
+    - db (AsyncSession | None): 当前事务会话，提交后会再次失效。
+    """
+    keys = [_global_version_key()]
+    _drop_local(None)
+    try:
+        await _bump(keys)
+    except Exception as e:
+        logger.warning(f"认证缓存失效失败: {e}")
+    _bump_after_commit(db, keys, None)
@@ -1,4 +1,5 @@
 import json
+from collections.abc import AsyncIterator
 from typing import Any
 
 from redis.asyncio.client import Redis
@@ -29,8 +30,26 @@ class RedisCURD:
             logger.error(f"批量获取缓存失败: {e!s}")
             return []
 
+    async def scan_keys(self, pattern: str = "*", count: int = 1000) -> AsyncIterator[list]:
+        """按 SCAN 游标分批迭代匹配的键名（不阻塞 Redis，替代 KEYS）
+
+        参数:
+        - pattern (str, optional): 匹配模式,默认值为"*"。
+        - count (int, optional): 每次 SCAN 的提示批量,默认值为1000。
+
+        返回:
+        - AsyncIterator[list]: 每批匹配到的键名列表（可能为空批次已跳过）
+        """
+        cursor = 0
+        while True:
+            cursor, keys = await self.redis.scan(cursor=cursor, match=pattern, count=count)
+            if keys:
+                yield keys
+            if not cursor:
+                break
+
     async def get_keys(self, pattern: str = "*") -> list:
-        """获取缓存键名
+        """获取缓存键名（SCAN 游标迭代）
 
         参数:
         - pattern (str, optional): 匹配模式,默认值为"*"。
@@ -39,7 +58,9 @@ class RedisCURD:
         - list: 返回匹配的缓存键名列表,如果获取失败则返回空列表
         """
         try:
-            keys = await self.redis.keys(f"{pattern}")
+            keys: list = []
+            async for batch in self.scan_keys(pattern):
+                keys.extend(batch)
             return keys
         except Exception as e:
             logger.error(f"获取缓存键名失败: {e!s}")
@@ -180,8 +201,27 @@ class RedisCURD:
             logger.error(f"删除缓存失败: {e!s}")
             return False
 
+    async def unlink(self, *keys: str, batch: int = 500) -> int:
+        """分批异步删除缓存（UNLINK 在后台线程回收内存，不阻塞 Redis）
+
+        参数:
+        - keys (str): 缓存键名
+        - batch (int, optional): 每批删除的键数量,默认值为500。
+
+        返回:
+        - int: 实际删除的键数量,失败时返回0
+        """
+        try:
+            removed = 0
+            for i in range(0, len(keys), batch):
+                removed += await self.redis.unlink(*keys[i : i + batch])
+            return removed
+        except Exception as e:
+            logger.error(f"删除缓存失败: {e!s}")
+            return 0
+
     async def clear(self, pattern: str = "*") -> bool:
-        """清空缓存
+        """清空缓存（SCAN 分批扫描 + UNLINK 分批删除）
 
         参数:
         - pattern (str, optional): 匹配模式,默认值为"*"。
@@ -190,9 +230,8 @@ class RedisCURD:
         - bool: 如果清空缓存成功则返回True,否则返回False
         """
         try:
-            keys = await self.redis.keys(f"{pattern}")
-            if keys:
-                await self.redis.delete(*keys)
+            async for keys in self.scan_keys(pattern):
+                await self.redis.unlink(*keys)
             return True
         except Exception as e:
             logger.error(f"清空缓存失败: {e!s}")
@@ -340,3 +379,111 @@ class RedisCURD:
         except Exception as e:
             logger.error(f"获取哈希缓存失败: {e!s}")
             return []
+
+    async def session_state(
+        self,
+        session_key: str,
+        access_key: str,
+        refresh_key: str,
+        renew_below: int,
+        access_expire: int,
+        refresh_expire: int,
+    ) -> tuple[Any, int]:
+        """一次往返读取会话并按需滑动续期
+
+        单个 Lua 脚本内完成：读取会话 JSON、读取访问令牌剩余 TTL（-2 即不在线），
+        会话存在且 TTL 低于阈值时同时续期访问/刷新令牌。
+
+        参数:
+        - session_key (str): 会话信息键名
+        - access_key (str): 访问令牌键名
+        - refresh_key (str): 刷新令牌键名
+        - renew_below (int): 剩余 TTL 低于该值时续期,0 表示不续期
+        - access_expire (int): 访问令牌续期时长,单位为秒
+        - refresh_expire (int): 刷新令牌续期时长,单位为秒
+
+        返回:
+        - tuple[Any, int]: (会话值或None, 访问令牌剩余TTL),获取失败时返回(None, -2)
+        """
+        script = """
+        local raw = redis.call('get', KEYS[1])
+        local ttl = redis.call('ttl', KEYS[2])
+        if raw and ttl > 0 and ttl < tonumber(ARGV[1]) then
+            redis.call('expire', KEYS[2], ARGV[2])
+            redis.call('expire', KEYS[3], ARGV[3])
+            ttl = tonumber(ARGV[2])
+        end
+        return {raw, ttl}
+        """
+        try:
+            raw, ttl = await self.redis.eval(  # pyright: ignore[reportGeneralTypeIssues]
+                script, 3, session_key, access_key, refresh_key, str(renew_below), str(access_expire), str(refresh_expire)
+            )
+            return raw, int(ttl)
+        except Exception as e:
+            logger.debug(f"会话脚本执行失败,降级为逐条命令: {e!s}")
+        try:
+            raw = await self.redis.get(session_key)
+            ttl = await self.redis.ttl(access_key)
+            if raw and 0 < ttl < renew_below:
+                await self.redis.expire(access_key, access_expire)
+                await self.redis.expire(refresh_key, refresh_expire)
+                ttl = access_expire
+            return raw, ttl
+        except Exception as e:
+            logger.error(f"获取会话状态失败: {e!s}")
+            return None, -2
+
+    async def index_add(self, index: str, *members: str) -> bool:
+        """向二级索引集合添加成员（用于按命名空间枚举键，避免扫描全库）
+
+        参数:
+        - index (str): 索引集合键名
+        - members (str): 成员（通常为键名后缀）
+
+        返回:
+        - bool: 如果添加成功则返回True,否则返回False
+        """
+        if not members:
+            return True
+        try:
+            await self.redis.sadd(index, *members)
+            return True
+        except Exception as e:
+            logger.error(f"写入索引集合失败: {e!s}")
+            return False
+
+    async def index_remove(self, index: str, *members: str) -> bool:
+        """从二级索引集合移除成员
+
+        参数:
+        - index (str): 索引集合键名
+        - members (str): 成员
+
+        返回:
+        - bool: 如果移除成功则返回True,否则返回False
+        """
+        if not members:
+            return True
+        try:
+            await self.redis.srem(index, *members)
+            return True
+        except Exception as e:
+            logger.error(f"移除索引集合成员失败: {e!s}")
+            return False
+
+    async def index_members(self, index: str) -> list[str]:
+        """读取二级索引集合的全部成员（O(成员数)，不触及其他键）
+
+        参数:
+        - index (str): 索引集合键名
+
+        返回:
+        - list[str]: 成员列表,获取失败时返回空列表
+        """
+        try:
+            members = await self.redis.smembers(index)
+            return [m.decode() if isinstance(m, bytes) else m for m in members]
+        except Exception as e:
+            logger.error(f"读取索引集合失败: {e!s}")
+            return []
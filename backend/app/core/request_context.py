@@ -41,3 +41,7 @@ class RequestContext:
     user_username: str | None = None
     session_info: dict[str, Any] | None = None
     login_location: str | None = None
+    principal: Any = None
+    # 中间件预解析认证时使用的 token 与访问令牌剩余 TTL（-2 不在线，None 未解析）
+    access_token: str | None = None
+    access_ttl: int | None = None
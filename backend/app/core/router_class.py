@@ -8,25 +8,14 @@ from fastapi.routing import APIRoute
 from starlette.background import BackgroundTask
 
 from app.config.setting import settings
-from app.core.base_schema import AuthSchema
-from app.core.database import async_db_session
+from app.core import sql_stats
+from app.core.log_sink import OPERATION_LOG_SINK
 from app.core.logger import logger
-
-
-async def _write_operation_log_async(log_data: dict) -> None:
-    from app.api.v1.module_system.log.schema import OperationLogCreateSchema
-    from app.api.v1.module_system.log.service import OperationLogService
-    try:
-        async with async_db_session() as _session:
-            async with _session.begin():
-                _auth = AuthSchema(db=_session)
-                await OperationLogService(_auth).create(data=OperationLogCreateSchema(**log_data))
-    except Exception:
-        logger.exception("操作日志写入失败: path={}", log_data.get("request_path"))
+from app.core.request_context import get_correlation_id
 
 
 class OperationLogRoute(APIRoute):
-    """操作日志路由 — 自动记录请求/响应并后台异步写入"""
+    """操作日志路由 — 自动记录请求/响应并交给日志写入器批量入库"""
 
     def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
         original_route_handler = super().get_route_handler()
@@ -65,19 +54,25 @@ class OperationLogRoute(APIRoute):
 
                 ctx = getattr(request.state, "ctx", None)
                 current_user_id = ctx.user_id if ctx else None
-
-                log_data: dict[str, Any] = {
-                    "request_path": request.url.path,
-                    "request_method": request.method,
-                    "request_payload": log_payload,
-                    "response_code": response.status_code,
-                    "response_json": response_data.decode(),
-                    "process_time": f"{(time.time() - start):.2f}s",
-                    "description": route.summary if route else "",
-                    "created_id": current_user_id,
-                    "updated_id": current_user_id,
-                }
-                response.background = BackgroundTask(_write_operation_log_async, log_data)
+                stats = sql_stats.current()
+
+                from app.api.v1.module_system.log.schema import OperationLogCreateSchema
+
+                log_data = OperationLogCreateSchema(
+                    request_path=request.url.path,
+                    request_method=request.method,
+                    request_payload=log_payload,
+                    response_code=response.status_code,
+                    response_json=response_data.decode(),
+                    process_time=f"{(time.time() - start):.2f}s",
+                    correlation_id=get_correlation_id() or None,
+                    sql_count=stats.count if stats else None,
+                    sql_time=f"{stats.total_ms:.2f}ms" if stats else None,
+                    description=route.summary if route else "",
+                    created_id=current_user_id,
+                    updated_id=current_user_id,
+                ).model_dump()
+                response.background = BackgroundTask(OPERATION_LOG_SINK.submit, log_data)
             except Exception:
                 logger.warning("操作日志采集异常: {}", request.url.path, exc_info=True)
             return response
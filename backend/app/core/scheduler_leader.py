@@ -0,0 +1,296 @@
+"""调度器主节点选举（Redis 租约）
+
+每个 uvicorn worker 的 lifespan 都会启动 ``AsyncIOScheduler``，仅共享 RedisJobStore 并不能阻止
+多个进程同时扫描任务存储：系统任务被每个 worker 重复注册，同一次触发可能被多个 worker 执行并各写一条日志。
+
+这里用 Redis 租约选出唯一的主节点：
+
+- 租约键 ``SET NX PX`` 抢占，值为本进程标识；主节点每 ``TTL/3`` 续约一次（Lua 比对标识后 ``PEXPIRE``）
+- 主节点无法在租约到期前续约（Redis 不可达、被其他进程抢占）时立即降级，不与新主节点重叠运行
+- 正常退出时比对标识后删除租约并广播，其他进程立即接手；进程崩溃时由租约到期兜底（最长约 ``TTL``）
+- 控制频道（pub/sub）用于从节点把任务变更转发给主节点、集群级暂停 / 恢复等，消息由 ``on_message`` 处理
+
+选举结果通过 ``on_elected`` / ``on_demoted`` 回调通知调用方（``SchedulerUtil``）。
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from redis.asyncio.client import Redis
+
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
+from app.core.logger import logger
+
+# 本进程标识（租约值），便于排查当前主节点所在的主机与进程
+_TOKEN: str = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+# 续约 / 释放前比对租约持有者，避免误续、误删其他进程的租约
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+_REDIS: Redis | None = None
+_LOOP: asyncio.AbstractEventLoop | None = None
+_ELECTOR: asyncio.Task | None = None
+_LISTENER: asyncio.Task | None = None
+_WAKE: asyncio.Event | None = None
+_ON_ELECTED: Callable[[], Awaitable[None]] | None = None
+_ON_DEMOTED: Callable[[], Awaitable[None]] | None = None
+_ON_MESSAGE: Callable[[dict[str, Any]], Awaitable[None]] | None = None
+_IS_LEADER = False
+# 租约在本地视角下的到期时刻（续约请求发出前记录，偏保守）
+_EXPIRES = 0.0
+_STATS: dict[str, int] = {"elected": 0, "demoted": 0, "renew_failed": 0, "messages": 0}
+
+
+def _lease_key() -> str:
+    return RedisInitKeyConfig.SCHEDULER_LEADER.key
+
+
+def _channel() -> str:
+    return RedisInitKeyConfig.SCHEDULER_CONTROL.key
+
+
+def is_leader() -> bool:
+    """
+    本进程是否为调度器主节点（未启用选举时始终为 True）。
+
+    返回:
+    - bool: 是否为主节点。
+    """
+    return _IS_LEADER or _REDIS is None
+
+
+def token() -> str:
+    """
+    本进程标识。
+
+    返回:
+    - str: ``主机名:PID:随机串``。
+    """
+    return _TOKEN
+
+
+async def current_leader() -> str | None:
+    """
+    当前持有租约的进程标识。
+
+    返回:
+    - str | None: 主节点标识，未选出或未启用选举时为 None。
+    """
+    if _REDIS is None:
+        return None
+    try:
+        return await _REDIS.get(_lease_key())
+    except Exception as e:
+        logger.warning(f"读取调度器主节点失败: {e}")
+        return None
+
+
+async def publish(message: dict[str, Any]) -> None:
+    """
+    向控制频道广播消息（所有进程的 ``on_message`` 都会收到，发送方自身除外）。
+
+    参数:
+    - message (dict[str, Any]): 消息内容，``action`` 字段区分类型。
+    """
+    if _REDIS is None:
+        return
+    payload = json.dumps({**message, "origin": _TOKEN}, ensure_ascii=False, default=str)
+    try:
+        await _REDIS.publish(_channel(), payload)
+    except Exception as e:
+        logger.warning(f"调度器控制消息广播失败[{message.get('action')}]: {e}")
+
+
+def notify(message: dict[str, Any]) -> None:
+    """
+    线程安全地广播消息（调度器事件监听器可能在执行器线程中调用）。
+
+    参数:
+    - message (dict[str, Any]): 消息内容。
+    """
+    if _LOOP is None:
+        return
+    try:
+        _LOOP.call_soon_threadsafe(lambda: asyncio.ensure_future(publish(message)))
+    except RuntimeError:
+        # 事件循环已关闭（进程退出阶段）
+        pass
+
+
+async def init(
+    redis: Redis,
+    on_elected: Callable[[], Awaitable[None]],
+    on_demoted: Callable[[], Awaitable[None]],
+    on_message: Callable[[dict[str, Any]], Awaitable[None]],
+) -> None:
+    """
+    启动选举与控制频道监听（调度器以暂停状态启动后调用）。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    - on_elected (Callable[[], Awaitable[None]]): 成为主节点时调用（开始调度）。
+    - on_demoted (Callable[[], Awaitable[None]]): 失去主节点身份时调用（停止调度）。
+    - on_message (Callable[[dict[str, Any]], Awaitable[None]]): 收到其他进程的控制消息时调用。
+    """
+    global _REDIS, _LOOP, _WAKE, _ELECTOR, _LISTENER, _ON_ELECTED, _ON_DEMOTED, _ON_MESSAGE
+    if _ELECTOR is not None and not _ELECTOR.done():
+        return
+    _REDIS = redis
+    _LOOP = asyncio.get_running_loop()
+    _WAKE = asyncio.Event()
+    _ON_ELECTED, _ON_DEMOTED, _ON_MESSAGE = on_elected, on_demoted, on_message
+    _LISTENER = asyncio.create_task(_listen(), name="scheduler-control")
+    _ELECTOR = asyncio.create_task(_elect_loop(), name="scheduler-leader")
+
+
+async def close() -> None:
+    """停止选举；主节点释放租约并广播，其他进程立即接手（lifespan 关闭时调用）"""
+    global _ELECTOR, _LISTENER, _REDIS, _LOOP, _IS_LEADER
+    for task in (_ELECTOR, _LISTENER):
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+    _ELECTOR = _LISTENER = None
+    if _IS_LEADER and _REDIS is not None:
+        _IS_LEADER = False
+        try:
+            await _REDIS.eval(_RELEASE_SCRIPT, 1, _lease_key(), _TOKEN)
+        except Exception as e:
+            logger.warning(f"释放调度器主节点租约失败: {e}")
+        await publish({"action": "released"})
+        logger.info(f"调度器主节点已释放: {_TOKEN}")
+    _REDIS = None
+    _LOOP = None
+
+
+def stats() -> dict[str, Any]:
+    """
+    选举统计。
+
+    返回:
+    - dict[str, Any]: 本进程标识、是否主节点、租约剩余秒数与当选 / 降级 / 续约失败次数。
+    """
+    return {
+        "token": _TOKEN,
+        "enabled": _REDIS is not None,
+        "leader": is_leader(),
+        "lease_remaining": round(max(_EXPIRES - time.monotonic(), 0.0), 3) if _IS_LEADER else None,
+        **_STATS,
+    }
+
+
+async def _become_leader() -> None:
+    global _IS_LEADER
+    _IS_LEADER = True
+    _STATS["elected"] += 1
+    logger.info(f"✅ 当选调度器主节点: {_TOKEN}")
+    if _ON_ELECTED is not None:
+        await _ON_ELECTED()
+
+
+async def _step_down(reason: str) -> None:
+    global _IS_LEADER
+    if not _IS_LEADER:
+        return
+    _IS_LEADER = False
+    _STATS["demoted"] += 1
+    logger.warning(f"调度器主节点降级（{reason}）: {_TOKEN}")
+    if _ON_DEMOTED is not None:
+        await _ON_DEMOTED()
+
+
+async def _elect_loop() -> None:
+    assert _REDIS is not None and _WAKE is not None
+    global _EXPIRES
+    ttl_ms = settings.SCHEDULER_LEADER_TTL * 1000
+    interval = settings.SCHEDULER_LEADER_TTL / 3
+    while True:
+        started = time.monotonic()
+        try:
+            if _IS_LEADER:
+                if await _REDIS.eval(_RENEW_SCRIPT, 1, _lease_key(), _TOKEN, ttl_ms):
+                    _EXPIRES = started + settings.SCHEDULER_LEADER_TTL
+                else:
+                    await _step_down("租约已失效")
+            elif await _REDIS.set(_lease_key(), _TOKEN, nx=True, px=ttl_ms):
+                _EXPIRES = started + settings.SCHEDULER_LEADER_TTL
+                await _become_leader()
+                # on_elected 期间无法续约（耗时可能接近租约时长），立即续约确认仍持有租约
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _STATS["renew_failed"] += _IS_LEADER
+            logger.warning(f"调度器主节点选举 / 续约失败: {e}")
+            # 下一次续约前租约可能已到期：提前降级，不与新主节点重叠
+            if _IS_LEADER and time.monotonic() + interval >= _EXPIRES:
+                await _step_down("无法续约")
+        try:
+            await asyncio.wait_for(_WAKE.wait(), interval)
+        except TimeoutError:
+            pass
+        _WAKE.clear()
+
+
+async def _dispatch(raw: Any) -> None:
+    try:
+        message = json.loads(raw)
+    except Exception:
+        return
+    if message.get("origin") == _TOKEN:
+        return
+    _STATS["messages"] += 1
+    if message.get("action") == "released":
+        # 主节点正常退出，立即尝试接手
+        if _WAKE is not None:
+            _WAKE.set()
+        return
+    if _ON_MESSAGE is not None:
+        try:
+            await _ON_MESSAGE(message)
+        except Exception as e:
+            logger.error(f"处理调度器控制消息失败[{message.get('action')}]: {e}")
+
+
+async def _listen() -> None:
+    assert _REDIS is not None
+    while True:
+        pubsub = None
+        try:
+            pubsub = _REDIS.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(_channel())
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    await _dispatch(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"调度器控制频道订阅中断，1 秒后重连: {e}")
+            await asyncio.sleep(1)
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
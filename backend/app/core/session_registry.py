@@ -0,0 +1,292 @@
+"""在线会话登记表 — 替代「KEYS access_token:* + 逐个解码 JWT」的在线用户枚举
+
+登录时把会话登记到：
+
+- ``online_session_data``（Hash）：session_id -> 会话 JSON（与 user_session 内容一致）
+- ``online_session_index:all`` / ``online_session_index:{tenant_id}``（ZSet）：按登录时间排序
+- ``online_session_expire``（ZSet）：session_id -> 会话过期时间戳，用于清理已过期的登记
+
+在线列表按 ZREVRANGE 分页、HMGET 批量取会话 JSON，筛选只解析会话 JSON、不解码 JWT；
+强制下线 / 清空也通过登记表定位会话，不再扫描全库。
+登记表只用于枚举，认证仍以 user_session / access_token 键为准，登记失败不影响登录。
+"""
+
+import json
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from typing import Any
+
+from redis.asyncio.client import Redis
+
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
+from app.core.logger import logger
+
+# 带筛选条件时每批扫描的会话数
+_SCAN_BATCH = 500
+
+
+def _index_key(tenant_id: int | None) -> str:
+    return f"{RedisInitKeyConfig.ONLINE_SESSION_INDEX.key}:{'all' if tenant_id is None else tenant_id}"
+
+
+def _data_key() -> str:
+    return RedisInitKeyConfig.ONLINE_SESSION_DATA.key
+
+
+def _expire_key() -> str:
+    return RedisInitKeyConfig.ONLINE_SESSION_EXPIRE.key
+
+
+def _session_keys(session_id: str) -> list[str]:
+    return [
+        f"{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}",
+        f"{RedisInitKeyConfig.REFRESH_TOKEN.key}:{session_id}",
+        f"{RedisInitKeyConfig.USER_SESSION.key}:{session_id}",
+    ]
+
+
+def _login_score(session: dict) -> float:
+    login_time = session.get("login_time")
+    if isinstance(login_time, str) and login_time:
+        try:
+            return datetime.fromisoformat(login_time).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+def _decode(raw: Any) -> dict | None:
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+async def register(redis: Redis, session_id: str, session_json: str, expire_seconds: int) -> None:
+    """
+    登记（或覆盖）一个在线会话。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    - session_id (str): 会话编号。
+    - session_json (str): 会话 JSON（与 user_session 内容一致）。
+    - expire_seconds (int): 会话剩余有效期（秒）。
+    """
+    session = _decode(session_json) or {}
+    tenant_id = session.get("tenant_id")
+    score = _login_score(session)
+    try:
+        pipe = redis.pipeline(transaction=False)
+        # 切换租户时旧租户索引中的登记需要移除
+        old = await redis.hget(_data_key(), session_id)
+        old_tenant = (_decode(old) or {}).get("tenant_id")
+        if old_tenant is not None and old_tenant != tenant_id:
+            pipe.zrem(_index_key(old_tenant), session_id)
+        pipe.hset(_data_key(), session_id, session_json)
+        pipe.zadd(_index_key(None), {session_id: score})
+        if tenant_id is not None:
+            pipe.zadd(_index_key(tenant_id), {session_id: score})
+        pipe.zadd(_expire_key(), {session_id: time.time() + expire_seconds})
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"登记在线会话失败[{session_id}]: {e}")
+
+
+async def set_login_location(redis: Redis, session_id: str, location: str) -> None:
+    """
+    回填会话的登录归属地（登录时归属地在后台解析，签发令牌时先以占位值写入）。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    - session_id (str): 会话编号。
+    - location (str): 解析得到的归属地。
+    """
+    session_key = f"{RedisInitKeyConfig.USER_SESSION.key}:{session_id}"
+    try:
+        session = _decode(await redis.get(session_key))
+        if not session:
+            return
+        session["login_location"] = location
+        session_json = json.dumps(session, ensure_ascii=False)
+        pipe = redis.pipeline(transaction=False)
+        pipe.set(session_key, session_json, keepttl=True, xx=True)
+        if await redis.hexists(_data_key(), session_id):
+            pipe.hset(_data_key(), session_id, session_json)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"回填会话归属地失败[{session_id}]: {e}")
+
+
+async def touch(redis: Redis, session_id: str, expire_seconds: int) -> None:
+    """
+    延长会话登记的过期时间（刷新令牌时调用）。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    - session_id (str): 会话编号。
+    - expire_seconds (int): 新的剩余有效期（秒）。
+    """
+    try:
+        await redis.zadd(_expire_key(), {session_id: time.time() + expire_seconds}, xx=True)
+    except Exception as e:
+        logger.warning(f"续期在线会话登记失败[{session_id}]: {e}")
+
+
+async def unregister(redis: Redis, session_ids: Iterable[str]) -> None:
+    """
+    移除会话登记（不删除会话键）。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    - session_ids (Iterable[str]): 会话编号列表。
+    """
+    ids = list(session_ids)
+    if not ids:
+        return
+    try:
+        sessions = await redis.hmget(_data_key(), ids)
+        tenants: dict[Any, list[str]] = {}
+        for sid, raw in zip(ids, sessions, strict=True):
+            tenant_id = (_decode(raw) or {}).get("tenant_id")
+            if tenant_id is not None:
+                tenants.setdefault(tenant_id, []).append(sid)
+        pipe = redis.pipeline(transaction=False)
+        pipe.hdel(_data_key(), *ids)
+        pipe.zrem(_index_key(None), *ids)
+        pipe.zrem(_expire_key(), *ids)
+        for tenant_id, tenant_ids in tenants.items():
+            pipe.zrem(_index_key(tenant_id), *tenant_ids)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"移除在线会话登记失败: {e}")
+
+
+async def revoke(redis: Redis, session_ids: Iterable[str]) -> None:
+    """
+    下线会话：删除令牌 / 会话键并移除登记。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    - session_ids (Iterable[str]): 会话编号列表。
+    """
+    ids = list(session_ids)
+    for i in range(0, len(ids), _SCAN_BATCH):
+        batch = ids[i : i + _SCAN_BATCH]
+        await redis.unlink(*[key for sid in batch for key in _session_keys(sid)])
+        await unregister(redis, batch)
+
+
+async def prune(redis: Redis) -> int:
+    """
+    清理已过期会话的登记。
+
+    参数:
+    - redis (Redis): Redis 连接。
+
+    返回:
+    - int: 清理的登记数。
+    """
+    try:
+        expired = await redis.zrangebyscore(_expire_key(), "-inf", time.time())
+    except Exception as e:
+        logger.warning(f"清理在线会话登记失败: {e}")
+        return 0
+    expired = [sid.decode() if isinstance(sid, bytes) else sid for sid in expired]
+    await unregister(redis, expired)
+    return len(expired)
+
+
+async def page(
+    redis: Redis,
+    tenant_id: int | None,
+    offset: int,
+    limit: int,
+    match: Callable[[dict], bool] | None = None,
+) -> tuple[int, list[dict]]:
+    """
+    按登录时间倒序分页读取在线会话。
+
+    无筛选时只读取当前页（ZCARD + ZREVRANGE + HMGET）；
+    有筛选时按批扫描登记表并只解析会话 JSON，不解码 JWT。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    - tenant_id (int | None): 租户ID，None 表示全部租户。
+    - offset (int): 偏移量。
+    - limit (int): 每页数量。
+    - match (Callable[[dict], bool] | None): 会话筛选函数。
+
+    返回:
+    - tuple[int, list[dict]]: (总数, 当前页会话)
+    """
+    await prune(redis)
+    index = _index_key(tenant_id)
+
+    if match is None:
+        total = await redis.zcard(index)
+        ids = await redis.zrevrange(index, offset, offset + limit - 1)
+        if not ids:
+            return total, []
+        sessions = [_decode(raw) for raw in await redis.hmget(_data_key(), ids)]
+        return total, [s for s in sessions if s]
+
+    total, items, start = 0, [], 0
+    while True:
+        ids = await redis.zrevrange(index, start, start + _SCAN_BATCH - 1)
+        if not ids:
+            break
+        for raw in await redis.hmget(_data_key(), ids):
+            session = _decode(raw)
+            if session is None or not match(session):
+                continue
+            if offset <= total < offset + limit:
+                items.append(session)
+            total += 1
+        start += _SCAN_BATCH
+    return total, items
+
+
+async def session_ids(redis: Redis, tenant_id: int | None) -> list[str]:
+    """
+    读取登记的全部会话编号。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    - tenant_id (int | None): 租户ID，None 表示全部租户。
+
+    返回:
+    - list[str]: 会话编号列表。
+    """
+    ids = await redis.zrange(_index_key(tenant_id), 0, -1)
+    return [sid.decode() if isinstance(sid, bytes) else sid for sid in ids]
+
+
+async def init(redis: Redis) -> None:
+    """
+    登记表为空时按现有 user_session 键回填（升级后首次启动，lifespan 中调用）。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    """
+    from app.core.redis_crud import RedisCURD
+
+    if await redis.zcard(_index_key(None)):
+        return
+    prefix = f"{RedisInitKeyConfig.USER_SESSION.key}:"
+    count = 0
+    async for keys in RedisCURD(redis).scan_keys(f"{prefix}*"):
+        values = await redis.mget(*keys)
+        for key, raw in zip(keys, values, strict=True):
+            if not raw:
+                continue
+            key = key.decode() if isinstance(key, bytes) else key
+            ttl = await redis.ttl(key)
+            raw = raw.decode() if isinstance(raw, bytes) else raw
+            await register(redis, key[len(prefix):], raw, ttl if ttl > 0 else settings.REFRESH_TOKEN_EXPIRE_SECONDS)
+            count += 1
+    if count:
+        logger.info(f"已回填 {count} 个在线会话登记")
@@ -0,0 +1,212 @@
+"""请求级 SQL 统计
+
+认证预加载、数据权限的部门查询、``__loader_options__`` 的 selectin 加载以及服务层的逐行查询
+都藏在 ``CRUDBase`` 之后，单看代码无法知道一个请求发出了多少条语句。这里在 ``async_engine``
+上挂 ``before_cursor_execute`` / ``after_cursor_execute`` 事件，按请求累计：
+
+- 语句条数、数据库总耗时、最慢的 ``SQL_STATS_TOP_N`` 条语句
+- 每种语句形态（参数占位符与 IN 列表归一化后的 SQL）的执行次数
+
+统计对象由 ``SqlStatsMiddleware`` 在请求开始时放入上下文（记下 ``CorrelationIdMiddleware`` 的关联 ID），
+请求结束时复位；结果写入 ``Server-Timing`` 响应头和操作日志；单条语句超过 ``SQL_SLOW_STATEMENT_MS`` 时输出告警日志。
+请求内派生的后台任务应在 ``detached_context()`` 中运行，其语句不计入（也不触发）所在请求的统计。
+
+``SQL_REPEAT_LIMIT`` > 0 时（建议仅在开发 / 测试环境开启）同一请求内同一语句形态执行超过该次数即抛出异常，
+用于尽早发现 N+1 查询。
+"""
+
+import heapq
+import re
+import time
+from contextvars import Context, ContextVar, Token, copy_context
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config.setting import settings
+from app.core.exceptions import CustomException
+from app.core.logger import logger
+from app.core.request_context import get_correlation_id
+
+# 慢语句中保留的 SQL 长度
+_STATEMENT_PREVIEW = 500
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER = re.compile(r"\$\d+|%s|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+_current: ContextVar["RequestSqlStats | None"] = ContextVar("request_sql_stats", default=None)
+_ENGINE: AsyncEngine | None = None
+
+
+@dataclass
+class RequestSqlStats:
+    """一个请求的 SQL 统计"""
+
+    correlation_id: str = ""
+    count: int = 0
+    total_ms: float = 0.0
+    # 小顶堆：(耗时毫秒, 语句)，只保留最慢的若干条
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+    shapes: dict[str, int] = field(default_factory=dict)
+
+    def top(self) -> list[tuple[float, str]]:
+        """
+        最慢的语句（按耗时倒序）。
+
+        返回:
+        - list[tuple[float, str]]: (耗时毫秒, 语句)。
+        """
+        return sorted(self.slowest, reverse=True)
+
+    def server_timing(self) -> str:
+        """
+        ``Server-Timing`` 响应头的值。
+
+        返回:
+        - str: 如 ``db;dur=12.34;desc="8 queries"``。
+        """
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} queries"'
+
+    def _record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        entry = (elapsed_ms, statement[:_STATEMENT_PREVIEW])
+        if len(self.slowest) < settings.SQL_STATS_TOP_N:
+            heapq.heappush(self.slowest, entry)
+        elif elapsed_ms > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+
+def begin() -> tuple[RequestSqlStats, Token]:
+    """
+    开始统计当前请求（中间件调用，请求结束时须以返回的令牌调用 ``reset``）。
+
+    返回:
+    - tuple[RequestSqlStats, Token]: 当前请求的统计对象与上下文令牌。
+    """
+    stats = RequestSqlStats(correlation_id=get_correlation_id())
+    return stats, _current.set(stats)
+
+
+def reset(token: Token) -> None:
+    """
+    结束当前请求的统计上下文（中间件在 finally 中调用）。
+
+    参数:
+    - token (Token): ``begin`` 返回的上下文令牌。
+    """
+    _current.reset(token)
+
+
+def detached_context() -> Context:
+    """
+    不带请求统计的当前上下文副本（关联 ID、租户等保留），供请求内派生的后台任务使用。
+
+    返回:
+    - Context: 可传给 ``asyncio.create_task(..., context=...)`` 的上下文。
+    """
+    ctx = copy_context()
+    ctx.run(_current.set, None)
+    return ctx
+
+
+def current() -> RequestSqlStats | None:
+    """
+    当前请求的统计（不在请求内时为 None）。
+
+    返回:
+    - RequestSqlStats | None: 统计对象。
+    """
+    return _current.get()
+
+
+def finish(stats: RequestSqlStats) -> None:
+    """
+    结束统计并输出慢语句告警（中间件在响应开始时调用）。
+
+    参数:
+    - stats (RequestSqlStats): 当前请求的统计对象。
+    """
+    slow = [(ms, sql) for ms, sql in stats.top() if ms >= settings.SQL_SLOW_STATEMENT_MS]
+    if slow:
+        details = "\n".join(f"  {ms:.1f}ms | {sql}" for ms, sql in slow)
+        logger.warning("慢 SQL [{}]: 共 {} 条 / {:.1f}ms\n{}", stats.correlation_id, stats.count, stats.total_ms, details)
+
+
+@lru_cache(maxsize=4096)
+def statement_shape(statement: str) -> str:
+    """
+    语句形态：合并空白，参数占位符统一为 ``?``，IN 列表折叠为 ``(?)``。
+
+    参数:
+    - statement (str): 驱动收到的 SQL。
+
+    返回:
+    - str: 归一化后的 SQL。
+    """
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _PLACEHOLDER.sub("?", shape)
+    return _IN_LIST.sub("(?)", shape)
+
+
+def _before_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    stats = _current.get()
+    if stats is None:
+        return
+    shape = statement_shape(statement)
+    repeats = stats.shapes.get(shape, 0) + 1
+    stats.shapes[shape] = repeats
+    limit = settings.SQL_REPEAT_LIMIT
+    # 先检查再记录开始时间：本事件在 handle_error 的捕获范围之外，抛出后不会再弹出开始时间
+    if 0 < limit < repeats:
+        raise CustomException(
+            msg=f"同一请求内相同 SQL 执行超过 {limit} 次，疑似 N+1 查询",
+            data={"correlation_id": stats.correlation_id, "repeats": repeats, "statement": shape[:_STATEMENT_PREVIEW]},
+        )
+    conn.info.setdefault("sql_stats_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+    stats = _current.get()
+    starts = conn.info.get("sql_stats_start")
+    if stats is None or not starts:
+        return
+    stats._record(statement, (time.perf_counter() - starts.pop()) * 1000)
+
+
+def _handle_error(exception_context: Any) -> None:
+    # 语句执行失败时不会触发 after_cursor_execute，丢弃对应的开始时间
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("sql_stats_start"):
+        conn.info["sql_stats_start"].pop()
+
+
+def init(engine: AsyncEngine) -> None:
+    """
+    在异步引擎上挂载统计事件（lifespan 启动时调用）。
+
+    参数:
+    - engine (AsyncEngine): 异步数据库引擎。
+    """
+    global _ENGINE
+    if _ENGINE is not None or not settings.SQL_STATS_ENABLE:
+        return
+    _ENGINE = engine
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+def close() -> None:
+    """移除统计事件（lifespan 关闭时调用）"""
+    global _ENGINE
+    if _ENGINE is None:
+        return
+    event.remove(_ENGINE.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.remove(_ENGINE.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.remove(_ENGINE.sync_engine, "handle_error", _handle_error)
+    _ENGINE = None
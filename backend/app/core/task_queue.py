@@ -0,0 +1,336 @@
+"""定时任务分片执行队列（Redis Stream）
+
+调度循环只在主节点运行（见 ``scheduler_leader``），节点任务的代码块默认也在主节点的线程池中执行，
+吞吐受限于单个进程。开启 ``TASK_QUEUE_ENABLE`` 后：
+
+- 主节点到点只把任务（任务 ID、代码块、参数）``XADD`` 到任务队列，并异步等待执行结果，
+  执行日志、耗时指标仍按原有事件流记录，结果 / 异常与本地执行一致
+- 执行进程（``python main.py worker``，可在多台机器上启动任意个）以同一消费组 ``XREADGROUP`` 消费，
+  每个进程并发执行 ``TASK_QUEUE_CONCURRENCY`` 个任务，结果通过 pub/sub 发回投递方所在进程
+- 执行中的任务定期 ``XCLAIM`` 自身以刷新空闲时间；执行进程失联超过 ``TASK_QUEUE_CLAIM_IDLE`` 后，
+  其未确认的任务由其他进程 ``XAUTOCLAIM`` 接管，超过 ``TASK_QUEUE_MAX_DELIVERIES`` 次投递的任务直接判定失败
+
+投递语义为至少一次：执行进程在回传结果后、确认前崩溃时，任务会被再执行一次。
+"""
+
+import asyncio
+import json
+import os
+import socket
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from redis.asyncio.client import Redis
+from redis.exceptions import ResponseError
+
+from app.common.enums import RedisInitKeyConfig
+from app.config.setting import settings
+from app.core.logger import logger
+
+_GROUP = "executors"
+_ORIGIN: str = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+# 单次阻塞读取的最长时间（需小于 Redis 连接的 socket_timeout）
+_BLOCK_MS = 5000
+
+_REDIS: Redis | None = None
+_LISTENER: asyncio.Task | None = None
+# 投递中的任务：task_id -> 等待结果的 Future
+_WAITERS: dict[str, asyncio.Future] = {}
+_STATS: dict[str, int] = {"submitted": 0, "succeeded": 0, "failed": 0, "timeout": 0}
+
+
+class TaskQueueError(RuntimeError):
+    """执行进程返回的任务异常（保留原异常类型名与信息）"""
+
+
+def _stream() -> str:
+    return RedisInitKeyConfig.TASK_QUEUE.key
+
+
+def _reply_channel() -> str:
+    return f"{RedisInitKeyConfig.TASK_RESULT.key}:{_ORIGIN}"
+
+
+def enabled() -> bool:
+    """
+    是否以分片模式执行节点任务。
+
+    返回:
+    - bool: 已开启 ``TASK_QUEUE_ENABLE`` 且已完成初始化。
+    """
+    return settings.TASK_QUEUE_ENABLE and _REDIS is not None
+
+
+async def init(redis: Redis) -> None:
+    """
+    创建消费组并启动结果监听（调度器初始化时调用）。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    """
+    global _REDIS, _LISTENER
+    _REDIS = redis
+    await _ensure_group(redis)
+    if _LISTENER is None or _LISTENER.done():
+        _LISTENER = asyncio.create_task(_listen(), name="task-queue-results")
+
+
+async def close() -> None:
+    """停止结果监听，仍在等待的任务以异常结束（调度器关闭后调用）"""
+    global _REDIS, _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.cancel()
+        try:
+            await _LISTENER
+        except (asyncio.CancelledError, Exception):
+            pass
+        _LISTENER = None
+    for future in _WAITERS.values():
+        if not future.done():
+            future.set_exception(TaskQueueError("调度器已关闭，未收到执行结果"))
+    _WAITERS.clear()
+    _REDIS = None
+
+
+async def submit(job_id: str, code_block: str | None, args: tuple | list, kwargs: dict) -> Any:
+    """
+    投递任务到执行队列并等待执行结果。
+
+    参数:
+    - job_id (str): 任务 ID。
+    - code_block (str | None): 代码块源码。
+    - args (tuple | list): handler 位置参数。
+    - kwargs (dict): handler 关键字参数。
+
+    返回:
+    - Any: handler 返回值（经 JSON 传回，无法序列化的值转为字符串）。
+
+    异常:
+    - TaskQueueError: 任务执行失败或多次投递后仍未完成。
+    - TimeoutError: ``TASK_QUEUE_RESULT_TIMEOUT`` 内未收到结果。
+    """
+    if _REDIS is None:
+        raise TaskQueueError("任务队列未初始化")
+    task_id = uuid.uuid4().hex
+    fields = {
+        "task_id": task_id,
+        "job_id": job_id,
+        "code": code_block or "",
+        "args": json.dumps(list(args), ensure_ascii=False, default=str),
+        "kwargs": json.dumps(kwargs, ensure_ascii=False, default=str),
+        "reply": _reply_channel(),
+    }
+    # 先登记再投递：结果可能在 XADD 返回前就已发回
+    future = _WAITERS[task_id] = asyncio.get_running_loop().create_future()
+    try:
+        await _REDIS.xadd(_stream(), fields, maxlen=settings.TASK_QUEUE_MAXLEN, approximate=True)
+        _STATS["submitted"] += 1
+        return await asyncio.wait_for(future, settings.TASK_QUEUE_RESULT_TIMEOUT)
+    except TimeoutError:
+        _STATS["timeout"] += 1
+        raise TimeoutError(f"任务 {job_id} 在 {settings.TASK_QUEUE_RESULT_TIMEOUT} 秒内未返回结果") from None
+    finally:
+        _WAITERS.pop(task_id, None)
+
+
+async def stats() -> dict[str, Any]:
+    """
+    队列统计。
+
+    返回:
+    - dict[str, Any]: 队列长度、未确认任务数、消费者数以及本进程的投递 / 成功 / 失败 / 超时计数。
+    """
+    result: dict[str, Any] = {"enabled": enabled(), "waiting": len(_WAITERS), **_STATS}
+    if _REDIS is None:
+        return result
+    try:
+        result["length"] = await _REDIS.xlen(_stream())
+        for group in await _REDIS.xinfo_groups(_stream()):
+            if group["name"] == _GROUP:
+                result["pending"] = group["pending"]
+                result["consumers"] = group["consumers"]
+    except Exception as e:
+        logger.warning(f"读取任务队列统计失败: {e}")
+    return result
+
+
+async def _ensure_group(redis: Redis) -> None:
+    try:
+        await redis.xgroup_create(_stream(), _GROUP, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def _resolve(raw: Any) -> None:
+    try:
+        message = json.loads(raw)
+    except Exception:
+        return
+    future = _WAITERS.get(message.get("task_id"))
+    if future is None or future.done():
+        return
+    if message.get("ok"):
+        _STATS["succeeded"] += 1
+        future.set_result(message.get("result"))
+    else:
+        _STATS["failed"] += 1
+        future.set_exception(TaskQueueError(message.get("error") or "未知错误"))
+
+
+async def _listen() -> None:
+    assert _REDIS is not None
+    while True:
+        pubsub = None
+        try:
+            pubsub = _REDIS.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(_reply_channel())
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    _resolve(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"任务结果订阅中断，1 秒后重连: {e}")
+            await asyncio.sleep(1)
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+# ---------------------------------------------------------------- 执行进程
+
+
+def _encode_result(value: Any) -> Any:
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return str(value)
+    return value
+
+
+class _Worker:
+    """执行进程：消费任务队列，在线程池中执行代码块并回传结果"""
+
+    def __init__(self, redis: Redis, concurrency: int) -> None:
+        self.redis = redis
+        self.concurrency = concurrency
+        self.consumer = _ORIGIN
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="task-worker")
+        self.inflight: dict[str, asyncio.Task] = {}
+
+    async def run(self) -> None:
+        await _ensure_group(self.redis)
+        logger.info(f"✅ 任务执行进程已启动: {self.consumer}, 并发 {self.concurrency}")
+        heartbeat = asyncio.create_task(self._heartbeat(), name="task-worker-heartbeat")
+        try:
+            while True:
+                free = self.concurrency - len(self.inflight)
+                if free <= 0:
+                    await asyncio.wait(self.inflight.values(), return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                try:
+                    entries = await self._claim(free)
+                    if not entries:
+                        streams = await self.redis.xreadgroup(
+                            _GROUP, self.consumer, {_stream(): ">"}, count=free, block=_BLOCK_MS
+                        )
+                        entries = [(mid, fields, False) for _, messages in streams or [] for mid, fields in messages]
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Redis 暂时不可达：执行中的任务继续，稍后重试拉取
+                    logger.warning(f"拉取任务失败，1 秒后重试: {e}")
+                    await asyncio.sleep(1)
+                    continue
+                for message_id, fields, reclaimed in entries:
+                    task = asyncio.create_task(self._handle(message_id, fields, reclaimed))
+                    self.inflight[message_id] = task
+                    task.add_done_callback(lambda _, mid=message_id: self.inflight.pop(mid, None))
+        finally:
+            heartbeat.cancel()
+            # 未完成的任务不确认，由其他执行进程接管
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _claim(self, count: int) -> list[tuple[str, dict, bool]]:
+        # 接管失联执行进程超时未确认的任务
+        _, messages, *_ = await self.redis.xautoclaim(
+            _stream(), _GROUP, self.consumer, settings.TASK_QUEUE_CLAIM_IDLE * 1000, count=count
+        )
+        # 已被删除的消息（Redis 6.2 返回空字段）直接确认，不再留在未确认列表中
+        deleted = [message_id for message_id, fields in messages if not fields]
+        if deleted:
+            await self.redis.xack(_stream(), _GROUP, *deleted)
+        return [(message_id, fields, True) for message_id, fields in messages if fields]
+
+    async def _heartbeat(self) -> None:
+        # 刷新执行中任务的空闲时间，长任务不会被误判为失联而重复执行
+        interval = settings.TASK_QUEUE_CLAIM_IDLE / 3
+        while True:
+            await asyncio.sleep(interval)
+            if not self.inflight:
+                continue
+            try:
+                await self.redis.xclaim(_stream(), _GROUP, self.consumer, 0, list(self.inflight), justid=True)
+            except Exception as e:
+                logger.warning(f"刷新执行中任务失败: {e}")
+
+    async def _deliveries(self, message_id: str) -> int:
+        pending = await self.redis.xpending_range(_stream(), _GROUP, min=message_id, max=message_id, count=1)
+        return pending[0]["times_delivered"] if pending else 1
+
+    async def _handle(self, message_id: str, fields: dict, reclaimed: bool) -> None:
+        from app.core.ap_scheduler import SchedulerUtil
+
+        job_id = fields.get("job_id", "")
+        reply = {"task_id": fields.get("task_id")}
+        try:
+            if reclaimed and await self._deliveries(message_id) > settings.TASK_QUEUE_MAX_DELIVERIES:
+                raise TaskQueueError(f"任务已投递 {settings.TASK_QUEUE_MAX_DELIVERIES} 次仍未完成，执行进程可能反复崩溃")
+            args = json.loads(fields.get("args") or "[]")
+            kwargs = json.loads(fields.get("kwargs") or "{}")
+            result = await asyncio.get_running_loop().run_in_executor(
+                self.executor, SchedulerUtil._run_code_block, job_id, fields.get("code"), args, kwargs
+            )
+            reply.update(ok=True, result=_encode_result(result))
+        except Exception as e:
+            reply.update(ok=False, error=f"{type(e).__name__}: {e}")
+        try:
+            await self.redis.publish(fields.get("reply", ""), json.dumps(reply, ensure_ascii=False, default=str))
+            await self.redis.xack(_stream(), _GROUP, message_id)
+            await self.redis.xdel(_stream(), message_id)
+        except Exception as e:
+            logger.error(f"回传任务结果失败: job_id={job_id}, {e}")
+
+
+async def run_worker(concurrency: int | None = None) -> None:
+    """
+    执行进程主循环（``python main.py worker`` 调用，直到进程被终止）。
+
+    参数:
+    - concurrency (int | None): 并发执行的任务数，默认 ``TASK_QUEUE_CONCURRENCY``。
+    """
+    from app.core.database import redis_url
+
+    redis = Redis.from_url(url=redis_url(), encoding="utf-8", decode_responses=True, health_check_interval=20)
+    try:
+        await _Worker(redis, concurrency or settings.TASK_QUEUE_CONCURRENCY).run()
+    finally:
+        await redis.aclose()
+
+
+def worker_main(concurrency: int | None = None) -> None:
+    """
+    在独立进程中运行执行进程主循环（``main.py worker --processes N`` 的子进程入口）。
+
+    参数:
+    - concurrency (int | None): 每个进程并发执行的任务数。
+    """
+    try:
+        asyncio.run(run_worker(concurrency))
+    except KeyboardInterrupt:
+        pass
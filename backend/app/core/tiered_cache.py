@@ -0,0 +1,281 @@
+"""两级缓存（进程内 LRU + Redis）
+
+高频只读配置（数据字典、系统参数、租户配置）原先每次读取都要 Redis GET + ``json.loads``。
+``TieredCache`` 在 Redis 前面加一层有界、带 TTL 的进程内 LRU：
+
+- 命中：零 Redis 往返、零反序列化
+- 未命中：调用 ``loader``（读取 Redis / 回源数据库）后写入本地
+- 写入方调用 ``invalidate``：本地立即失效，并通过 Redis pub/sub 广播，
+  其他 uvicorn worker 收到后同步丢弃本地条目
+- 回源数据库的缓存在请求事务中用 ``invalidate_after_commit``：提交后才失效，
+  避免并发请求在提交前回填旧数据
+
+pub/sub 监听断开期间可能漏掉失效消息，重连时会清空全部本地缓存，最坏情况由 TTL 兜底。
+本地缓存的值在各请求间共享，调用方不得原地修改。
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from redis.asyncio.client import Redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.enums import RedisInitKeyConfig
+from app.core.logger import logger
+
+_REDIS: Redis | None = None
+_LISTENER: asyncio.Task | None = None
+# 本进程标识，用于日志排查广播来源
+_ORIGIN: str = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class TieredCache:
+    """进程内 LRU + TTL 缓存，失效通过 Redis pub/sub 跨 worker 广播"""
+
+    _registry: dict[str, "TieredCache"] = {}
+
+    def __init__(self, name: str, maxsize: int = 1024, ttl: float = 300.0) -> None:
+        """
+        创建并注册一个命名缓存（名称即广播时的缓存标识，需全局唯一）。
+
+        参数:
+        - name (str): 缓存名称。
+        - maxsize (int): 本地最多缓存的条目数，超出按 LRU 淘汰。
+        - ttl (float): 本地条目存活秒数。
+        """
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # 失效代次：加载期间发生失效时不回填旧值
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        TieredCache._registry[name] = self
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        读取缓存，未命中时调用 loader 加载（loader 返回 None 不缓存）。
+
+        参数:
+        - key (Hashable): 缓存键。
+        - loader (Callable[[], Awaitable[Any]]): 未命中时的加载函数（通常读取 Redis / 回源数据库）。
+
+        返回:
+        - Any: 缓存值。
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            if time.monotonic() < entry[0]:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self._data.pop(key, None)
+
+        self.misses += 1
+        generation = self._generation
+        value = await loader()
+        if value is not None and generation == self._generation:
+            self._put(key, value)
+        return value
+
+    def peek(self, key: Hashable) -> Any:
+        """
+        仅读取本地条目，不加载（同步调用方使用）。
+
+        参数:
+        - key (Hashable): 缓存键。
+
+        返回:
+        - Any: 缓存值，未命中或已过期返回 None。
+        """
+        entry = self._data.get(key)
+        if entry is None or time.monotonic() >= entry[0]:
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        直接写入本地条目（批量加载后回填）。
+
+        参数:
+        - key (Hashable): 缓存键。
+        - value (Any): 缓存值（None 不写入）。
+        """
+        if value is not None:
+            self._put(key, value)
+
+    def _put(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def drop(self, key: Hashable | None = None) -> None:
+        """
+        仅失效本进程的条目（收到广播时调用）。
+
+        参数:
+        - key (Hashable | None): 缓存键，None 表示清空。
+        """
+        self._generation += 1
+        self.invalidations += 1
+        if key is None:
+            self._data.clear()
+        else:
+            self._data.pop(key, None)
+
+    async def invalidate(self, key: Hashable | None = None) -> None:
+        """
+        失效条目并广播到所有 worker（写入方在更新 Redis / 数据库后调用）。
+
+        参数:
+        - key (Hashable | None): 缓存键，None 表示清空整个缓存。
+        """
+        self.drop(key)
+        await _publish(self.name, key)
+
+    def invalidate_after_commit(self, db: AsyncSession | None, key: Hashable | None = None) -> None:
+        """
+        事务提交后再失效并广播（写入方在请求事务中调用；回滚时不失效）。
+
+        提交前失效时，并发请求会把尚未提交的旧数据重新回填到各 worker，直到 TTL 过期。
+
+        参数:
+        - db (AsyncSession | None): 当前事务会话，None 时立即失效。
+        - key (Hashable | None): 缓存键，None 表示清空整个缓存。
+        """
+
+        def _on_commit(_session: Any) -> None:
+            self.drop(key)
+            try:
+                asyncio.get_running_loop().create_task(_publish(self.name, key))
+            except RuntimeError:
+                pass
+
+        if db is None:
+            _on_commit(None)
+            return
+        event.listen(db.sync_session, "after_commit", _on_commit, once=True)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        缓存统计。
+
+        返回:
+        - dict[str, Any]: 名称、条目数、命中/未命中/淘汰/失效次数与命中率。
+        """
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    @classmethod
+    def all_stats(cls) -> list[dict[str, Any]]:
+        """
+        所有已注册缓存的统计。
+
+        返回:
+        - list[dict[str, Any]]: 各缓存统计列表。
+        """
+        return [cache.stats() for cache in cls._registry.values()]
+
+
+def _channel() -> str:
+    return RedisInitKeyConfig.CACHE_INVALIDATE.key
+
+
+async def _publish(name: str, key: Hashable | None) -> None:
+    if _REDIS is None:
+        return
+    message = json.dumps({"cache": name, "key": key, "origin": _ORIGIN}, ensure_ascii=False, default=str)
+    try:
+        await _REDIS.publish(_channel(), message)
+    except Exception as e:
+        logger.warning(f"缓存失效广播失败[{name}]: {e}")
+
+
+def _apply(raw: Any) -> None:
+    try:
+        message = json.loads(raw)
+        cache = TieredCache._registry.get(message["cache"])
+    except Exception:
+        return
+    if cache is not None:
+        key = message.get("key")
+        # JSON 不区分 tuple / list，复合键统一按 tuple 处理
+        cache.drop(tuple(key) if isinstance(key, list) else key)
+
+
+def _drop_all() -> None:
+    for cache in TieredCache._registry.values():
+        cache.drop()
+
+
+async def _listen() -> None:
+    while True:
+        pubsub = None
+        try:
+            pubsub = _REDIS.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(_channel())
+            # (重新)订阅成功前的失效消息可能已丢失
+            _drop_all()
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    _apply(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"缓存失效订阅中断，1 秒后重连: {e}")
+            await asyncio.sleep(1)
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+async def init(redis: Redis) -> None:
+    """
+    注册 Redis 连接并启动失效广播监听（lifespan 中调用）。
+
+    参数:
+    - redis (Redis): Redis 连接。
+    """
+    global _REDIS, _LISTENER
+    _REDIS = redis
+    if _LISTENER is None or _LISTENER.done():
+        _LISTENER = asyncio.create_task(_listen(), name="tiered-cache-invalidation")
+
+
+async def close() -> None:
+    """停止失效广播监听并清空本地缓存（lifespan 关闭时调用）。"""
+    global _LISTENER
+    if _LISTENER is not None:
+        _LISTENER.cancel()
+        try:
+            await _LISTENER
+        except (asyncio.CancelledError, Exception):
+            pass
+        _LISTENER = None
+    _drop_all()
@@ -7,6 +7,10 @@ from pydantic import AfterValidator, PlainSerializer, WithJsonSchema
 from app.common.constant import DATE_DISPLAY_FMT, DATETIME_DISPLAY_FMT, RET, TIME_DISPLAY_FMT
 from app.core.exceptions import CustomException
 
+EMAIL_REGEX = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
+MOBILE_REGEX = r"^1(3\d|4[4-9]|5[0-35-9]|6[67]|7[013-8]|8[0-9]|9[0-9])\d{8}$"
+USERNAME_REGEX = r"^[A-Za-z][A-Za-z0-9_.-]{1,31}$"
+
 # 自定义日期时间字符串类型
 DateTimeStr = Annotated[
     datetime,
@@ -142,9 +146,7 @@ def email_validator(value: str) -> str:
     if not value:
         raise CustomException(code=RET.ERROR.code, msg="邮箱地址不能为空")
 
-    regex = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-
-    if not re.match(regex, value):
+    if not re.match(EMAIL_REGEX, value):
         raise CustomException(code=RET.ERROR.code, msg="邮箱地址格式不正确")
 
     return value
@@ -169,9 +171,7 @@ def mobile_validator(value: str | None) -> str | None:
     if len(value) != 11 or not value.isdigit():
         raise CustomException(code=RET.ERROR.code, msg="手机号格式不正确")
 
-    regex = r"^1(3\d|4[4-9]|5[0-35-9]|6[67]|7[013-8]|8[0-9]|9[0-9])\d{8}$"
-
-    if not re.match(regex, value):
+    if not re.match(MOBILE_REGEX, value):
         raise CustomException(code=RET.ERROR.code, msg="手机号格式不正确")
 
     return value
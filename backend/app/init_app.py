@@ -9,7 +9,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi_limiter import FastAPILimiter
 from fastapi_limiter.depends import RateLimiter, WebSocketRateLimiter
 
-from app.core import cache_util
+from app.core import cache_util, log_sink, login_audit, metrics, principal, session_registry, sql_stats, tiered_cache
 
 from .config.setting import settings
 from .core.exceptions import handle_exception
@@ -18,6 +18,8 @@ from .core.logger import logger
 from .scripts.initialize import InitializeData
 from .utils.common_util import import_module, import_modules_async
 from .utils.console import console_end, console_start
+from .utils.hash_bcrpy_util import PwdUtil
+from .utils.ip_local_util import IpLocalUtil
 
 
 @asynccontextmanager
@@ -26,6 +28,8 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
     from app.api.v1.module_system.dict.service import DictDataService
     from app.api.v1.module_system.params.service import ParamsService
     from app.core.ap_scheduler import SchedulerUtil
+    from app.core.permission_index import PermissionIndex
+    from app.plugin.module_task.workflow.handlers import workflow_engine
 
     try:
         await InitializeData().init_db()
@@ -42,6 +46,23 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
         logger.info("✅ 定时任务调度器初始化完成")
         await cache_util.init(redis=app.state.redis)
         logger.info("✅ fastapi-admin-cache 初始化完成")
+        await principal.init(redis=app.state.redis)
+        logger.info("✅ 认证主体缓存初始化完成")
+        await tiered_cache.init(redis=app.state.redis)
+        logger.info("✅ 两级缓存失效监听已启动")
+        await session_registry.init(redis=app.state.redis)
+        logger.info("✅ 在线会话登记表初始化完成")
+        await log_sink.init()
+        logger.info("✅ 日志批量写入器已启动")
+        await login_audit.init(redis=app.state.redis)
+        logger.info("✅ 登录审计管道已启动")
+        await PermissionIndex.init()
+        logger.info("✅ 权限位图索引初始化完成")
+        from app.core.database import async_engine
+        sql_stats.init(async_engine)
+        logger.info("✅ 请求级 SQL 统计已挂载")
+        await metrics.init(async_engine, app.state.redis)
+        logger.info("✅ Prometheus 指标采集已启动")
         await FastAPILimiter.init(
             redis=app.state.redis,
             prefix=settings.REQUEST_LIMITER_REDIS_PREFIX,
@@ -65,12 +86,27 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[Any, Any]:
     try:
         await SchedulerUtil.shutdown(wait=True)
         logger.info("✅ 定时任务调度器已关闭")
+        workflow_engine.close()
+        logger.info("✅ 工作流节点线程池已关闭")
         await cache_util.clear()
         logger.info("✅ fastapi-admin-cache 已关闭")
+        await tiered_cache.close()
+        logger.info("✅ 两级缓存失效监听已关闭")
+        PwdUtil.shutdown_pool()
+        logger.info("✅ 密码哈希线程池已关闭")
+        await login_audit.close()
+        logger.info("✅ 登录审计管道已关闭")
+        await IpLocalUtil.aclose()
+        logger.info("✅ IP 归属地查询连接池已关闭")
+        await log_sink.close()
+        logger.info("✅ 日志批量写入器已关闭，剩余日志已写入")
         await FastAPILimiter.close()
         logger.info("✅ 请求限制器已关闭")
         await import_modules_async(modules=settings.EVENT_LIST, desc="全局事件", app=app, status=False)
         logger.info("✅ 全局事件模块卸载完成")
+        await metrics.close()
+        logger.info("✅ Prometheus 指标采集已停止")
+        sql_stats.close()
         from app.core.database import async_engine
         await async_engine.dispose()
         logger.info("✅ 数据库引擎连接池已释放")
@@ -110,6 +146,9 @@ def register_routers(app: FastAPI) -> None:
     app.include_router(router=get_dynamic_router(), dependencies=[Depends(RateLimiter(times=200, seconds=10))])
     set_app_ref(app)
 
+    if settings.METRICS_ENABLE:
+        app.add_route(settings.METRICS_PATH, metrics.metrics_endpoint, include_in_schema=False)
+
 def register_files(app: FastAPI) -> None:
     if settings.STATIC_ENABLE:
         settings.STATIC_ROOT.mkdir(parents=True, exist_ok=True)
@@ -693,6 +693,7 @@ class GenTableService:
 
         from app.api.v1.module_platform.menu.crud import MenuCRUD
         from app.api.v1.module_platform.menu.schema import MenuCreateSchema
+        from app.api.v1.module_platform.menu.service import MenuService
         from app.utils.common_util import CamelCaseUtil
 
         # 按“上级目录”规则矫正最终包名（分系统根）
@@ -878,6 +879,7 @@ class GenTableService:
                 )
             )
             logger.info(f"成功创建按钮权限: {button['name']}")
+        MenuService.invalidate_tree(self.auth.db)
         logger.info(f"成功创建{gen_table_schema.function_name}菜单及按钮权限")
 
         return True
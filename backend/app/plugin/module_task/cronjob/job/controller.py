@@ -23,7 +23,7 @@ JobRouter = APIRouter(route_class=OperationLogRoute, prefix="/cronjob/job", tags
     dependencies=[Depends(AuthPermission(["module_task:cronjob:job:query"]))],
 )
 async def get_scheduler_status_controller() -> JSONResponse:
-    data = JobService.get_scheduler_status()
+    data = await JobService.get_scheduler_status()
     return SuccessResponse(data=data, msg="获取调度器状态成功")
 
 
@@ -45,7 +45,7 @@ async def get_scheduler_jobs_controller() -> JSONResponse:
     dependencies=[Depends(AuthPermission(["module_task:cronjob:job:scheduler"]))],
 )
 async def start_scheduler_controller() -> JSONResponse:
-    SchedulerUtil.start()
+    await SchedulerUtil.start()
     return SuccessResponse(msg="调度器已启动")
 
 
@@ -56,7 +56,7 @@ async def start_scheduler_controller() -> JSONResponse:
     dependencies=[Depends(AuthPermission(["module_task:cronjob:job:scheduler"]))],
 )
 async def pause_scheduler_controller() -> JSONResponse:
-    SchedulerUtil.pause()
+    await SchedulerUtil.pause()
     return SuccessResponse(msg="调度器已暂停")
 
 
@@ -67,7 +67,7 @@ async def pause_scheduler_controller() -> JSONResponse:
     dependencies=[Depends(AuthPermission(["module_task:cronjob:job:scheduler"]))],
 )
 async def resume_scheduler_controller() -> JSONResponse:
-    SchedulerUtil.resume()
+    await SchedulerUtil.resume()
     return SuccessResponse(msg="调度器已恢复")
 
 
@@ -1,4 +1,6 @@
 
+from app.config.setting import settings
+from app.core import scheduler_leader, task_queue
 from app.core.ap_scheduler import SchedulerUtil
 from app.core.base_schema import AuthSchema
 from app.core.exceptions import CustomException
@@ -89,15 +91,22 @@ class JobService:
         await JobCRUD(self.auth).clear_obj_crud()
 
     @staticmethod
-    def get_scheduler_status() -> dict:
+    async def get_scheduler_status() -> dict:
         status = SchedulerUtil.get_scheduler_state()
         is_running = SchedulerUtil.is_running()
         jobs = SchedulerUtil.get_all_jobs()
-        return {
+        data = {
             "status": status,
             "is_running": is_running,
             "job_count": len(jobs),
+            # 多进程部署时只有主节点运行调度循环
+            "node": scheduler_leader.token(),
+            "is_leader": scheduler_leader.is_leader(),
+            "leader": await scheduler_leader.current_leader(),
         }
+        if settings.TASK_QUEUE_ENABLE:
+            data["task_queue"] = await task_queue.stats()
+        return data
 
     @staticmethod
     def get_scheduler_jobs() -> list[dict]:
@@ -1,5 +1,6 @@
 from apscheduler.jobstores.base import JobLookupError
 
+from app.core import code_cache
 from app.core.ap_scheduler import SchedulerUtil
 from app.core.base_schema import AuthSchema
 from app.core.exceptions import CustomException
@@ -78,9 +79,12 @@ class NodeService:
         if not exist_obj:
             raise CustomException(msg="更新失败，该节点不存在")
 
+        old_func = exist_obj.func
         obj = await NodeCRUD(self.auth).update_obj_crud(id=id, data=data)
         if not obj:
             raise CustomException(msg="更新失败")
+        if old_func and old_func != obj.func:
+            code_cache.invalidate(old_func)
         return NodeOutSchema.model_validate(obj)
 
     async def delete(self, ids: list[int]) -> None:
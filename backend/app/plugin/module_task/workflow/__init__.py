@@ -3,7 +3,8 @@
 
 - ``definition``: 工作流定义（画布 CRUD、发布、执行 API）
 - ``node_type``: 节点类型（palette / 与 task_node 分离）
-- ``engine``: 拓扑分层并行执行引擎
+- ``engine``: 按依赖调度的并行执行引擎（节点的上游全部完成即开始执行）
+- ``runs``: 运行记录（逐节点状态 / 耗时 / 输出，失败续跑与节点输出缓存）
 
 动态路由仍统一挂在 ``/task`` 下（见各子包 ``controller.py`` 的 ``prefix``）。
 """
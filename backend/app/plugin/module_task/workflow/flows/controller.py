@@ -3,7 +3,7 @@ from typing import Annotated
 from fastapi import APIRouter, Body, Depends, Path
 from fastapi.responses import JSONResponse
 
-from app.common.response import ResponseSchema, SuccessResponse
+from app.common.response import ResponseSchema, StreamResponse, SuccessResponse
 from app.core.base_params import PaginationQueryParam
 from app.core.base_schema import AuthSchema, PageResultSchema
 from app.core.dependencies import AuthPermission
@@ -118,3 +118,20 @@ async def execute_workflow_controller(
 ) -> JSONResponse:
     result_dict = await WorkflowService(auth).execute_workflow(body=body)
     return SuccessResponse(data=result_dict, msg="执行工作流完成")
+
+
+@WorkflowRouter.post(
+    "/execute/stream",
+    summary="执行工作流（SSE 流式返回节点结果）",
+)
+async def execute_workflow_stream_controller(
+    body: WorkflowExecuteSchema,
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_task:workflow:definition:execute"]))],
+) -> StreamResponse:
+    events = await WorkflowService(auth).stream_workflow(body=body)
+    return StreamResponse(
+        data=events,
+        media_type="text/event-stream",
+        # 逐条推送：不经 GZip 缓冲，也不让反向代理缓冲
+        headers={"Cache-Control": "no-cache", "Content-Encoding": "identity", "X-Accel-Buffering": "no"},
+    )
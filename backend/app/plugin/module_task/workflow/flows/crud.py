@@ -78,7 +78,11 @@ class WorkflowCRUD(CRUDBase[WorkflowModel, WorkflowCreateSchema, WorkflowUpdateS
         返回:
         - WorkflowModel | None: 更新后实体或 None。
         """
-        return await self.update(id=id, data=data)
+        # 流程状态对应模型的 status 列（schema 字段名与 ModelMixin.status 区分）
+        obj_dict = data.model_dump(exclude_unset=True, exclude={"id"})
+        if "workflow_status" in obj_dict:
+            obj_dict["status"] = obj_dict.pop("workflow_status")
+        return await self.update(id=id, data=obj_dict)
 
     async def delete_obj_crud(self, ids: list[int]) -> None:
         """
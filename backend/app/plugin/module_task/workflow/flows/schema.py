@@ -87,7 +87,7 @@ class WorkflowOutSchema(BaseSchema, UserBySchema, TenantBySchema):
                 "updated_id": data.updated_id,
                 "name": data.name,
                 "code": data.code,
-                "status": data.workflow_status,
+                "status": data.status,
                 "nodes": data.nodes,
                 "edges": data.edges,
             }
@@ -113,6 +113,7 @@ class WorkflowExecuteSchema(BaseModel):
     variables: dict | None = Field(default=None, description="注入到各节点的 variables 上下文")
     business_key: str | None = Field(default=None, description="业务键")
     job_id: int | None = Field(default=None, description="关联任务ID")
+    use_cache: bool = Field(default=False, description="跳过输入未变化的节点（沿用历史运行中相同输入的输出）")
 
 
 class WorkflowExecuteResultSchema(BaseModel):
@@ -120,6 +121,7 @@ class WorkflowExecuteResultSchema(BaseModel):
 
     workflow_id: int = Field(..., description="工作流ID")
     workflow_name: str = Field(..., description="工作流名称")
+    run_id: int | None = Field(default=None, description="运行记录ID")
     status: int = Field(description="执行状态 0:失败 / 1:已完成")
     start_time: str | None = Field(default=None, description="开始时间")
     end_time: str | None = Field(default=None, description="结束时间")
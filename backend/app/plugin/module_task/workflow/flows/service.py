@@ -1,12 +1,15 @@
 
 import asyncio
+from collections.abc import AsyncIterator
 from typing import Any
 
+from app.common.response import dumps_response_content
 from app.core.base_schema import AuthSchema
 from app.core.exceptions import CustomException
 
-from ..handlers.workflow_engine import run_workflow_sync, utc_now_iso, validate_workflow_graph
+from ..handlers.workflow_engine import EventCallback, run_workflow, utc_now_iso, validate_workflow_graph
 from ..nodes.crud import WorkflowNodeTypeCRUD
+from ..runs.service import WORKFLOW_RUN_STATUS_COMPLETED, WORKFLOW_RUN_STATUS_FAILED, WorkflowRunRecorder, WorkflowRunService
 from .crud import WorkflowCRUD
 from .schema import (
     WorkflowCreateSchema,
@@ -28,7 +31,7 @@ WORKFLOW_EXEC_STATUS_COMPLETED = 1
 
 
 class WorkflowService:
-    """工作流：画布存储 + 发布校验 + 分层并行执行"""
+    """工作流：画布存储 + 发布校验 + 按依赖并行执行"""
 
     def __init__(self, auth: AuthSchema) -> None:
         self.auth = auth
@@ -126,15 +129,14 @@ class WorkflowService:
             raise CustomException(msg="发布失败")
         return self._out(updated)
 
-    async def execute_workflow(self, body: WorkflowExecuteSchema) -> WorkflowExecuteResultSchema:
+    async def _prepare_execution(self, body: WorkflowExecuteSchema) -> tuple[Any, dict[str, dict[str, Any]], dict]:
         obj = await WorkflowCRUD(self.auth).get_obj_by_id_crud(id=body.workflow_id)
         if not obj:
             raise CustomException(msg="工作流不存在")
-        if obj.workflow_status != WORKFLOW_STATUS_PUBLISHED:
+        if obj.status != WORKFLOW_STATUS_PUBLISHED:
             raise CustomException(msg="仅已发布的工作流可执行")
 
         nodes = obj.nodes or []
-        edges = obj.edges or []
         if not nodes:
             raise CustomException(msg="工作流没有节点")
 
@@ -154,44 +156,138 @@ class WorkflowService:
                 "args": node_type.args,
                 "kwargs": node_type.kwargs,
             }
+        return obj, templates, body.variables or {}
+
+    async def _execute(
+        self,
+        obj: Any,
+        templates: dict[str, dict[str, Any]],
+        variables: dict[str, Any],
+        *,
+        use_cache: bool = False,
+        reuse: dict[str, tuple[str | None, Any]] | None = None,
+        resumed_from_id: int | None = None,
+        forward: EventCallback | None = None,
+    ) -> WorkflowExecuteResultSchema:
+        """
+        执行工作流并写入运行记录；节点失败时返回失败结果，图 / 节点配置错误抛出 CustomException。
+
+        参数:
+        - obj (Any): 工作流实体。
+        - templates (dict[str, dict[str, Any]]): 节点类型编码 -> func / args / kwargs。
+        - variables (dict[str, Any]): 流程变量。
+        - use_cache (bool): 是否跳过输入未变化的节点。
+        - reuse (dict[str, tuple[str | None, Any]] | None): 续跑时可沿用的节点 (输入哈希, 输出)。
+        - resumed_from_id (int | None): 续跑来源运行 ID。
+        - forward (EventCallback | None): 额外接收执行事件（SSE 推送）。
 
-        variables = body.variables or {}
-        start = utc_now_iso()
+        返回:
+        - WorkflowExecuteResultSchema: 执行结果。
+        """
+        recorder = WorkflowRunRecorder(self.auth, obj, variables, use_cache=use_cache, resumed_from_id=resumed_from_id)
+        run_id = await recorder.start()
+
+        async def on_event(event: dict[str, Any]) -> None:
+            await recorder.on_event(event)
+            if forward is not None:
+                await forward(event)
+
+        result = WorkflowExecuteResultSchema(
+            workflow_id=obj.id,
+            workflow_name=obj.name,
+            run_id=run_id,
+            status=WORKFLOW_EXEC_STATUS_COMPLETED,
+            start_time=utc_now_iso(),
+            variables=variables,
+        )
         try:
-            raw = await asyncio.to_thread(
-                run_workflow_sync,
-                nodes,
-                edges,
+            raw = await run_workflow(
+                obj.nodes or [],
+                obj.edges or [],
                 templates,
                 variables,
+                on_event=on_event,
+                reuse=reuse,
+                memo=recorder.lookup if use_cache else None,
             )
         except ValueError as e:
+            await recorder.finish(WORKFLOW_RUN_STATUS_FAILED, str(e))
             raise CustomException(msg=str(e)) from e
-        except CustomException:
+        except asyncio.CancelledError:
+            # 客户端断开（SSE）时执行被取消，仍要收尾运行记录
+            await asyncio.shield(recorder.finish(WORKFLOW_RUN_STATUS_FAILED, "执行已取消"))
             raise
         except Exception as e:
-            end = utc_now_iso()
-            err = WorkflowExecuteResultSchema(
-                workflow_id=obj.id,
-                workflow_name=obj.name,
-                status=WORKFLOW_EXEC_STATUS_FAILED,
-                start_time=start,
-                end_time=end,
-                variables=variables,
-                node_results=None,
-                error=str(e),
-            )
-            return err
+            await recorder.finish(WORKFLOW_RUN_STATUS_FAILED, str(e))
+            result.status = WORKFLOW_EXEC_STATUS_FAILED
+            result.error = str(e)
+        else:
+            await recorder.finish(WORKFLOW_RUN_STATUS_COMPLETED)
+            result.node_results = raw.get("node_results")
+        result.end_time = utc_now_iso()
+        return result
 
-        end = utc_now_iso()
-        ok = WorkflowExecuteResultSchema(
-            workflow_id=obj.id,
-            workflow_name=obj.name,
-            status=WORKFLOW_EXEC_STATUS_COMPLETED,
-            start_time=start,
-            end_time=end,
-            variables=variables,
-            node_results=raw.get("node_results"),
-            error=None,
+    async def execute_workflow(self, body: WorkflowExecuteSchema) -> WorkflowExecuteResultSchema:
+        obj, templates, variables = await self._prepare_execution(body)
+        return await self._execute(obj, templates, variables, use_cache=body.use_cache)
+
+    async def resume_workflow(self, run_id: int, use_cache: bool = False) -> WorkflowExecuteResultSchema:
+        """
+        从失败节点续跑：上次已成功且代码、参数与输入均未变化的节点沿用其输出，
+        其余节点（失败、未执行或定义已修改）按当前定义重新执行。
+
+        参数:
+        - run_id (int): 失败的运行 ID。
+        - use_cache (bool): 其余节点是否也跳过输入未变化的节点。
+
+        返回:
+        - WorkflowExecuteResultSchema: 本次续跑的执行结果（新的运行记录）。
+        """
+        run, outputs = await WorkflowRunService(self.auth).get_resume_outputs(run_id)
+        body = WorkflowExecuteSchema(workflow_id=run.workflow_id, variables=run.variables)
+        obj, templates, variables = await self._prepare_execution(body)
+        return await self._execute(
+            obj, templates, variables, use_cache=use_cache, reuse=outputs, resumed_from_id=run.id
         )
-        return ok
+
+    async def stream_workflow(self, body: WorkflowExecuteSchema) -> AsyncIterator[bytes]:
+        """
+        执行工作流并以 SSE 逐个推送节点事件（node_started / node_finished / node_failed / node_skipped），
+        最后推送 workflow_finished（data 与 execute_workflow 的结果一致）。
+
+        校验在返回迭代器前完成，失败直接抛出 CustomException；客户端断开时取消执行。
+
+        参数:
+        - body (WorkflowExecuteSchema): 执行参数。
+
+        返回:
+        - AsyncIterator[bytes]: SSE 消息流。
+        """
+        obj, templates, variables = await self._prepare_execution(body)
+        try:
+            validate_workflow_graph(obj.nodes or [], obj.edges or [])
+        except ValueError as e:
+            raise CustomException(msg=str(e)) from e
+
+        def sse(event: str, data: Any) -> bytes:
+            return f"event: {event}\ndata: ".encode() + dumps_response_content(data) + b"\n\n"
+
+        async def events() -> AsyncIterator[bytes]:
+            queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+            task = asyncio.create_task(
+                self._execute(obj, templates, variables, use_cache=body.use_cache, forward=queue.put)
+            )
+            task.add_done_callback(lambda _: queue.put_nowait(None))
+            try:
+                while (event := await queue.get()) is not None:
+                    yield sse(event["event"], event)
+                if task.cancelled():
+                    return
+                if task.exception() is not None:
+                    yield sse("workflow_failed", {"error": str(task.exception())})
+                else:
+                    yield sse("workflow_finished", task.result())
+            finally:
+                task.cancel()
+
+        return events()
@@ -1,8 +1,9 @@
-"""工作流执行引擎（DAG 校验、拓扑排序、分层并行执行）。"""
+"""工作流执行引擎（DAG 校验、按依赖并行执行、执行事件流）。"""
 
-from .workflow_engine import run_workflow_sync, utc_now_iso, validate_workflow_graph
+from .workflow_engine import run_workflow, run_workflow_sync, utc_now_iso, validate_workflow_graph
 
 __all__ = [
+    "run_workflow",
     "run_workflow_sync",
     "utc_now_iso",
     "validate_workflow_graph",
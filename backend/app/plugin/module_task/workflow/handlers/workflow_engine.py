@@ -1,12 +1,38 @@
+import asyncio
+import hashlib
 import json
+import time
 from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Any
 
+import orjson
+
+from app.config.setting import settings
 from app.core.ap_scheduler import SchedulerUtil
 from app.core.logger import logger
 
+# 所有工作流共享的节点线程池（有界，按需创建）
+_EXECUTOR: ThreadPoolExecutor | None = None
+
+# 执行事件回调：按节点完成顺序逐个推送（用于 SSE 流式返回、运行记录）
+EventCallback = Callable[[dict[str, Any]], Awaitable[None]]
+# 节点输出缓存查询：输入哈希 -> (是否命中, 输出)
+MemoLookup = Callable[[str], Awaitable[tuple[bool, Any]]]
+
+
+@dataclass
+class _Graph:
+    """预先建好的邻接 / 入度索引，执行期间不再扫描 edges"""
+
+    nodes: dict[str, dict] = field(default_factory=dict)
+    upstream: dict[str, list[str]] = field(default_factory=lambda: defaultdict(list))
+    downstream: dict[str, list[str]] = field(default_factory=lambda: defaultdict(list))
+    in_degree: dict[str, int] = field(default_factory=dict)
+
 
 def _parse_args(args_str: str | None) -> list[Any]:
     if not args_str or not str(args_str).strip():
@@ -23,50 +49,77 @@ def _parse_kwargs(kwargs_str: str | None) -> dict[str, Any]:
         return {}
 
 
-def validate_workflow_graph(nodes: list[dict], edges: list[dict]) -> None:
+def _digest(value: Any) -> str:
+    # 规范化 JSON（键排序）后取哈希；无法序列化的值按 str() 参与计算
+    return hashlib.sha256(
+        orjson.dumps(value, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    ).hexdigest()
+
+
+def node_input_hash(
+    node_type: str,
+    code_hash: str,
+    args_str: str | None,
+    kwargs_str: str | None,
+    upstream: dict[str, Any],
+    flow_variables: dict[str, Any],
+) -> str:
+    """
+    节点输入哈希：节点类型、代码哈希、参数、上游输出与流程变量都相同时，视为同一输入。
+
+    返回:
+    - str: sha256 十六进制串。
+    """
+    return _digest([node_type, code_hash, args_str, kwargs_str, upstream, flow_variables])
+
+
+def _build_graph(nodes: list[dict], edges: list[dict]) -> _Graph:
     if not nodes:
         raise ValueError("工作流至少需要一个节点")
-    ids = {n["id"] for n in nodes}
+    graph = _Graph(nodes={n["id"]: n for n in nodes})
+    graph.in_degree = dict.fromkeys(graph.nodes, 0)
     for e in edges:
-        if e.get("source") not in ids or e.get("target") not in ids:
+        source, target = e.get("source"), e.get("target")
+        if source not in graph.nodes or target not in graph.nodes:
             raise ValueError("连线引用了不存在的节点")
-    in_degree: dict[str, int] = dict.fromkeys(ids, 0)
-    adj: dict[str, list[str]] = defaultdict(list)
-    for e in edges:
-        adj[e["source"]].append(e["target"])
-        in_degree[e["target"]] += 1
-    q: deque[str] = deque([nid for nid in ids if in_degree[nid] == 0])
+        graph.downstream[source].append(target)
+        graph.upstream[target].append(source)
+        graph.in_degree[target] += 1
+    return graph
+
+
+def _check_acyclic(graph: _Graph) -> None:
+    in_degree = dict(graph.in_degree)
+    q: deque[str] = deque([nid for nid, degree in in_degree.items() if degree == 0])
     visited = 0
     while q:
         u = q.popleft()
         visited += 1
-        for v in adj[u]:
+        for v in graph.downstream[u]:
             in_degree[v] -= 1
             if in_degree[v] == 0:
                 q.append(v)
-    if visited != len(ids):
+    if visited != len(in_degree):
         raise ValueError("工作流图存在环路，无法执行")
 
 
-def _topological_levels(nodes: list[dict], edges: list[dict]) -> list[list[dict]]:
-    id_to_node = {n["id"]: n for n in nodes}
-    in_degree: dict[str, int] = {n["id"]: 0 for n in nodes}
-    adj: dict[str, list[str]] = defaultdict(list)
-    for e in edges:
-        adj[e["source"]].append(e["target"])
-        in_degree[e["target"]] += 1
-    levels: list[list[dict]] = []
-    current = [nid for nid in in_degree if in_degree[nid] == 0]
-    while current:
-        levels.append([id_to_node[nid] for nid in current])
-        next_level: list[str] = []
-        for nid in current:
-            for target in adj[nid]:
-                in_degree[target] -= 1
-                if in_degree[target] == 0:
-                    next_level.append(target)
-        current = next_level
-    return levels
+def validate_workflow_graph(nodes: list[dict], edges: list[dict]) -> None:
+    _check_acyclic(_build_graph(nodes, edges))
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=settings.WORKFLOW_MAX_WORKERS, thread_name_prefix="workflow")
+    return _EXECUTOR
+
+
+def close() -> None:
+    """关闭节点线程池（应用关闭时调用，不等待仍在运行的节点）"""
+    global _EXECUTOR
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _EXECUTOR = None
 
 
 def _execute_node(
@@ -83,50 +136,148 @@ def _execute_node(
     kw = _parse_kwargs(kwargs_str)
     kw.setdefault("upstream", upstream)
     kw.setdefault("variables", flow_variables)
-    return SchedulerUtil._task_wrapper(job_id, code_block, *args, **kw)
+    return SchedulerUtil._run_code_block(job_id, code_block, args, kw, label=f"workflow:{node_type_code}")
 
 
-def run_workflow_sync(
+async def run_workflow(
     nodes: list[dict],
     edges: list[dict],
     node_templates: dict[str, dict[str, Any]],
     flow_variables: dict[str, Any],
+    on_event: EventCallback | None = None,
+    reuse: dict[str, tuple[str | None, Any]] | None = None,
+    memo: MemoLookup | None = None,
 ) -> dict[str, Any]:
-    """同步执行工作流：按拓扑层级分组，同层节点并行执行。"""
-    validate_workflow_graph(nodes, edges)
-    levels = _topological_levels(nodes, edges)
+    """
+    按依赖执行工作流：节点的上游全部完成即提交到共享线程池，不再等待整层结束。
+
+    任一节点失败或超时，取消尚未开始的节点并抛出异常；已在线程中运行的节点无法中断，其结果被丢弃。
+    节点超时取节点 ``data.timeout``（秒），未设置时为 ``WORKFLOW_NODE_TIMEOUT``；超时与 ``node_started`` 事件
+    均从线程池实际开始执行该节点时算起，等待空闲线程的排队时间不计入。
+
+    参数:
+    - nodes (list[dict]): 画布节点。
+    - edges (list[dict]): 画布连线。
+    - node_templates (dict[str, dict[str, Any]]): 节点类型编码 -> func / args / kwargs。
+    - flow_variables (dict[str, Any]): 注入各节点的 variables。
+    - on_event (EventCallback | None): 节点开始 / 完成 / 失败 / 跳过时的回调。
+    - reuse (dict[str, tuple[str | None, Any]] | None): 节点ID -> (输入哈希, 输出)，从失败节点续跑时为上次已成功的节点；
+      仅当节点当前输入哈希（含代码哈希、参数、上游输出与流程变量）与记录一致时沿用输出，否则重新执行。
+    - memo (MemoLookup | None): 按输入哈希查询历史输出，命中则跳过执行。
+
+    返回:
+    - dict[str, Any]: ``{"node_results": {节点ID: 返回值}, "status": 1}``。
+    """
+    graph = _build_graph(nodes, edges)
+    _check_acyclic(graph)
+
+    # 先解析全部节点配置，未知节点类型在执行任何节点前报错
+    calls: dict[str, tuple[str, str, str | None, str | None, float]] = {}
+    code_hashes: dict[str, str] = {}
+    for nid, node in graph.nodes.items():
+        ntype = node.get("type") or ""
+        tpl = node_templates.get(ntype)
+        if not tpl or not tpl.get("func"):
+            raise ValueError(f"未知或未配置节点类型: {ntype}")
+        data = node.get("data") or {}
+        args_str = data.get("args") if data.get("args") is not None else tpl.get("args")
+        kwargs_str = data.get("kwargs") if data.get("kwargs") is not None else tpl.get("kwargs")
+        timeout = float(data.get("timeout") or settings.WORKFLOW_NODE_TIMEOUT)
+        calls[nid] = (ntype, tpl["func"], args_str, kwargs_str, timeout)
+        if ntype not in code_hashes:
+            code_hashes[ntype] = hashlib.sha256(tpl["func"].encode("utf-8")).hexdigest()
+
+    async def emit(event: str, nid: str, **extra: Any) -> None:
+        if on_event is not None:
+            await on_event({"event": event, "node_id": nid, "node_type": calls[nid][0], **extra})
+
+    loop = asyncio.get_running_loop()
+    executor = _executor()
+    reuse = reuse or {}
+    in_degree = dict(graph.in_degree)
     results: dict[str, Any] = {}
-    for level in levels:
-        with ThreadPoolExecutor(max_workers=len(level)) as executor:
-            futures: dict[str, Any] = {}
-            for node in level:
-                nid = node["id"]
-                ntype = node.get("type") or ""
-                tpl = node_templates.get(ntype)
-                if not tpl or not tpl.get("func"):
-                    raise ValueError(f"未知或未配置节点类型: {ntype}")
-                data = node.get("data") or {}
-                args_str = data.get("args") if data.get("args") is not None else tpl.get("args")
-                kwargs_str = data.get("kwargs") if data.get("kwargs") is not None else tpl.get("kwargs")
-                upstream: dict[str, Any] = {}
-                for e in edges:
-                    if e.get("target") == nid and e.get("source") in results:
-                        upstream[e["source"]] = results[e["source"]]
-                futures[nid] = executor.submit(
-                    _execute_node,
-                    nid,
-                    ntype,
-                    tpl["func"],
-                    args_str,
-                    kwargs_str,
-                    upstream,
-                    flow_variables,
-                )
-            for nid, fut in futures.items():
-                results[nid] = fut.result()
+    running: dict[asyncio.Task, tuple[str, str, float]] = {}
+    # 节点被线程池实际开始执行的时刻（排队中的节点不计时）
+    began: dict[str, float] = {}
+
+    async def call(nid: str, upstream: dict[str, Any], input_hash: str) -> tuple[str | None, Any]:
+        # 返回 (跳过原因, 输出)：resumed 沿用上次输出 / cached 命中输入哈希缓存 / None 实际执行
+        stored = reuse.get(nid)
+        if stored is not None and stored[0] == input_hash:
+            return "resumed", stored[1]
+        if memo is not None:
+            hit, value = await memo(input_hash)
+            if hit:
+                return "cached", value
+        ntype, func, args_str, kwargs_str, timeout = calls[nid]
+        picked = loop.create_future()
+
+        def work() -> Any:
+            # 线程真正开始执行时才通知事件循环：排队等待空闲线程的时间不计入超时与耗时
+            loop.call_soon_threadsafe(lambda: picked.done() or picked.set_result(None))
+            return _execute_node(nid, ntype, func, args_str, kwargs_str, upstream, flow_variables)
+
+        future = loop.run_in_executor(executor, work)
+        try:
+            await asyncio.wait((picked, future), return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        if picked.done():
+            began[nid] = time.perf_counter()
+            await emit("node_started", nid, input_hash=input_hash)
+        return None, await asyncio.wait_for(future, timeout)
+
+    def start(nid: str) -> None:
+        upstream = {src: results[src] for src in graph.upstream[nid]}
+        ntype, _, args_str, kwargs_str, _ = calls[nid]
+        input_hash = node_input_hash(ntype, code_hashes[ntype], args_str, kwargs_str, upstream, flow_variables)
+        running[asyncio.ensure_future(call(nid, upstream, input_hash))] = (nid, input_hash, time.perf_counter())
+
+    try:
+        for nid, degree in in_degree.items():
+            if degree == 0:
+                start(nid)
+        while running:
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                nid, input_hash, started = running.pop(task)
+                elapsed = round(time.perf_counter() - began.get(nid, started), 4)
+                hashes = {"code_hash": code_hashes[calls[nid][0]], "input_hash": input_hash}
+                try:
+                    skipped, results[nid] = task.result()
+                except TimeoutError:
+                    timeout = calls[nid][4]
+                    await emit("node_failed", nid, error=f"节点执行超时({timeout:g}s)", elapsed=elapsed, **hashes)
+                    raise TimeoutError(f"节点 {nid} 执行超时({timeout:g}s)") from None
+                except Exception as e:
+                    await emit("node_failed", nid, error=str(e), elapsed=elapsed, **hashes)
+                    raise
+                if skipped:
+                    await emit("node_skipped", nid, reason=skipped, result=results[nid], **hashes)
+                else:
+                    await emit("node_finished", nid, result=results[nid], elapsed=elapsed, **hashes)
+                for target in graph.downstream[nid]:
+                    in_degree[target] -= 1
+                    if in_degree[target] == 0:
+                        start(target)
+    finally:
+        # 首个失败（或调用方取消）时取消其余节点：排队中的不再执行
+        for task in running:
+            task.cancel()
     logger.info("工作流执行完成: nodes={}", list(results.keys()))
     return {"node_results": results, "status": 1}
 
 
+def run_workflow_sync(
+    nodes: list[dict],
+    edges: list[dict],
+    node_templates: dict[str, dict[str, Any]],
+    flow_variables: dict[str, Any],
+) -> dict[str, Any]:
+    """同步执行工作流（脚本等无事件循环的调用方使用），见 ``run_workflow``。"""
+    return asyncio.run(run_workflow(nodes, edges, node_templates, flow_variables))
+
+
 def utc_now_iso() -> str:
     return datetime.now(UTC).isoformat()
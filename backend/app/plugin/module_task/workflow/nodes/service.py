@@ -1,4 +1,5 @@
 
+from app.core import code_cache
 from app.core.base_schema import AuthSchema
 from app.core.exceptions import CustomException
 
@@ -90,9 +91,12 @@ class WorkflowNodeTypeService:
             other = await WorkflowNodeTypeCRUD(self.auth).get(code=data.code)
             if other:
                 raise CustomException(msg="节点编码已存在")
+        old_func = exist.func
         obj = await WorkflowNodeTypeCRUD(self.auth).update_obj_crud(id=id, data=data)
         if not obj:
             raise CustomException(msg="更新失败")
+        if old_func and old_func != obj.func:
+            code_cache.invalidate(old_func)
         return self._out(obj)
 
     async def delete(self, ids: list[int]) -> None:
@@ -0,0 +1 @@
+"""工作流运行记录：每次执行的节点状态、耗时、输入哈希与输出，支持从失败节点续跑。"""
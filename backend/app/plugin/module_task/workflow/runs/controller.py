@@ -0,0 +1,83 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Depends, Path
+from fastapi.responses import JSONResponse
+
+from app.common.response import ResponseSchema, SuccessResponse
+from app.core.base_params import PaginationQueryParam
+from app.core.base_schema import AuthSchema, PageResultSchema
+from app.core.dependencies import AuthPermission
+from app.core.router_class import OperationLogRoute
+
+from ..flows.schema import WorkflowExecuteResultSchema
+from ..flows.service import WorkflowService
+from .schema import (
+    WorkflowRunDetailOutSchema,
+    WorkflowRunOutSchema,
+    WorkflowRunQueryParam,
+    WorkflowRunResumeSchema,
+)
+from .service import WorkflowRunService
+
+WorkflowRunRouter = APIRouter(route_class=OperationLogRoute, prefix="/workflow/run", tags=["任务调度", "工作流运行记录"])
+
+
+@WorkflowRunRouter.get(
+    "/list",
+    summary="工作流运行记录列表",
+    response_model=ResponseSchema[PageResultSchema[WorkflowRunOutSchema]],
+)
+async def get_workflow_run_list_controller(
+    page: Annotated[PaginationQueryParam, Depends()],
+    search: Annotated[WorkflowRunQueryParam, Depends()],
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_task:workflow:run:query"]))],
+) -> JSONResponse:
+    result_dict = await WorkflowRunService(auth).get_run_page(
+        page_no=page.page_no,
+        page_size=page.page_size,
+        search=search,
+        order_by=page.order_by,
+        cursor=page.cursor,
+        count=page.count,
+    )
+    return SuccessResponse(data=result_dict, msg="查询工作流运行记录成功")
+
+
+@WorkflowRunRouter.get(
+    "/detail/{id}",
+    summary="工作流运行详情",
+    response_model=ResponseSchema[WorkflowRunDetailOutSchema],
+)
+async def get_workflow_run_detail_controller(
+    id: Annotated[int, Path(description="运行记录ID")],
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_task:workflow:run:detail"]))],
+) -> JSONResponse:
+    result_dict = await WorkflowRunService(auth).get_run_detail(id=id)
+    return SuccessResponse(data=result_dict, msg="获取工作流运行详情成功")
+
+
+@WorkflowRunRouter.post(
+    "/resume/{id}",
+    summary="从失败节点续跑",
+    response_model=ResponseSchema[WorkflowExecuteResultSchema],
+)
+async def resume_workflow_run_controller(
+    id: Annotated[int, Path(description="运行记录ID")],
+    data: WorkflowRunResumeSchema,
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_task:workflow:definition:execute"]))],
+) -> JSONResponse:
+    result_dict = await WorkflowService(auth).resume_workflow(run_id=id, use_cache=data.use_cache)
+    return SuccessResponse(data=result_dict, msg="续跑工作流完成")
+
+
+@WorkflowRunRouter.delete(
+    "/delete",
+    summary="删除工作流运行记录",
+    response_model=ResponseSchema[None],
+)
+async def delete_workflow_run_controller(
+    ids: Annotated[list[int], Body(description="ID列表")],
+    auth: Annotated[AuthSchema, Depends(AuthPermission(["module_task:workflow:run:delete"]))],
+) -> JSONResponse:
+    await WorkflowRunService(auth).delete_run(ids=ids)
+    return SuccessResponse(msg="删除工作流运行记录成功")
@@ -0,0 +1,30 @@
+from collections.abc import Sequence
+
+from sqlalchemy import select
+
+from app.core.base_crud import CRUDBase
+from app.core.base_schema import AuthSchema
+
+from .model import WorkflowRunModel, WorkflowRunNodeModel
+
+
+class WorkflowRunCRUD(CRUDBase[WorkflowRunModel, None, None]):
+    """工作流运行记录数据层（记录由 WorkflowRunRecorder 写入，这里只查询 / 删除）"""
+
+    def __init__(self, auth: AuthSchema) -> None:
+        super().__init__(model=WorkflowRunModel, auth=auth)
+
+    async def get_nodes_crud(self, run_id: int) -> Sequence[WorkflowRunNodeModel]:
+        """
+        查询运行的节点记录（调用方已按租户校验过运行记录）。
+
+        参数:
+        - run_id (int): 运行 ID。
+
+        返回:
+        - Sequence[WorkflowRunNodeModel]: 按结束先后排列的节点记录。
+        """
+        result = await self.db.execute(
+            select(WorkflowRunNodeModel).where(WorkflowRunNodeModel.run_id == run_id).order_by(WorkflowRunNodeModel.id)
+        )
+        return result.scalars().all()
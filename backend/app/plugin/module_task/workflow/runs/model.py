@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.base_model import ModelMixin, TenantMixin, UserMixin
+
+
+class WorkflowRunModel(ModelMixin, TenantMixin, UserMixin):
+    """
+    工作流运行记录：每次执行（含续跑）一行
+    """
+
+    __tablename__: str = "task_workflow_run"
+    __table_args__ = (
+        # 列表按 id 倒序分页，按工作流 / 状态筛选
+        Index("ix_task_workflow_run_workflow", "tenant_id", "workflow_id", "id"),
+        Index("ix_task_workflow_run_status", "tenant_id", "status", "id"),
+        {"comment": "工作流运行记录表"},
+    )
+    __loader_options__: list[str] = ["created_by", "updated_by", "deleted_by", "tenant_by"]
+
+    workflow_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("task_workflow.id", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+        comment="工作流ID",
+    )
+    workflow_name: Mapped[str] = mapped_column(String(128), nullable=False, comment="流程名称")
+    status: Mapped[int] = mapped_column(Integer, default=2, nullable=False, comment="执行状态(0:失败 1:已完成 2:执行中)")
+    resumed_from_id: Mapped[int | None] = mapped_column(Integer, nullable=True, comment="续跑来源运行ID")
+    use_cache: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, comment="是否跳过输入未变化的节点")
+    variables: Mapped[dict | None] = mapped_column(JSON, nullable=True, comment="流程变量")
+    start_time: Mapped[datetime] = mapped_column(DateTime, nullable=False, comment="开始时间")
+    end_time: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, comment="结束时间")
+    duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True, comment="耗时(毫秒)")
+    node_total: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="节点总数")
+    node_executed: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="实际执行成功的节点数")
+    node_skipped: Mapped[int] = mapped_column(Integer, default=0, nullable=False, comment="沿用 / 命中缓存而跳过的节点数")
+    error: Mapped[str | None] = mapped_column(Text, nullable=True, comment="错误信息")
+
+
+class WorkflowRunNodeModel(ModelMixin, TenantMixin):
+    """
+    工作流运行的节点记录：节点结束（成功 / 失败 / 跳过）时写入
+    """
+
+    __tablename__: str = "task_workflow_run_node"
+    __table_args__ = (
+        Index("ix_task_workflow_run_node_run", "run_id", "node_id"),
+        # 节点输出缓存：同租户下按输入哈希查最近一次成功输出
+        Index("ix_task_workflow_run_node_input", "tenant_id", "input_hash"),
+        {"comment": "工作流运行节点记录表"},
+    )
+
+    run_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("task_workflow_run.id", ondelete="CASCADE", onupdate="CASCADE"),
+        nullable=False,
+        comment="运行ID",
+    )
+    node_id: Mapped[str] = mapped_column(String(64), nullable=False, comment="画布节点ID")
+    node_type: Mapped[str] = mapped_column(String(64), nullable=False, comment="节点类型编码")
+    status: Mapped[int] = mapped_column(Integer, nullable=False, comment="节点状态(0:失败 1:成功 2:续跑沿用 3:缓存命中)")
+    code_hash: Mapped[str] = mapped_column(String(64), nullable=False, comment="代码块哈希")
+    input_hash: Mapped[str] = mapped_column(String(64), nullable=False, comment="输入哈希(节点类型+代码+参数+上游输出+变量)")
+    output: Mapped[Any] = mapped_column(JSON, nullable=True, comment="节点输出")
+    reusable: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, comment="输出能否原样还原(可用于续跑 / 缓存)")
+    duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True, comment="耗时(毫秒)")
+    error: Mapped[str | None] = mapped_column(Text, nullable=True, comment="错误信息")
@@ -0,0 +1,75 @@
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import Query
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.common.enums import QueueEnum
+from app.core.base_params import BaseQueryParam, TenantByQueryParam, UserByQueryParam
+from app.core.base_schema import BaseSchema, TenantBySchema, UserBySchema
+from app.core.validator import DateTimeStr
+
+
+class WorkflowRunOutSchema(BaseSchema, UserBySchema, TenantBySchema):
+    """工作流运行记录"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    workflow_id: int = Field(description="工作流ID")
+    workflow_name: str = Field(description="流程名称")
+    status: int = Field(description="执行状态 0:失败 / 1:已完成 / 2:执行中")
+    resumed_from_id: int | None = Field(default=None, description="续跑来源运行ID")
+    use_cache: bool = Field(default=False, description="是否跳过输入未变化的节点")
+    variables: dict | None = Field(default=None, description="流程变量")
+    start_time: DateTimeStr | None = Field(default=None, description="开始时间")
+    end_time: DateTimeStr | None = Field(default=None, description="结束时间")
+    duration_ms: int | None = Field(default=None, description="耗时(毫秒)")
+    node_total: int = Field(default=0, description="节点总数")
+    node_executed: int = Field(default=0, description="实际执行成功的节点数")
+    node_skipped: int = Field(default=0, description="沿用 / 命中缓存而跳过的节点数")
+    error: str | None = Field(default=None, description="错误信息")
+
+
+class WorkflowRunNodeOutSchema(BaseModel):
+    """运行中的单个节点"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    node_id: str = Field(description="画布节点ID")
+    node_type: str = Field(description="节点类型编码")
+    status: int = Field(description="节点状态 0:失败 / 1:成功 / 2:续跑沿用 / 3:缓存命中")
+    code_hash: str = Field(description="代码块哈希")
+    input_hash: str = Field(description="输入哈希")
+    output: Any = Field(default=None, description="节点输出")
+    duration_ms: int | None = Field(default=None, description="耗时(毫秒)")
+    error: str | None = Field(default=None, description="错误信息")
+    created_time: DateTimeStr | None = Field(default=None, description="结束时间")
+
+
+class WorkflowRunDetailOutSchema(WorkflowRunOutSchema):
+    """运行详情（含节点记录）"""
+
+    nodes: list[WorkflowRunNodeOutSchema] = Field(default_factory=list, description="节点记录")
+
+
+class WorkflowRunResumeSchema(BaseModel):
+    """从失败节点续跑"""
+
+    use_cache: bool = Field(default=False, description="其余节点是否也跳过输入未变化的节点")
+
+
+@dataclass
+class WorkflowRunQueryParam(BaseQueryParam, UserByQueryParam, TenantByQueryParam):
+    """运行记录查询"""
+
+    workflow_id: int | None = Query(None, description="工作流ID")
+    workflow_name: str | None = Query(None, description="流程名称")
+    status: int | None = Query(None, ge=0, le=2, description="执行状态(0:失败 1:已完成 2:执行中)")
+
+    def __post_init__(self) -> None:
+        if isinstance(self.workflow_id, int):
+            self.workflow_id = (QueueEnum.eq.value, self.workflow_id)
+        if self.workflow_name:
+            self.workflow_name = (QueueEnum.like.value, self.workflow_name)
+        if isinstance(self.status, int):
+            self.status = (QueueEnum.eq.value, self.status)
@@ -0,0 +1,253 @@
+import time
+from datetime import datetime
+from typing import Any
+
+import orjson
+from sqlalchemy import select, update
+
+from app.common.enums import PageCountEnum
+from app.common.response import dumps_response_content
+from app.core.base_schema import AuthSchema
+from app.core.database import async_db_session
+from app.core.exceptions import CustomException
+from app.core.logger import logger
+
+from .crud import WorkflowRunCRUD
+from .model import WorkflowRunModel, WorkflowRunNodeModel
+from .schema import (
+    WorkflowRunDetailOutSchema,
+    WorkflowRunNodeOutSchema,
+    WorkflowRunOutSchema,
+    WorkflowRunQueryParam,
+)
+
+# 运行状态（与 WorkflowRunModel.status 保持一致：0:失败 1:已完成 2:执行中）
+WORKFLOW_RUN_STATUS_FAILED = 0
+WORKFLOW_RUN_STATUS_COMPLETED = 1
+WORKFLOW_RUN_STATUS_RUNNING = 2
+
+# 节点状态（与 WorkflowRunNodeModel.status 保持一致：0:失败 1:成功 2:续跑沿用 3:缓存命中）
+WORKFLOW_RUN_NODE_FAILED = 0
+WORKFLOW_RUN_NODE_SUCCESS = 1
+WORKFLOW_RUN_NODE_RESUMED = 2
+WORKFLOW_RUN_NODE_CACHED = 3
+
+_SKIP_STATUS = {"resumed": WORKFLOW_RUN_NODE_RESUMED, "cached": WORKFLOW_RUN_NODE_CACHED}
+_OK_STATUS = (WORKFLOW_RUN_NODE_SUCCESS, WORKFLOW_RUN_NODE_RESUMED, WORKFLOW_RUN_NODE_CACHED)
+
+
+def _to_json(value: Any) -> tuple[Any, bool]:
+    # 返回 (可写入 JSON 列的值, 是否能原样还原)；无法还原的输出只保存文本，不参与续跑 / 缓存
+    try:
+        encoded = orjson.loads(dumps_response_content(value))
+    except Exception:
+        return str(value), False
+    return encoded, encoded == value
+
+
+class WorkflowRunRecorder:
+    """
+    一次工作流执行的运行记录：开始时写运行行，每个节点结束时写节点行，结束时回写状态与统计。
+
+    使用独立会话逐条提交（不依赖请求事务），执行中途进程退出时已完成的节点仍可用于续跑。
+    """
+
+    def __init__(
+        self,
+        auth: AuthSchema,
+        workflow: Any,
+        variables: dict[str, Any],
+        use_cache: bool = False,
+        resumed_from_id: int | None = None,
+    ) -> None:
+        self.workflow = workflow
+        self.tenant_id: int = workflow.tenant_id
+        self.user_id: int | None = auth.user.id if auth and auth.user else None
+        self.variables = variables
+        self.use_cache = use_cache
+        self.resumed_from_id = resumed_from_id
+        self.run_id: int | None = None
+        self._started = 0.0
+        self._executed = 0
+        self._skipped = 0
+
+    async def start(self) -> int:
+        """
+        写入执行中的运行记录。
+
+        返回:
+        - int: 运行 ID。
+        """
+        self._started = time.perf_counter()
+        run = WorkflowRunModel(
+            workflow_id=self.workflow.id,
+            workflow_name=self.workflow.name,
+            status=WORKFLOW_RUN_STATUS_RUNNING,
+            resumed_from_id=self.resumed_from_id,
+            use_cache=self.use_cache,
+            variables=_to_json(self.variables)[0],
+            start_time=datetime.now(),
+            node_total=len(self.workflow.nodes or []),
+            tenant_id=self.tenant_id,
+            created_id=self.user_id,
+            updated_id=self.user_id,
+        )
+        async with async_db_session() as session, session.begin():
+            session.add(run)
+            await session.flush()
+            self.run_id = run.id
+        return run.id
+
+    async def on_event(self, event: dict[str, Any]) -> None:
+        """
+        记录节点结束事件（作为 run_workflow 的 on_event 回调）。
+
+        参数:
+        - event (dict[str, Any]): 执行引擎事件。
+        """
+        name = event["event"]
+        if name == "node_finished":
+            status = WORKFLOW_RUN_NODE_SUCCESS
+            self._executed += 1
+        elif name == "node_skipped":
+            status = _SKIP_STATUS[event["reason"]]
+            self._skipped += 1
+        elif name == "node_failed":
+            status = WORKFLOW_RUN_NODE_FAILED
+        else:
+            return
+        output, reusable = _to_json(event.get("result"))
+        elapsed = event.get("elapsed")
+        try:
+            async with async_db_session() as session, session.begin():
+                session.add(
+                    WorkflowRunNodeModel(
+                        run_id=self.run_id,
+                        node_id=str(event["node_id"]),
+                        node_type=event["node_type"],
+                        status=status,
+                        code_hash=event["code_hash"],
+                        input_hash=event["input_hash"],
+                        output=output,
+                        reusable=reusable and status != WORKFLOW_RUN_NODE_FAILED,
+                        duration_ms=round(elapsed * 1000) if elapsed is not None else None,
+                        error=event.get("error"),
+                        tenant_id=self.tenant_id,
+                    )
+                )
+        except Exception as e:
+            # 记录失败不影响工作流本身
+            logger.error(f"写入工作流节点记录失败: run_id={self.run_id}, node={event['node_id']}, {e}")
+
+    async def finish(self, status: int, error: str | None = None) -> None:
+        """
+        回写运行状态、耗时与节点统计。
+
+        参数:
+        - status (int): 运行状态。
+        - error (str | None): 错误信息。
+        """
+        async with async_db_session() as session, session.begin():
+            await session.execute(
+                update(WorkflowRunModel)
+                .where(WorkflowRunModel.id == self.run_id)
+                .values(
+                    status=status,
+                    end_time=datetime.now(),
+                    duration_ms=round((time.perf_counter() - self._started) * 1000),
+                    node_executed=self._executed,
+                    node_skipped=self._skipped,
+                    error=error,
+                    updated_time=datetime.now(),
+                )
+            )
+
+    async def lookup(self, input_hash: str) -> tuple[bool, Any]:
+        """
+        按输入哈希查询本租户最近一次可还原的成功输出（作为 run_workflow 的 memo 回调）。
+
+        参数:
+        - input_hash (str): 节点输入哈希。
+
+        返回:
+        - tuple[bool, Any]: (是否命中, 输出)。
+        """
+        async with async_db_session() as session:
+            row = (
+                await session.execute(
+                    select(WorkflowRunNodeModel.output)
+                    .where(
+                        WorkflowRunNodeModel.tenant_id == self.tenant_id,
+                        WorkflowRunNodeModel.input_hash == input_hash,
+                        WorkflowRunNodeModel.status.in_(_OK_STATUS),
+                        WorkflowRunNodeModel.reusable.is_(True),
+                    )
+                    .order_by(WorkflowRunNodeModel.id.desc())
+                    .limit(1)
+                )
+            ).first()
+        return (True, row[0]) if row is not None else (False, None)
+
+
+class WorkflowRunService:
+    """工作流运行记录：分页、详情、续跑、删除"""
+
+    def __init__(self, auth: AuthSchema) -> None:
+        self.auth = auth
+
+    async def get_run_page(
+        self,
+        page_no: int,
+        page_size: int,
+        search: WorkflowRunQueryParam | None = None,
+        order_by: list[dict[str, str]] | None = None,
+        cursor: str | None = None,
+        count: PageCountEnum | None = None,
+    ) -> dict:
+        return await WorkflowRunCRUD(self.auth).page(
+            offset=(page_no - 1) * page_size,
+            limit=page_size,
+            order_by=order_by or [{"id": "desc"}],
+            search=vars(search) if search else None,
+            out_schema=WorkflowRunOutSchema,
+            cursor=cursor,
+            count=count,
+        )
+
+    async def get_run_detail(self, id: int) -> WorkflowRunDetailOutSchema:
+        crud = WorkflowRunCRUD(self.auth)
+        obj = await crud.get(id=id)
+        if not obj:
+            raise CustomException(msg="运行记录不存在")
+        detail = WorkflowRunDetailOutSchema.model_validate(obj)
+        detail.nodes = [WorkflowRunNodeOutSchema.model_validate(n) for n in await crud.get_nodes_crud(run_id=id)]
+        return detail
+
+    async def get_resume_outputs(self, id: int) -> tuple[WorkflowRunModel, dict[str, tuple[str | None, Any]]]:
+        """
+        续跑前读取上次运行中已成功节点的输入哈希与输出。
+
+        参数:
+        - id (int): 要续跑的运行 ID。
+
+        返回:
+        - tuple[WorkflowRunModel, dict[str, tuple[str | None, Any]]]: 运行记录与 节点ID -> (输入哈希, 输出)
+          （输出无法还原的节点不在其中，会重新执行）。
+        """
+        crud = WorkflowRunCRUD(self.auth)
+        obj = await crud.get(id=id)
+        if not obj:
+            raise CustomException(msg="运行记录不存在")
+        if obj.status != WORKFLOW_RUN_STATUS_FAILED:
+            raise CustomException(msg="仅失败的运行可以续跑")
+        outputs = {
+            n.node_id: (n.input_hash, n.output)
+            for n in await crud.get_nodes_crud(run_id=id)
+            if n.status in _OK_STATUS and n.reusable
+        }
+        return obj, outputs
+
+    async def delete_run(self, ids: list[int]) -> None:
+        if not ids:
+            raise CustomException(msg="删除ID不能为空")
+        await WorkflowRunCRUD(self.auth).delete(ids=ids)
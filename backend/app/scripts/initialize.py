@@ -99,6 +99,7 @@ class InitializeData:
         async with async_db_session() as session:
             async with session.begin():
                 await self.__init_data(session)
+                await self.__init_dept_closure(session)
 
     async def __init_data(self, db: AsyncSession) -> None:
         """按依赖顺序初始化各表种子数据"""
@@ -186,6 +187,18 @@ class InitializeData:
                 logger.error(f"❌️ 初始化 {table_name} 表数据失败")
                 raise
 
+    async def __init_dept_closure(self, db: AsyncSession) -> None:
+        """部门闭包表为空时按部门表构建（新库种子数据 / 历史库首次升级）"""
+        from app.api.v1.module_system.dept.model import DeptClosureModel
+        from app.api.v1.module_system.dept.service import DeptService
+
+        count = await db.execute(select(func.count()).select_from(DeptClosureModel))
+        if count.scalar():
+            return
+        rows = await DeptService.rebuild_closure(db)
+        if rows:
+            logger.info(f"✅️ 已构建 sys_dept_closure 部门闭包表, 共 {rows} 行")
+
     @staticmethod
     def __create_objects_with_children(data: list[dict], model_class: type) -> list:
         """递归创建树形模型实例，处理嵌套 children 并注入 parent_id"""
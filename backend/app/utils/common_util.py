@@ -1,7 +1,8 @@
 import importlib
 import re
 import uuid
-from collections.abc import Generator, Sequence
+from collections.abc import Callable, Generator, Sequence
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Literal
 
@@ -11,6 +12,7 @@ from sqlalchemy.orm.collections import InstrumentedList
 from sqlalchemy.sql.elements import Null
 from sqlalchemy.sql.expression import null
 
+from app.common.response import RawJSON, dumps_response_content
 from app.config.setting import settings
 from app.core.exceptions import CustomException
 from app.core.logger import logger
@@ -165,43 +167,53 @@ def get_child_recursion(
     return ids
 
 
-def traversal_to_tree(nodes: list[dict[str, Any]]) -> list[dict[str, Any]]:
+def get_closure_rows(parent_map: dict[int, int | None]) -> list[tuple[int, int, int]]:
     """
-    通过遍历算法构造树形结构
+    由 {id: parent_id} 映射生成祖先闭包行（含自身，depth=0）
 
     参数:
-    - nodes (list[dict[str, Any]]): 树节点列表。
+    - parent_map (dict[int, int | None]): 节点 ID 到父级 ID 的映射。
 
     返回:
-    - list[dict[str, Any]]: 构造后的树形结构列表。
+    - list[tuple[int, int, int]]: (ancestor_id, descendant_id, depth) 列表。
     """
-    tree: list[dict[str, Any]] = []
-    node_dict = {node["id"]: node for node in nodes}
+    rows = []
+    for node_id in parent_map:
+        ancestor_id, depth, seen = node_id, 0, set()
+        # 父级缺失或出现环时停止向上追溯
+        while ancestor_id is not None and ancestor_id in parent_map and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            rows.append((ancestor_id, node_id, depth))
+            ancestor_id = parent_map[ancestor_id]
+            depth += 1
+    return rows
+
+
+def traversal_to_tree(nodes: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    按 id 索引一次遍历构造树形结构（O(n)，保持输入顺序）
 
+    节点原有的 children 会被覆盖，子节点只来自 nodes 本身；父节点不在 nodes 中的节点作为根节点。
+
+    参数:
+    - nodes (list[dict[str, Any]]): 树节点列表（会被原地修改）。
+
+    返回:
+    - list[dict[str, Any]]: 构造后的树形结构列表（无子节点时 children 为 None）。
+    """
+    index = {node["id"]: node for node in nodes}
     for node in nodes:
-        # 确保每个节点都有children字段，即使没有子节点也设置为null
-        if "children" not in node:
-            node["children"] = None
+        node["children"] = None
 
-        parent_id = node["parent_id"]
-        if parent_id is None:
+    tree: list[dict[str, Any]] = []
+    for node in nodes:
+        parent = index.get(node["parent_id"])
+        if parent is None or parent is node:
             tree.append(node)
+        elif parent["children"] is None:
+            parent["children"] = [node]
         else:
-            parent_node = node_dict.get(parent_id)
-            if parent_node is not None:
-                if "children" not in parent_node or parent_node["children"] is None:
-                    parent_node["children"] = []
-                if node not in parent_node["children"]:
-                    parent_node["children"].append(node)
-            else:
-                if node not in tree:
-                    tree.append(node)
-
-    # 确保所有节点都有children字段
-    for node in tree:
-        if "children" not in node:
-            node["children"] = None
-
+            parent["children"].append(node)
     return tree
 
 
@@ -209,23 +221,77 @@ def recursive_to_tree(
     nodes: list[dict[str, Any]], *, parent_id: int | None = None
 ) -> list[dict[str, Any]]:
     """
-    通过递归算法构造树形结构（性能影响较大）
+    构造以 parent_id 为根的子树（按父级分组一次遍历，O(n)）
 
     参数:
-    - nodes (list[dict[str, Any]]): 树节点列表。
+    - nodes (list[dict[str, Any]]): 树节点列表（会被原地修改）。
     - parent_id (int | None): 父节点 ID,默认为 None 表示根节点。
 
     返回:
-    - list[dict[str, Any]]: 构造后的树形结构列表。
+    - list[dict[str, Any]]: 构造后的树形结构列表（仅有子节点时才设置 children）。
     """
-    tree: list[dict[str, Any]] = []
+    by_parent: dict[Any, list[dict[str, Any]]] = {}
     for node in nodes:
-        if node["parent_id"] == parent_id:
-            child_nodes = recursive_to_tree(nodes, parent_id=node["id"])
-            if child_nodes:
-                node["children"] = child_nodes
-            tree.append(node)
-    return tree
+        by_parent.setdefault(node["parent_id"], []).append(node)
+    for node in nodes:
+        children = by_parent.get(node["id"])
+        if children:
+            node["children"] = children
+    return list(by_parent.get(parent_id, []))
+
+
+@dataclass(frozen=True)
+class TreeSnapshot:
+    """
+    一棵树的全部扁平节点及整棵树的预序列化结果（作为缓存值共享，调用方不得修改 rows）
+
+    请求侧只需查出可见节点 ID：与全部节点一致时直接返回预序列化的整棵树，
+    否则从扁平节点中挑出可见部分重新构树。
+    """
+
+    rows: tuple[dict[str, Any], ...]
+    ids: frozenset[int]
+    body: bytes
+
+    @classmethod
+    def build(cls, rows: list[dict[str, Any]]) -> "TreeSnapshot":
+        """
+        由扁平节点构造快照。
+
+        参数:
+        - rows (list[dict[str, Any]]): 已排好序的节点（不含 children）。
+
+        返回:
+        - TreeSnapshot: 快照。
+        """
+        tree = traversal_to_tree([dict(row) for row in rows])
+        return cls(rows=tuple(rows), ids=frozenset(row["id"] for row in rows), body=dumps_response_content(tree))
+
+    def tree(self, visible_ids: set[int] | None = None) -> Any:
+        """
+        获取可见节点构成的树。
+
+        参数:
+        - visible_ids (set[int] | None): 可见节点 ID，None 表示全部。
+
+        返回:
+        - Any: 全部可见时为预序列化的 ``RawJSON``，否则为新构造的树（list[dict]）。
+        """
+        if visible_ids is None or visible_ids >= self.ids:
+            return RawJSON(self.body)
+        return traversal_to_tree([dict(row) for row in self.rows if row["id"] in visible_ids])
+
+    def select(self, predicate: Callable[[dict[str, Any]], bool]) -> list[dict[str, Any]]:
+        """
+        按条件挑选节点并构树。
+
+        参数:
+        - predicate (Callable[[dict[str, Any]], bool]): 节点筛选函数。
+
+        返回:
+        - list[dict[str, Any]]: 新构造的树。
+        """
+        return traversal_to_tree([dict(row) for row in self.rows if predicate(row)])
 
 
 def bytes2human(n: int, format_str: str = "%(value).1f%(symbol)s") -> str:
@@ -1,4 +1,10 @@
+import asyncio
+import csv
 import io
+import tempfile
+from collections.abc import AsyncIterator
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Any
 
 import pandas as pd
@@ -7,6 +13,11 @@ from openpyxl.styles import Alignment, PatternFill
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
 
+from app.common.constant import DATETIME_DISPLAY_FMT
+
+# 流式导出时每次输出的字节块大小
+_STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class ExcelUtil:
     """
@@ -108,3 +119,74 @@ class ExcelUtil:
         df.to_excel(buffer, index=False, engine="openpyxl")  # pyright: ignore[reportArgumentType]
         binary_data = buffer.getvalue()
         return binary_data
+
+    @classmethod
+    async def stream_xlsx(cls, batches: AsyncIterator[list[dict[str, Any]]], mapping_dict: dict) -> AsyncIterator[bytes]:
+        """
+        流式导出 Excel：逐批写入 write-only 工作簿（行数据落盘，不驻留内存），
+        写完后将文件分块输出。写入与压缩均在线程中执行，不阻塞事件循环。
+
+        参数:
+        - batches (AsyncIterator[list[dict[str, Any]]]): 数据批次。
+        - mapping_dict (dict): 字段名映射字典（决定列顺序与表头）。
+
+        返回:
+        - AsyncIterator[bytes]: Excel 文件字节块。
+        """
+        keys = list(mapping_dict)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(list(mapping_dict.values()))
+        async for batch in batches:
+            await asyncio.to_thread(cls.__append_rows, ws, batch, keys)
+
+        with tempfile.TemporaryFile() as buffer:
+            await asyncio.to_thread(wb.save, buffer)
+            buffer.seek(0)
+            while chunk := await asyncio.to_thread(buffer.read, _STREAM_CHUNK_SIZE):
+                yield chunk
+
+    @classmethod
+    async def stream_csv(cls, batches: AsyncIterator[list[dict[str, Any]]], mapping_dict: dict) -> AsyncIterator[bytes]:
+        """
+        流式导出 CSV（UTF-8 BOM，Excel 可直接打开）：每批编码后立即输出。
+
+        参数:
+        - batches (AsyncIterator[list[dict[str, Any]]]): 数据批次。
+        - mapping_dict (dict): 字段名映射字典（决定列顺序与表头）。
+
+        返回:
+        - AsyncIterator[bytes]: CSV 字节块。
+        """
+        keys = list(mapping_dict)
+        yield "\ufeff".encode() + cls.__encode_csv([list(mapping_dict.values())])
+        async for batch in batches:
+            yield await asyncio.to_thread(
+                cls.__encode_csv, [[cls.__csv_cell(item.get(key)) for key in keys] for item in batch]
+            )
+
+    @classmethod
+    def __append_rows(cls, ws: Any, batch: list[dict[str, Any]], keys: list[str]) -> None:
+        for item in batch:
+            ws.append([cls.__xlsx_cell(item.get(key)) for key in keys])
+
+    @staticmethod
+    def __xlsx_cell(value: Any) -> Any:
+        if value is None or isinstance(value, (str, int, float, Decimal, date)):
+            if isinstance(value, datetime) and value.tzinfo is not None:
+                # Excel 不支持时区，转为本地时间
+                return value.astimezone().replace(tzinfo=None)
+            return value
+        return str(value)
+
+    @staticmethod
+    def __csv_cell(value: Any) -> Any:
+        if isinstance(value, datetime):
+            return value.strftime(DATETIME_DISPLAY_FMT)
+        return "" if value is None else value
+
+    @staticmethod
+    def __encode_csv(rows: list[list[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode("utf-8")
@@ -1,16 +1,112 @@
+import asyncio
 import base64
 import hashlib
 import os
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
 
 from cryptography.hazmat.backends.openssl import backend
 from cryptography.hazmat.primitives import padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from fastapi import status
+
+from app.config.setting import settings
+from app.core.exceptions import CustomException
 
 _PBKDF2_ALGO = "sha256"
 _PBKDF2_ITERATIONS = 600_000
 _PBKDF2_SALT_LEN = 16
 _PBKDF2_PREFIX = "$pbkdf2-sha256$"
 
+_T = TypeVar("_T")
+
+
+class _HashPool:
+    """
+    密码哈希专用线程池。
+
+    600,000 次迭代的 PBKDF2 单次耗时数百毫秒，直接在协程里调用会阻塞整个事件循环。
+    ``hashlib.pbkdf2_hmac`` 计算期间释放 GIL，放到线程池即可并行且不占用事件循环；
+    使用独立线程池而非默认执行器，避免登录高峰占满 ``asyncio.to_thread`` 的线程。
+    信号量限制同时计算数，排队数超过上限时直接拒绝，防止请求无限堆积。
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.max_pending_seen = 0
+        self.wait_seconds = 0.0
+        self.run_seconds = 0.0
+
+    def _limiter(self) -> asyncio.Semaphore:
+        # 信号量绑定事件循环，循环变化（如测试中重建）时重新创建
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.workers)
+            self._loop = loop
+        return self._semaphore
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pwd-hash")
+        return self._executor
+
+    async def run(self, func: Callable[..., _T], *args: Any) -> _T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise CustomException(msg="系统繁忙，请稍后重试", status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.pending += 1
+        self.max_pending_seen = max(self.max_pending_seen, self.pending)
+        queued_at = time.perf_counter()
+        acquired = False
+        try:
+            async with self._limiter():
+                acquired = True
+                self.pending -= 1
+                self.running += 1
+                started_at = time.perf_counter()
+                self.wait_seconds += started_at - queued_at
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(self._pool(), func, *args)
+                finally:
+                    self.running -= 1
+                    self.completed += 1
+                    self.run_seconds += time.perf_counter() - started_at
+        finally:
+            # 排队期间被取消时未获取到信号量，排队计数需要回退
+            if not acquired:
+                self.pending -= 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_pending_seen": self.max_pending_seen,
+            "avg_wait_ms": round(self.wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "avg_run_ms": round(self.run_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+_HASH_POOL = _HashPool(workers=settings.PASSWORD_HASH_WORKERS, max_pending=settings.PASSWORD_HASH_MAX_PENDING)
+
 
 class PwdUtil:
 
@@ -31,6 +127,48 @@ class PwdUtil:
         except Exception:
             return False
 
+    @staticmethod
+    async def hash_password_async(password: str) -> str:
+        """
+        在密码哈希线程池中计算密码哈希，不阻塞事件循环。
+
+        参数:
+        - password (str): 明文密码。
+
+        返回:
+        - str: 密码哈希。
+        """
+        return await _HASH_POOL.run(PwdUtil.hash_password, password)
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, password_hash: str) -> bool:
+        """
+        在密码哈希线程池中校验密码，不阻塞事件循环。
+
+        参数:
+        - plain_password (str): 明文密码。
+        - password_hash (str): 密码哈希。
+
+        返回:
+        - bool: 是否匹配。
+        """
+        return await _HASH_POOL.run(PwdUtil.verify_password, plain_password, password_hash)
+
+    @staticmethod
+    def pool_stats() -> dict[str, Any]:
+        """
+        密码哈希线程池统计。
+
+        返回:
+        - dict[str, Any]: 线程数、排队数、执行中、已完成、拒绝数与平均排队/计算耗时。
+        """
+        return _HASH_POOL.stats()
+
+    @staticmethod
+    def shutdown_pool() -> None:
+        """关闭密码哈希线程池（lifespan 关闭时调用）。"""
+        _HASH_POOL.shutdown()
+
     @staticmethod
     def check_password_strength(password: str) -> str | None:
         if len(password) < 6:
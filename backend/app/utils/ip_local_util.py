@@ -1,15 +1,30 @@
+import asyncio
 import ipaddress
+from collections.abc import Iterable
+from pathlib import Path
 
 import httpx
 from starlette.requests import Request
 
+from app.config.path_conf import BASE_DIR
 from app.config.setting import settings
 from app.core.logger import logger
+from app.core.tiered_cache import TieredCache
+from app.utils.ip_region_util import XdbSearcher, format_region
 
 # 归属地缓存：IP 几乎不变化，缓存 7 天可显著减少外网请求
 _IP_CACHE_TTL = 7 * 24 * 3600
 # 硬超时（秒），避免外网查询阻塞主流程
 _IP_QUERY_TIMEOUT = 3.0
+# 批量解析时同时进行的在线查询数
+_REMOTE_CONCURRENCY = 8
+
+# Redis ``ip:location:*`` 前面的进程内 LRU（离线库与在线查询的结果都会进入）
+_LOCATION_CACHE = TieredCache("ip_location", maxsize=settings.IP_LOCATION_CACHE_SIZE, ttl=3600.0)
+# 离线库查询器：None 表示尚未加载，False 表示文件不存在或无效
+_SEARCHER: XdbSearcher | bool | None = None
+# 在线查询共享的连接池
+_CLIENT: httpx.AsyncClient | None = None
 
 
 def get_client_ip(request: Request) -> str | None:
@@ -24,7 +39,13 @@ def get_client_ip(request: Request) -> str | None:
 
 
 class IpLocalUtil:
-    """获取 IP 归属地工具类（带 Redis 缓存、硬超时、降级）。"""
+    """获取 IP 归属地工具类（离线库 + 进程内 LRU + Redis 缓存，在线 API 作为可选回退）。
+
+    查询顺序：内网判断 -> 进程内 LRU -> 离线 xdb 库 -> Redis 缓存 -> 在线 API（``IP_LOCATION_REMOTE_ENABLE``）。
+    """
+
+    # 需要后台查询、暂未得到结果时的占位值
+    PENDING = "归属地查询中"
 
     @classmethod
     def is_valid_ip(cls, ip: str) -> bool:
@@ -42,58 +63,137 @@ class IpLocalUtil:
             return False
 
     @classmethod
-    async def resolve_location_for_log(cls, redis, ip: str | None) -> str | None:
-        """登录日志写入入口：仅返回可同步获取的值（内网/缓存/降级），
-
-        外网查询由后台任务异步执行（见 ``resolve_location_async``）。
-        """
+    def location_hint(cls, ip: str | None) -> str | None:
+        """不做网络 I/O 即可得到的归属地（内网 / 已关闭查询 / 进程内缓存 / 离线库），其余返回占位值，由后台解析回填。"""
         if not ip:
             return None
-        if not settings.IP_LOCATION_ENABLE:
-            return "内网IP" if cls.is_private_ip(ip) else "未解析(已关闭归属地查询)"
+        # 先查进程内缓存：ipaddress 判断内网需要逐个比对保留网段，比缓存命中更慢
+        cached = _LOCATION_CACHE.peek(ip)
+        if cached is not None:
+            return cached
         if cls.is_private_ip(ip):
             return "内网IP"
+        if not settings.IP_LOCATION_ENABLE:
+            return "未解析(已关闭归属地查询)"
+        return cls._lookup_local(ip) or cls.PENDING
+
+    @classmethod
+    async def resolve_location_for_log(cls, redis, ip: str | None) -> str | None:
+        """登录日志写入入口：仅返回可同步获取的值（内网/离线库/缓存/降级），
+
+        外网查询由后台任务异步执行（见 ``resolve_location_async``）。
+        """
+        hint = cls.location_hint(ip)
+        if hint != cls.PENDING:
+            return hint
         if redis:
             cached = await cls._cache_get(redis, ip)
             if cached is not None:
+                _LOCATION_CACHE.set(ip, cached)
                 return cached
-        return "归属地查询中"
+        return cls.PENDING
 
     @classmethod
     async def resolve_location_async(cls, redis, ip: str) -> str:
-        """异步查询归属地（含缓存、降级、硬超时）。"""
-        if not cls.is_valid_ip(ip):
-            return "未知"
-        if cls.is_private_ip(ip):
-            return "内网IP"
+        """异步查询归属地（含缓存、离线库、降级、硬超时）。"""
+        return (await cls.resolve_locations(redis, [ip]))[ip]
 
-        cached = await cls._cache_get(redis, ip) if redis else None
-        if cached is not None:
-            return cached
+    @classmethod
+    async def resolve_locations(cls, redis, ips: Iterable[str]) -> dict[str, str]:
+        """
+        批量查询归属地（登录日志回填归属地等场景）。
+
+        离线库 / 进程内缓存未命中的 IP 用一次 MGET 读取 Redis 缓存，仍未命中的并发查询在线 API
+        （受 ``_REMOTE_CONCURRENCY`` 限制），结果用一次 pipeline 写回 Redis。
 
-        result = await cls._query_with_timeout(ip)
+        参数:
+        - redis: Redis 连接（可为 None）。
+        - ips (Iterable[str]): IP 列表（可重复）。
+
+        返回:
+        - dict[str, str]: IP -> 归属地。
+        """
+        result: dict[str, str] = {}
+        pending: list[str] = []
+        for ip in dict.fromkeys(ips):
+            if not cls.is_valid_ip(ip):
+                result[ip] = "未知"
+            elif cls.is_private_ip(ip):
+                result[ip] = "内网IP"
+            elif not settings.IP_LOCATION_ENABLE:
+                result[ip] = "未解析(已关闭归属地查询)"
+            elif location := cls._lookup_local(ip):
+                result[ip] = location
+            else:
+                pending.append(ip)
+        if not pending:
+            return result
+
+        cached = await cls._cache_get_many(redis, pending) if redis else {}
+        for ip, location in cached.items():
+            _LOCATION_CACHE.set(ip, location)
+        result.update(cached)
+        pending = [ip for ip in pending if ip not in cached]
+        if not pending:
+            return result
+
+        if not settings.IP_LOCATION_REMOTE_ENABLE:
+            result.update(dict.fromkeys(pending, "未知"))
+            return result
+
+        semaphore = asyncio.Semaphore(_REMOTE_CONCURRENCY)
+
+        async def query(ip: str) -> str:
+            async with semaphore:
+                return await cls._query_with_timeout(ip)
+
+        remote = dict(zip(pending, await asyncio.gather(*(query(ip) for ip in pending)), strict=True))
+        for ip, location in remote.items():
+            _LOCATION_CACHE.set(ip, location)
         if redis:
-            await cls._cache_set(redis, ip, result)
+            await cls._cache_set_many(redis, remote)
+        result.update(remote)
         return result
 
+    @classmethod
+    async def aclose(cls) -> None:
+        """关闭在线查询连接池与离线库映射（lifespan 关闭时调用）"""
+        global _CLIENT, _SEARCHER
+        if _CLIENT is not None:
+            await _CLIENT.aclose()
+            _CLIENT = None
+        if isinstance(_SEARCHER, XdbSearcher):
+            _SEARCHER.close()
+        _SEARCHER = None
+
+    @classmethod
+    def _lookup_local(cls, ip: str) -> str | None:
+        """进程内缓存 + 离线库（纯内存查询，不做网络 I/O）"""
+        cached = _LOCATION_CACHE.peek(ip)
+        if cached is not None:
+            return cached
+        searcher = _get_searcher()
+        if searcher is None:
+            return None
+        location = format_region(searcher.search(ip))
+        _LOCATION_CACHE.set(ip, location)
+        return location
+
     @classmethod
     async def _query_with_timeout(cls, ip: str) -> str:
         """在硬超时内尝试主备两个 API，全部失败返回未知。"""
         apis = [
-            ("https://ip9.com.cn/get", cls._parse_ip9),
-            ("http://ip-api.com/json", cls._parse_ipapi),
+            (f"https://ip9.com.cn/get?ip={ip}", cls._parse_ip9),
+            (f"http://ip-api.com/json/{ip}", cls._parse_ipapi),
         ]
+        client = _get_client()
         for url, parser in apis:
             try:
-                async with httpx.AsyncClient(timeout=_IP_QUERY_TIMEOUT) as client:
-                    resp = await client.get(
-                        url if "ip-api" in url else f"{url}?ip={ip}",
-                        params={} if "ip-api" in url else None,
-                    )
-                    if resp.status_code == 200:
-                        location = parser(resp.json())
-                        if location:
-                            return location
+                resp = await client.get(url)
+                if resp.status_code == 200:
+                    location = parser(resp.json())
+                    if location:
+                        return location
             except Exception as e:
                 logger.warning(f"IP 归属地 API 失败: {url} - {e}")
         return "未知"
@@ -127,9 +227,50 @@ class IpLocalUtil:
             return None
 
     @staticmethod
-    async def _cache_set(redis, ip: str, value: str) -> None:
+    async def _cache_get_many(redis, ips: list[str]) -> dict[str, str]:
         try:
-            from app.core.redis_crud import RedisCURD
-            await RedisCURD(redis).set(f"ip:location:{ip}", value, expire=_IP_CACHE_TTL)
+            values = await redis.mget([f"ip:location:{ip}" for ip in ips])
+        except Exception:
+            return {}
+        return {
+            ip: value.decode("utf-8") if isinstance(value, bytes) else str(value)
+            for ip, value in zip(ips, values, strict=True)
+            if value is not None
+        }
+
+    @staticmethod
+    async def _cache_set_many(redis, locations: dict[str, str]) -> None:
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for ip, value in locations.items():
+                pipe.set(f"ip:location:{ip}", value, ex=_IP_CACHE_TTL)
+            await pipe.execute()
         except Exception:
             pass
+
+
+def _get_searcher() -> XdbSearcher | None:
+    """首次使用时加载离线库，文件不存在时只提示一次"""
+    global _SEARCHER
+    if _SEARCHER is None:
+        path = Path(settings.IP_LOCATION_DB_PATH)
+        if not path.is_absolute():
+            path = BASE_DIR / path
+        try:
+            _SEARCHER = XdbSearcher(path)
+            logger.info(f"已加载离线 IP 归属地库: {path}")
+        except (OSError, ValueError) as e:
+            _SEARCHER = False
+            fallback = "缓存与在线 API" if settings.IP_LOCATION_REMOTE_ENABLE else "缓存（在线 API 未启用，未命中时为未知）"
+            logger.info(f"未加载离线 IP 归属地库（{e}），归属地查询使用{fallback}")
+    return _SEARCHER or None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.AsyncClient(
+            timeout=_IP_QUERY_TIMEOUT,
+            limits=httpx.Limits(max_connections=_REMOTE_CONCURRENCY * 2, max_keepalive_connections=_REMOTE_CONCURRENCY),
+        )
+    return _CLIENT
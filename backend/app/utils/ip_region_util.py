@@ -0,0 +1,95 @@
+"""离线 IP 归属地库（ip2region xdb 格式）
+
+xdb 文件结构（IPv4，小端序）：
+
+- 头部 256 字节
+- 向量索引：按 IP 前两个字节分为 256 x 256 格，每格 8 字节（该格段索引的起止偏移）
+- 段索引：每条 14 字节（起始 IP u32、结束 IP u32、区域长度 u16、区域偏移 u32），按起始 IP 升序
+- 区域数据：UTF-8 文本，形如 ``中国|0|广东省|深圳市|电信``，``0`` 表示缺省
+
+查询先由向量索引定位到一格，再在该格的段索引内二分查找，文件以 mmap 只读映射，
+不整体读入内存，多个 worker 共享操作系统页缓存。
+"""
+
+import ipaddress
+import mmap
+import struct
+from pathlib import Path
+
+HEADER_SIZE = 256
+VECTOR_COLS = 256
+VECTOR_INDEX_SIZE = 8
+SEGMENT_INDEX_SIZE = 14
+VECTOR_INDEX_LENGTH = 256 * VECTOR_COLS * VECTOR_INDEX_SIZE
+
+_VECTOR = struct.Struct("<II")
+_SEGMENT = struct.Struct("<IIHI")
+
+
+class XdbSearcher:
+    """ip2region xdb 只读查询器（仅 IPv4）"""
+
+    def __init__(self, path: str | Path) -> None:
+        """
+        以 mmap 方式打开 xdb 文件。
+
+        参数:
+        - path (str | Path): xdb 文件路径。
+        """
+        with open(path, "rb") as f:
+            self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buf) < HEADER_SIZE + VECTOR_INDEX_LENGTH:
+            self._buf.close()
+            raise ValueError(f"无效的 xdb 文件: {path}")
+        self.path = Path(path)
+
+    def search(self, ip: str) -> str | None:
+        """
+        查询 IP 所在区域。
+
+        参数:
+        - ip (str): IPv4 地址。
+
+        返回:
+        - str | None: 区域原文（``国家|区域|省份|城市|ISP``），未收录或非 IPv4 返回 None。
+        """
+        try:
+            value = int(ipaddress.IPv4Address(ip))
+        except ValueError:
+            return None
+        offset = HEADER_SIZE + ((value >> 24) * VECTOR_COLS + ((value >> 16) & 0xFF)) * VECTOR_INDEX_SIZE
+        start_ptr, end_ptr = _VECTOR.unpack_from(self._buf, offset)
+        if not start_ptr or end_ptr < start_ptr:
+            return None
+
+        low, high = 0, (end_ptr - start_ptr) // SEGMENT_INDEX_SIZE
+        while low <= high:
+            mid = (low + high) >> 1
+            start_ip, end_ip, data_len, data_ptr = _SEGMENT.unpack_from(self._buf, start_ptr + mid * SEGMENT_INDEX_SIZE)
+            if value < start_ip:
+                high = mid - 1
+            elif value > end_ip:
+                low = mid + 1
+            else:
+                return self._buf[data_ptr : data_ptr + data_len].decode("utf-8")
+        return None
+
+    def close(self) -> None:
+        """关闭内存映射"""
+        self._buf.close()
+
+
+def format_region(region: str | None) -> str | None:
+    """
+    区域原文转为与在线 API 一致的展示格式（``国家-省份-城市-ISP``）。
+
+    参数:
+    - region (str | None): 区域原文。
+
+    返回:
+    - str | None: 展示文本，全部缺省时返回 None。
+    """
+    if not region:
+        return None
+    parts = [part for part in region.split("|") if part and part != "0"]
+    return "-".join(parts) or None
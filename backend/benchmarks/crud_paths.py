@@ -0,0 +1,128 @@
+"""CRUDBase 查询路径微基准
+
+对 UserCRUD / DictDataCRUD / OperationLogCRUD 的 get / get_list / page 路径计时：
+
+- build: 会话 execute 直接返回空结果，只计 CRUDBase 自身构建语句的开销
+- e2e: 临时 SQLite 库端到端（含编译缓存命中、执行与 ORM 装载、selectin 关系）
+
+最后输出 SQLAlchemy 编译缓存条目数，用于确认重复的查询形态没有重复编译。
+
+运行:
+    cd backend && python -m benchmarks.crud_paths
+"""
+
+import asyncio
+import logging
+import os
+import tempfile
+import time
+
+_DB_PATH = tempfile.NamedTemporaryFile(suffix="", delete=False).name
+os.environ["DATABASE_TYPE"] = "sqlite"
+os.environ["DATABASE_NAME"] = _DB_PATH
+
+from sqlalchemy import insert  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.config.setting import settings  # noqa: E402
+
+settings.DATABASE_TYPE = "sqlite"
+settings.DATABASE_NAME = _DB_PATH
+
+from app.api.v1.module_system.dict.model import DictDataModel, DictTypeModel  # noqa: E402
+from app.api.v1.module_system.log.model import OperationLogModel  # noqa: E402
+from app.api.v1.module_system.user.model import UserModel  # noqa: E402
+from app.core.base_crud import CRUDBase  # noqa: E402
+from app.core.base_model import MappedBase  # noqa: E402
+from app.utils.import_util import ImportUtil  # noqa: E402
+
+ROWS = 50
+NUMBER = 500
+
+
+async def _seed(db: AsyncSession) -> None:
+    await db.execute(insert(UserModel), [
+        {"username": f"bench{i}", "password": "x", "name": f"bench{i}", "status": i % 2, "tenant_id": 1} for i in range(ROWS)
+    ])
+    await db.execute(insert(DictTypeModel), [{"id": 1, "dict_name": "bench", "dict_type": "bench", "tenant_id": 1}])
+    await db.execute(insert(DictDataModel), [
+        {"dict_label": f"l{i}", "dict_value": str(i), "dict_type": "bench", "dict_type_id": 1, "dict_sort": i, "tenant_id": 1}
+        for i in range(ROWS)
+    ])
+    await db.execute(insert(OperationLogModel), [
+        {"request_path": f"/bench/{i}", "request_method": "GET", "response_code": 200, "tenant_id": 1} for i in range(ROWS)
+    ])
+    await db.commit()
+
+
+class _NullResult:
+    def scalars(self) -> "_NullResult":
+        return self
+
+    def all(self) -> list:
+        return []
+
+    def first(self) -> None:
+        return None
+
+    def scalar(self) -> int:
+        return 0
+
+
+class _NullSession:
+    """只接收语句不执行的会话"""
+
+    async def execute(self, *args, **kwargs) -> _NullResult:
+        return _NullResult()
+
+
+async def _time(fn) -> float:
+    await fn()  # 预热（首次编译）
+    start = time.perf_counter()
+    for _ in range(NUMBER):
+        await fn()
+    return (time.perf_counter() - start) / NUMBER * 1e6
+
+
+def _cases(db) -> list[tuple[str, object]]:
+    user = CRUDBase(model=UserModel, session=db)
+    dict_data = CRUDBase(model=DictDataModel, session=db)
+    op_log = CRUDBase(model=OperationLogModel, session=db)
+    return [
+        ("UserCRUD.get", lambda: user.get(username="bench3")),
+        ("UserCRUD.get_list", lambda: user.get_list(
+            search={"status": ("eq", 0), "name": ("like", "bench"), "id": ("in", [1, 2, 3, 4, 5])}
+        )),
+        ("DictDataCRUD.get_list", lambda: dict_data.get_list(
+            search={"dict_type": "bench", "status": ("eq", 0)}, order_by=[{"dict_sort": "asc"}]
+        )),
+        ("OperationLogCRUD.page", lambda: op_log.page(
+            offset=10, limit=10, order_by=[{"id": "desc"}], search={"request_method": ("eq", "GET")}
+        )),
+        ("OperationLogCRUD.page(cursor)", lambda: op_log.page(
+            offset=0, limit=10, order_by=[{"id": "desc"}], search={"request_method": ("eq", "GET")}, cursor=""
+        )),
+    ]
+
+
+async def main() -> None:
+    logging.getLogger("aiosqlite").setLevel(logging.WARNING)
+    ImportUtil.find_models(MappedBase)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{_DB_PATH}.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(MappedBase.metadata.create_all)
+
+    print(f"{'path':<32} {'build(us)':>10} {'e2e(us)':>10}")
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        await _seed(db)
+        for (label, build_fn), (_, e2e_fn) in zip(_cases(_NullSession()), _cases(db), strict=True):
+            print(f"{label:<32} {await _time(build_fn):>10.1f} {await _time(e2e_fn):>10.1f}")
+
+    cache = engine.sync_engine._compiled_cache
+    print(f"compiled cache entries: {len(cache) if cache is not None else 'disabled'}")
+    await engine.dispose()
+    os.remove(f"{_DB_PATH}.db")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+"""IP 归属地离线查询基准
+
+生成一个覆盖全部 IPv4 空间的合成 xdb 文件（每个 /16 随机切分为若干段），对比：
+
+- xdb: ``XdbSearcher.search`` 冷查询（向量索引 + 段内二分，mmap 读取）
+- hint: ``IpLocalUtil.location_hint``（进程内 LRU 命中后不再查库）
+
+启动时用 bisect 对照校验全部抽样查询结果。
+在线 API 单次查询受 3 秒硬超时约束，无外网环境下每个未缓存 IP 都要等满超时，这里不参与计时。
+
+运行:
+    cd backend && python -m benchmarks.ip_location
+"""
+
+import bisect
+import ipaddress
+import random
+import struct
+import tempfile
+import time
+from pathlib import Path
+
+from app.utils.ip_region_util import HEADER_SIZE, SEGMENT_INDEX_SIZE, VECTOR_COLS, VECTOR_INDEX_LENGTH, VECTOR_INDEX_SIZE, XdbSearcher
+
+SEGMENTS_PER_CELL = 8
+QUERIES = 200_000
+REGIONS = [
+    "中国|0|广东省|深圳市|电信",
+    "中国|0|北京|北京市|联通",
+    "中国|0|上海|上海市|移动",
+    "美国|0|加利福尼亚|0|0",
+    "日本|0|东京都|0|0",
+    "0|0|0|内网IP|内网IP",
+]
+
+
+def build_xdb(path: Path, seed: int = 7) -> list[tuple[int, int, str]]:
+    """写出合成 xdb 文件，返回 (起始 IP, 结束 IP, 区域) 列表"""
+    rng = random.Random(seed)
+    region_bytes = [region.encode() for region in REGIONS]
+    region_ptrs = []
+    data = bytearray()
+    data_start = HEADER_SIZE + VECTOR_INDEX_LENGTH
+    for raw in region_bytes:
+        region_ptrs.append(data_start + len(data))
+        data += raw
+
+    segment_start = data_start + len(data)
+    vector = bytearray(VECTOR_INDEX_LENGTH)
+    segments = bytearray()
+    ranges: list[tuple[int, int, str]] = []
+    for cell in range(256 * VECTOR_COLS):
+        base = cell << 16
+        cuts = sorted(rng.sample(range(1, 1 << 16), SEGMENTS_PER_CELL - 1))
+        bounds = [0, *cuts, 1 << 16]
+        first = segment_start + len(segments)
+        for lo, hi in zip(bounds, bounds[1:], strict=False):
+            index = rng.randrange(len(REGIONS))
+            start_ip, end_ip = base + lo, base + hi - 1
+            segments += struct.pack("<IIHI", start_ip, end_ip, len(region_bytes[index]), region_ptrs[index])
+            ranges.append((start_ip, end_ip, REGIONS[index]))
+        last = segment_start + len(segments) - SEGMENT_INDEX_SIZE
+        struct.pack_into("<II", vector, cell * VECTOR_INDEX_SIZE, first, last)
+
+    header = bytearray(HEADER_SIZE)
+    struct.pack_into("<HHIII", header, 0, 2, 1, int(time.time()), segment_start, segment_start + len(segments) - SEGMENT_INDEX_SIZE)
+    path.write_bytes(bytes(header) + bytes(vector) + bytes(data) + bytes(segments))
+    return ranges
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.xdb"
+        started = time.perf_counter()
+        ranges = build_xdb(path)
+        print(f"built {len(ranges)} segments, {path.stat().st_size / 1024 / 1024:.1f} MiB in {time.perf_counter() - started:.2f}s")
+
+        rng = random.Random(11)
+        ips = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(QUERIES)]
+        starts = [r[0] for r in ranges]
+        searcher = XdbSearcher(path)
+        for ip in ips[:20_000]:
+            expected = ranges[bisect.bisect_right(starts, int(ipaddress.IPv4Address(ip))) - 1][2]
+            assert searcher.search(ip) == expected, ip
+
+        started = time.perf_counter()
+        for ip in ips:
+            searcher.search(ip)
+        elapsed = time.perf_counter() - started
+        print(f"{'xdb search':<12} {elapsed * 1e6 / QUERIES:>8.2f} us/op {QUERIES / elapsed:>12,.0f} ops/s")
+
+        from app.config.setting import settings
+        from app.utils import ip_local_util
+
+        settings.IP_LOCATION_DB_PATH = str(path)
+        hot = ips[:5_000]
+        for ip in hot:
+            ip_local_util.IpLocalUtil.location_hint(ip)
+        started = time.perf_counter()
+        for _ in range(QUERIES // len(hot)):
+            for ip in hot:
+                ip_local_util.IpLocalUtil.location_hint(ip)
+        elapsed = time.perf_counter() - started
+        print(f"{'lru hint':<12} {elapsed * 1e6 / QUERIES:>8.2f} us/op {QUERIES / elapsed:>12,.0f} ops/s")
+        searcher.close()
+        if isinstance(ip_local_util._SEARCHER, XdbSearcher):
+            ip_local_util._SEARCHER.close()
+
+
+if __name__ == "__main__":
+    main()
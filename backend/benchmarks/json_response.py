@@ -0,0 +1,96 @@
+"""统一响应序列化基准
+
+构造 1000 条 ``UserOutSchema``（含部门、岗位、角色嵌套）的分页结果，对比 ``SuccessResponse`` 两条路径：
+
+- legacy: ``ResponseSchema.model_dump`` -> ``jsonable_encoder`` -> ``json.dumps``（``fast=False``）
+- orjson: 分页项（``CRUDBase.page`` 产出的 dict）直接交给 orjson，datetime 由 default 按展示格式输出
+- orjson(model): 分页项保持 ``UserOutSchema`` 实例，由 orjson default 逐个 ``model_dump``
+
+两条路径输出逐字节一致（启动时校验）。
+
+运行:
+    cd backend && python -m benchmarks.json_response
+"""
+
+import statistics
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from app.api.v1.module_system.user.schema import UserOutSchema
+from app.common.response import SuccessResponse
+from app.core.base_schema import PageResultSchema
+
+ITEMS = 1000
+ROUNDS = 30
+
+
+def _build_users() -> list[UserOutSchema]:
+    now = datetime(2026, 1, 1, 8, 30, 0)
+    users = []
+    for i in range(1, ITEMS + 1):
+        users.append(
+            UserOutSchema.model_validate(
+                {
+                    "id": i,
+                    "uuid": f"00000000-0000-0000-0000-{i:012d}",
+                    "username": f"user{i}",
+                    "name": f"用户{i}",
+                    "mobile": "13800138000",
+                    "email": f"user{i}@example.com",
+                    "gender": "0",
+                    "status": 0,
+                    "is_superuser": False,
+                    "description": "基准测试用户",
+                    "last_login": now,
+                    "created_time": now - timedelta(days=i),
+                    "updated_time": now,
+                    "created_id": 1,
+                    "created_by": {"id": 1, "name": "管理员"},
+                    "dept_id": 1,
+                    "dept": {"id": 1, "name": "研发部"},
+                    "positions": [{"id": 1, "name": "工程师"}],
+                    "roles": [{"id": 2, "name": "普通用户", "code": "common", "status": 0, "created_time": now}],
+                }
+            )
+        )
+    return users
+
+
+def _timeit(fn: Callable[[], bytes]) -> tuple[float, int]:
+    samples = []
+    size = 0
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        size = len(fn())
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), size
+
+
+def main() -> None:
+    users = _build_users()
+    dict_items = [user.model_dump() for user in users]
+
+    def page(items: list) -> PageResultSchema:
+        return PageResultSchema(page_no=1, page_size=ITEMS, total=ITEMS, has_next=False, items=items)
+
+    cases: dict[str, Callable[[], bytes]] = {
+        "legacy": lambda: SuccessResponse(data=page(dict_items), fast=False).body,
+        "orjson": lambda: SuccessResponse(data=page(dict_items), fast=True).body,
+        "orjson(model)": lambda: SuccessResponse(data=page(users), fast=True).body,
+    }
+    expected = cases["legacy"]()
+    for name, fn in cases.items():
+        assert fn() == expected, f"{name} 输出与 legacy 不一致"
+
+    print(f"{ITEMS} x UserOutSchema, median of {ROUNDS} rounds")
+    print(f"{'mode':<16} {'time(ms)':>10} {'bytes':>10} {'speedup':>8}")
+    baseline = None
+    for name, fn in cases.items():
+        elapsed, size = _timeit(fn)
+        baseline = baseline or elapsed
+        print(f"{name:<16} {elapsed:>10.2f} {size:>10} {baseline / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
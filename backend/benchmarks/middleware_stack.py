@@ -0,0 +1,136 @@
+"""中间件栈延迟基准
+
+对比旧的 ``BaseHTTPMiddleware`` 实现与纯 ASGI 实现（RequestLog + CorrelationId + Tenant）
+在同一个最小应用上的 p50 / p99 单请求延迟。请求经 httpx ASGITransport 在进程内发送，
+不含网络开销，只反映中间件栈自身的调度与包装成本。
+
+旧实现在此处按原逻辑保留一份精简副本（日志/配置加载/拦截/请求头回写均保留）。
+
+运行:
+    cd backend && python -m benchmarks.middleware_stack
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.common.response import ErrorResponse
+from app.core.middlewares import (
+    _DEFAULT_CONFIG,
+    CorrelationIdMiddleware,
+    RequestLogMiddleware,
+    TenantMiddleware,
+    _extract_tenant_from_token,
+    _is_path_whitelisted,
+    _tenant_is_whitelisted,
+)
+from app.core.request_context import clear_current_tenant, reset_correlation_id, set_correlation_id, set_current_tenant
+from app.utils.ip_local_util import get_client_ip
+
+REQUESTS = 2000
+WARMUP = 200
+
+
+class _LegacyRequestLog(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        start_time = time.time()
+        client_ip = get_client_ip(request)
+        logger.info("请求: {} {} | client={}", request.method, request.url.path, client_ip or "unknown")
+        config = _DEFAULT_CONFIG
+        if (client_ip and client_ip in config["ip_black_list"]) or (
+            config["demo_enable"] and request.method != "GET"
+            and not _is_path_whitelisted(request.url.path, config["white_api_list_path"])
+        ):
+            return ErrorResponse(msg="演示环境，禁止操作")
+        response = await call_next(request)
+        process_time = round(time.time() - start_time, 5)
+        response.headers["X-Process-Time"] = str(process_time)
+        logger.info("响应: {} | {:.1f}ms", response.status_code, process_time * 1000)
+        return response
+
+
+class _LegacyCorrelationId(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        cid = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
+        token = set_correlation_id(cid)
+        try:
+            response = await call_next(request)
+        finally:
+            reset_correlation_id(token)
+        response.headers["X-Correlation-ID"] = cid
+        return response
+
+
+class _LegacyTenant(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        if request.method == "OPTIONS" or _tenant_is_whitelisted(request.url.path):
+            return await call_next(request)
+        set_current_tenant(await _extract_tenant_from_token(request))
+        try:
+            return await call_next(request)
+        finally:
+            clear_current_tenant()
+
+
+def _build_app(middlewares: list[type]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/v1/bench/ping")
+    async def ping() -> dict:
+        return {"code": 0, "msg": "ok"}
+
+    @app.get("/api/v1/bench/stream")
+    async def stream() -> StreamingResponse:
+        return StreamingResponse((b"x" * 1024 for _ in range(32)), media_type="text/plain")
+
+    # 与 register_middlewares 一致：列表顺序为外层 -> 内层
+    for middleware in reversed(middlewares):
+        app.add_middleware(middleware)
+    return app
+
+
+async def _measure(app: FastAPI, path: str) -> list[float]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(WARMUP):
+            await client.get(path)
+        samples = []
+        for _ in range(REQUESTS):
+            start = time.perf_counter()
+            response = await client.get(path)
+            samples.append((time.perf_counter() - start) * 1e6)
+            assert response.status_code == 200 and "X-Correlation-ID" in response.headers
+    return samples
+
+
+def _pct(samples: list[float], q: int) -> float:
+    return statistics.quantiles(samples, n=100)[q - 1]
+
+
+async def main() -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logger.disable("app")
+    logger.disable("__main__")
+    stacks = {
+        "BaseHTTPMiddleware": _build_app([_LegacyRequestLog, _LegacyCorrelationId, _LegacyTenant]),
+        "pure ASGI": _build_app([RequestLogMiddleware, CorrelationIdMiddleware, TenantMiddleware]),
+    }
+    print(f"{'stack':<20} {'path':<10} {'p50(us)':>10} {'p99(us)':>10}")
+    for path in ("/api/v1/bench/ping", "/api/v1/bench/stream"):
+        for name, app in stacks.items():
+            samples = await _measure(app, path)
+            print(f"{name:<20} {path.rsplit('/', 1)[-1]:<10} {_pct(samples, 50):>10.1f} {_pct(samples, 99):>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""AuthPermission 鉴权路径微基准
+
+对比旧实现（每个请求遍历角色菜单构建 dict + 套餐菜单 ID 集合过滤）
+与权限位图实现（用户位图 & 租户位图 & 接口位图）的单次校验耗时。
+
+运行:
+    cd backend && python -m benchmarks.permission_check
+"""
+
+import timeit
+from dataclasses import dataclass, field
+from functools import partial
+
+from app.core.permission_index import PermissionIndex
+
+ROLES_PER_USER = 5
+MENUS_PER_ROLE = (10, 100, 1000)
+NUMBER = 2000
+
+
+@dataclass
+class _Menu:
+    id: int
+    permission: str
+    status: int = 0
+
+
+@dataclass
+class _Role:
+    status: int = 0
+    menus: list[_Menu] = field(default_factory=list)
+
+
+def _build(menus_per_role: int) -> tuple[list[_Role], set[int], list[str]]:
+    roles = []
+    for r in range(ROLES_PER_USER):
+        base = r * menus_per_role
+        roles.append(_Role(menus=[_Menu(id=base + i, permission=f"module_bench:r{r}:p{i}") for i in range(menus_per_role)]))
+    package_ids = {menu.id for role in roles for menu in role.menus if menu.id % 2 == 0}
+    # 取最后一个角色的最后一个权限，模拟最坏情况
+    required = [f"module_bench:r{ROLES_PER_USER - 1}:p{menus_per_role - 2}"]
+    return roles, package_ids, required
+
+
+def _legacy_check(roles: list[_Role], package_ids: set[int], required: list[str]) -> bool:
+    role_perms: dict[str, int] = {}
+    for role in roles:
+        if role.status != 0:
+            continue
+        for menu in role.menus:
+            if menu.status == 0 and menu.permission:
+                role_perms[menu.permission] = menu.id
+    user_permissions = {p for p, mid in role_perms.items() if mid in package_ids}
+    return any(perm in user_permissions for perm in required)
+
+
+def _bitset_check(user_bits: int, tenant_bits: int, required_bits: int) -> bool:
+    return bool(user_bits & tenant_bits & required_bits)
+
+
+def main() -> None:
+    print(f"{'menus/role':>10} {'legacy(us)':>12} {'bitset(us)':>12} {'speedup':>9}")
+    for menus_per_role in MENUS_PER_ROLE:
+        roles, package_ids, required = _build(menus_per_role)
+        # 位图在登录 / 缓存构建时预编译，不计入单次校验耗时
+        user_bits = 0
+        for role in roles:
+            user_bits |= PermissionIndex.role_mask(role)
+        package_perms = [menu.permission for role in roles for menu in role.menus if menu.id in package_ids]
+        tenant_bits = PermissionIndex.mask(package_perms)
+        required_bits = PermissionIndex.mask(required)
+
+        assert _legacy_check(roles, package_ids, required) == _bitset_check(user_bits, tenant_bits, required_bits)
+
+        legacy_call = partial(_legacy_check, roles, package_ids, required)
+        bitset_call = partial(_bitset_check, user_bits, tenant_bits, required_bits)
+        legacy = timeit.timeit(legacy_call, number=NUMBER) / NUMBER * 1e6
+        bitset = timeit.timeit(bitset_call, number=NUMBER) / NUMBER * 1e6
+        print(f"{menus_per_role:>10} {legacy:>12.2f} {bitset:>12.3f} {legacy / bitset:>8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from typing import Annotated
 
@@ -68,6 +69,12 @@ def run(
     )
     logger.info(worship(env.value))
 
+    # 多 worker 指标目录：清理上次运行遗留的计数
+    if settings.METRICS_MULTIPROC_DIR:
+        from app.core.metrics import reset_multiprocess_dir
+
+        reset_multiprocess_dir()
+
     # 启动uvicorn服务
     uvicorn.run(
         app="main:create_app",
@@ -131,5 +138,90 @@ def upgrade(
     typer.echo("所有迁移已应用。")
 
 
+@fastapiadmin_cli.command(
+    name="rebuild-dept-closure",
+    help="重建部门闭包表, 运行 python main.py rebuild-dept-closure --env=dev",
+)
+def rebuild_dept_closure(
+    env: Annotated[
+        EnvironmentEnum, typer.Option("--env", help="运行环境 (dev, prod)")
+    ] = EnvironmentEnum.DEV,
+) -> None:
+    """
+    按部门表全量重建 sys_dept_closure（数据修复或手工改动部门层级后使用）。
+
+    参数:
+    - env (EnvironmentEnum): 运行环境。
+
+    返回:
+    - None
+    """
+    os.environ["ENVIRONMENT"] = env.value
+    from app.config.setting import get_settings
+
+    get_settings.cache_clear()
+
+    async def _rebuild() -> int:
+        from app.api.v1.module_system.dept.service import DeptService
+        from app.core.database import async_db_session
+
+        async with async_db_session() as session:
+            async with session.begin():
+                return await DeptService.rebuild_closure(session)
+
+    rows = asyncio.run(_rebuild())
+    typer.echo(f"部门闭包表已重建, 共 {rows} 行。")
+
+
+@fastapiadmin_cli.command(
+    name="worker",
+    help="启动定时任务执行进程(需开启 TASK_QUEUE_ENABLE), 运行 python main.py worker --env=dev --processes=4",
+)
+def worker(
+    env: Annotated[
+        EnvironmentEnum, typer.Option("--env", help="运行环境 (dev, prod)")
+    ] = EnvironmentEnum.DEV,
+    processes: Annotated[int, typer.Option("--processes", help="执行进程数，建议不超过 CPU 核数")] = 1,
+    concurrency: Annotated[
+        int | None, typer.Option("--concurrency", help="每个进程并发执行的任务数，默认 TASK_QUEUE_CONCURRENCY")
+    ] = None,
+) -> None:
+    """
+    启动消费任务队列的执行进程；可在多台机器上分别启动，共同分担节点任务。
+
+    参数:
+    - env (EnvironmentEnum): 运行环境。
+    - processes (int): 本机启动的执行进程数。
+    - concurrency (int | None): 每个进程并发执行的任务数。
+
+    返回:
+    - None
+    """
+    os.environ["ENVIRONMENT"] = env.value
+    from app.config.setting import get_settings
+
+    get_settings.cache_clear()
+    from app.core.task_queue import worker_main
+
+    if processes <= 1:
+        worker_main(concurrency)
+        return
+
+    import multiprocessing
+
+    # spawn：子进程不继承父进程的事件循环与连接
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=worker_main, args=(concurrency,), daemon=True) for _ in range(processes)]
+    for process in workers:
+        process.start()
+    typer.echo(f"已启动 {processes} 个任务执行进程")
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+
+
 if __name__ == "__main__":
     fastapiadmin_cli()
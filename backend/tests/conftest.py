@@ -4,21 +4,24 @@ conftest — 模块化 API 接口测试共享 fixture。
 提供:
 - test_client: FastAPI TestClient 实例 (session 级复用)
 - assert_route: 验证接口路由存在 (status_code != 404)
+- query_db: 直接查询测试库，断言接口写入的数据
+- run_in_app: 在应用事件循环中执行协程（直接驱动写入器等后台组件）
 """
 
 import os
 import sys
 import tempfile
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import Any
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import pytest
 from fastapi.testclient import TestClient
+from redis.exceptions import ResponseError
 
 # ============================================================
 # 测试环境变量
@@ -41,8 +44,13 @@ settings.POOL_SIZE = 1
 settings.MAX_OVERFLOW = 1
 settings.CAPTCHA_ENABLE = False  # 测试环境关闭验证码
 
+from app.core import log_sink
+
+# 日志写入器的溢出文件写到临时目录（SQLite 锁表时会溢出），不写入 backend/logs
+log_sink.SPILL_DIR = Path(tempfile.mkdtemp(prefix="log-spill-"))
+
 # ============================================================
-# Mock Redis — dict 存储，支持 get/set/delete/exists/keys/ttl/expire
+# Mock Redis — dict 存储，支持 get/set/delete/exists/keys/scan/ttl/expire/集合/哈希/有序集合/pipeline
 # 登录成功后写入的 session 数据可在后续请求中正确读取
 # ============================================================
 
@@ -74,6 +82,35 @@ def _redis_keys(pattern: bytes | None = None) -> list[bytes]:
     return [k for k in _mock_redis_store if pattern == b"*" or k.startswith(pattern.replace(b"*", b""))]
 
 
+def _redis_scan(cursor: int = 0, match: bytes | None = None, count: int | None = None) -> tuple[int, list[bytes]]:
+    return 0, _redis_keys(match)
+
+
+_mock_redis_sets: dict[bytes, set] = {}
+
+
+def _redis_sadd(name: bytes, *values: bytes) -> int:
+    members = _mock_redis_sets.setdefault(name, set())
+    added = len(set(values) - members)
+    members.update(values)
+    return added
+
+
+def _redis_srem(name: bytes, *values: bytes) -> int:
+    members = _mock_redis_sets.get(name, set())
+    removed = len(members & set(values))
+    members.difference_update(values)
+    return removed
+
+
+def _redis_smembers(name: bytes) -> set:
+    return set(_mock_redis_sets.get(name, set()))
+
+
+def _redis_mget(*names: bytes) -> list[bytes | None]:
+    return [_mock_redis_store.get(n) for n in names]
+
+
 def _redis_exists(*names: bytes) -> int:
     return sum(1 for n in names if n in _mock_redis_store)
 
@@ -88,11 +125,17 @@ async def _redis_expire(name: bytes, time: int) -> bool:
 
 async def _redis_flushall( asynchronous: bool = False) -> bool:
     _mock_redis_store.clear()
+    _mock_redis_sets.clear()
+    _mock_redis_hashes.clear()
+    _mock_redis_zsets.clear()
     return True
 
 
 async def _redis_flushdb( asynchronous: bool = False) -> bool:
     _mock_redis_store.clear()
+    _mock_redis_sets.clear()
+    _mock_redis_hashes.clear()
+    _mock_redis_zsets.clear()
     return True
 
 
@@ -104,26 +147,91 @@ async def _redis_aclose() -> None:
     pass
 
 
+_mock_redis_hashes: dict[bytes, dict] = {}
+_mock_redis_zsets: dict[bytes, dict] = {}
+
+
 async def _redis_hmget(name: bytes, keys: list[bytes]) -> list[bytes | None]:
-    return [_mock_redis_store.get(name + b":" + k) for k in keys]
+    fields = _mock_redis_hashes.get(name, {})
+    return [fields.get(k) for k in keys]
+
+
+async def _redis_hget(name: bytes, key: bytes) -> bytes | None:
+    return _mock_redis_hashes.get(name, {}).get(key)
 
 
 async def _redis_hset(name: bytes, key: bytes, value: bytes) -> int:
-    _mock_redis_store[name + b":" + key] = value
-    return 1
+    fields = _mock_redis_hashes.setdefault(name, {})
+    added = int(key not in fields)
+    fields[key] = value
+    return added
 
 
 async def _redis_hgetall(name: bytes) -> dict[bytes, bytes]:
-    prefix = name + b":"
-    return {k[len(prefix):]: v for k, v in _mock_redis_store.items() if k.startswith(prefix)}
+    return dict(_mock_redis_hashes.get(name, {}))
 
 
 async def _redis_hdel(name: bytes, *keys: bytes) -> int:
-    count = 0
-    for k in keys:
-        if _mock_redis_store.pop(name + b":" + k, None) is not None:
-            count += 1
-    return count
+    fields = _mock_redis_hashes.get(name, {})
+    return sum(1 for k in keys if fields.pop(k, None) is not None)
+
+
+def _redis_zadd(name: bytes, mapping: dict, xx: bool = False) -> int:
+    members = _mock_redis_zsets.setdefault(name, {})
+    added = 0
+    for member, score in mapping.items():
+        if xx and member not in members:
+            continue
+        added += int(member not in members)
+        members[member] = score
+    return added
+
+
+def _redis_zrem(name: bytes, *members: bytes) -> int:
+    zset = _mock_redis_zsets.get(name, {})
+    return sum(1 for m in members if zset.pop(m, None) is not None)
+
+
+def _redis_zcard(name: bytes) -> int:
+    return len(_mock_redis_zsets.get(name, {}))
+
+
+def _zslice(name: bytes, start: int, end: int, reverse: bool) -> list:
+    ordered = sorted(_mock_redis_zsets.get(name, {}).items(), key=lambda item: item[1], reverse=reverse)
+    members = [m for m, _ in ordered]
+    return members[start:] if end == -1 else members[start : end + 1]
+
+
+def _redis_zrange(name: bytes, start: int, end: int) -> list:
+    return _zslice(name, start, end, reverse=False)
+
+
+def _redis_zrevrange(name: bytes, start: int, end: int) -> list:
+    return _zslice(name, start, end, reverse=True)
+
+
+def _redis_zrangebyscore(name: bytes, min: float | str, max: float | str) -> list:
+    low = float("-inf") if min == "-inf" else float(min)
+    high = float("inf") if max == "+inf" else float(max)
+    return [m for m, score in _mock_redis_zsets.get(name, {}).items() if low <= score <= high]
+
+
+class _MockPipeline:
+    """按顺序缓存命令，execute 时逐条调用 mock（不保证原子性，仅用于测试）"""
+
+    def __init__(self) -> None:
+        self._calls: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def _queue(*args, **kwargs) -> "_MockPipeline":
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    async def execute(self) -> list:
+        calls, self._calls = self._calls, []
+        return [await getattr(_mock_redis, name)(*args, **kwargs) for name, args, kwargs in calls]
 
 
 def _redis_info(section: str | None = None) -> dict:
@@ -139,7 +247,13 @@ _mock_redis.ping = AsyncMock(return_value=True)
 _mock_redis.get = AsyncMock(side_effect=_redis_get)
 _mock_redis.set = AsyncMock(side_effect=_redis_set)
 _mock_redis.delete = AsyncMock(side_effect=_redis_delete)
+_mock_redis.unlink = AsyncMock(side_effect=_redis_delete)
+_mock_redis.scan = AsyncMock(side_effect=_redis_scan)
+_mock_redis.sadd = AsyncMock(side_effect=_redis_sadd)
+_mock_redis.srem = AsyncMock(side_effect=_redis_srem)
+_mock_redis.smembers = AsyncMock(side_effect=_redis_smembers)
 _mock_redis.keys = AsyncMock(side_effect=_redis_keys)
+_mock_redis.mget = AsyncMock(side_effect=_redis_mget)
 _mock_redis.exists = AsyncMock(side_effect=_redis_exists)
 _mock_redis.ttl = AsyncMock(side_effect=_redis_ttl)
 _mock_redis.expire = AsyncMock(side_effect=_redis_expire)
@@ -148,11 +262,21 @@ _mock_redis.flushdb = AsyncMock(side_effect=_redis_flushdb)
 _mock_redis.close = AsyncMock(side_effect=_redis_close)
 _mock_redis.aclose = AsyncMock(side_effect=_redis_aclose)
 _mock_redis.hmget = AsyncMock(side_effect=_redis_hmget)
+_mock_redis.hget = AsyncMock(side_effect=_redis_hget)
 _mock_redis.hset = AsyncMock(side_effect=_redis_hset)
 _mock_redis.hgetall = AsyncMock(side_effect=_redis_hgetall)
 _mock_redis.hdel = AsyncMock(side_effect=_redis_hdel)
+_mock_redis.zadd = AsyncMock(side_effect=_redis_zadd)
+_mock_redis.zrem = AsyncMock(side_effect=_redis_zrem)
+_mock_redis.zcard = AsyncMock(side_effect=_redis_zcard)
+_mock_redis.zrange = AsyncMock(side_effect=_redis_zrange)
+_mock_redis.zrevrange = AsyncMock(side_effect=_redis_zrevrange)
+_mock_redis.zrangebyscore = AsyncMock(side_effect=_redis_zrangebyscore)
+_mock_redis.pipeline = MagicMock(side_effect=lambda transaction=True: _MockPipeline())
 _mock_redis.info = AsyncMock(side_effect=_redis_info)
 _mock_redis.dbsize = AsyncMock(side_effect=_redis_dbsize)
+# mock 不支持 Lua 脚本：RedisCURD 走逐条命令的降级路径
+_mock_redis.eval = AsyncMock(side_effect=ResponseError("unknown command 'eval'"))
 
 patch("redis.asyncio.Redis.from_url", return_value=_mock_redis).start()
 patch("app.init_app.FastAPILimiter.init", new=AsyncMock()).start()
@@ -284,3 +408,34 @@ def assert_route(
         assert response.status_code != 404, (
             f"{method} {path} 返回 404，路由未注册"
         )
+
+
+def query_db(sql: str, params: tuple | dict = ()) -> list[tuple]:
+    """直接查询测试 SQLite 库（断言接口写入的数据；写语句在退出时提交，用于准备数据）。
+
+    Args:
+        sql: SQL 语句。
+        params: 绑定参数。
+
+    Returns:
+        查询结果行。
+    """
+    import sqlite3
+
+    # 与 settings.DB_URI 一致：SQLite 库文件名为 DATABASE_NAME + ".db"
+    with sqlite3.connect(f"{_TEST_DB_PATH}.db") as conn:
+        return conn.execute(sql, params).fetchall()
+
+
+def run_in_app(test_client: TestClient, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+    """在应用事件循环中执行协程函数（与接口请求共享数据库引擎与连接池）。
+
+    Args:
+        test_client: FastAPI TestClient 实例。
+        func: 协程函数。
+        *args: 位置参数。
+
+    Returns:
+        协程返回值。
+    """
+    return test_client.portal.call(func, *args)
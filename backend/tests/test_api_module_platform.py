@@ -3,7 +3,9 @@
 认证数据测试：admin 登录后验证 CRUD 真实数据。
 """
 
-from conftest import assert_route  # noqa: F401
+import json
+
+from conftest import assert_route, query_db  # noqa: F401
 from fastapi.testclient import TestClient
 
 
@@ -282,6 +284,28 @@ class TestOrder:
     def test_order_detail(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "GET", "/platform/order/detail/1", auth=auth_headers)
 
+    def test_order_list_order_by(self, test_client: TestClient, auth_headers: dict) -> None:
+        """列表按客户端传入的排序返回（游标分页同样使用该排序）。"""
+        # 直接写入两条订单：创建时间与主键顺序相反，便于区分默认排序与请求的排序
+        for i, created in enumerate(("2000-01-02 00:00:00", "2000-01-01 00:00:00")):
+            query_db(
+                "INSERT INTO platform_order (uuid, order_no, order_type, amount, period_count, expire_time, status, "
+                "is_deleted, created_time, updated_time, tenant_id) "
+                "VALUES (?, ?, 'renew', 0, 1, ?, 2, 0, ?, ?, 1)",
+                (f"order-sort-{i}", f"SORT{i}", created, created, created),
+            )
+        ids: dict[str, list[int]] = {}
+        for direction in ("asc", "desc"):
+            params = {"page_size": 100, "order_by": json.dumps([{"id": direction}])}
+            ids[direction] = [o["id"] for o in test_client.get("/platform/order/list", headers=auth_headers, params=params).json()["data"]["items"]]
+            first = test_client.get(
+                "/platform/order/list", headers=auth_headers, params={**params, "cursor": "", "page_size": 1}
+            ).json()["data"]
+            assert [o["id"] for o in first["items"]] == ids[direction][:1]
+        assert len(ids["asc"]) >= 2
+        assert ids["asc"] == sorted(ids["asc"])
+        assert ids["desc"] == ids["asc"][::-1]
+
     def test_order_create(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(
             test_client, "POST", "/platform/order/create", auth=auth_headers,
@@ -3,8 +3,48 @@
 认证数据测试：admin 登录后验证 CRUD 真实数据。
 """
 
-from conftest import assert_route  # noqa: F401
+import csv
+import io
+import json
+
+import pytest
+from conftest import assert_route, query_db  # noqa: F401
 from fastapi.testclient import TestClient
+from openpyxl import load_workbook
+
+from app.api.v1.module_system.dict.service import DictDataService, DictTypeService
+from app.api.v1.module_system.notice.service import NoticeService
+from app.api.v1.module_system.params.service import ParamsService
+from app.api.v1.module_system.position.service import PositionService
+from app.api.v1.module_system.role.service import RoleService
+from app.api.v1.module_system.user.service import UserService
+
+EXPORT_FORMATS = ("xlsx", "csv")
+
+
+def read_export(
+    test_client: TestClient,
+    method: str,
+    path: str,
+    auth: dict,
+    file_format: str,
+    filename: str,
+    params: dict | None = None,
+) -> tuple[list[str], dict[str, dict[str, str]]]:
+    """调用导出接口并解析文件，返回 (表头, 编号 -> {表头: 单元格文本})。"""
+    resp = test_client.request(method, path, headers=auth, params={**(params or {}), "file_format": file_format})
+    assert resp.status_code == 200, f"{method} {path} 导出失败: {resp.text[:200]}"
+    assert resp.headers["content-disposition"] == f"attachment; filename={filename}.{file_format}"
+    if file_format == "csv":
+        assert resp.headers["content-type"].startswith("text/csv")
+        table = list(csv.reader(io.StringIO(resp.content.decode("utf-8-sig"))))
+    else:
+        assert resp.headers["content-type"].startswith("application/vnd.openxmlformats")
+        sheet = load_workbook(io.BytesIO(resp.content), read_only=True).active
+        table = [["" if cell is None else str(cell) for cell in row] for row in sheet.iter_rows(values_only=True)]
+    header, *rows = table
+    # xlsx 行尾的空单元格不会写出，按表头补齐
+    return header, {row[0]: dict(zip(header, row + [""] * (len(header) - len(row)), strict=True)) for row in rows}
 
 
 class TestAuth:
@@ -102,8 +142,21 @@ class TestUser:
     def test_user_import_template(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "GET", "/system/user/import/template", auth=auth_headers)
 
-    def test_user_export(self, test_client: TestClient, auth_headers: dict) -> None:
-        assert_route(test_client, "GET", "/system/user/export", auth=auth_headers)
+    @pytest.mark.parametrize("file_format", EXPORT_FORMATS)
+    def test_user_export(self, test_client: TestClient, auth_headers: dict, file_format: str) -> None:
+        # 性别取值 0=男 1=女
+        query_db("UPDATE sys_user SET gender = '1' WHERE username = 'super'")
+        try:
+            header, rows = read_export(test_client, "GET", "/system/user/export", auth_headers, file_format, "user")
+        finally:
+            query_db("UPDATE sys_user SET gender = '0' WHERE username = 'super'")
+        assert header == list(UserService.EXPORT_MAPPING.values())
+        super_row = next(row for row in rows.values() if row["用户名称"] == "super")
+        admin_row = next(row for row in rows.values() if row["用户名称"] == "admin")
+        assert (super_row["性别"], admin_row["性别"]) == ("女", "男")
+        assert admin_row["状态"] == "启用"
+        assert admin_row["是否超级管理员"] == "是"
+        assert admin_row["部门"]
 
     def test_user_import_data(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(
@@ -111,6 +164,55 @@ class TestUser:
             json={"list": []},
         )
 
+    def test_user_import_job(self, test_client: TestClient, auth_headers: dict) -> None:
+        assert_route(
+            test_client, "POST", "/system/user/import/job", auth=auth_headers,
+            json={"list": []},
+        )
+
+    def test_user_import_job_detail(self, test_client: TestClient, auth_headers: dict) -> None:
+        assert_route(test_client, "GET", "/system/user/import/job/unknown", auth=auth_headers)
+
+    def test_user_import_mixed_rows(self, test_client: TestClient, auth_headers: dict) -> None:
+        header = "部门编号,账号,昵称,邮箱,手机号,性别,状态\n"
+
+        def upload(*lines: str) -> str:
+            content = (header + "\n".join(lines) + "\n").encode()
+            resp = test_client.post(
+                "/system/user/import/data", headers=auth_headers,
+                files={"file": ("users.csv", content, "text/csv")},
+            ).json()
+            assert resp["success"], resp
+            return resp["data"]
+
+        upload("1,import_exist,导入已存在,,,男,正常")
+        # 回拨审计字段，验证批量更新时重新填充
+        query_db("UPDATE sys_user SET updated_time = '2000-01-01 00:00:00', updated_id = NULL WHERE username = 'import_exist'")
+
+        summary = upload(
+            "1,import_new,导入新增,new@example.com,,女,正常",
+            "1,import_exist,导入已更新,,,男,停用",
+            "99999,import_bad_dept,部门无效,,,男,正常",
+            "1,import_bad_mail,邮箱无效,not-an-email,,男,正常",
+        )
+        assert summary.startswith("成功导入 2 条数据")
+        assert "第4行: 部门编号 99999 不存在" in summary
+        assert "第5行: 邮箱地址格式不正确" in summary
+
+        rows = {
+            r[0]: r[1:]
+            for r in query_db(
+                "SELECT username, name, email, gender, status, updated_id, updated_time FROM sys_user "
+                "WHERE username LIKE 'import\\_%' ESCAPE '\\'"
+            )
+        }
+        assert set(rows) == {"import_new", "import_exist"}
+        assert rows["import_new"][:4] == ("导入新增", "new@example.com", "1", 0)
+        admin_id = query_db("SELECT id FROM sys_user WHERE username = 'admin'")[0][0]
+        name, _, _, status, updated_id, updated_time = rows["import_exist"]
+        assert (name, status, updated_id) == ("导入已更新", 1, admin_id)
+        assert not updated_time.startswith("2000")
+
     def test_user_current_info_update(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(
             test_client, "PUT", "/system/user/current/info/update", auth=auth_headers,
@@ -172,8 +274,17 @@ class TestRole:
     def test_role_delete(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "DELETE", "/system/role/delete", auth=auth_headers, json=[9999])
 
-    def test_role_export(self, test_client: TestClient, auth_headers: dict) -> None:
-        assert_route(test_client, "GET", "/system/role/export", auth=auth_headers)
+    @pytest.mark.parametrize("file_format", EXPORT_FORMATS)
+    def test_role_export(self, test_client: TestClient, auth_headers: dict, file_format: str) -> None:
+        header, rows = read_export(test_client, "GET", "/system/role/export", auth_headers, file_format, "role")
+        assert header == list(RoleService.EXPORT_MAPPING.values())
+        expected = query_db("SELECT id, name, status, data_scope FROM sys_role WHERE id IN (1, 2)")
+        scopes = {1: "仅本人数据权限", 2: "本部门数据权限", 3: "本部门及以下数据权限", 4: "全部数据权限", 5: "自定义数据权限"}
+        for role_id, name, status, data_scope in expected:
+            row = rows[str(role_id)]
+            assert row["角色名称"] == name
+            assert row["状态"] == ("启用" if status == 0 else "停用")
+            assert row["数据权限"] == scopes[data_scope]
 
     def test_role_permission(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(
@@ -219,6 +330,101 @@ class TestDept:
         )
 
 
+class TestDeptClosure:
+    """部门闭包表 — 新增 / 移动 / 部分更新 / 删除后的祖先行。"""
+
+    _seq = 0
+
+    def _create(self, client: TestClient, auth: dict, parent_id: int | None = None) -> int:
+        TestDeptClosure._seq += 1
+        resp = client.post(
+            "/system/dept/create", headers=auth,
+            json={"name": f"闭包测试{self._seq}", "code": f"closure_{self._seq}", "parent_id": parent_id},
+        )
+        assert resp.json()["success"], resp.text
+        return resp.json()["data"]["id"]
+
+    def _update(self, client: TestClient, auth: dict, id: int, **fields) -> dict:
+        detail = client.get(f"/system/dept/detail/{id}", headers=auth).json()["data"]
+        body = {"name": detail["name"], "code": detail["code"], **fields}
+        return client.put(f"/system/dept/update/{id}", headers=auth, json=body).json()
+
+    @staticmethod
+    def _ancestors(id: int) -> dict[int, int]:
+        rows = query_db("SELECT ancestor_id, depth FROM sys_dept_closure WHERE descendant_id = ?", (id,))
+        return dict(rows)
+
+    def test_dept_closure_move(self, test_client: TestClient, auth_headers: dict) -> None:
+        a = self._create(test_client, auth_headers)
+        b = self._create(test_client, auth_headers, a)
+        c = self._create(test_client, auth_headers, b)
+        d = self._create(test_client, auth_headers)
+        assert self._ancestors(c) == {c: 0, b: 1, a: 2}
+
+        # 移到根节点：整棵子树与原祖先断开
+        assert self._update(test_client, auth_headers, b, parent_id=None)["success"]
+        assert self._ancestors(b) == {b: 0}
+        assert self._ancestors(c) == {c: 0, b: 1}
+
+        # 再挂到另一棵树下：子树与新祖先重新连接
+        assert self._update(test_client, auth_headers, b, parent_id=d)["success"]
+        assert self._ancestors(b) == {b: 0, d: 1}
+        assert self._ancestors(c) == {c: 0, b: 1, d: 2}
+        assert query_db("SELECT COUNT(*) FROM sys_dept_closure WHERE ancestor_id = ?", (a,)) == [(1,)]
+
+    def test_dept_closure_rejects_cycle(self, test_client: TestClient, auth_headers: dict) -> None:
+        a = self._create(test_client, auth_headers)
+        b = self._create(test_client, auth_headers, a)
+        c = self._create(test_client, auth_headers, b)
+
+        for parent_id in (a, c):
+            result = self._update(test_client, auth_headers, a, parent_id=parent_id)
+            assert not result["success"]
+            assert "子部门" in result["msg"]
+        assert self._ancestors(a) == {a: 0}
+        assert self._ancestors(c) == {c: 0, b: 1, a: 2}
+
+    def test_dept_closure_partial_update(self, test_client: TestClient, auth_headers: dict) -> None:
+        a = self._create(test_client, auth_headers)
+        b = self._create(test_client, auth_headers, a)
+        c = self._create(test_client, auth_headers, b)
+
+        # 未传 parent_id 的更新（改排序 / 名称）不移动节点
+        assert self._update(test_client, auth_headers, b, order=9)["success"]
+        assert query_db("SELECT parent_id, \"order\" FROM sys_dept WHERE id = ?", (b,)) == [(a, 9)]
+        assert self._ancestors(b) == {b: 0, a: 1}
+        assert self._ancestors(c) == {c: 0, b: 1, a: 2}
+
+    def test_dept_tree_refreshes_after_commit(self, test_client: TestClient, auth_headers: dict) -> None:
+        def tree_ids() -> set[int]:
+            ids: set[int] = set()
+            stack = list(test_client.get("/system/dept/tree", headers=auth_headers).json()["data"])
+            while stack:
+                node = stack.pop()
+                ids.add(node["id"])
+                stack.extend(node.get("children") or [])
+            return ids
+
+        before = tree_ids()
+        a = self._create(test_client, auth_headers)
+        assert a not in before
+        assert a in tree_ids()
+
+    def test_dept_closure_delete(self, test_client: TestClient, auth_headers: dict) -> None:
+        a = self._create(test_client, auth_headers)
+        b = self._create(test_client, auth_headers, a)
+
+        result = test_client.request("DELETE", "/system/dept/delete", headers=auth_headers, json=[a]).json()
+        assert not result["success"]
+        assert self._ancestors(b) == {b: 0, a: 1}
+
+        assert test_client.request("DELETE", "/system/dept/delete", headers=auth_headers, json=[b]).json()["success"]
+        assert query_db(
+            "SELECT COUNT(*) FROM sys_dept_closure WHERE descendant_id = ? OR ancestor_id = ?", (b, b)
+        ) == [(0,)]
+        assert self._ancestors(a) == {a: 0}
+
+
 class TestPosition:
     """岗位管理接口 — 数据验证。"""
 
@@ -243,8 +449,15 @@ class TestPosition:
     def test_position_delete(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "DELETE", "/system/position/delete", auth=auth_headers, json=[9999])
 
-    def test_position_export(self, test_client: TestClient, auth_headers: dict) -> None:
-        assert_route(test_client, "GET", "/system/position/export", auth=auth_headers)
+    @pytest.mark.parametrize("file_format", EXPORT_FORMATS)
+    def test_position_export(self, test_client: TestClient, auth_headers: dict, file_format: str) -> None:
+        header, rows = read_export(test_client, "GET", "/system/position/export", auth_headers, file_format, "position")
+        assert header == list(PositionService.EXPORT_MAPPING.values())
+        expected = query_db("SELECT id, name, status FROM sys_position WHERE is_deleted = 0 AND tenant_id = 1")
+        assert expected
+        for position_id, name, status in expected:
+            assert rows[str(position_id)]["岗位名称"] == name
+            assert rows[str(position_id)]["状态"] == ("启用" if status == 0 else "停用")
 
     def test_position_status_batch(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(
@@ -298,8 +511,18 @@ class TestDict:
     def test_dict_data_delete(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "DELETE", "/system/dict/data/delete", auth=auth_headers, json=[9999])
 
-    def test_dict_data_export(self, test_client: TestClient, auth_headers: dict) -> None:
-        assert_route(test_client, "POST", "/system/dict/data/export", auth=auth_headers)
+    @pytest.mark.parametrize("file_format", EXPORT_FORMATS)
+    def test_dict_data_export(self, test_client: TestClient, auth_headers: dict, file_format: str) -> None:
+        header, rows = read_export(
+            test_client, "POST", "/system/dict/data/export", auth_headers, file_format, "dict_data",
+            params={"dict_type": "sys_user_sex"},
+        )
+        assert header == list(DictDataService.EXPORT_MAPPING.values())
+        expected = query_db(
+            "SELECT id, dict_label, dict_value FROM sys_dict_data "
+            "WHERE dict_type = 'sys_user_sex' AND is_deleted = 0 AND tenant_id = 1"
+        )
+        assert sorted((int(k), r["字典标签"], r["字典键值"]) for k, r in rows.items()) == sorted(expected)
 
     def test_dict_data_status_batch(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(
@@ -307,8 +530,16 @@ class TestDict:
             json={"ids": [1], "status": 1},
         )
 
-    def test_dict_type_export(self, test_client: TestClient, auth_headers: dict) -> None:
-        assert_route(test_client, "POST", "/system/dict/type/export", auth=auth_headers)
+    @pytest.mark.parametrize("file_format", EXPORT_FORMATS)
+    def test_dict_type_export(self, test_client: TestClient, auth_headers: dict, file_format: str) -> None:
+        header, rows = read_export(test_client, "POST", "/system/dict/type/export", auth_headers, file_format, "dict_type")
+        assert header == list(DictTypeService.EXPORT_MAPPING.values())
+        ((type_id, dict_name, status),) = query_db(
+            "SELECT id, dict_name, status FROM sys_dict_type WHERE dict_type = 'sys_user_sex' AND tenant_id = 1"
+        )
+        assert rows[str(type_id)]["字典类型"] == "sys_user_sex"
+        assert rows[str(type_id)]["字典名称"] == dict_name
+        assert rows[str(type_id)]["状态"] == ("启用" if status == 0 else "停用")
 
     def test_dict_type_optionselect(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "GET", "/system/dict/type/optionselect", auth=auth_headers)
@@ -329,6 +560,69 @@ class TestNotice:
     def test_notice_detail(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "GET", "/system/notice/detail/1", auth=auth_headers)
 
+    def test_notice_cursor_list(self, test_client: TestClient, auth_headers: dict) -> None:
+        """游标分页逐页结果应与页码分页一致。"""
+        for i in range(3):
+            test_client.post(
+                "/system/notice/create", headers=auth_headers,
+                json={"notice_title": f"游标分页公告{i}", "notice_type": "1", "notice_content": "内容", "status": 0},
+            )
+        path = "/system/notice/list"
+        offset_ids = [
+            item["id"]
+            for page_no in (1, 2)
+            for item in test_client.get(path, headers=auth_headers, params={"page_no": page_no, "page_size": 2}).json()["data"]["items"]
+        ]
+        first = test_client.get(path, headers=auth_headers, params={"cursor": "", "page_size": 2, "count": "none"}).json()["data"]
+        assert first["total"] is None
+        assert first["page_no"] is None
+        assert first["next_cursor"]
+        second = test_client.get(path, headers=auth_headers, params={"cursor": first["next_cursor"], "page_size": 2}).json()["data"]
+        cursor_ids = [item["id"] for item in first["items"] + second["items"]]
+        assert len(cursor_ids) >= 3
+        assert cursor_ids == offset_ids
+
+    def test_notice_cursor_nullable_order(self, test_client: TestClient, auth_headers: dict) -> None:
+        """按可空列游标分页时不跳过 NULL 行（NULL 视为最大值）。"""
+        for i, description in enumerate(["b", None, "a", None, "c"]):
+            test_client.post(
+                "/system/notice/create", headers=auth_headers,
+                json={"notice_title": f"空值游标{i}", "notice_type": "1", "status": 0, "description": description},
+            )
+        path = "/system/notice/list"
+        for direction in ("asc", "desc"):
+            params = {"notice_title": "空值游标", "page_size": 2, "order_by": json.dumps([{"description": direction}])}
+            cursor, seen = "", []
+            while cursor is not None:
+                data = test_client.get(path, headers=auth_headers, params={**params, "cursor": cursor}).json()["data"]
+                seen += [item["description"] for item in data["items"]]
+                cursor = data["next_cursor"]
+            values = ["a", "b", "c", None, None]
+            assert seen == (values if direction == "asc" else values[::-1])
+
+    def test_notice_estimate_count_respects_filters(
+        self, test_client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """count=estimate 仅在无筛选条件时使用表级估算，带筛选时回退精确统计。"""
+        from app.core.base_crud import CRUDBase
+
+        async def estimate(self: CRUDBase) -> int:
+            return 1_000_000
+
+        monkeypatch.setattr(CRUDBase, "_estimate_rows", estimate)
+        for i in range(2):
+            test_client.post(
+                "/system/notice/create", headers=auth_headers,
+                json={"notice_title": f"估算统计{i}", "notice_type": "1", "status": 0},
+            )
+        path = "/system/notice/list"
+        filtered = test_client.get(
+            path, headers=auth_headers, params={"notice_title": "估算统计", "count": "estimate"}
+        ).json()["data"]
+        assert filtered["total"] == 2
+        unfiltered = test_client.get(path, headers=auth_headers, params={"count": "estimate"}).json()["data"]
+        assert unfiltered["total"] == 1_000_000
+
     def test_notice_create(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(
             test_client, "POST", "/system/notice/create", auth=auth_headers,
@@ -350,8 +644,23 @@ class TestNotice:
     def test_notice_available(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "GET", "/system/notice/available", auth=auth_headers)
 
-    def test_notice_export(self, test_client: TestClient, auth_headers: dict) -> None:
-        assert_route(test_client, "POST", "/system/notice/export", auth=auth_headers)
+    @pytest.mark.parametrize("file_format", EXPORT_FORMATS)
+    def test_notice_export(self, test_client: TestClient, auth_headers: dict, file_format: str) -> None:
+        title = f"导出公告-{file_format}"
+        for notice_type, status in (("1", 0), ("2", 1)):
+            test_client.post(
+                "/system/notice/create", headers=auth_headers,
+                json={"notice_title": f"{title}-{notice_type}", "notice_type": notice_type, "notice_content": "正文", "status": status},
+            )
+        header, rows = read_export(
+            test_client, "POST", "/system/notice/export", auth_headers, file_format, "notice",
+            params={"notice_title": title},
+        )
+        assert header == list(NoticeService.EXPORT_MAPPING.values())
+        assert sorted((r["公告标题"], r["公告类型（1通知 2公告）"], r["状态"]) for r in rows.values()) == [
+            (f"{title}-1", "通知", "启用"),
+            (f"{title}-2", "公告", "停用"),
+        ]
 
     def test_notice_panel(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "GET", "/system/notice/panel", auth=auth_headers)
@@ -393,8 +702,19 @@ class TestParams:
     def test_params_detail(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "GET", "/system/param/detail/1", auth=auth_headers)
 
-    def test_params_export(self, test_client: TestClient, auth_headers: dict) -> None:
-        assert_route(test_client, "GET", "/system/param/export", auth=auth_headers)
+    @pytest.mark.parametrize("file_format", EXPORT_FORMATS)
+    def test_params_export(self, test_client: TestClient, auth_headers: dict, file_format: str) -> None:
+        header, rows = read_export(
+            test_client, "GET", "/system/param/export", auth_headers, file_format, "params",
+            params={"config_key": "demo_enable"},
+        )
+        assert header == list(ParamsService.EXPORT_MAPPING.values())
+        ((param_id, config_value, config_type),) = query_db(
+            "SELECT id, config_value, config_type FROM sys_param WHERE config_key = 'demo_enable' AND tenant_id = 1"
+        )
+        assert list(rows) == [str(param_id)]
+        assert rows[str(param_id)]["参数键值"] == config_value
+        assert rows[str(param_id)]["系统内置((True:是 False:否))"] == ("是" if config_type else "否")
 
     def test_params_info(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "GET", "/system/param/info", auth=auth_headers)
@@ -427,6 +747,10 @@ class TestLog:
     def test_operation_log_detail(self, test_client: TestClient, auth_headers: dict) -> None:
         assert_route(test_client, "GET", "/system/log/operation/detail/1", auth=auth_headers)
 
+    def test_login_log_invalid_cursor(self, test_client: TestClient, auth_headers: dict) -> None:
+        response = test_client.get("/system/log/login/list", headers=auth_headers, params={"cursor": "bad"})
+        assert response.json()["code"] != 0
+
 
 class TestTicket:
     """工单管理接口 — 数据验证。"""
@@ -7,7 +7,11 @@
 每个接口一个测试用例，覆盖查询 / 新增 / 修改 / 删除 等操作。
 """
 
-from conftest import assert_route
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from conftest import assert_route, query_db
 from fastapi.testclient import TestClient
 
 # ============================================================
@@ -170,6 +174,115 @@ class TestWorkflowDefinition:
             json={"definition_id": 1, "input_data": {}},
         )
 
+    def test_workflow_execute_stream(self, test_client: TestClient) -> None:
+        assert_route(
+            test_client,
+            "POST",
+            "/task/workflow/definition/execute/stream",
+            json={"workflow_id": 9999},
+        )
+
+    def test_workflow_run_list(self, test_client: TestClient) -> None:
+        assert_route(test_client, "GET", "/task/workflow/run/list")
+
+    def test_workflow_run_resume(self, test_client: TestClient) -> None:
+        assert_route(test_client, "POST", "/task/workflow/run/resume/9999", json={})
+
+    def test_workflow_run_resume_reexecutes_changed_nodes(self, test_client: TestClient, auth_headers: dict) -> None:
+        echo = "def handler(*args, **kwargs):\n    return list(args)\n"
+        fail = "def handler(*args, **kwargs):\n    raise RuntimeError('boom')\n"
+
+        def node_type(code: str, func: str) -> int:
+            resp = test_client.post(
+                "/task/workflow/node-type/create", headers=auth_headers,
+                json={"name": code, "code": code, "func": func},
+            ).json()
+            assert resp["success"], resp
+            return resp["data"]["id"]
+
+        def save(workflow_id: int | None, n1_args: str) -> int:
+            body = {
+                "name": "续跑测试",
+                "code": "resume_test",
+                "nodes": [
+                    {"id": "n0", "type": "resume_echo", "data": {"args": "x"}},
+                    {"id": "n1", "type": "resume_echo", "data": {"args": n1_args}},
+                    {"id": "n2", "type": "resume_last", "data": {}},
+                ],
+                "edges": [{"source": "n0", "target": "n1"}, {"source": "n1", "target": "n2"}],
+            }
+            if workflow_id is None:
+                resp = test_client.post("/task/workflow/definition/create", headers=auth_headers, json=body).json()
+            else:
+                resp = test_client.put(
+                    f"/task/workflow/definition/update/{workflow_id}", headers=auth_headers, json=body
+                ).json()
+            assert resp["success"], resp
+            workflow_id = resp["data"]["id"]
+            assert test_client.post(f"/task/workflow/definition/publish/{workflow_id}", headers=auth_headers).json()["success"]
+            return workflow_id
+
+        def node_status(run_id: int) -> dict[str, int]:
+            return dict(query_db("SELECT node_id, status FROM task_workflow_run_node WHERE run_id = ?", (run_id,)))
+
+        node_type("resume_echo", echo)
+        last_id = node_type("resume_last", fail)
+        workflow_id = save(None, "a")
+        resp = test_client.post(
+            "/task/workflow/definition/execute", headers=auth_headers, json={"workflow_id": workflow_id}
+        ).json()
+        assert resp["success"], resp
+        failed = resp["data"]
+        assert failed["status"] == 0
+        assert node_status(failed["run_id"]) == {"n0": 1, "n1": 1, "n2": 0}
+
+        # n1 参数变化、n2 代码修复后续跑：n0 沿用（2），n1 / n2 按当前定义重新执行（1）
+        save(workflow_id, "b")
+        resp = test_client.put(
+            f"/task/workflow/node-type/update/{last_id}", headers=auth_headers,
+            json={"name": "resume_last", "code": "resume_last", "func": echo},
+        ).json()
+        assert resp["success"], resp
+        resp = test_client.post(f"/task/workflow/run/resume/{failed['run_id']}", headers=auth_headers, json={}).json()
+        assert resp["success"], resp
+        resumed = resp["data"]
+        assert resumed["status"] == 1
+        assert node_status(resumed["run_id"]) == {"n0": 2, "n1": 1, "n2": 1}
+        assert resumed["node_results"]["n1"] == ["b"]
+
+    def test_workflow_node_timeout_excludes_queue_wait(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        from app.plugin.module_task.workflow.handlers import workflow_engine
+
+        # 单线程池下三个并行节点排队执行：每个耗时 0.3s < 超时 0.5s，但第三个要排队约 0.6s
+        executor = ThreadPoolExecutor(max_workers=1)
+        monkeypatch.setattr(workflow_engine, "_EXECUTOR", executor)
+        sleep = "import time\ndef handler(*args, **kwargs):\n    time.sleep(0.3)\n    return 1\n"
+        nodes = [{"id": f"n{i}", "type": "sleep", "data": {"timeout": 0.5}} for i in range(3)]
+        events: list[dict] = []
+
+        async def on_event(event: dict) -> None:
+            events.append(event)
+
+        try:
+            result = asyncio.run(
+                workflow_engine.run_workflow(nodes, [], {"sleep": {"func": sleep}}, {}, on_event=on_event)
+            )
+        finally:
+            executor.shutdown()
+        assert result["node_results"] == {"n0": 1, "n1": 1, "n2": 1}
+        # 耗时从线程真正开始执行时算起，不含排队时间
+        finished = [e for e in events if e["event"] == "node_finished"]
+        assert len(finished) == 3
+        assert all(e["elapsed"] < 0.5 for e in finished)
+
+    def test_workflow_run_permissions_seeded(self, test_client: TestClient) -> None:
+        rows = query_db("SELECT permission FROM platform_menu WHERE permission LIKE 'module_task:workflow:run:%'")
+        assert {r[0] for r in rows} == {
+            "module_task:workflow:run:query",
+            "module_task:workflow:run:detail",
+            "module_task:workflow:run:delete",
+        }
+
 
 class TestWorkflowNodeType:
     """工作流节点类型接口。"""
@@ -0,0 +1,62 @@
+"""
+核心组件测试 —— 接口权限校验（app.core.dependencies.AuthPermission）
+
+租户用户的权限位图是「启用角色的菜单权限」与「租户套餐内菜单权限」的交集：
+角色拥有但套餐未包含的权限必须拒绝。
+"""
+
+from collections.abc import Iterator
+
+import pytest
+from conftest import query_db
+from fastapi.testclient import TestClient
+
+from app.core import dependencies, login_audit
+
+TENANT_ID = 2
+IN_PACKAGE = ("module_system:position:query", "/system/position/list")
+NOT_IN_PACKAGE = ("module_system:notice:query", "/system/notice/list")
+
+
+def button_id(permission: str) -> int:
+    ((found,),) = query_db("SELECT id FROM platform_menu WHERE permission = ? AND type = 3", (permission,))
+    return found
+
+
+async def _skip_login_log(*args: object, **kwargs: object) -> None:
+    return None
+
+
+@pytest.fixture
+def tenant_member(test_client: TestClient, monkeypatch: pytest.MonkeyPatch) -> Iterator[dict[str, str]]:
+    """测试租户下的普通用户：角色同时拥有两个查询权限，租户套餐只包含其中一个"""
+    ((user_id, password),) = query_db("SELECT id, password FROM sys_user WHERE username = 'test_user'")
+    ((role_id,),) = query_db("SELECT role_id FROM sys_user_roles WHERE user_id = ?", (user_id,))
+    ((package_id,),) = query_db("SELECT package_id FROM platform_tenant WHERE id = ?", (TENANT_ID,))
+    in_package, not_in_package = button_id(IN_PACKAGE[0]), button_id(NOT_IN_PACKAGE[0])
+
+    query_db("UPDATE sys_user SET password = (SELECT password FROM sys_user WHERE username = 'admin') WHERE id = ?", (user_id,))
+    query_db("INSERT INTO sys_role_menus (role_id, menu_id) VALUES (?, ?), (?, ?)", (role_id, in_package, role_id, not_in_package))
+    query_db("INSERT INTO platform_package_menu (package_id, menu_id) VALUES (?, ?)", (package_id, in_package))
+    dependencies.clear_package_menu_cache(TENANT_ID)
+    # 登录日志与本用例无关，跳过其写入（未启动管道时会与登录事务争用 SQLite 写锁）
+    monkeypatch.setattr(login_audit, "record", _skip_login_log)
+    try:
+        resp = test_client.post("/system/auth/login", data={"username": "test_user", "password": "admin123"})
+        yield {"Authorization": f"Bearer {resp.json()['data']['access_token']}"}
+    finally:
+        query_db("DELETE FROM platform_package_menu WHERE package_id = ? AND menu_id = ?", (package_id, in_package))
+        query_db(
+            "DELETE FROM sys_role_menus WHERE role_id = ? AND menu_id IN (?, ?)", (role_id, in_package, not_in_package)
+        )
+        query_db("UPDATE sys_user SET password = ? WHERE id = ?", (password, user_id))
+        dependencies.clear_package_menu_cache(TENANT_ID)
+
+
+def test_role_permission_outside_tenant_package_is_denied(test_client: TestClient, tenant_member: dict) -> None:
+    allowed = test_client.get(IN_PACKAGE[1], headers=tenant_member).json()
+    assert allowed["success"], allowed
+
+    denied = test_client.get(NOT_IN_PACKAGE[1], headers=tenant_member).json()
+    assert not denied["success"]
+    assert denied["code"] == 10403
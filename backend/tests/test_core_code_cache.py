@@ -0,0 +1,83 @@
+"""
+核心组件测试 —— 任务代码块编译缓存（app.core.code_cache）
+"""
+
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config.setting import settings
+from app.core import code_cache
+
+
+def source(tag: str) -> str:
+    return f"def handler(*args, **kwargs):\n    return {tag!r}\n"
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache() -> Iterator[None]:
+    code_cache._CODES.clear()
+    yield
+    code_cache._CODES.clear()
+
+
+def test_hit_returns_same_code_without_compiling() -> None:
+    before = code_cache.stats()
+    code, elapsed = code_cache.get_code(source("a"))
+    assert elapsed > 0
+    again, elapsed = code_cache.get_code(source("a"))
+    assert again is code
+    assert elapsed == 0.0
+
+    after = code_cache.stats()
+    assert after["size"] == 1
+    assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (1, 1)
+
+    # 每次执行使用新的命名空间，缓存的只是 code 对象
+    namespace: dict = {}
+    exec(code, namespace)
+    assert namespace["handler"]() == "a"
+
+
+def test_lru_eviction(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "TASK_CODE_CACHE_SIZE", 2)
+    evictions = code_cache.stats()["evictions"]
+    code_a, _ = code_cache.get_code(source("a"))
+    code_cache.get_code(source("b"))
+    code_cache.get_code(source("a"))
+    # 超出容量淘汰最久未使用的 b
+    code_cache.get_code(source("c"))
+
+    assert code_cache.stats()["evictions"] == evictions + 1
+    assert code_cache._key(source("b")) not in code_cache._CODES
+    assert code_cache.get_code(source("a")) == (code_a, 0.0)
+    assert code_cache.get_code(source("b"))[1] > 0
+
+
+def test_invalidate() -> None:
+    code_cache.get_code(source("a"))
+    code_cache.get_code(source("b"))
+    code_cache.invalidate(source("a"))
+    assert list(code_cache._CODES) == [code_cache._key(source("b"))]
+    code_cache.invalidate()
+    assert not code_cache._CODES
+
+
+def test_node_update_invalidates_old_source(test_client: TestClient, auth_headers: dict) -> None:
+    old, new = source("node-old"), source("node-new")
+    node = {"name": "编译缓存节点", "code": "code_cache_node", "func": old}
+    node_id = test_client.post("/task/cronjob/node/create", headers=auth_headers, json=node).json()["data"]["id"]
+    code_cache.get_code(old)
+    code_cache.get_code(source("unrelated"))
+
+    # 未修改代码块不影响缓存
+    resp = test_client.put(f"/task/cronjob/node/update/{node_id}", headers=auth_headers, json={**node, "name": "编译缓存节点1"})
+    assert resp.json()["success"], resp.text
+    assert code_cache._key(old) in code_cache._CODES
+
+    # 修改代码块后丢弃旧源码的编译结果
+    resp = test_client.put(f"/task/cronjob/node/update/{node_id}", headers=auth_headers, json={**node, "func": new})
+    assert resp.json()["success"], resp.text
+    assert code_cache._key(old) not in code_cache._CODES
+    assert code_cache._key(source("unrelated")) in code_cache._CODES
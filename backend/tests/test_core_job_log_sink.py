@@ -0,0 +1,171 @@
+"""
+核心组件测试 —— 定时任务执行日志写入器（app.core.job_log_sink）
+
+以合成的 APScheduler 事件驱动 ``_apply`` / ``_flush``，断言 task_job 表中的日志行。
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import pytest
+from apscheduler.events import (
+    EVENT_ALL_JOBS_REMOVED,
+    EVENT_JOB_ADDED,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_SUBMITTED,
+    JobEvent,
+    JobExecutionEvent,
+    JobSubmissionEvent,
+    SchedulerEvent,
+)
+from apscheduler.triggers.interval import IntervalTrigger
+from conftest import query_db, run_in_app
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core import job_log_sink
+from app.core.database import async_engine
+from app.core.job_log_sink import JobMeta
+
+RUN_TIME = datetime(2026, 1, 1, 8, 0, tzinfo=UTC)
+
+
+@pytest.fixture(autouse=True)
+def _reset_sink() -> Iterator[None]:
+    """每个用例使用干净的内存状态"""
+    state = (
+        job_log_sink._META, job_log_sink._PENDING, job_log_sink._RUNNING,
+        job_log_sink._EARLY, job_log_sink._DIRTY, job_log_sink._OPS,
+    )
+    for item in state:
+        item.clear()
+    yield
+    for item in state:
+        item.clear()
+
+
+@contextmanager
+def count_inserts() -> Iterator[list[str]]:
+    """收集执行期间写入 task_job 的 INSERT 语句"""
+    statements: list[str] = []
+
+    def listener(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        if statement.lstrip().upper().startswith("INSERT INTO TASK_JOB"):
+            statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+
+
+def rows(log_job_id: str) -> list[tuple]:
+    return query_db(
+        "SELECT status, result, error, next_run_time FROM task_job WHERE job_id = ? ORDER BY id", (log_job_id,)
+    )
+
+
+def submitted(job_id: str, run_time: datetime = RUN_TIME) -> JobSubmissionEvent:
+    return JobSubmissionEvent(EVENT_JOB_SUBMITTED, job_id, "default", [run_time])
+
+
+def executed(job_id: str, retval: str = "ok", run_time: datetime = RUN_TIME) -> JobExecutionEvent:
+    return JobExecutionEvent(EVENT_JOB_EXECUTED, job_id, "default", run_time, retval=retval)
+
+
+def interval_meta(log_job_id: str) -> JobMeta:
+    return JobMeta(log_job_id=log_job_id, name="周期任务", trigger_type="interval", trigger=IntervalTrigger(minutes=5, timezone=UTC))
+
+
+def test_submit_and_execute_coalesce_into_one_insert(test_client: TestClient) -> None:
+    job_log_sink.remember("sink-once", JobMeta(log_job_id="log-once", name="一次性任务", trigger_type="date"))
+    job_log_sink._apply(submitted("sink-once"))
+    job_log_sink._apply(executed("sink-once", retval="done"))
+
+    with count_inserts() as inserts:
+        run_in_app(test_client, job_log_sink._flush)
+
+    assert len(inserts) == 1
+    assert rows("log-once") == [(job_log_sink.JOB_STATUS_SUCCESS, "done", None, None)]
+    # 一次性任务执行完后不再保留登记信息
+    assert "sink-once" not in job_log_sink._META
+
+
+def test_completion_before_submit(test_client: TestClient) -> None:
+    job_log_sink.remember("sink-early", JobMeta(log_job_id="log-early", name="短任务", trigger_type="date"))
+    job_log_sink._apply(executed("sink-early", retval="fast"))
+    assert ("sink-early", RUN_TIME) in job_log_sink._EARLY
+
+    job_log_sink._apply(submitted("sink-early"))
+    assert not job_log_sink._EARLY
+    assert not job_log_sink._RUNNING
+    run_in_app(test_client, job_log_sink._flush)
+    assert rows("log-early") == [(job_log_sink.JOB_STATUS_SUCCESS, "fast", None, None)]
+
+    # 一直未等到提交事件：写入前按无提交记录处理
+    job_log_sink.remember("sink-orphan", JobMeta(log_job_id="log-orphan", name="短任务", trigger_type="date"))
+    job_log_sink._apply(executed("sink-orphan", retval="alone"))
+    run_in_app(test_client, job_log_sink._flush)
+    assert rows("log-orphan") == [(job_log_sink.JOB_STATUS_SUCCESS, "alone", None, None)]
+
+
+def test_periodic_job_reuses_pending_row_and_schedules_next(test_client: TestClient) -> None:
+    job_log_sink.remember("sink-periodic", interval_meta("log-periodic"))
+    job_log_sink._apply(JobEvent(EVENT_JOB_ADDED, "sink-periodic", "default"))
+    run_in_app(test_client, job_log_sink._flush)
+    assert [r[0] for r in rows("log-periodic")] == [job_log_sink.JOB_STATUS_PENDING]
+
+    # pending 行在提交时转为执行中、完成后为成功，并为下一次执行新建 pending 行
+    job_log_sink._apply(submitted("sink-periodic"))
+    job_log_sink._apply(executed("sink-periodic"))
+    with count_inserts() as inserts:
+        run_in_app(test_client, job_log_sink._flush)
+
+    assert len(inserts) == 1
+    (done_status, *_), (next_status, _, _, next_run_time) = rows("log-periodic")
+    assert done_status == job_log_sink.JOB_STATUS_SUCCESS
+    assert next_status == job_log_sink.JOB_STATUS_PENDING
+    assert next_run_time == str(RUN_TIME + timedelta(minutes=5))
+    assert job_log_sink._PENDING["sink-periodic"].row_id is not None
+
+
+def test_all_jobs_removed_cancels_pending_rows(test_client: TestClient) -> None:
+    # 数据库中遗留的 pending 日志（例如上次运行留下的）
+    query_db(
+        "INSERT INTO task_job (uuid, job_id, status, is_deleted, created_time, updated_time, tenant_id) "
+        "VALUES ('sink-stale', 'log-stale', 0, 0, '2026-01-01 00:00:00', '2026-01-01 00:00:00', 1)"
+    )
+    job_log_sink.remember("sink-removed", interval_meta("log-removed"))
+    job_log_sink._apply(JobEvent(EVENT_JOB_ADDED, "sink-removed", "default"))
+    run_in_app(test_client, job_log_sink._flush)
+
+    job_log_sink._apply(SchedulerEvent(EVENT_ALL_JOBS_REMOVED))
+    assert not job_log_sink._PENDING
+    run_in_app(test_client, job_log_sink._flush)
+
+    assert [r[0] for r in rows("log-removed")] == [job_log_sink.JOB_STATUS_CANCELLED]
+    assert [r[0] for r in rows("log-stale")] == [job_log_sink.JOB_STATUS_CANCELLED]
+
+
+def test_failed_flush_requeues_dirty_rows(test_client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    def broken_session() -> None:
+        raise RuntimeError("数据库不可用")
+
+    job_log_sink.remember("sink-retry", JobMeta(log_job_id="log-retry", name="重试任务", trigger_type="date"))
+    job_log_sink._apply(submitted("sink-retry"))
+    job_log_sink._apply(executed("sink-retry", retval="later"))
+
+    failed = job_log_sink._STATS["failed"]
+    with monkeypatch.context() as patched:
+        patched.setattr(job_log_sink, "async_db_session", broken_session)
+        run_in_app(test_client, job_log_sink._flush)
+    assert job_log_sink._STATS["failed"] == failed + 1
+    assert len(job_log_sink._DIRTY) == 1
+    assert rows("log-retry") == []
+
+    run_in_app(test_client, job_log_sink._flush)
+    assert not job_log_sink._DIRTY
+    assert rows("log-retry") == [(job_log_sink.JOB_STATUS_SUCCESS, "later", None, None)]
@@ -0,0 +1,225 @@
+"""
+核心组件测试 —— 日志批量写入器（app.core.log_sink）
+
+以独立注册的登录日志写入器写入测试 SQLite 库，覆盖批量 / 定时刷新、队列溢出策略、
+溢出文件回放与关闭时的收尾写入。
+"""
+
+import asyncio
+import itertools
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+from conftest import query_db, run_in_app
+from fastapi.testclient import TestClient
+
+from app.config.setting import settings
+from app.core import log_sink
+from app.core.log_sink import LogSink
+
+_SEQ = itertools.count()
+
+
+@pytest.fixture
+def sink(test_client: TestClient) -> Iterator[LogSink]:
+    """每个用例一个独立的写入器（不参与 lifespan 的 init / close）"""
+    name = f"test_login_log_{next(_SEQ)}"
+    instance = LogSink(name, log_sink._login_log_model)
+    yield instance
+    LogSink._registry.pop(name, None)
+    run_in_app(test_client, instance.close)
+    for path in log_sink.SPILL_DIR.glob(f"{name}-*"):
+        path.unlink()
+
+
+def row(sink: LogSink, i: int) -> dict[str, Any]:
+    return {"username": sink.name, "status": 1, "msg": f"row-{i}", "tenant_id": 1}
+
+
+def stored(sink: LogSink) -> list[str]:
+    return [r[0] for r in query_db("SELECT msg FROM sys_login_log WHERE username = ? ORDER BY id", (sink.name,))]
+
+
+def gate_writes(sink: LogSink) -> asyncio.Event:
+    """后台批次写入前等待放行，模拟写入进行中"""
+    release = asyncio.Event()
+
+    async def gated(rows: list[dict[str, Any]]) -> None:
+        await release.wait()
+        await LogSink._write(sink, rows)
+
+    sink._write = gated  # type: ignore[method-assign]
+    return release
+
+
+async def wait_until(predicate: Callable[[], bool], timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("等待条件超时")
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def small_queue(monkeypatch: pytest.MonkeyPatch) -> None:
+    # 队列容量 1：后台任务未取走前，第二行即触发溢出策略
+    monkeypatch.setattr(settings, "LOG_SINK_QUEUE_SIZE", 1)
+    monkeypatch.setattr(settings, "LOG_SINK_FLUSH_INTERVAL_MS", 20)
+
+
+def test_not_running_writes_inline(test_client: TestClient, sink: LogSink) -> None:
+    run_in_app(test_client, sink.submit, row(sink, 0))
+    assert stored(sink) == ["row-0"]
+    assert sink.stats()["batches"] == 1
+
+
+def test_full_batch_flushes_without_waiting(
+    test_client: TestClient, sink: LogSink, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "LOG_SINK_BATCH_SIZE", 3)
+    monkeypatch.setattr(settings, "LOG_SINK_FLUSH_INTERVAL_MS", 60_000)
+
+    async def main() -> None:
+        await sink.start()
+        for i in range(4):
+            await sink.submit(row(sink, i))
+        # 攒满一批立即写入；不足一批的行等待刷新间隔
+        await wait_until(lambda: sink.batches == 1)
+        await asyncio.sleep(0.05)
+        assert sink.written == 3
+        assert sink.stats()["running"]
+
+    run_in_app(test_client, main)
+    assert stored(sink) == ["row-0", "row-1", "row-2"]
+
+
+def test_partial_batch_flushes_after_interval(
+    test_client: TestClient, sink: LogSink, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "LOG_SINK_BATCH_SIZE", 100)
+    monkeypatch.setattr(settings, "LOG_SINK_FLUSH_INTERVAL_MS", 50)
+
+    async def main() -> None:
+        await sink.start()
+        await sink.submit(row(sink, 0))
+        await sink.submit(row(sink, 1))
+        await wait_until(lambda: sink.written == 2)
+        # 两行合并为一次写入
+        assert sink.batches == 1
+
+    run_in_app(test_client, main)
+    assert stored(sink) == ["row-0", "row-1"]
+
+
+def test_overflow_drop(test_client: TestClient, sink: LogSink, small_queue: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOG_SINK_OVERFLOW", "drop")
+
+    async def main() -> None:
+        await sink.start()
+        # 连续提交之间不让出事件循环，后台任务来不及取走
+        for i in range(3):
+            await sink.submit(row(sink, i))
+        assert sink.dropped == 2
+        await sink.close()
+
+    run_in_app(test_client, main)
+    assert stored(sink) == ["row-0"]
+    assert not list(log_sink.SPILL_DIR.glob(f"{sink.name}-*"))
+
+
+def test_overflow_block(test_client: TestClient, sink: LogSink, small_queue: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOG_SINK_OVERFLOW", "block")
+    monkeypatch.setattr(settings, "LOG_SINK_BATCH_SIZE", 1)
+
+    async def main() -> None:
+        release = gate_writes(sink)
+        await sink.start()
+        await sink.submit(row(sink, 0))
+        await wait_until(lambda: sink._queue is not None and sink._queue.empty())
+        await sink.submit(row(sink, 1))
+        # 第一行写入中、第二行占满队列：第三行的提交一直等待空位
+        blocked = asyncio.create_task(sink.submit(row(sink, 2)))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        release.set()
+        await asyncio.wait_for(blocked, 2)
+        await sink.close()
+        assert sink.dropped == 0 and sink.spilled == 0
+
+    run_in_app(test_client, main)
+    assert stored(sink) == ["row-0", "row-1", "row-2"]
+
+
+def test_overflow_spill_replays_on_start(
+    test_client: TestClient, sink: LogSink, small_queue: None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "LOG_SINK_OVERFLOW", "spill")
+
+    async def overflow() -> None:
+        await sink.start()
+        await sink.submit(row(sink, 0))
+        await sink.submit(row(sink, 1))
+        assert sink.spilled == 1
+        await sink.close()
+
+    run_in_app(test_client, overflow)
+    assert stored(sink) == ["row-0"]
+    (spill_file,) = log_sink.SPILL_DIR.glob(f"{sink.name}-*.jsonl")
+    assert '"msg": "row-1"' in spill_file.read_text(encoding="utf-8")
+
+    # 下次启动先回放溢出文件（时间字段还原为 datetime 后入库），回放完删除文件
+    run_in_app(test_client, sink.start)
+    assert stored(sink) == ["row-0", "row-1"]
+    assert not list(log_sink.SPILL_DIR.glob(f"{sink.name}-*"))
+    created = query_db(
+        "SELECT created_time FROM sys_login_log WHERE username = ? AND msg = 'row-1'", (sink.name,)
+    )
+    assert created[0][0] is not None
+
+
+def test_close_writes_partial_batch(test_client: TestClient, sink: LogSink, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOG_SINK_FLUSH_INTERVAL_MS", 60_000)
+
+    async def main() -> None:
+        await sink.start()
+        await sink.submit(row(sink, 0))
+        await sink.submit(row(sink, 1))
+        # 后台任务已取出两行、正在等待凑批：关闭时暂存的行也要写完
+        await wait_until(lambda: sink._queue is not None and sink._queue.empty())
+        assert sink.written == 0
+        await sink.close()
+
+    run_in_app(test_client, main)
+    assert stored(sink) == ["row-0", "row-1"]
+
+
+def test_close_waits_for_inflight_batch(
+    test_client: TestClient, sink: LogSink, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "LOG_SINK_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "LOG_SINK_FLUSH_INTERVAL_MS", 60_000)
+
+    async def main() -> None:
+        release = gate_writes(sink)
+        await sink.start()
+        await sink.submit(row(sink, 0))
+        await sink.submit(row(sink, 1))
+        # 第一批已取出、正在写入
+        await wait_until(lambda: sink._inflight is not None)
+        # 写入完成前后台任务不再取行，后续提交留在队列
+        for i in range(2, 5):
+            await sink.submit(row(sink, i))
+
+        closing = asyncio.create_task(sink.close())
+        await asyncio.sleep(0.05)
+        # 写入中的批次未完成前 close 不返回，也不会被取消
+        assert not closing.done()
+        release.set()
+        await asyncio.wait_for(closing, 2)
+        assert not sink.running
+        assert sink.stats()["queued"] == 0
+
+    run_in_app(test_client, main)
+    assert sorted(stored(sink)) == [f"row-{i}" for i in range(5)]
+    assert sink.failed == 0
@@ -0,0 +1,148 @@
+"""
+核心组件测试 —— 登录审计管道（app.core.login_audit）的失败聚合
+
+聚合用例用可控时钟替换 ``time.monotonic``，并截获 ``_emit`` 的事件；
+未启动管道时的直接写入用测试 SQLite 库断言。
+"""
+
+import asyncio
+from collections.abc import Iterator
+from types import SimpleNamespace
+
+import pytest
+from conftest import query_db, run_in_app
+from fastapi.testclient import TestClient
+
+from app.config.setting import settings
+from app.core import login_audit
+from app.utils.ip_local_util import IpLocalUtil
+
+IP = "10.0.0.8"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _reset_windows() -> Iterator[None]:
+    login_audit._WINDOWS.clear()
+    yield
+    login_audit._WINDOWS.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(login_audit, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def emitted(monkeypatch: pytest.MonkeyPatch, clock: Clock) -> list[login_audit._AuditEvent]:
+    """模拟管道已启动：聚合生效，发出的事件收集到列表"""
+    events: list[login_audit._AuditEvent] = []
+
+    async def capture(event: login_audit._AuditEvent) -> None:
+        events.append(event)
+
+    monkeypatch.setattr(login_audit, "_running", lambda: True)
+    monkeypatch.setattr(login_audit, "_emit", capture)
+    monkeypatch.setattr(settings, "LOGIN_AUDIT_AGGREGATE", True)
+    monkeypatch.setattr(settings, "LOGIN_AUDIT_AGGREGATE_WINDOW", 60)
+    monkeypatch.setattr(settings, "LOGIN_AUDIT_AGGREGATE_THRESHOLD", 3)
+    return events
+
+
+def fail(times: int, username: str = "attacker", msg: str = "密码错误", ip: str | None = IP) -> None:
+    async def main() -> None:
+        for _ in range(times):
+            await login_audit.record(username, 2, login_ip=ip, msg=msg)
+
+    asyncio.run(main())
+
+
+def test_failures_beyond_threshold_are_counted_not_recorded(emitted: list[login_audit._AuditEvent]) -> None:
+    aggregated = login_audit._STATS["aggregated"]
+    fail(5)
+    # 前 THRESHOLD 次逐条记录，其余只计数
+    assert len(emitted) == 3
+    assert login_audit._STATS["aggregated"] == aggregated + 2
+    (window,) = login_audit._WINDOWS.values()
+    assert (window.count, window.suppressed) == (5, 2)
+
+    # 失败原因不同或成功登录不并入同一窗口
+    fail(1, msg="验证码错误")
+    asyncio.run(login_audit.record("attacker", 1, login_ip=IP, msg="登录成功"))
+    assert len(emitted) == 5
+    assert len(login_audit._WINDOWS) == 2
+
+
+def test_expired_window_emits_merged_row(emitted: list[login_audit._AuditEvent], clock: Clock) -> None:
+    fail(5)
+    emitted.clear()
+    clock.now += settings.LOGIN_AUDIT_AGGREGATE_WINDOW
+
+    # 窗口结束后的下一次失败：先写出合并记录，再开启新窗口并逐条记录
+    fail(1)
+    merged, single = emitted
+    assert merged.row is not None and single.row is not None
+    assert merged.row["msg"] == "密码错误（重复 2 次）"
+    assert single.row["msg"] == "密码错误"
+    (window,) = login_audit._WINDOWS.values()
+    assert (window.count, window.suppressed) == (1, 0)
+
+    # 没有被合并的失败时窗口结束不产生记录
+    clock.now += settings.LOGIN_AUDIT_AGGREGATE_WINDOW
+    assert login_audit._sweep() == []
+    assert not login_audit._WINDOWS
+
+
+def test_merged_row_content(emitted: list[login_audit._AuditEvent], clock: Clock) -> None:
+    fail(6, username="merged-user")
+    (window,) = login_audit._WINDOWS.values()
+    last = window.last_suppressed
+
+    # 未到期的窗口不被清扫，强制清扫（关闭时）照常写出
+    assert login_audit._sweep() == []
+    (event,) = login_audit._sweep(force=True)
+    assert event.ip == IP and event.row is not None
+    assert event.row["username"] == "merged-user"
+    assert event.row["status"] == 2
+    assert event.row["msg"] == "密码错误（重复 3 次）"
+    assert event.row["description"].startswith("60 秒内共失败 6 次，其中 3 次合并为本条记录")
+    assert f"{window.first_suppressed:%Y-%m-%d %H:%M:%S} 至 {last:%Y-%m-%d %H:%M:%S}" in event.row["description"]
+    assert event.row["created_time"] == event.row["updated_time"] == last
+
+
+def test_window_cap_falls_back_to_single_rows(
+    emitted: list[login_audit._AuditEvent], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(login_audit, "_MAX_WINDOWS", 2)
+    fail(1, username="user-a")
+    fail(1, username="user-b")
+    emitted.clear()
+
+    # 窗口数已达上限：新键不再聚合，每次失败都逐条记录
+    fail(10, username="user-c")
+    assert len(emitted) == 10
+    assert set(login_audit._WINDOWS) == {("user-a", IP, "密码错误"), ("user-b", IP, "密码错误")}
+
+
+def test_not_running_writes_every_failure_inline(test_client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LOGIN_AUDIT_AGGREGATE_THRESHOLD", 1)
+    assert not login_audit.stats()["running"]
+
+    async def main() -> None:
+        for _ in range(3):
+            await login_audit.record("inline-audit", 2, login_ip="127.0.0.1", msg="密码错误")
+
+    # 未启动时不聚合，当场解析本地可得的归属地并写入
+    run_in_app(test_client, main)
+    rows = query_db("SELECT status, msg, login_location FROM sys_login_log WHERE username = 'inline-audit'")
+    assert rows == [(2, "密码错误", IpLocalUtil.location_hint("127.0.0.1"))] * 3
+    assert not login_audit._WINDOWS
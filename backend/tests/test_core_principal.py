@@ -0,0 +1,134 @@
+"""
+核心组件测试 —— 认证主体缓存（app.core.principal）
+
+以普通用户登录后反复请求受权限保护的接口：角色权限、用户状态、菜单状态变更后
+必须递增版本号，且下一次请求按新数据重建认证快照。
+"""
+
+import itertools
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import pytest
+from conftest import query_db
+from fastapi.testclient import TestClient
+
+from app.core import login_audit, principal
+
+_SEQ = itertools.count()
+PERMISSION = "module_system:position:query"
+PROTECTED = "/system/position/list"
+
+
+@dataclass
+class Member:
+    user_id: int
+    role_id: int
+    headers: dict[str, str]
+
+
+@pytest.fixture(autouse=True)
+def principal_redis(test_client: TestClient) -> Iterator[None]:
+    """与请求共用测试 Redis，使失效操作写入版本号"""
+    original = principal._REDIS
+    principal._REDIS = test_client.app.state.redis
+    yield
+    principal._REDIS = original
+
+
+async def _skip_login_log(*args: object, **kwargs: object) -> None:
+    return None
+
+
+@pytest.fixture
+def member(test_client: TestClient, auth_headers: dict, monkeypatch: pytest.MonkeyPatch) -> Member:
+    """新建一个未授权任何菜单的角色及其下的普通用户，并以该用户登录"""
+    # 登录日志与本组用例无关，跳过其写入（未启动管道时会与登录事务争用 SQLite 写锁）
+    monkeypatch.setattr(login_audit, "record", _skip_login_log)
+    tag = f"principal{next(_SEQ)}"
+    resp = test_client.post(
+        "/system/role/create", headers=auth_headers, json={"name": f"缓存角色{tag}", "code": tag, "status": 0}
+    )
+    role_id = resp.json()["data"]["id"]
+    resp = test_client.post(
+        "/system/user/create",
+        headers=auth_headers,
+        json={"username": tag, "password": "member123", "name": tag, "dept_id": 1, "role_ids": [role_id]},
+    )
+    user_id = resp.json()["data"]["id"]
+    resp = test_client.post("/system/auth/login", data={"username": tag, "password": "member123"})
+    token = resp.json()["data"]["access_token"]
+    return Member(user_id=user_id, role_id=role_id, headers={"Authorization": f"Bearer {token}"})
+
+
+def menu_id(permission: str) -> int:
+    ((found,),) = query_db("SELECT id FROM platform_menu WHERE permission = ? AND type = 3", (permission,))
+    return found
+
+
+def versions(test_client: TestClient, user_id: int) -> tuple:
+    return test_client.portal.call(principal.get_version, test_client.app.state.redis, user_id)
+
+
+def grant(test_client: TestClient, auth_headers: dict, role_id: int, menu_ids: list[int]) -> None:
+    resp = test_client.put(
+        "/system/role/permission",
+        headers=auth_headers,
+        json={"role_ids": [role_id], "menu_ids": menu_ids, "data_scope": 1},
+    )
+    assert resp.json()["success"], resp.text
+
+
+def allowed(test_client: TestClient, member: Member) -> bool:
+    body = test_client.get(PROTECTED, headers=member.headers).json()
+    assert body["success"] or body["code"] == 10403, body
+    return body["success"]
+
+
+def test_role_permission_change_reloads_principal(test_client: TestClient, auth_headers: dict, member: Member) -> None:
+    assert not allowed(test_client, member)
+    # 第二次请求命中缓存
+    assert not allowed(test_client, member)
+    assert member.user_id in principal._principal_cache
+
+    before = versions(test_client, member.user_id)
+    grant(test_client, auth_headers, member.role_id, [menu_id(PERMISSION)])
+    assert versions(test_client, member.user_id)[0] != before[0]
+    assert member.user_id not in principal._principal_cache
+    assert allowed(test_client, member)
+    assert PERMISSION in principal._principal_cache[member.user_id][2].permissions
+
+    grant(test_client, auth_headers, member.role_id, [])
+    assert not allowed(test_client, member)
+
+
+def test_disabled_user_is_rejected_on_next_request(test_client: TestClient, auth_headers: dict, member: Member) -> None:
+    assert test_client.get("/system/user/current/info", headers=member.headers).json()["success"]
+    before = versions(test_client, member.user_id)
+
+    resp = test_client.patch(
+        "/system/user/status/batch", headers=auth_headers, json={"ids": [member.user_id], "status": 1}
+    )
+    assert resp.json()["success"], resp.text
+    assert versions(test_client, member.user_id)[1] != before[1]
+
+    body = test_client.get("/system/user/current/info", headers=member.headers).json()
+    assert not body["success"]
+    assert body["code"] == 10401
+
+
+def test_menu_edit_reloads_principal(test_client: TestClient, auth_headers: dict, member: Member) -> None:
+    target = menu_id(PERMISSION)
+    grant(test_client, auth_headers, member.role_id, [target])
+    assert allowed(test_client, member)
+
+    before = versions(test_client, member.user_id)
+    resp = test_client.patch("/platform/menu/status/batch", headers=auth_headers, json={"ids": [target], "status": 1})
+    try:
+        assert resp.json()["success"], resp.text
+        assert versions(test_client, member.user_id)[0] != before[0]
+        # 停用菜单的权限不再计入快照
+        assert not allowed(test_client, member)
+    finally:
+        test_client.patch("/platform/menu/status/batch", headers=auth_headers, json={"ids": [target], "status": 0})
+    assert allowed(test_client, member)
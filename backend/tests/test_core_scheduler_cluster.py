@@ -0,0 +1,281 @@
+"""
+核心组件测试 —— 调度器主节点选举（app.core.scheduler_leader）与分片执行队列（app.core.task_queue）
+
+使用内存版的 Redis 替身（字符串 / Lua 租约脚本 / pub/sub / Stream 的最小子集），不依赖真实 Redis。
+"""
+
+import asyncio
+import importlib.util
+import json
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from types import ModuleType
+from typing import Any
+
+import pytest
+
+from app.config.setting import settings
+from app.core import scheduler_leader, task_queue
+
+
+class FakePubSub:
+    def __init__(self, redis: "FakeRedis") -> None:
+        self.redis = redis
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.channels: list[str] = []
+
+    async def subscribe(self, *channels: str) -> None:
+        for channel in channels:
+            self.redis.subscribers[channel].append(self.queue)
+            self.channels.append(channel)
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            yield await self.queue.get()
+
+    async def aclose(self) -> None:
+        for channel in self.channels:
+            self.redis.subscribers[channel].remove(self.queue)
+
+
+class FakeRedis:
+    """选举与任务队列用到的 Redis 命令子集"""
+
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+        self.subscribers: dict[str, list[asyncio.Queue]] = defaultdict(list)
+        self.published: list[tuple[str, Any]] = []
+        self.stream: list[tuple[str, dict]] = []
+        self.acked: list[str] = []
+        self.deleted: list[str] = []
+        self.deliveries: dict[str, int] = {}
+        self.fail_eval = False
+        self.on_xadd: Callable[[dict], Awaitable[None]] | None = None
+
+    async def set(self, key: str, value: str, nx: bool = False, px: int | None = None) -> bool | None:
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def get(self, key: str) -> str | None:
+        return self.store.get(key)
+
+    async def eval(self, script: str, numkeys: int, key: str, token: str, *args: Any) -> int:
+        # 续约 / 释放脚本：比对持有者后 PEXPIRE / DEL
+        if self.fail_eval:
+            raise ConnectionError("Redis 不可达")
+        if self.store.get(key) != token:
+            return 0
+        if "'del'" in script:
+            del self.store[key]
+        return 1
+
+    async def publish(self, channel: str, message: Any) -> int:
+        self.published.append((channel, message))
+        for queue in self.subscribers[channel]:
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(self.subscribers[channel])
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> FakePubSub:
+        return FakePubSub(self)
+
+    async def xgroup_create(self, *args: Any, **kwargs: Any) -> bool:
+        return True
+
+    async def xadd(self, stream: str, fields: dict, **kwargs: Any) -> str:
+        message_id = f"{len(self.stream) + 1}-0"
+        self.stream.append((message_id, fields))
+        if self.on_xadd is not None:
+            await self.on_xadd(fields)
+        return message_id
+
+    async def xpending_range(self, stream: str, group: str, min: str, max: str, count: int) -> list[dict]:
+        return [{"message_id": min, "times_delivered": self.deliveries.get(min, 1)}]
+
+    async def xack(self, stream: str, group: str, *message_ids: str) -> int:
+        self.acked.extend(message_ids)
+        return len(message_ids)
+
+    async def xdel(self, stream: str, *message_ids: str) -> int:
+        self.deleted.extend(message_ids)
+        return len(message_ids)
+
+
+async def wait_until(predicate: Callable[[], bool], timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("等待条件超时")
+        await asyncio.sleep(0.01)
+
+
+def load_contender(name: str) -> ModuleType:
+    """加载一份独立的选举模块，模拟另一个进程（拥有不同的进程标识与状态）"""
+    spec = importlib.util.spec_from_file_location(name, scheduler_leader.__file__)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class Contender:
+    def __init__(self, module: ModuleType) -> None:
+        self.module = module
+        self.elected = 0
+        self.demoted = 0
+
+    async def start(self, redis: FakeRedis) -> None:
+        async def on_elected() -> None:
+            self.elected += 1
+
+        async def on_demoted() -> None:
+            self.demoted += 1
+
+        async def on_message(message: dict[str, Any]) -> None:
+            pass
+
+        await self.module.init(redis, on_elected, on_demoted, on_message)
+
+
+@pytest.fixture
+def long_lease(monkeypatch: pytest.MonkeyPatch) -> None:
+    # 续约间隔 TTL/3 远长于用例耗时：选举结果只能来自首次抢占、广播唤醒或手动唤醒
+    monkeypatch.setattr(settings, "SCHEDULER_LEADER_TTL", 30)
+
+
+class TestSchedulerLeader:
+    def test_only_one_contender_wins(self, long_lease: None) -> None:
+        async def main() -> None:
+            redis = FakeRedis()
+            contenders = [Contender(load_contender(f"leader_contender_{i}")) for i in range(3)]
+            for contender in contenders:
+                await contender.start(redis)
+            await wait_until(lambda: any(c.module.is_leader() for c in contenders))
+            await asyncio.sleep(0.05)
+            leaders = [c for c in contenders if c.module.is_leader()]
+            assert len(leaders) == 1
+            assert redis.store[scheduler_leader._lease_key()] == leaders[0].module.token()
+            assert [c.elected for c in contenders].count(1) == 1
+            for contender in contenders:
+                await contender.module.close()
+
+        asyncio.run(main())
+
+    def test_released_lease_wakes_follower(self, long_lease: None) -> None:
+        async def main() -> None:
+            redis = FakeRedis()
+            first, second = Contender(load_contender("leader_first")), Contender(load_contender("leader_second"))
+            await first.start(redis)
+            await wait_until(first.module.is_leader)
+            await second.start(redis)
+            await asyncio.sleep(0.05)
+            assert not second.module.is_leader()
+
+            # 主节点正常退出：释放租约并广播，从节点不等续约间隔立即接手
+            await first.module.close()
+            assert json.loads(redis.published[-1][1])["action"] == "released"
+            await wait_until(second.module.is_leader, timeout=1.0)
+            assert redis.store[scheduler_leader._lease_key()] == second.module.token()
+            await second.module.close()
+
+        asyncio.run(main())
+
+    def test_lost_lease_steps_down(self, long_lease: None) -> None:
+        async def main() -> None:
+            redis = FakeRedis()
+            contender = Contender(load_contender("leader_lost"))
+            await contender.start(redis)
+            await wait_until(contender.module.is_leader)
+
+            # 租约被其他进程持有：续约脚本返回 0，立即降级
+            redis.store[scheduler_leader._lease_key()] = "other-process"
+            contender.module._WAKE.set()
+            await wait_until(lambda: not contender.module.is_leader())
+            assert contender.demoted == 1
+            assert contender.module.stats()["demoted"] == 1
+            await contender.module.close()
+            # 已降级的进程不会删除他人的租约
+            assert redis.store[scheduler_leader._lease_key()] == "other-process"
+
+        asyncio.run(main())
+
+    def test_unreachable_redis_steps_down_before_expiry(self, long_lease: None) -> None:
+        async def main() -> None:
+            redis = FakeRedis()
+            contender = Contender(load_contender("leader_unreachable"))
+            await contender.start(redis)
+            await wait_until(contender.module.is_leader)
+
+            # 续约请求失败，且下一次续约前租约即将到期：提前降级，不与新主节点重叠
+            redis.fail_eval = True
+            contender.module._EXPIRES = 0.0
+            contender.module._WAKE.set()
+            await wait_until(lambda: not contender.module.is_leader())
+            assert contender.demoted == 1
+            assert contender.module.stats()["renew_failed"] >= 1
+            await contender.module.close()
+
+        asyncio.run(main())
+
+
+class TestTaskQueue:
+    def test_submit_resolves_from_published_reply(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(settings, "TASK_QUEUE_RESULT_TIMEOUT", 5)
+
+        async def main() -> None:
+            redis = FakeRedis()
+
+            async def executor_reply(fields: dict) -> None:
+                # 执行进程：按投递内容回传结果（在 XADD 返回前即发布，验证先登记再投递）
+                args = json.loads(fields["args"])
+                if fields["job_id"] == "boom":
+                    reply = {"task_id": fields["task_id"], "ok": False, "error": "ValueError: 失败"}
+                else:
+                    reply = {"task_id": fields["task_id"], "ok": True, "result": sum(args)}
+                await redis.publish(fields["reply"], json.dumps(reply))
+
+            redis.on_xadd = executor_reply
+            await task_queue.init(redis)
+            try:
+                await wait_until(lambda: bool(redis.subscribers[task_queue._reply_channel()]))
+                assert await task_queue.submit("sum", "def handler(*a): ...", [1, 2, 3], {}) == 6
+                with pytest.raises(task_queue.TaskQueueError, match="失败"):
+                    await task_queue.submit("boom", "", [], {})
+                assert not task_queue._WAITERS
+                assert redis.stream[0][1]["job_id"] == "sum"
+            finally:
+                await task_queue.close()
+
+        asyncio.run(main())
+
+    def test_worker_fails_message_after_max_deliveries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        from app.core.ap_scheduler import SchedulerUtil
+
+        executed: list[str] = []
+        monkeypatch.setattr(SchedulerUtil, "_run_code_block", lambda job_id, *args, **kwargs: executed.append(job_id))
+
+        async def main() -> None:
+            redis = FakeRedis()
+            worker = task_queue._Worker(redis, concurrency=1)
+            fields = {"task_id": "t1", "job_id": "crashy", "code": "", "args": "[]", "kwargs": "{}", "reply": "reply-ch"}
+            try:
+                # 被接管的消息已投递次数超过上限：不再执行，直接回传失败并确认删除
+                redis.deliveries["1-0"] = settings.TASK_QUEUE_MAX_DELIVERIES + 1
+                await worker._handle("1-0", fields, reclaimed=True)
+                channel, payload = redis.published[-1]
+                reply = json.loads(payload)
+                assert channel == "reply-ch"
+                assert reply["ok"] is False and "TaskQueueError" in reply["error"]
+                assert executed == []
+                assert redis.acked == ["1-0"] and redis.deleted == ["1-0"]
+
+                # 未超过上限的接管消息照常执行
+                redis.deliveries["2-0"] = settings.TASK_QUEUE_MAX_DELIVERIES
+                await worker._handle("2-0", fields, reclaimed=True)
+                assert json.loads(redis.published[-1][1])["ok"] is True
+                assert executed == ["crashy"]
+            finally:
+                worker.executor.shutdown(wait=True)
+
+        asyncio.run(main())
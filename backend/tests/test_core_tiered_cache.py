@@ -0,0 +1,168 @@
+"""
+核心组件测试 —— 两级缓存（app.core.tiered_cache）
+
+本地 TTL 用可控时钟替换 ``time.monotonic``；提交后失效使用测试 SQLite 库的真实事务。
+"""
+
+import asyncio
+import itertools
+import json
+from collections.abc import Iterator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from conftest import run_in_app
+from fastapi.testclient import TestClient
+
+from app.core import tiered_cache
+from app.core.database import async_db_session
+from app.core.tiered_cache import TieredCache
+
+_SEQ = itertools.count()
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class Publisher:
+    """记录失效广播的 Redis 替身"""
+
+    def __init__(self) -> None:
+        self.messages: list[dict[str, Any]] = []
+
+    async def publish(self, channel: str, message: str) -> int:
+        self.messages.append(json.loads(message))
+        return 1
+
+
+class Loader:
+    def __init__(self, value: Any = "v") -> None:
+        self.value = value
+        self.calls = 0
+
+    async def __call__(self) -> Any:
+        self.calls += 1
+        return self.value
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(tiered_cache, "time", SimpleNamespace(monotonic=clock.monotonic))
+    return clock
+
+
+@pytest.fixture
+def publisher(monkeypatch: pytest.MonkeyPatch) -> Publisher:
+    publisher = Publisher()
+    monkeypatch.setattr(tiered_cache, "_REDIS", publisher)
+    return publisher
+
+
+@pytest.fixture
+def cache() -> Iterator[TieredCache]:
+    instance = TieredCache(f"test_tiered_{next(_SEQ)}", maxsize=2, ttl=10)
+    yield instance
+    TieredCache._registry.pop(instance.name, None)
+
+
+def test_hit_until_ttl_expires(cache: TieredCache, clock: Clock) -> None:
+    loader = Loader()
+
+    async def main() -> None:
+        assert await cache.get("k", loader) == "v"
+        clock.now += 9.9
+        assert await cache.get("k", loader) == "v"
+        assert cache.peek("k") == "v"
+        assert loader.calls == 1
+
+        # 过期后重新加载
+        clock.now += 0.1
+        assert cache.peek("k") is None
+        assert await cache.get("k", loader) == "v"
+        assert loader.calls == 2
+
+    asyncio.run(main())
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_lru_eviction_and_none_not_cached(cache: TieredCache, clock: Clock) -> None:
+    async def main() -> None:
+        for key in ("a", "b"):
+            await cache.get(key, Loader(key))
+        await cache.get("a", Loader())
+        # 超出容量淘汰最久未使用的 b
+        await cache.get("c", Loader("c"))
+        assert cache.peek("b") is None
+        assert (cache.peek("a"), cache.peek("c")) == ("a", "c")
+
+        missing = Loader(None)
+        assert await cache.get("none", missing) is None
+        assert await cache.get("none", missing) is None
+        assert missing.calls == 2
+
+    asyncio.run(main())
+    assert cache.evictions == 1
+
+
+def test_invalidate_drops_and_broadcasts(cache: TieredCache, clock: Clock, publisher: Publisher) -> None:
+    async def main() -> None:
+        await cache.get(("dict", 1), Loader("old"))
+        await cache.get("other", Loader("keep"))
+        await cache.invalidate(("dict", 1))
+        assert cache.peek(("dict", 1)) is None
+        assert cache.peek("other") == "keep"
+
+        await cache.invalidate()
+        assert cache.peek("other") is None
+
+    asyncio.run(main())
+    assert [(m["cache"], m["key"]) for m in publisher.messages] == [(cache.name, ["dict", 1]), (cache.name, None)]
+
+    # 其他 worker 的广播：复合键经 JSON 变为 list，按 tuple 失效
+    cache.set(("dict", 1), "new")
+    tiered_cache._apply(json.dumps({"cache": cache.name, "key": ["dict", 1], "origin": "other"}))
+    assert cache.peek(("dict", 1)) is None
+
+
+def test_invalidate_during_load_skips_backfill(cache: TieredCache, clock: Clock, publisher: Publisher) -> None:
+    async def main() -> None:
+        async def slow_loader() -> str:
+            # 加载期间写入方完成更新并失效
+            await cache.invalidate("k")
+            return "stale"
+
+        assert await cache.get("k", slow_loader) == "stale"
+        assert cache.peek("k") is None
+
+    asyncio.run(main())
+
+
+def test_invalidate_after_commit_only_on_commit(
+    test_client: TestClient, cache: TieredCache, clock: Clock, publisher: Publisher
+) -> None:
+    async def main() -> None:
+        cache.set("k", "v")
+        with pytest.raises(RuntimeError):
+            async with async_db_session() as session, session.begin():
+                cache.invalidate_after_commit(session, "k")
+                raise RuntimeError("回滚")
+        # 回滚不失效、不广播
+        assert cache.peek("k") == "v"
+
+        async with async_db_session() as session, session.begin():
+            cache.invalidate_after_commit(session, "k")
+            # 提交前仍保留本地条目
+            assert cache.peek("k") == "v"
+        assert cache.peek("k") is None
+        # 广播在提交回调中异步发出
+        await asyncio.sleep(0)
+
+    run_in_app(test_client, main)
+    assert [(m["cache"], m["key"]) for m in publisher.messages] == [(cache.name, "k")]
@@ -1,8 +1,18 @@
 """
-应用入口测试 —— 健康检查接口返回码与响应体校验。
+应用入口测试 —— 健康检查接口返回码与响应体校验、请求级 SQL 统计。
 """
 
+import asyncio
+from collections.abc import Iterator
+
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.config.setting import settings
+from app.core import sql_stats
+from app.core.exceptions import CustomException
 
 
 def test_check_readiness(test_client: TestClient) -> None:
@@ -19,3 +29,109 @@ def test_check_health(test_client: TestClient) -> None:
     body = response.json()
     assert body["success"] is True
     assert body["code"] == 0
+
+
+def test_metrics(test_client: TestClient) -> None:
+    test_client.get("/common/health")
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'fastapiadmin_http_request_duration_seconds_count{method="GET",route="/common/health",status="200"' in response.text
+
+
+@pytest.fixture
+def stats_engine(monkeypatch: pytest.MonkeyPatch) -> Iterator[AsyncEngine]:
+    """挂载 SQL 统计事件的独立内存库引擎（应用引擎的挂载在用例结束后恢复）"""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    monkeypatch.setattr(sql_stats, "_ENGINE", None)
+    sql_stats.init(engine)
+    yield engine
+    sql_stats.close()
+
+
+async def _select(engine: AsyncEngine, *values: int) -> None:
+    async with engine.connect() as conn:
+        for value in values:
+            await conn.execute(text("SELECT :v"), {"v": value})
+
+
+def test_sql_stats_server_timing(test_client: TestClient) -> None:
+    response = test_client.get("/common/health/")
+    assert response.headers["server-timing"].startswith("db;dur=")
+
+
+def test_sql_stats_counts_statements(stats_engine: AsyncEngine) -> None:
+    async def main() -> sql_stats.RequestSqlStats:
+        await _select(stats_engine)  # 首次连接的方言初始化语句不计入
+        stats, token = sql_stats.begin()
+        try:
+            await _select(stats_engine, 1, 2, 3)
+            async with stats_engine.connect() as conn:
+                await conn.execute(text("SELECT 1 WHERE 1 IN (1, 2)"))
+        finally:
+            sql_stats.reset(token)
+        assert sql_stats.current() is None
+        await _select(stats_engine, 4)  # 复位后不再计入
+        await stats_engine.dispose()
+        return stats
+
+    stats = asyncio.run(main())
+    assert stats.count == 4
+    assert stats.shapes == {"SELECT ?": 3, "SELECT 1 WHERE 1 IN (1, 2)": 1}
+    assert stats.total_ms > 0
+    assert len(stats.top()) == 4
+    assert stats.server_timing().endswith('desc="4 queries"')
+
+
+def test_sql_stats_repeat_limit(stats_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "SQL_REPEAT_LIMIT", 2)
+
+    async def main() -> None:
+        stats, token = sql_stats.begin()
+        try:
+            async with stats_engine.connect() as conn:
+                for value in (1, 2):
+                    await conn.execute(text("SELECT :v"), {"v": value})
+                with pytest.raises(CustomException, match="N\\+1"):
+                    await conn.execute(text("SELECT :v"), {"v": 3})
+                # 超限时不应在连接上遗留未配对的开始时间
+                assert not conn.info.get("sql_stats_start")
+        finally:
+            sql_stats.reset(token)
+            await stats_engine.dispose()
+        assert stats.count == 2
+
+    asyncio.run(main())
+
+
+def test_sql_stats_isolation(stats_engine: AsyncEngine) -> None:
+    async def request(n: int) -> int:
+        stats, token = sql_stats.begin()
+        try:
+            await _select(stats_engine, *range(n))
+            await asyncio.sleep(0)
+        finally:
+            sql_stats.reset(token)
+        return stats.count
+
+    async def job() -> sql_stats.RequestSqlStats | None:
+        await _select(stats_engine, 1, 2, 3)
+        return sql_stats.current()
+
+    async def main() -> tuple[list[int], int, sql_stats.RequestSqlStats | None]:
+        await _select(stats_engine)
+        counts = await asyncio.gather(request(1), request(2), request(3))
+        stats, token = sql_stats.begin()
+        try:
+            # 请求内派生的后台任务：不继承、不累加请求的统计
+            inner = await asyncio.create_task(job(), context=sql_stats.detached_context())
+            await _select(stats_engine, 1)
+        finally:
+            sql_stats.reset(token)
+        await stats_engine.dispose()
+        return counts, stats.count, inner
+
+    counts, count, inner = asyncio.run(main())
+    assert counts == [1, 2, 3]
+    assert count == 1
+    assert inner is None
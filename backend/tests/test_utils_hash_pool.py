@@ -0,0 +1,71 @@
+"""
+工具测试 —— 密码哈希线程池（app.utils.hash_bcrpy_util._HashPool）
+
+排队数达到上限时直接拒绝并返回 503，不在事件循环上无限堆积登录请求。
+"""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import login_audit
+from app.core.exceptions import CustomException
+from app.utils import hash_bcrpy_util
+from app.utils.hash_bcrpy_util import _HashPool
+
+
+def test_pending_limit_rejects_with_503() -> None:
+    pool = _HashPool(workers=1, max_pending=1)
+    release = threading.Event()
+
+    async def main() -> None:
+        running = asyncio.create_task(pool.run(release.wait))
+        while not pool.running:
+            await asyncio.sleep(0.01)
+        queued = asyncio.create_task(pool.run(lambda: "queued"))
+        await asyncio.sleep(0.01)
+        assert (pool.running, pool.pending) == (1, 1)
+
+        # 线程已占满且排队数达到上限：第三个请求立即拒绝
+        with pytest.raises(CustomException) as exc_info:
+            await pool.run(lambda: "rejected")
+        assert exc_info.value.status_code == 503
+        assert pool.rejected == 1
+
+        release.set()
+        assert await running is True
+        assert await queued == "queued"
+
+        # 排队中被取消的请求回退排队计数
+        release.clear()
+        blocker = asyncio.create_task(pool.run(release.wait))
+        while not pool.running:
+            await asyncio.sleep(0.01)
+        cancelled = asyncio.create_task(pool.run(lambda: "cancelled"))
+        await asyncio.sleep(0.01)
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert pool.pending == 0
+        release.set()
+        await blocker
+
+    try:
+        asyncio.run(main())
+    finally:
+        release.set()
+        pool.shutdown()
+    assert pool.stats()["completed"] == 3
+
+
+def test_login_returns_503_when_hash_queue_is_full(test_client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def skip_login_log(*args: object, **kwargs: object) -> None:
+        return None
+
+    monkeypatch.setattr(login_audit, "record", skip_login_log)
+    monkeypatch.setattr(hash_bcrpy_util._HASH_POOL, "max_pending", 0)
+    resp = test_client.post("/system/auth/login", data={"username": "admin", "password": "admin123"})
+    assert resp.status_code == 503
+    assert resp.json()["msg"] == "系统繁忙，请稍后重试"